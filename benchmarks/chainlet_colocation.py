@@ -0,0 +1,116 @@
+"""Benchmark the per-hop overhead removed by co-locating a chainlet.
+
+Calls a light-weight "glue" chainlet `--calls` times sequentially, with a pydantic
+document of `--tokens` tokens as input and output:
+
+* `http hop`: through a generated-style stub (`predict_async`) to a local aiohttp
+  server that parses the input model, calls `run_remote` like the generated
+  `predict` and serializes the output model. This is a lower bound for a deployed
+  dependency, which additionally goes through the truss server and the network.
+* `co-located`: a direct `await` on the instance, as generated for chainlets with
+  `ChainletOptions(colocate=True)`.
+
+Usage:
+    uv run python benchmarks/chainlet_colocation.py
+    uv run python benchmarks/chainlet_colocation.py --calls 5000 --tokens 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+import pydantic
+from aiohttp import web
+
+import truss_chains as chains
+from truss_chains.remote_chainlet import utils
+
+
+class Document(pydantic.BaseModel):
+    text: str
+    tokens: list[int]
+    scores: list[float]
+
+
+class Glue:
+    async def run_remote(self, doc: Document) -> Document:
+        return doc
+
+
+# As generated for the stub and the truss model of `Glue`.
+class GlueInput(pydantic.BaseModel):
+    doc: Document
+
+
+GlueOutput = pydantic.RootModel[Document]
+
+
+class GlueStub(chains.StubBase):
+    async def run_remote(self, doc: Document) -> Document:
+        return (await self.predict_async(GlueInput(doc=doc), GlueOutput)).root
+
+
+async def _start_server(glue: Glue) -> tuple[web.AppRunner, str]:
+    async def predict(request: web.Request) -> web.Response:
+        inputs = GlueInput.model_validate_json(await request.read())
+        result = await glue.run_remote(**utils.pydantic_set_field_dict(inputs))
+        return web.Response(
+            body=GlueOutput(result).model_dump_json(), content_type="application/json"
+        )
+
+    app = web.Application()
+    app.router.add_post("/predict", predict)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/predict"
+
+
+async def _time(
+    name: str, calls: int, fn: Callable[[Document], Awaitable[Document]], doc: Document
+) -> None:
+    durations = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        await fn(doc)
+        durations.append(time.perf_counter() - t0)
+    durations.sort()
+    print(
+        f"{name:>11} | {statistics.mean(durations) * 1e6:>9.1f}us "
+        f"{statistics.median(durations) * 1e6:>9.1f}us "
+        f"{durations[int(len(durations) * 0.99)] * 1e6:>9.1f}us | "
+        f"{calls / sum(durations):>9.0f}/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=256)
+    args = parser.parse_args()
+
+    doc = Document(
+        text="lorem ipsum " * (args.tokens // 2),
+        tokens=list(range(args.tokens)),
+        scores=[i / args.tokens for i in range(args.tokens)],
+    )
+    glue = Glue()
+    runner, url = await _start_server(glue)
+    stub = GlueStub.from_url(url, "dummy-API-key")
+
+    print(f"{'':>11} | {'mean':>11} {'p50':>11} {'p99':>11} | {'rate':>11}")
+    try:
+        await _time("http hop", args.calls, stub.run_remote, doc)
+        await _time("co-located", args.calls, glue.run_remote, doc)
+    finally:
+        if stub._cached_async_client:
+            await stub._cached_async_client[0].close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
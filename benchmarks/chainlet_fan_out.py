@@ -0,0 +1,98 @@
+"""Benchmark fan-out RPCs from a chainlet stub to a local stand-in server.
+
+Sends `--items` small inputs to an aiohttp server that simulates `--latency-ms` of
+model time per request and compares:
+
+* `gather`: one `predict_async` call per input, all started at once,
+* `many`: `predict_async_many`, pipelined over `--max-in-flight` requests,
+* `many batched`: `predict_async_many` with `--batch-size` inputs per request.
+
+Usage:
+    uv run python benchmarks/chainlet_fan_out.py
+    uv run python benchmarks/chainlet_fan_out.py --items 10000 --batch-size 64
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from aiohttp import web
+
+import truss_chains as chains
+
+
+async def _start_server(latency_secs: float) -> tuple[web.AppRunner, str]:
+    async def predict(request: web.Request) -> web.Response:
+        body = await request.json()
+        await asyncio.sleep(latency_secs)
+        if "items" in body:
+            return web.json_response(
+                [{"embedding": [item["id"]]} for item in body["items"]]
+            )
+        return web.json_response({"embedding": [body["id"]]})
+
+    app = web.Application()
+    app.router.add_post("/predict", predict)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/predict"
+
+
+async def _time(name: str, num_items: int, fn: Callable[[], Awaitable[Any]]) -> None:
+    t0 = time.perf_counter()
+    await fn()
+    duration = time.perf_counter() - t0
+    print(f"{name:>14} | {duration:>7.2f}s | {num_items / duration:>9.0f} items/s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    runner, url = await _start_server(args.latency_ms / 1000)
+    stub = chains.StubBase.from_url(
+        url,
+        "dummy-API-key",
+        options=chains.RPCOptions(concurrency_limit=args.max_in_flight),
+    )
+    inputs = [{"id": i} for i in range(args.items)]
+
+    async def gather() -> None:
+        await asyncio.gather(*(stub.predict_async(item) for item in inputs))
+
+    async def many() -> None:
+        async for _ in stub.predict_async_many(
+            inputs, max_in_flight=args.max_in_flight
+        ):
+            pass
+
+    async def many_batched() -> None:
+        async for _ in stub.predict_async_many(
+            inputs,
+            max_in_flight=args.max_in_flight,
+            batch_size=args.batch_size,
+            batch_inputs=lambda items: {"items": items},
+        ):
+            pass
+
+    print(f"{'':>14} | {'time':>8} | {'throughput':>16}")
+    try:
+        await _time("gather", args.items, gather)
+        await _time("many", args.items, many)
+        await _time("many batched", args.items, many_batched)
+    finally:
+        if stub._cached_async_client:
+            await stub._cached_async_client[0].close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+"""Benchmark the throughput of the chains streaming codec (`truss_chains.streaming`).
+
+Writes `--items` items with a stream writer and reads them back with a stream reader
+from chunks of `--chunk-size` bytes (like an HTTP response body), for two item types:
+
+* `tokens`: a text delta with `--tokens` token ids, as streamed from an LLM,
+* `audio`: a 20ms 48kHz 16bit stereo PCM frame (3840 bytes).
+
+Compares `before` (the previous JSON serialization and compacting `bytearray` reader,
+patched in here), `json` and `msgpack` encodings, each with validated and raw
+(`read_raw_items`) reading. With JSON, the PCM data is base64 encoded.
+
+Usage:
+    uv run python benchmarks/chains_streaming_codec.py
+    uv run python benchmarks/chains_streaming_codec.py --items 50000 --chunk-size 1024
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+
+import pydantic
+
+from truss_chains import streaming
+
+
+class TokenChunk(pydantic.BaseModel):
+    text: str
+    token_ids: list[int]
+
+
+class AudioFrame(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+
+    seq: int
+    pcm: bytes
+
+
+class _LegacyByteReader:
+    def __init__(self, source: AsyncIterator[bytes]) -> None:
+        self._source = source
+        self._buffer = bytearray()
+
+    async def readexactly(self, num_bytes: int) -> bytes:
+        while len(self._buffer) < num_bytes:
+            try:
+                chunk = await self._source.__anext__()
+            except StopAsyncIteration:
+                break
+            self._buffer.extend(chunk)
+        if len(self._buffer) < num_bytes:
+            if len(self._buffer) == 0:
+                raise EOFError()
+            raise asyncio.IncompleteReadError(self._buffer, num_bytes)
+        result = bytes(self._buffer[:num_bytes])
+        del self._buffer[:num_bytes]
+        return result
+
+
+class _LegacyStreamReader(streaming._StreamReader):
+    def __init__(self, types: streaming.StreamTypes, stream: AsyncIterator[bytes]):
+        super().__init__(types, stream)
+        self._stream = _LegacyByteReader(stream)  # type: ignore[assignment]
+
+    def _validate(self, model, data):
+        return model.model_validate_json(data)
+
+
+class _LegacyStreamWriter(streaming._StreamWriter):
+    def _serialize(self, obj: pydantic.BaseModel, delimiter) -> bytes:
+        data_bytes = obj.model_dump_json().encode()
+        data = bytearray(self._pack_tag(delimiter, len(data_bytes)))
+        data.extend(data_bytes)
+        return memoryview(data)  # type: ignore[return-value]
+
+
+async def _chunks(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), chunk_size):
+        yield data[i : i + chunk_size]
+
+
+async def _count(items: AsyncIterator) -> int:
+    count = 0
+    async for _ in items:
+        count += 1
+    return count
+
+
+def _bench(
+    name: str,
+    items: list[pydantic.BaseModel],
+    serialize: Callable[[pydantic.BaseModel], bytes],
+    read: Callable[[AsyncIterator[bytes]], Awaitable[int]],
+    chunk_size: int,
+) -> None:
+    t0 = time.perf_counter()
+    frames: Iterable[bytes] = [serialize(item) for item in items]
+    write_secs = time.perf_counter() - t0
+    data = b"".join(frames)
+
+    t0 = time.perf_counter()
+    count = asyncio.run(read(_chunks(data, chunk_size)))
+    read_secs = time.perf_counter() - t0
+    assert count == len(items), (count, len(items))
+    print(
+        f"{name:>22} | {len(items) / write_secs:>11.0f}/s | "
+        f"{len(items) / read_secs:>11.0f}/s {len(data) / read_secs / 1e6:>8.1f}MB/s | "
+        f"{len(data) / len(items):>7.0f}B"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--tokens", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=16 * 1024)
+    args = parser.parse_args()
+
+    pcm = bytes(i % 256 for i in range(3840))
+    payloads = {
+        "tokens": [
+            TokenChunk(text=" lorem" * args.tokens, token_ids=list(range(args.tokens)))
+            for _ in range(args.items)
+        ],
+        "audio": [AudioFrame(seq=i, pcm=pcm) for i in range(args.items)],
+    }
+    print(f"{'':>22} | {'write':>13} | {'read':>13} {'':>10} | {'size':>8}")
+    for kind, items in payloads.items():
+        model = type(items[0])
+        types = streaming.stream_types(model)
+        _bench(
+            f"{kind} before",
+            items,
+            _LegacyStreamWriter(types).yield_item,
+            lambda source: _count(_LegacyStreamReader(types, source).read_items()),
+            args.chunk_size,
+        )
+        for encoding in ("json", "msgpack"):
+            types = streaming.stream_types(model, encoding=encoding)
+            writer = streaming.stream_writer(types)
+            for raw in (False, True):
+
+                def read(source, raw=raw):
+                    reader = streaming.stream_reader(types, source)
+                    return _count(
+                        reader.read_raw_items() if raw else reader.read_items()
+                    )
+
+                _bench(
+                    f"{kind} {encoding}{' raw' if raw else ''}",
+                    items,
+                    writer.yield_item,
+                    read,
+                    args.chunk_size,
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""Benchmark content-addressed, chunk-deduplicated truss uploads.
+
+Prototype of a packing mode for `truss push` that only uploads the chunks of a
+truss that a blob store does not have yet, and of how the remote side assembles
+the archive from them. It is not part of the package, since the Baseten API has no
+endpoints to check for stored blobs and assemble them yet. `LocalBlobStore` stands
+in for the remote store.
+
+Creates a truss with `--size-mb` of data in `--files` files, uploads it, modifies
+one small file and one `--chunk-mb` chunk of a large file in place, and uploads it
+again. Reports wall time and uploaded bytes of each upload, compared to the size of
+the tar archive that `truss push` uploads every time, and checks that the assembled
+archive has the same content.
+
+Usage:
+    uv run python benchmarks/content_addressed_upload.py
+    uv run python benchmarks/content_addressed_upload.py --size-mb 4096 --chunk-mb 16
+"""
+
+import abc
+import argparse
+import io
+import os
+import tarfile
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import pydantic
+from blake3 import blake3
+
+from truss.base.constants import CONFIG_FILE
+from truss.remote.baseten.core import archive_dir
+from truss.util.path import collect_files
+
+MANIFEST_VERSION = 1
+# Files are split into chunks of this size, so that a change in a large file only
+# requires uploading the changed chunks (as long as the file size does not shift).
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_MAX_CONCURRENCY = 10
+
+# Where to read a chunk from: a (file, offset, size) range or in-memory content.
+_ChunkSource = Union[Tuple[Path, int, int], bytes]
+
+
+class ManifestFile(pydantic.BaseModel):
+    path: str
+    mode: int
+    size: int
+    mtime: int
+    chunks: List[str]
+
+
+class TrussManifest(pydantic.BaseModel):
+    """Describes a packed truss as files made up of content-addressed chunks."""
+
+    version: int = MANIFEST_VERSION
+    chunk_size: int
+    files: List[ManifestFile]
+
+    def serialize(self) -> bytes:
+        return self.model_dump_json().encode("utf-8")
+
+
+class ContentAddressedUpload(pydantic.BaseModel):
+    manifest_digest: str
+    total_bytes: int
+    uploaded_bytes: int
+
+
+class BlobStore(abc.ABC):
+    """Object store of blobs, keyed by the blake3 hex digest of their content."""
+
+    @abc.abstractmethod
+    def missing_blobs(self, digests: Iterable[str]) -> Set[str]:
+        """Returns the subset of `digests` that is not stored yet."""
+
+    @abc.abstractmethod
+    def put_blob(self, digest: str, content: bytes) -> None: ...
+
+    @abc.abstractmethod
+    def get_blob(self, digest: str) -> bytes: ...
+
+
+class LocalBlobStore(BlobStore):
+    """Stores blobs in a local directory, e.g. as stand-in for a remote store."""
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._root / digest[:2] / digest
+
+    def missing_blobs(self, digests: Iterable[str]) -> Set[str]:
+        return {digest for digest in digests if not self._blob_path(digest).exists()}
+
+    def put_blob(self, digest: str, content: bytes) -> None:
+        if blake3(content).hexdigest() != digest:
+            raise ValueError(f"Content does not match digest `{digest}`.")
+        path = self._blob_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            f.write(content)
+        # Atomic, so that concurrent uploads never expose a partial blob.
+        os.replace(f.name, path)
+
+    def get_blob(self, digest: str) -> bytes:
+        return self._blob_path(digest).read_bytes()
+
+
+def build_manifest(
+    source_dir: Path,
+    ignore_patterns: Optional[List[str]] = None,
+    config_yaml_override: Optional[bytes] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[TrussManifest, Dict[str, _ChunkSource]]:
+    """Hashes the files of `source_dir` in chunks.
+
+    Includes the same files as `create_tar_with_progress_bar`. Returns the manifest
+    and where to read the content of each distinct chunk from.
+    """
+    files_to_include = collect_files(source_dir, ignore_patterns)
+    files: List[ManifestFile] = []
+    sources: Dict[str, _ChunkSource] = {}
+    for file_path in files_to_include:
+        rel_path = file_path.relative_to(source_dir).as_posix()
+        if config_yaml_override is not None and rel_path == CONFIG_FILE:
+            continue
+        stat = file_path.stat()
+        chunks = _file_chunk_hashes(file_path, chunk_size)
+        for index, digest in enumerate(chunks):
+            offset = index * chunk_size
+            sources.setdefault(
+                digest, (file_path, offset, min(chunk_size, stat.st_size - offset))
+            )
+        files.append(
+            ManifestFile(
+                path=rel_path,
+                mode=stat.st_mode & 0o7777,
+                size=stat.st_size,
+                mtime=int(stat.st_mtime),
+                chunks=chunks,
+            )
+        )
+    if config_yaml_override is not None:
+        digest = blake3(config_yaml_override).hexdigest()
+        sources.setdefault(digest, config_yaml_override)
+        files.append(
+            ManifestFile(
+                path=CONFIG_FILE,
+                mode=0o644,
+                size=len(config_yaml_override),
+                mtime=0,
+                chunks=[digest],
+            )
+        )
+    return TrussManifest(chunk_size=chunk_size, files=files), sources
+
+
+def _read_chunk(source: _ChunkSource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    file_path, offset, size = source
+    with file_path.open("rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+def upload_content_addressed(
+    store: BlobStore,
+    source_dir: Path,
+    ignore_patterns: Optional[List[str]] = None,
+    config_yaml_override: Optional[bytes] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ContentAddressedUpload:
+    """Uploads the chunks of `source_dir` that `store` does not have yet.
+
+    The manifest is uploaded last, so that a stored manifest always refers to
+    stored chunks. Its digest identifies the upload.
+    """
+    manifest, sources = build_manifest(
+        source_dir, ignore_patterns, config_yaml_override, chunk_size
+    )
+    missing = store.missing_blobs(sources)
+    total_bytes = sum(file.size for file in manifest.files)
+    upload_bytes = sum(_chunk_length(sources[digest]) for digest in missing)
+
+    def upload(digest: str) -> None:
+        store.put_blob(digest, _read_chunk(sources[digest]))
+
+    with ThreadPoolExecutor(UPLOAD_MAX_CONCURRENCY) as executor:
+        # Consume the results, to raise errors.
+        list(executor.map(upload, sorted(missing)))
+
+    manifest_content = manifest.serialize()
+    manifest_digest = blake3(manifest_content).hexdigest()
+    if store.missing_blobs([manifest_digest]):
+        store.put_blob(manifest_digest, manifest_content)
+    return ContentAddressedUpload(
+        manifest_digest=manifest_digest,
+        total_bytes=total_bytes,
+        uploaded_bytes=upload_bytes,
+    )
+
+
+def _chunk_length(source: _ChunkSource) -> int:
+    if isinstance(source, bytes):
+        return len(source)
+    return source[2]
+
+
+class _BlobsReader(io.RawIOBase):
+    """Reads the concatenation of blobs, fetching one blob at a time."""
+
+    def __init__(self, store: BlobStore, digests: List[str]) -> None:
+        self._store = store
+        self._digests = iter(digests)
+        self._current = b""
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        while self._offset >= len(self._current):
+            digest = next(self._digests, None)
+            if digest is None:
+                return 0
+            self._current = self._store.get_blob(digest)
+            self._offset = 0
+        n = min(len(buffer), len(self._current) - self._offset)
+        buffer[:n] = self._current[self._offset : self._offset + n]
+        self._offset += n
+        return n
+
+
+def assemble_tar(store: BlobStore, manifest_digest: str, fileobj: IO[bytes]) -> None:
+    """Writes the tar of the truss described by a stored manifest to `fileobj`.
+
+    This is what the remote side does with an upload, to get the same archive that
+    `create_tar_with_progress_bar` creates.
+    """
+    manifest = TrussManifest.model_validate_json(store.get_blob(manifest_digest))
+    if manifest.version != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version {manifest.version}.")
+    with tarfile.open(fileobj=fileobj, mode="w:") as tar:
+        for file in manifest.files:
+            tarinfo = tarfile.TarInfo(name=file.path)
+            tarinfo.size = file.size
+            tarinfo.mode = file.mode
+            tarinfo.mtime = file.mtime
+            tar.addfile(tarinfo, fileobj=_BlobsReader(store, file.chunks))
+
+
+def _file_chunk_hashes(file: Path, chunk_size: int) -> List[str]:
+    hashes = []
+    buffer = bytearray(chunk_size)
+    mem_view = memoryview(buffer)
+    with file.open("rb") as f:
+        while n := f.readinto(mem_view):
+            hashes.append(blake3(mem_view[:n]).hexdigest())
+    return hashes
+
+
+def _create_truss(root: Path, num_files: int, total_bytes: int) -> List[Path]:
+    (root / "model").mkdir(parents=True)
+    (root / "model" / "model.py").write_text("class Model:\n    pass\n")
+    (root / CONFIG_FILE).write_text("model_name: benchmark\n")
+    data_dir = root / "data"
+    data_dir.mkdir()
+    files = []
+    file_bytes = total_bytes // num_files
+    for i in range(num_files):
+        file = data_dir / f"weights{i}.bin"
+        with file.open("wb") as f:
+            # Random content, repeated blocks would be deduplicated.
+            for offset in range(0, file_bytes, 1 << 20):
+                f.write(os.urandom(min(1 << 20, file_bytes - offset)))
+        files.append(file)
+    return files
+
+
+def _tar_contents(fileobj: IO[bytes]) -> Dict[str, bytes]:
+    fileobj.seek(0)
+    with tarfile.open(fileobj=fileobj, mode="r:") as tar:
+        return {
+            member.name: tar.extractfile(member).read()  # type: ignore[union-attr]
+            for member in tar.getmembers()
+        }
+
+
+def _timed_upload(
+    label: str, store: BlobStore, root: Path, chunk_size: int
+) -> ContentAddressedUpload:
+    t0 = time.perf_counter()
+    upload = upload_content_addressed(store, root, chunk_size=chunk_size)
+    print(
+        f"{label:>15}: {time.perf_counter() - t0:8.3f}s, "
+        f"{upload.uploaded_bytes / 1e6:10.1f}MB of {upload.total_bytes / 1e6:.1f}MB"
+    )
+    return upload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--chunk-mb", type=int, default=DEFAULT_CHUNK_SIZE >> 20)
+    args = parser.parse_args()
+    chunk_size = args.chunk_mb << 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "truss"
+        store = LocalBlobStore(Path(tmp) / "store")
+        print(f"Creating {args.files} files, {args.size_mb}MB ...")
+        data_files = _create_truss(root, args.files, args.size_mb << 20)
+
+        t0 = time.perf_counter()
+        archive = archive_dir(root)
+        print(
+            f"{'tar':>15}: {time.perf_counter() - t0:8.3f}s, "
+            f"{os.path.getsize(archive.name) / 1e6:10.1f}MB uploaded every push"
+        )
+        _timed_upload("first upload", store, root, chunk_size)
+        (root / "model" / "model.py").write_text("class Model:\n    x = 1\n")
+        with data_files[0].open("r+b") as f:
+            f.write(os.urandom(1024))
+        upload = _timed_upload("after change", store, root, chunk_size)
+
+        assembled = io.BytesIO()
+        assemble_tar(store, upload.manifest_digest, assembled)
+        archive = archive_dir(root)
+        assert _tar_contents(assembled) == _tar_contents(archive)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Load test for the control server proxy while the inference server (re)starts.
+
+Sends concurrent predict requests through the control server's proxy while a
+simulated inference server is down for `--downtime` seconds, and measures:
+
+* latency of the control server's own index endpoint meanwhile, which shows whether
+  waiting requests hold up the event loop,
+* how long after the inference server became ready the waiting requests complete.
+
+The inference server is simulated with an `httpx.MockTransport`, the control app is
+driven in-process via `httpx.ASGITransport`.
+
+Usage:
+    uv run python benchmarks/control_proxy_restart.py
+    uv run python benchmarks/control_proxy_restart.py --requests 500 --downtime 3
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+_TEMPLATES = Path(__file__).parent.parent / "truss" / "templates"
+sys.path[:0] = [
+    str(_TEMPLATES / "control" / "control"),
+    str(_TEMPLATES),
+    str(_TEMPLATES / "shared"),
+]
+
+from endpoints import control_app  # noqa: E402
+from helpers.inference_server_process_controller import (  # noqa: E402
+    InferenceServerProcessController,
+)
+
+
+def _percentiles(values: list[float]) -> str:
+    values = sorted(values)
+    p50 = statistics.median(values)
+    p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+    return f"p50={p50 * 1000:8.2f}ms p99={p99 * 1000:8.2f}ms max={values[-1] * 1000:8.2f}ms"
+
+
+async def _run(num_requests: int, downtime_secs: float) -> None:
+    server_up = False
+
+    def inference_server(request: httpx.Request) -> httpx.Response:
+        if not server_up:
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    app = FastAPI()
+    app.include_router(control_app)
+    app.state.logger = logging.getLogger(__name__)
+    app.state.proxy_client = httpx.AsyncClient(
+        base_url="http://inference-server",
+        transport=httpx.MockTransport(inference_server),
+    )
+    controller = InferenceServerProcessController(
+        tempfile.gettempdir(), [], 8080, app_logger=app.state.logger
+    )
+    app.state.inference_server_process_controller = controller
+
+    client = httpx.AsyncClient(
+        base_url="http://control", transport=httpx.ASGITransport(app=app), timeout=None
+    )
+
+    async def predict() -> float:
+        resp = await client.post("/v1/models/model:predict", json={})
+        resp.raise_for_status()
+        return time.monotonic()
+
+    index_latencies: list[float] = []
+
+    async def poll_index() -> None:
+        while True:
+            t0 = time.monotonic()
+            await client.get("/")
+            index_latencies.append(time.monotonic() - t0)
+            await asyncio.sleep(0.01)
+
+    poller = asyncio.create_task(poll_index())
+    predictions = [asyncio.create_task(predict()) for _ in range(num_requests)]
+    await asyncio.sleep(downtime_secs)
+    server_up = True
+    ready_at = time.monotonic()
+    controller.mark_inference_server_ready()
+    done_at = await asyncio.gather(*predictions)
+    poller.cancel()
+
+    resumed = [t - ready_at for t in done_at]
+    print(f"requests={num_requests} downtime={downtime_secs}s")
+    print(f"  control index latency during restart: {_percentiles(index_latencies)}")
+    print(f"  predict completion after ready:       {_percentiles(resumed)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--downtime", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(_run(args.requests, args.downtime))
+
+
+if __name__ == "__main__":
+    main()
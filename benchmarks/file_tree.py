@@ -0,0 +1,159 @@
+"""Benchmark browsing a large training cache or checkpoint listing.
+
+Generates a synthetic flat listing of `--entries` files and directories (about ten
+files per directory, several levels deep) and times, `--rounds` times each:
+
+* `cache sizes`: `calculate_directory_sizes` as used by `truss train cache view`,
+* `browse`: listing the root and then `--steps` directories on the way down and back
+  up, as the interactive checkpoint explorer does on each navigation step.
+
+Both are compared to the previous implementations, which walked the parents of every
+file and scanned the flat listing with `startswith` on every step, respectively.
+
+Usage:
+    uv run python benchmarks/file_tree.py
+    uv run python benchmarks/file_tree.py --entries 200000 --steps 50
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Callable
+
+from truss.cli.train.cache import calculate_directory_sizes
+from truss.cli.train.checkpoint_viewer import _build_file_tree, _list_directory
+from truss.remote.baseten.custom_types import FileSummary
+
+
+def _scan_directory_sizes(files: list[FileSummary]) -> dict[str, int]:
+    """Previous `calculate_directory_sizes`."""
+    directory_sizes = {f.path: 0 for f in files if f.file_type == "directory"}
+    for file_info in files:
+        current_path = file_info.path
+        for _ in range(100):
+            if current_path in directory_sizes:
+                directory_sizes[current_path] += file_info.size_bytes
+            parent = os.path.dirname(current_path)
+            if parent == current_path:
+                break
+            current_path = parent
+    return directory_sizes
+
+
+def _scan_directory_listing(files: list[dict], current_path: str) -> tuple:
+    """Previous `_build_directory_listing`."""
+    dir_stats: dict[str, dict] = {}
+    dir_files: list[dict] = []
+    prefix = current_path + "/" if current_path else ""
+    for f in files:
+        rel = f.get("_rel_path", "")
+        if not rel.startswith(prefix):
+            continue
+        remainder = rel[len(prefix) :]
+        if not remainder:
+            continue
+        if "/" in remainder:
+            subdir_name = remainder.split("/", 1)[0]
+            if subdir_name not in dir_stats:
+                dir_stats[subdir_name] = {
+                    "name": subdir_name,
+                    "total_size": 0,
+                    "file_count": 0,
+                }
+            dir_stats[subdir_name]["total_size"] += f.get("size_bytes", 0)
+            dir_stats[subdir_name]["file_count"] += 1
+        else:
+            dir_files.append(f)
+    return list(dir_stats.values()), dir_files
+
+
+def _generate_listing(entries: int) -> list[FileSummary]:
+    """Directories `/cache/model-<i>/snapshot-<j>/shard-<k>` with ten files each."""
+    files: list[FileSummary] = []
+
+    def add(path: str, size: int, file_type: str) -> None:
+        files.append(
+            FileSummary.model_construct(
+                path=path,
+                size_bytes=size,
+                modified="2025-01-01T00:00:00Z",
+                file_type=file_type,
+                permissions=None,
+            )
+        )
+
+    i = 0
+    while len(files) < entries:
+        model = f"/cache/model-{i // 100}"
+        if i % 100 == 0:
+            add(model, 4096, "directory")
+        snapshot = f"{model}/snapshot-{i // 10 % 10}"
+        if i % 10 == 0:
+            add(snapshot, 4096, "directory")
+        shard = f"{snapshot}/shard-{i % 10}"
+        add(shard, 4096, "directory")
+        for k in range(10):
+            add(f"{shard}/file-{k}.bin", (i * 10 + k) % 100_000, "file")
+        i += 1
+    return files[:entries]
+
+
+def _browse_path(files: list[FileSummary], steps: int) -> list[str]:
+    """Directories visited when opening `steps` directories down and back up."""
+    deepest = max((f.path for f in files if f.file_type == "directory"), key=len)
+    parts = deepest.split("/")
+    down = ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+    path: list[str] = []
+    while len(path) < steps:
+        path.extend(down + down[-2::-1])
+    return path[:steps]
+
+
+def _time(fn: Callable[[], object], rounds: int) -> tuple[float, float]:
+    durations = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - t0)
+    return statistics.mean(durations), max(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    files = _generate_listing(args.entries)
+    file_dicts = [{"_rel_path": f.path, "size_bytes": f.size_bytes} for f in files]
+    browse_path = _browse_path(files, args.steps)
+    assert calculate_directory_sizes(files) == _scan_directory_sizes(files)
+
+    def browse_indexed() -> None:
+        file_tree = _build_file_tree(file_dicts)
+        for path in browse_path:
+            _list_directory(file_tree, path)
+
+    def browse_scan() -> None:
+        for path in browse_path:
+            _scan_directory_listing(file_dicts, path)
+
+    print(
+        f"{len(files)} entries, {len(browse_path)} browse steps, {args.rounds} rounds\n"
+        f"{'':>22} | {'mean':>8} {'max':>8}"
+    )
+    benchmarks: list[tuple[str, Callable[[], object]]] = [
+        ("cache sizes, scan", lambda: _scan_directory_sizes(files)),
+        ("cache sizes, indexed", lambda: calculate_directory_sizes(files)),
+        ("browse, scan", browse_scan),
+        ("browse, indexed", browse_indexed),
+    ]
+    for name, fn in benchmarks:
+        mean, worst = _time(fn, args.rounds)
+        print(f"{name:>22} | {mean:>7.2f}s {worst:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
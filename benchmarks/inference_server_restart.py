@@ -0,0 +1,124 @@
+"""Benchmark inference server restart latency with and without the zygote.
+
+Builds a truss whose model imports the packages in `--requirements`, runs its
+inference server under the control server's process controller and measures the time
+from stopping the running server until the new one has loaded the model, `--restarts`
+times each:
+
+* `spawn`: a new interpreter per restart (`subprocess.Popen`),
+* `zygote`: forked from a zygote that preloaded the truss server and requirements
+  (`INFERENCE_SERVER_ZYGOTE=1`). The first start, which also starts the zygote, is
+  reported separately.
+
+Usage:
+    uv run python benchmarks/inference_server_restart.py
+    uv run python benchmarks/inference_server_restart.py --requirements torch transformers
+"""
+
+import argparse
+import logging
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import yaml
+
+from truss.contexts.image_builder.serving_image_builder import (
+    ServingImageBuilderContext,
+)
+from truss.contexts.local_loader.docker_build_emulator import DockerBuildEmulator
+
+_TEMPLATES = Path(__file__).parent.parent / "truss" / "templates"
+sys.path[:0] = [
+    str(_TEMPLATES / "control" / "control"),
+    str(_TEMPLATES),
+    str(_TEMPLATES / "shared"),
+]
+
+from helpers.inference_server_process_controller import (  # noqa: E402
+    InferenceServerProcessController,
+)
+
+
+def _build_truss_fs(requirements: list[str], tmp_path: Path) -> Path:
+    truss_dir = tmp_path / "truss"
+    (truss_dir / "model").mkdir(parents=True)
+    (truss_dir / "config.yaml").write_text(
+        yaml.safe_dump({"model_name": "restart", "requirements": requirements})
+    )
+    imports = "\n".join(f"import {name.replace('-', '_')}" for name in requirements)
+    (truss_dir / "model" / "model.py").write_text(
+        f"{imports}\n\n\nclass Model:\n    def predict(self, inputs):\n        return inputs\n"
+    )
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    ServingImageBuilderContext.run(truss_dir).prepare_image_build_dir(build_dir)
+    truss_fs = tmp_path / "truss_fs"
+    truss_fs.mkdir()
+    DockerBuildEmulator(build_dir / "Dockerfile", build_dir).run(truss_fs)
+    return truss_fs / "app"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+def _restart(controller: InferenceServerProcessController, port: int) -> float:
+    t0 = time.perf_counter()
+    controller.stop()
+    controller.start(dict(os.environ))
+    url = f"http://localhost:{port}/v1/models/model/loaded"
+    while True:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return time.perf_counter() - t0
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+
+
+def _run(home: Path, use_zygote: bool, restarts: int) -> None:
+    port = _free_port()
+    controller = InferenceServerProcessController(
+        str(home),
+        [sys.executable, "main.py"],
+        port,
+        app_logger=logging.getLogger(__name__),
+        use_zygote=use_zygote,
+    )
+    try:
+        first = _restart(controller, port)
+        durations = [_restart(controller, port) for _ in range(restarts)]
+    finally:
+        controller.stop()
+        controller.reset_zygote()
+    name = "zygote" if use_zygote else "spawn"
+    print(
+        f"{name:>7} | {first:>9.2f}s | {statistics.mean(durations):>9.2f}s "
+        f"{statistics.median(durations):>9.2f}s {max(durations):>9.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--restarts", type=int, default=5)
+    parser.add_argument("--requirements", nargs="*", default=["numpy"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        home = _build_truss_fs(args.requirements, Path(tmp_dir))
+        print(f"{'':>7} | {'first':>10} | {'mean':>10} {'p50':>9} {'max':>9}")
+        _run(home, use_zygote=False, restarts=args.restarts)
+        _run(home, use_zygote=True, restarts=args.restarts)
+
+
+if __name__ == "__main__":
+    main()
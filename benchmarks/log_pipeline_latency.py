@@ -0,0 +1,152 @@
+"""Benchmark the logging cost on the inference server's event loop.
+
+Emits `--records` uvicorn access records at `--rate` per second (plus one model
+log line per `--model-log-every` requests) from an event loop, with stdout and stderr going to a
+pipe that is drained by a reader thread, like a container's log collector. Reports
+the latency of the logging calls on the loop, the resulting request rate, the time
+until all records are written and the number of dropped records for:
+
+* `before`: separate health check and metrics filters, synchronous handlers,
+* `fused`: the single-pass filter, synchronous handlers,
+* `queued`: the single-pass filter, `TRUSS_QUEUED_LOGGING` handlers.
+
+Usage:
+    uv run python benchmarks/log_pipeline_latency.py
+    uv run python benchmarks/log_pipeline_latency.py --records 200000 --rate 0
+"""
+
+import argparse
+import asyncio
+import logging
+import logging.config
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Any
+
+from truss.templates.shared import log_config
+
+
+class _LegacyHealthCheckFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        excluded_paths = {
+            "GET / ",
+            "GET /v1/models/model ",
+            "GET /v1/models/model/loaded ",
+        }
+        msg = record.getMessage()
+        return not any(path in msg for path in excluded_paths)
+
+
+class _LegacyMetricsFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return "/metrics" not in record.getMessage()
+
+
+def _drain(fd: int) -> None:
+    while os.read(fd, 1 << 16):
+        pass
+
+
+def _configure(mode: str) -> dict[str, Any]:
+    if mode == "queued":
+        os.environ["TRUSS_QUEUED_LOGGING"] = "1"
+    else:
+        os.environ.pop("TRUSS_QUEUED_LOGGING", None)
+    config: Any = log_config.make_log_config("INFO")
+    if mode == "before":
+        config["filters"]["legacy_health"] = {"()": _LegacyHealthCheckFilter}
+        config["filters"]["legacy_metrics"] = {"()": _LegacyMetricsFilter}
+        config["loggers"]["uvicorn.access"]["filters"] = [
+            "legacy_health",
+            "legacy_metrics",
+        ]
+    logging.config.dictConfig(config)
+    return config
+
+
+async def _run(records: int, model_log_every: int, rate: float) -> list[float]:
+    access_logger = logging.getLogger("uvicorn.access")
+    model_logger = logging.getLogger("model")
+    durations = []
+    start = time.perf_counter()
+    for i in range(records):
+        t0 = time.perf_counter()
+        access_logger.info(
+            '%s - "%s %s HTTP/%s" %d',
+            "10.0.0.1:51234",
+            "POST",
+            "/v1/models/model:predict",
+            "1.1",
+            200,
+        )
+        if i % model_log_every == 0:
+            model_logger.info("Processed batch %d with %d items.", i, 32)
+        durations.append(time.perf_counter() - t0)
+        if i % 100 == 0:
+            # Let other "requests" run, paced to `rate` records per second.
+            delay = i / rate - (time.perf_counter() - start) if rate else 0
+            await asyncio.sleep(max(delay, 0))
+    return durations
+
+
+def _bench(mode: str, records: int, model_log_every: int, rate: float) -> str:
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=_drain, args=(read_fd,), daemon=True)
+    reader.start()
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    pipe = os.fdopen(write_fd, "w", buffering=1)
+    sys.stdout = sys.stderr = pipe
+    try:
+        _configure(mode)
+        t0 = time.perf_counter()
+        durations = asyncio.run(_run(records, model_log_every, rate))
+        loop_secs = time.perf_counter() - t0
+        handlers = {
+            handler
+            for name in ("uvicorn", "uvicorn.access")
+            for handler in logging.getLogger(name).handlers
+        }
+        # Flushes and closes (queued handlers write their remaining records).
+        logging.config.dictConfig({"version": 1, "disable_existing_loggers": False})
+        total_secs = time.perf_counter() - t0
+        dropped = sum(getattr(handler, "dropped", 0) for handler in handlers)
+    finally:
+        sys.stdout, sys.stderr = original_stdout, original_stderr
+        pipe.close()
+        reader.join()
+        os.close(read_fd)
+    durations.sort()
+    p50 = statistics.median(durations) * 1e6
+    p99 = durations[int(len(durations) * 0.99)] * 1e6
+    return (
+        f"{mode:>7} | {p50:>7.1f}us {p99:>8.1f}us {durations[-1] * 1e3:>8.2f}ms | "
+        f"{records / loop_secs:>9.0f}/s {total_secs:>7.2f}s {dropped:>8}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--model-log-every", type=int, default=10)
+    parser.add_argument(
+        "--rate", type=float, default=5000, help="Records per second, 0 for no limit."
+    )
+    args = parser.parse_args()
+
+    results = [
+        _bench(mode, args.records, args.model_log_every, args.rate)
+        for mode in ("before", "fused", "queued")
+    ]
+    print(
+        f"{'':>7} | {'p50':>9} {'p99':>10} {'max':>10} | "
+        f"{'loop rate':>11} {'drained':>8} {'dropped':>8}"
+    )
+    for result in results:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
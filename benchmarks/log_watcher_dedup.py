@@ -0,0 +1,103 @@
+"""Benchmark log de-duplication of `LogWatcher` on a long-running tail.
+
+Replays `--lines` synthetic log lines, `--lines-per-sec` at a time per simulated
+second, polled every 2 seconds with the usual clock-skew overlap, and reports time
+and the memory held by the de-duplication state at the end for:
+
+* `sha256 set`: the previous implementation, a never pruned set of SHA-256 hex
+  digests of every line,
+* `recent logs`: `_RecentLogs`, timestamp-bucketed and pruned to the overlap window.
+
+Usage:
+    uv run python benchmarks/log_watcher_dedup.py
+    uv run python benchmarks/log_watcher_dedup.py --lines 5000000
+"""
+
+import argparse
+import hashlib
+import time
+import tracemalloc
+from typing import Iterator
+
+from truss.cli.logs.base_watcher import (
+    CLOCK_SKEW_BUFFER_MS,
+    POLL_INTERVAL_SEC,
+    _RecentLogs,
+)
+from truss.cli.logs.utils import ParsedLog
+
+
+def _polls(num_lines: int, lines_per_sec: int) -> Iterator[tuple[int, list[ParsedLog]]]:
+    """Yields (poll start in ns, logs returned by the poll) as `LogWatcher` sees them."""
+    poll_interval_ms = POLL_INTERVAL_SEC * 1000
+    lines_per_poll = lines_per_sec * POLL_INTERVAL_SEC
+    # Every poll re-fetches the lines of the overlap window.
+    overlap_polls = CLOCK_SKEW_BUFFER_MS // poll_interval_ms
+    logs: list[ParsedLog] = []
+    now_ms = 1_700_000_000_000
+    for i in range(0, num_lines, lines_per_poll):
+        for j in range(min(lines_per_poll, num_lines - i)):
+            timestamp_ns = (now_ms + j * poll_interval_ms // lines_per_poll) * 1_000_000
+            logs.append(
+                ParsedLog.model_construct(
+                    timestamp=str(timestamp_ns),
+                    message=f"INFO request {i + j} completed in 12ms status=200",
+                    replica=f"replica-{j % 4}",
+                )
+            )
+        start_ns = (now_ms - CLOCK_SKEW_BUFFER_MS) * 1_000_000
+        logs = logs[-lines_per_poll * (overlap_polls + 1) :]
+        yield start_ns, [log for log in logs if int(log.timestamp) >= start_ns]
+        now_ms += poll_interval_ms
+
+
+def _run_sha256(num_lines: int, lines_per_sec: int) -> tuple[int, object]:
+    hashes: set[str] = set()
+    printed = 0
+    for _, logs in _polls(num_lines, lines_per_sec):
+        for log in logs:
+            log_str = f"{log.timestamp}-{log.message}-{log.replica}"
+            if (h := hashlib.sha256(log_str.encode("utf-8")).hexdigest()) not in hashes:
+                hashes.add(h)
+                printed += 1
+    return printed, hashes
+
+
+def _run_recent_logs(num_lines: int, lines_per_sec: int) -> tuple[int, object]:
+    recent_logs = _RecentLogs()
+    printed = 0
+    for start_ns, logs in _polls(num_lines, lines_per_sec):
+        for log in logs:
+            if recent_logs.add(int(log.timestamp), log):
+                printed += 1
+        recent_logs.prune(start_ns)
+    return printed, recent_logs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--lines-per-sec", type=int, default=20)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    for _ in _polls(args.lines, args.lines_per_sec):
+        pass
+    print(f"replaying {args.lines} lines alone: {time.perf_counter() - t0:.2f}s")
+    print(f"{'':>12} | {'time':>8} | {'memory of dedup state':>21}")
+    for name, fn in (("sha256 set", _run_sha256), ("recent logs", _run_recent_logs)):
+        t0 = time.perf_counter()
+        printed, _ = fn(args.lines, args.lines_per_sec)
+        duration = time.perf_counter() - t0
+        assert printed == args.lines, (printed, args.lines)
+        # Separate run, tracemalloc slows down allocations considerably.
+        tracemalloc.start()
+        _, state = fn(args.lines, args.lines_per_sec)
+        state_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del state
+        print(f"{name:>12} | {duration:>7.2f}s | {state_bytes / 1e6:>19.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
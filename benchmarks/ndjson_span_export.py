@@ -0,0 +1,101 @@
+"""Benchmark the request-path cost of exporting truss spans to an NDJSON file.
+
+Ends `--spans` spans (with a few events each, like the truss server's) and measures
+the time spent in the thread ending them, for:
+
+* `simple`: the previous setup, a `SimpleSpanProcessor` with an exporter that
+  re-parses the JSON of each span and flushes the file per span,
+* `batched`: `JSONFileExporter` behind a `BatchSpanProcessor`, as configured by
+  `tracing.get_truss_tracer` if `OTEL_TRACING_NDJSON_FILE` is set,
+* `sampled`: like `batched`, with `tracing_sample_ratio: 0.1`.
+
+Usage:
+    uv run python benchmarks/ndjson_span_export.py
+    uv run python benchmarks/ndjson_span_export.py --spans 100000
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import time
+from typing import Sequence
+from unittest import mock
+
+import opentelemetry.sdk.trace as sdk_trace
+import opentelemetry.sdk.trace.export as trace_export
+
+_TEMPLATES = pathlib.Path(__file__).parent.parent / "truss" / "templates"
+sys.path[:0] = [str(_TEMPLATES / "server"), str(_TEMPLATES)]
+
+from common import tracing  # noqa: E402
+
+
+class _LegacyJSONFileExporter(tracing.JSONFileExporter):
+    def export(
+        self, spans: Sequence[sdk_trace.ReadableSpan]
+    ) -> trace_export.SpanExportResult:
+        for span in spans:
+            self._file.write(json.dumps(json.loads(span.to_json())))
+            self._file.write("\n")
+        self._file.flush()
+        return trace_export.SpanExportResult.SUCCESS
+
+
+def _run(tracer, num_spans: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(num_spans):
+        with tracer.start_as_current_span("predict-endpoint") as span:
+            with tracing.section_as_event(span, "model-call"):
+                pass
+    elapsed = time.perf_counter() - t0
+    tracer.span_processor.shutdown()
+    return elapsed
+
+
+def _legacy_tracer(traces_file: pathlib.Path):
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(
+        trace_export.SimpleSpanProcessor(_LegacyJSONFileExporter(traces_file))
+    )
+    return provider.get_tracer("truss_server")
+
+
+def _truss_tracer(traces_file: pathlib.Path, sample_ratio: float):
+    tracing._truss_tracer = None
+    with mock.patch.dict(
+        os.environ, {tracing.OTEL_TRACING_NDJSON_FILE: str(traces_file)}
+    ):
+        return tracing.get_truss_tracer(
+            {},
+            {
+                "runtime": {
+                    "enable_tracing_data": True,
+                    "tracing_sample_ratio": sample_ratio,
+                }
+            },
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'':>8} | {'per span':>10} | {'lines':>7}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, make_tracer in [
+            ("simple", _legacy_tracer),
+            ("batched", lambda path: _truss_tracer(path, 1.0)),
+            ("sampled", lambda path: _truss_tracer(path, 0.1)),
+        ]:
+            traces_file = pathlib.Path(tmp_dir) / f"{name}.ndjson"
+            elapsed = _run(make_tracer(traces_file), args.spans)
+            lines = len(traces_file.read_text().splitlines())
+            print(f"{name:>8} | {elapsed / args.spans * 1e6:>8.1f}us | {lines:>7}")
+
+
+if __name__ == "__main__":
+    main()
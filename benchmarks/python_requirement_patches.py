@@ -0,0 +1,129 @@
+"""Benchmark applying a python requirement patch that touches many requirements.
+
+Applies `ADD` patches for `--requirements` to a fresh virtual environment with the
+control server's `ModelContainerPatchApplier`, then `REMOVE` patches for all of
+them, `--rounds` times each:
+
+* `per patch`: one `uv pip install`/`uninstall` per patch,
+* `batched`: all patches of the request in a single `uv pip install`/`uninstall`, as
+  the control server applies them.
+
+A warm-up round fills the uv cache first, so the numbers measure resolution and
+installation rather than downloads. Requires `uv` on the `PATH`.
+
+Usage:
+    uv run python benchmarks/python_requirement_patches.py
+    uv run python benchmarks/python_requirement_patches.py --rounds 5 --requirements six pytz
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from truss.base.truss_config import TrussConfig
+
+sys.path.insert(
+    0, str(Path(__file__).parent.parent / "truss" / "templates" / "control" / "control")
+)
+
+from helpers.custom_types import Action, PythonRequirementPatch  # noqa: E402
+from helpers.truss_patch.model_container_patch_applier import (  # noqa: E402
+    ModelContainerPatchApplier,
+)
+
+DEFAULT_REQUIREMENTS = [
+    "six",
+    "pytz",
+    "idna",
+    "certifi",
+    "attrs",
+    "packaging",
+    "tomli",
+    "wrapt",
+    "colorama",
+    "decorator",
+    "toolz",
+    "markupsafe",
+    "itsdangerous",
+    "blinker",
+    "more-itertools",
+]
+
+
+def _patches(action: Action, requirements: list[str]) -> list[PythonRequirementPatch]:
+    return [
+        PythonRequirementPatch(action=action, requirement=requirement)
+        for requirement in requirements
+    ]
+
+
+def _per_patch(
+    applier: ModelContainerPatchApplier, patches: list[PythonRequirementPatch]
+) -> None:
+    for patch in patches:
+        applier.apply_python_requirement_patches([patch])
+
+
+def _batched(
+    applier: ModelContainerPatchApplier, patches: list[PythonRequirementPatch]
+) -> None:
+    applier.apply_python_requirement_patches(patches)
+
+
+def _time(
+    apply: Callable[[ModelContainerPatchApplier, list[PythonRequirementPatch]], None],
+    applier: ModelContainerPatchApplier,
+    requirements: list[str],
+    rounds: int,
+) -> tuple[list[float], list[float]]:
+    add, remove = [], []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        apply(applier, _patches(Action.ADD, requirements))
+        add.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        apply(applier, _patches(Action.REMOVE, requirements))
+        remove.append(time.perf_counter() - t0)
+    return add, remove
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--requirements", nargs="+", default=DEFAULT_REQUIREMENTS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        home = Path(tmp_dir) / "app"
+        home.mkdir()
+        TrussConfig().write_to_yaml_file(home / "config.yaml")
+        venv = Path(tmp_dir) / "venv"
+        subprocess.run(
+            ["uv", "venv", "--quiet", "--python", sys.executable, str(venv)], check=True
+        )
+        os.environ["PYTHON_EXECUTABLE"] = str(venv / "bin" / "python")
+        applier = ModelContainerPatchApplier(home, logging.getLogger(__name__))
+
+        _time(_batched, applier, args.requirements, rounds=1)
+        print(
+            f"{len(args.requirements)} requirements, {args.rounds} rounds\n"
+            f"{'':>9} | {'add mean':>9} {'add max':>9} | "
+            f"{'remove mean':>11} {'remove max':>10}"
+        )
+        for name, apply in [("per patch", _per_patch), ("batched", _batched)]:
+            add, remove = _time(apply, applier, args.requirements, args.rounds)
+            print(
+                f"{name:>9} | {statistics.mean(add):>8.2f}s {max(add):>8.2f}s | "
+                f"{statistics.mean(remove):>10.2f}s {max(remove):>9.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
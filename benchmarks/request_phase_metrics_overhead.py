@@ -0,0 +1,95 @@
+"""Benchmark the per-request cost of recording phase timings.
+
+Times `--requests` simulated requests, each recording the 7 phases of a non-streamed
+predict request (queue, body read, deserialize, preprocess, predict, postprocess,
+serialize), with:
+
+* `baseline`: `perf_counter` calls only, no recording,
+* `prometheus`: a labelled `prometheus_client.Histogram`, `labels(...).observe(...)`,
+* `phases`: `PhaseHistograms.time(...)`, as used by the truss server,
+* `disabled`: `PhaseHistograms.time(...)` with phase metrics disabled (the default).
+
+Usage:
+    uv run python benchmarks/request_phase_metrics_overhead.py
+    uv run python benchmarks/request_phase_metrics_overhead.py --requests 500000
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from prometheus_client import CollectorRegistry, Histogram
+
+from truss.templates.server.common import phase_metrics
+
+_PHASES = (
+    phase_metrics.QUEUE,
+    phase_metrics.BODY_READ,
+    phase_metrics.DESERIALIZE,
+    phase_metrics.PREPROCESS,
+    phase_metrics.PREDICT,
+    phase_metrics.POSTPROCESS,
+    phase_metrics.SERIALIZE,
+)
+
+
+def _baseline(n: int) -> None:
+    for _ in range(n):
+        for _phase in _PHASES:
+            start = time.perf_counter()
+            time.perf_counter() - start
+
+
+def _prometheus(n: int) -> None:
+    histogram = Histogram(
+        phase_metrics.METRIC_NAME,
+        "Time spent in the phases of handling requests.",
+        labelnames=("endpoint", "phase"),
+        buckets=phase_metrics.DEFAULT_BUCKETS,
+        registry=CollectorRegistry(),
+    )
+    for _ in range(n):
+        for phase in _PHASES:
+            start = time.perf_counter()
+            histogram.labels(endpoint="predict", phase=phase).observe(
+                time.perf_counter() - start
+            )
+
+
+def _phases(enabled: bool) -> Callable[[int], None]:
+    def run(n: int) -> None:
+        histograms = phase_metrics.PhaseHistograms(enabled=enabled)
+        for _ in range(n):
+            for phase in _PHASES:
+                with histograms.time("predict", phase):
+                    pass
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'':>10} | {'per request':>12} | {'overhead':>10}")
+    baseline = None
+    for name, fn in [
+        ("baseline", _baseline),
+        ("prometheus", _prometheus),
+        ("phases", _phases(enabled=True)),
+        ("disabled", _phases(enabled=False)),
+    ]:
+        t0 = time.perf_counter()
+        fn(args.requests)
+        per_request = (time.perf_counter() - t0) / args.requests
+        if baseline is None:
+            baseline = per_request
+        print(
+            f"{name:>10} | {per_request * 1e6:>10.2f}us | "
+            f"{(per_request - baseline) * 1e6:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark binary codecs for numpy payloads: msgpack-numpy vs. tensor frames.
+
+Measures serialize and deserialize time for a payload holding a single float32 array
+of increasing size, for the default `truss_msgpack_serialize` codec and tensor frames
+(both the joined bytes and the chunk list that avoids the join).
+
+Usage:
+    uv run python benchmarks/serialization_codecs.py
+    uv run python benchmarks/serialization_codecs.py --sizes 1000 1000000 --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+
+import numpy as np
+
+from truss.templates.shared import serialization
+
+
+def _time_ms(fn: Callable[[], object], repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - t0)
+    return statistics.median(durations) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 10_000, 1_000_000, 10_000_000, 50_000_000],
+        help="Number of float32 elements per array.",
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(
+        f"{'elements':>12} {'MB':>8} | {'msgpack ser':>11} {'msgpack de':>11} | "
+        f"{'frame ser':>10} {'chunks ser':>10} {'frame de':>10} | {'speedup':>7}"
+    )
+    for size in args.sizes:
+        payload = {"embeddings": np.random.rand(size).astype(np.float32), "id": 1}
+        msgpack_data = serialization.truss_msgpack_serialize(payload)
+        frame_data = serialization.truss_tensor_serialize(payload)
+
+        msgpack_ser = _time_ms(
+            lambda: serialization.truss_msgpack_serialize(payload), args.repeat
+        )
+        msgpack_de = _time_ms(
+            lambda: serialization.truss_msgpack_deserialize(msgpack_data), args.repeat
+        )
+        frame_ser = _time_ms(
+            lambda: serialization.truss_tensor_serialize(payload), args.repeat
+        )
+        chunks_ser = _time_ms(
+            lambda: serialization.truss_tensor_serialize_chunks(payload), args.repeat
+        )
+        frame_de = _time_ms(
+            lambda: serialization.truss_msgpack_deserialize(frame_data), args.repeat
+        )
+        speedup = (msgpack_ser + msgpack_de) / (chunks_ser + frame_de)
+        print(
+            f"{size:>12} {payload['embeddings'].nbytes / 1e6:>8.2f} | "
+            f"{msgpack_ser:>9.3f}ms {msgpack_de:>9.3f}ms | "
+            f"{frame_ser:>8.3f}ms {chunks_ser:>8.3f}ms {frame_de:>8.3f}ms | "
+            f"{speedup:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
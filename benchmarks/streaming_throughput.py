@@ -0,0 +1,101 @@
+"""Benchmark tokens/sec of streamed responses through the truss server's buffering.
+
+Streams `--tokens` small chunks from a sync and an async generator and measures the
+rate at which the consumer (the response body) receives them, for:
+
+* `queue`: the previous implementation, an `asyncio.Queue` read with `wait_for` per
+  chunk and a thread hop per chunk for sync generators,
+* `buffer`: `StreamBuffer` without coalescing,
+* `coalesce`: `StreamBuffer` merging chunks up to 4KB.
+
+Usage:
+    uv run python benchmarks/streaming_throughput.py
+    uv run python benchmarks/streaming_throughput.py --tokens 200000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncGenerator, Callable, Generator
+
+from anyio import to_thread
+
+from truss.templates.server.common.streaming import StreamBuffer, start_producer
+
+_SENTINEL = object()
+
+
+def _sync_tokens(n: int) -> Generator[str, None, None]:
+    for i in range(n):
+        yield f"tok{i} "
+
+
+async def _async_tokens(n: int) -> AsyncGenerator[str, None]:
+    for i in range(n):
+        yield f"tok{i} "
+
+
+async def _queue_stream(gen) -> AsyncGenerator[str, None]:
+    if not hasattr(gen, "__anext__"):
+        sync_gen = gen
+
+        async def _to_async():
+            while True:
+                chunk = await to_thread.run_sync(next, sync_gen, _SENTINEL)
+                if chunk is _SENTINEL:
+                    return
+                yield chunk
+
+        gen = _to_async()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _write():
+        async for chunk in gen:
+            await queue.put(chunk)
+        await queue.put(_SENTINEL)
+
+    task = asyncio.create_task(_write())
+    while True:
+        chunk = await asyncio.wait_for(queue.get(), timeout=60)
+        if chunk is _SENTINEL:
+            break
+        yield chunk
+    await task
+
+
+async def _buffer_stream(gen, coalesce_max_bytes: int) -> AsyncGenerator[str, None]:
+    buffer = StreamBuffer(coalesce_max_bytes=coalesce_max_bytes)
+    start_producer(gen, buffer, on_error=print, on_done=lambda: None)
+    async for chunk in buffer.iter_chunks(read_timeout=60):
+        yield chunk
+
+
+async def _measure(stream: Callable[[], AsyncGenerator[str, None]]) -> float:
+    t0 = time.perf_counter()
+    async for _ in stream():
+        pass
+    return time.perf_counter() - t0
+
+
+async def _run(num_tokens: int) -> None:
+    modes = {
+        "queue": lambda gen: _queue_stream(gen),
+        "buffer": lambda gen: _buffer_stream(gen, 0),
+        "coalesce": lambda gen: _buffer_stream(gen, 4096),
+    }
+    print(f"{'generator':>9} {'mode':>9} | {'tokens/s':>12}")
+    for gen_name, make_gen in (("sync", _sync_tokens), ("async", _async_tokens)):
+        for mode, make_stream in modes.items():
+            duration = await _measure(lambda: make_stream(make_gen(num_tokens)))
+            print(f"{gen_name:>9} {mode:>9} | {num_tokens / duration:>12,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=50_000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.tokens))
+
+
+if __name__ == "__main__":
+    main()
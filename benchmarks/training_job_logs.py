@@ -0,0 +1,133 @@
+"""Benchmark downloading the logs of a long training job.
+
+Serves `--hours` of training job logs with `--logs-per-minute` from a local fake of
+the logs endpoint that answers each request after `--latency-ms`, and fetches all of
+them `--rounds` times each:
+
+* `sequential`: `get_training_job_logs_with_pagination`, one 2 hour window after the
+  other,
+* `concurrent`: `ConcurrentTrainingLogsFetcher` with `--workers` windows fetched at
+  a time over a shared HTTP session, as `truss train logs` does.
+
+Usage:
+    uv run python benchmarks/training_job_logs.py
+    uv run python benchmarks/training_job_logs.py --hours 72 --latency-ms 100 --workers 16
+"""
+
+import argparse
+import bisect
+import http.server
+import json
+import logging
+import statistics
+import threading
+import time
+from typing import Callable, List
+from unittest import mock
+
+from truss.remote.baseten.api import BasetenApi
+from truss.remote.baseten.core import (
+    NANOSECONDS_PER_MILLISECOND,
+    ConcurrentTrainingLogsFetcher,
+    get_training_job_logs_with_pagination,
+)
+from truss.remote.baseten.utils.time import iso_to_millis
+
+CREATED_AT = "2022-01-01T00:00:00Z"
+
+
+class _LogsHandler(http.server.BaseHTTPRequestHandler):
+    def do_POST(self):
+        query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.latency_secs)  # type: ignore[attr-defined]
+        timestamps = self.server.timestamps  # type: ignore[attr-defined]
+        start = query["start_epoch_millis"] * NANOSECONDS_PER_MILLISECOND
+        end = (query["end_epoch_millis"] + 1) * NANOSECONDS_PER_MILLISECOND
+        first = bisect.bisect_left(timestamps, start)
+        last = min(bisect.bisect_left(timestamps, end), first + query["limit"])
+        logs = [
+            {"timestamp": str(ts), "message": "step done", "replica": "node-0"}
+            for ts in timestamps[first:last]
+        ]
+        data = json.dumps({"logs": logs}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _fake_api(port: int, hours: int) -> BasetenApi:
+    api = BasetenApi("https://app.baseten.co", mock.Mock(fetch_auth_header=dict))
+    api._rest_api_client.base_url = f"http://localhost:{port}"
+    updated_at = iso_to_millis(CREATED_AT) + hours * 60 * 60 * 1000
+    api.get_training_job = mock.Mock(  # type: ignore[method-assign]
+        return_value={
+            "training_job": {
+                "created_at": CREATED_AT,
+                "updated_at": time.strftime(
+                    "%Y-%m-%dT%H:%M:%SZ", time.gmtime(updated_at / 1000)
+                ),
+                "current_status": "TRAINING_JOB_COMPLETED",
+            }
+        }
+    )
+    return api
+
+
+def _sequential(api: BasetenApi, workers: int) -> List:
+    return get_training_job_logs_with_pagination(api, "project", "job")
+
+
+def _concurrent(api: BasetenApi, workers: int) -> List:
+    fetcher = ConcurrentTrainingLogsFetcher(api, "project", "job", max_workers=workers)
+    return [log for batch_logs in fetcher for log in batch_logs]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=int, default=48)
+    parser.add_argument("--logs-per-minute", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    # `BatchedTrainingLogsFetcher` logs reaching the end of the logs as an error.
+    logging.disable(logging.ERROR)
+
+    server = http.server.ThreadingHTTPServer(("localhost", 0), _LogsHandler)
+    server.daemon_threads = True
+    server.latency_secs = args.latency_ms / 1000  # type: ignore[attr-defined]
+    start = iso_to_millis(CREATED_AT) * NANOSECONDS_PER_MILLISECOND
+    step = 60 * 10**9 // args.logs_per_minute
+    server.timestamps = list(  # type: ignore[attr-defined]
+        range(start + 1, start + args.hours * 60 * 60 * 10**9, step)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api = _fake_api(server.server_port, args.hours)
+
+    print(
+        f"{args.hours} hours, {len(server.timestamps)} logs, "  # type: ignore[attr-defined]
+        f"{args.latency_ms:.0f}ms latency, {args.rounds} rounds\n"
+        f"{'':>10} | {'mean':>8} {'max':>8}"
+    )
+    fetches: List[Callable[[BasetenApi, int], List]] = [_sequential, _concurrent]
+    for fetch in fetches:
+        durations = []
+        for _ in range(args.rounds):
+            t0 = time.perf_counter()
+            logs = fetch(api, args.workers)
+            durations.append(time.perf_counter() - t0)
+            assert len(logs) == len(server.timestamps)  # type: ignore[attr-defined]
+        name = fetch.__name__.lstrip("_")
+        print(
+            f"{name:>10} | {statistics.mean(durations):>7.2f}s {max(durations):>7.2f}s"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark directory signatures as calculated on each `truss watch` iteration.
+
+Creates a synthetic truss with `--files` files totalling `--total-mb` (a few large
+files in `data/`, many small ones in `model/` and `packages/`) and measures:
+
+* `uncached`: hashing every file, as before the file hash cache,
+* `cold cache`: first calculation with an empty cache (large files hashed in parallel),
+* `warm cache`: a repeated calculation without changes,
+* `warm, N changed`: a repeated calculation after modifying `--changed` small files.
+
+Usage:
+    uv run python benchmarks/truss_dir_signature.py
+    uv run python benchmarks/truss_dir_signature.py --files 1000 --total-mb 500
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from truss.truss_handle.patch.dir_signature import directory_content_signature
+from truss.truss_handle.patch.hash import FileHashCache, file_content_hash_str
+from truss.util.path import get_unignored_relative_paths_from_root
+
+NUM_LARGE_FILES = 20
+SMALL_FILE_BYTES = 4096
+OLD_MTIME = 1_600_000_000
+
+
+def _create_truss(root: Path, num_files: int, total_bytes: int) -> list[Path]:
+    small_files = []
+    num_small = max(num_files - NUM_LARGE_FILES, 0)
+    for i in range(num_small):
+        subdir = root / ("model" if i % 2 else "packages") / f"pkg{i % 100}"
+        subdir.mkdir(parents=True, exist_ok=True)
+        file = subdir / f"module{i}.py"
+        file.write_bytes(os.urandom(SMALL_FILE_BYTES))
+        small_files.append(file)
+    large_bytes = max(total_bytes - num_small * SMALL_FILE_BYTES, 0) // NUM_LARGE_FILES
+    data_dir = root / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    block = os.urandom(1 << 20)
+    for i in range(NUM_LARGE_FILES):
+        with (data_dir / f"weights{i}.bin").open("wb") as f:
+            for _ in range(large_bytes // len(block)):
+                f.write(block)
+            f.write(os.urandom(large_bytes % len(block)))
+    # Files modified within the last seconds are never cached.
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(Path(dirpath) / name, (OLD_MTIME, OLD_MTIME))
+    return small_files
+
+
+def _uncached_signature(root: Path) -> dict:
+    paths = sorted(get_unignored_relative_paths_from_root(root))
+    return {
+        str(path): file_content_hash_str(root / path)
+        if (root / path).is_file()
+        else None
+        for path in paths
+    }
+
+
+def _timed(label: str, fn) -> dict:
+    t0 = time.perf_counter()
+    result = fn()
+    print(f"{label:>20}: {time.perf_counter() - t0:8.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--total-mb", type=int, default=5 * 1024)
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "truss"
+        cache_file = Path(tmp) / "cache.json"
+        print(f"Creating {args.files} files, {args.total_mb}MB ...")
+        small_files = _create_truss(root, args.files, args.total_mb * (1 << 20))
+
+        expected = _timed("uncached", lambda: _uncached_signature(root))
+
+        def cached_signature() -> dict:
+            cache = FileHashCache(cache_file)
+            signature = directory_content_signature(root, cache=cache)
+            cache.save()
+            return signature
+
+        assert _timed("cold cache", cached_signature) == expected
+        assert _timed("warm cache", cached_signature) == expected
+        for file in small_files[: args.changed]:
+            file.write_bytes(os.urandom(SMALL_FILE_BYTES))
+            os.utime(file, (OLD_MTIME + 1, OLD_MTIME + 1))
+        _timed(f"warm, {args.changed} changed", cached_signature)
+
+
+if __name__ == "__main__":
+    main()
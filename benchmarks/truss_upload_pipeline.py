@@ -0,0 +1,195 @@
+"""Benchmark packing and uploading a truss to a local S3 stand-in.
+
+Creates a truss with `--size-mb` of data (`--files` files, half of them random,
+half of them compressible text) and uploads it to an in-process S3 stand-in that
+accepts multipart uploads at `--bandwidth-mbps` (0 for no limit). Compares:
+
+* `tar then upload`: `create_tar_with_progress_bar` to a temporary file, then
+  `multipart_upload_boto3` (the current `truss push` path),
+* `stream <compression>`: `stream_tar_upload`, packing, compressing and uploading
+  parts concurrently.
+
+Reports wall time, uploaded bytes and the size of the temporary archive on disk.
+
+Usage:
+    uv run python benchmarks/truss_upload_pipeline.py
+    uv run python benchmarks/truss_upload_pipeline.py --size-mb 4096 --bandwidth-mbps 400
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs, urlparse
+
+from botocore.config import Config
+
+from truss.remote.baseten.utils.tar import create_tar_with_progress_bar
+from truss.remote.baseten.utils.transfer import (
+    multipart_upload_boto3,
+    stream_tar_upload,
+)
+
+_READ_SIZE = 1 << 16
+
+
+class _S3StandIn(BaseHTTPRequestHandler):
+    """Just enough of the S3 API for (multipart) uploads, bodies are discarded."""
+
+    protocol_version = "HTTP/1.1"
+    bytes_per_sec: float = 0
+    received_bytes = 0
+    link_free_at = 0.0
+    _lock = threading.Lock()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _read_body(self) -> None:
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining:
+            data = self.rfile.read(min(remaining, _READ_SIZE))
+            remaining -= len(data)
+            if not self.bytes_per_sec:
+                continue
+            # Throttle like a link shared by all connections.
+            with self._lock:
+                now = time.perf_counter()
+                link_free_at = max(now, type(self).link_free_at)
+                link_free_at += len(data) / self.bytes_per_sec
+                type(self).link_free_at = link_free_at
+            time.sleep(max(link_free_at - now, 0))
+        with self._lock:
+            type(self).received_bytes += int(self.headers.get("Content-Length", 0))
+
+    def _respond(self, status: int = 200, body: bytes = b"", **headers: str) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self) -> None:
+        self._read_body()
+        self._respond(ETag='"etag"')
+
+    def do_POST(self) -> None:
+        self._read_body()
+        query = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+        if "uploads" in query:
+            body = (
+                "<InitiateMultipartUploadResult><Bucket>bucket</Bucket><Key>key</Key>"
+                "<UploadId>upload</UploadId></InitiateMultipartUploadResult>"
+            )
+        else:
+            body = (
+                "<CompleteMultipartUploadResult><Bucket>bucket</Bucket><Key>key</Key>"
+                '<ETag>"etag"</ETag></CompleteMultipartUploadResult>'
+            )
+        self._respond(body=body.encode())
+
+    def do_DELETE(self) -> None:
+        self._respond(204)
+
+
+def _make_truss(root: Path, size_mb: int, num_files: int) -> None:
+    (root / "model").mkdir(parents=True)
+    (root / "model" / "model.py").write_text("class Model:\n    pass\n")
+    (root / "config.yaml").write_text("model_name: upload-benchmark\n")
+    data_dir = root / "data"
+    data_dir.mkdir()
+    file_size = size_mb * 1024 * 1024 // num_files
+    text = b"".join(
+        f"token_{i} {i * 7919 % 10007} {i % 13}\n".encode() for i in range(50_000)
+    )
+    for i in range(num_files):
+        with (data_dir / f"shard_{i:04}.bin").open("wb") as f:
+            written = 0
+            while written < file_size:
+                chunk = (
+                    os.urandom(1 << 20) if i % 2 else text[: min(1 << 20, len(text))]
+                )
+                chunk = chunk[: file_size - written]
+                f.write(chunk)
+                written += len(chunk)
+
+
+def _time(name: str, fn: Callable[[], int]) -> None:
+    _S3StandIn.received_bytes = 0
+    t0 = time.perf_counter()
+    temp_bytes = fn()
+    duration = time.perf_counter() - t0
+    uploaded_mb = _S3StandIn.received_bytes / 1024 / 1024
+    print(
+        f"{name:>18} | {duration:>7.2f}s | {uploaded_mb:>9.0f}MB | "
+        f"{temp_bytes / 1024 / 1024:>8.0f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument(
+        "--bandwidth-mbps", type=float, default=800, help="0 for no limit."
+    )
+    parser.add_argument("--gzip-level", type=int, default=1)
+    args = parser.parse_args()
+
+    _S3StandIn.bytes_per_sec = args.bandwidth_mbps * 1e6 / 8
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _S3StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    credentials = {
+        "endpoint_url": f"http://127.0.0.1:{server.server_address[1]}",
+        "aws_access_key_id": "dummy",
+        "aws_secret_access_key": "dummy",
+        "region_name": "us-west-2",
+        "config": Config(
+            s3={"addressing_style": "path"},
+            request_checksum_calculation="when_required",
+        ),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        truss_dir = Path(tmp) / "truss"
+        _make_truss(truss_dir, args.size_mb, args.files)
+
+        def tar_then_upload() -> int:
+            temp_file = create_tar_with_progress_bar(truss_dir)
+            size = os.stat(temp_file.name).st_size
+            multipart_upload_boto3(temp_file.name, "bucket", "key", credentials)
+            temp_file.close()
+            return size
+
+        def stream(compression: str, level=None) -> Callable[[], int]:
+            def fn() -> int:
+                stream_tar_upload(
+                    truss_dir,
+                    "bucket",
+                    "key",
+                    credentials,
+                    compression=compression,
+                    compression_level=level,
+                )
+                return 0
+
+            return fn
+
+        print(
+            f"{args.size_mb}MB truss, {args.bandwidth_mbps or 'unlimited'} Mbit/s, "
+            f"{os.cpu_count()} CPUs"
+        )
+        print(f"{'':>18} | {'time':>8} | {'uploaded':>11} | {'temp file':>10}")
+        _time("tar then upload", tar_then_upload)
+        _time("stream none", stream("none"))
+        _time("stream gzip", stream("gzip", args.gzip_level))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -919,3 +919,122 @@ def test_chainlet_with_weights_config():
     asset_spec = ChainletWithWeights.remote_config.get_asset_spec()
     assert len(asset_spec.weights) == 1
     assert asset_spec.weights[0].source == "hf://meta-llama/Llama-2-7b"
+
+
+# Co-located chainlets. ################################################################
+
+
+def test_colocated_dependencies():
+    from truss_chains.deployment import code_gen, deployment_client
+
+    with _raise_errors():
+
+        class RemoteLeaf(chains.ChainletBase):
+            def run_remote(self) -> str:
+                return "leaf"
+
+        class ColocatedGlue(chains.ChainletBase):
+            remote_config = chains.RemoteConfig(
+                options=chains.ChainletOptions(colocate=True),
+                assets=chains.Assets(secret_keys=["glue_secret"]),
+            )
+
+            def __init__(
+                self,
+                leaf=chains.depends(RemoteLeaf, retries=3),
+                context=chains.depends_context(),
+            ):
+                self._leaf = leaf
+
+            async def run_remote(self) -> str:
+                return "glue " + self._leaf.run_remote()
+
+        class ColocatedMiddle(chains.ChainletBase):
+            remote_config = chains.RemoteConfig(
+                options=chains.ChainletOptions(colocate=True)
+            )
+
+            def __init__(self, glue=chains.depends(ColocatedGlue)):
+                self._glue = glue
+
+            async def run_remote(self) -> str:
+                return await self._glue.run_remote()
+
+        class ColocatedHost(chains.ChainletBase):
+            def __init__(
+                self,
+                glue=chains.depends(ColocatedGlue),
+                middle=chains.depends(ColocatedMiddle),
+            ):
+                self._glue = glue
+
+            async def run_remote(self) -> str:
+                return await self._glue.run_remote()
+
+        framework.raise_validation_errors()
+        host = framework.get_descriptor(ColocatedHost)
+        assert framework.get_colocated_dependencies(host) == [
+            framework.get_descriptor(ColocatedGlue),
+            framework.get_descriptor(ColocatedMiddle),
+        ]
+        remote_deps = framework.get_remote_dependencies(host)
+        assert [(dep.name, dep.options.retries) for dep in remote_deps] == [
+            ("RemoteLeaf", 3)
+        ]
+        # Co-located chainlets are not deployed separately.
+        deployed = deployment_client._get_ordered_dependencies([ColocatedHost])
+        assert [descr.name for descr in deployed] == ["RemoteLeaf", "ColocatedHost"]
+
+        load_src = code_gen._gen_load_src(host).src
+        # Instantiated once, with stubs for remote dependencies.
+        assert load_src.count("colocated_ColocatedGlue = ") == 1
+        assert re.search(
+            r"colocated_ColocatedGlue = \w+\.ColocatedGlue\("
+            r"leaf=stub\.factory\(RemoteLeaf, self\._context\), "
+            r"context=self\._context\)",
+            load_src,
+        )
+        assert re.search(
+            r"colocated_ColocatedMiddle = \w+\.ColocatedMiddle\("
+            r"glue=colocated_ColocatedGlue\)",
+            load_src,
+        )
+        assert re.search(
+            r"self\._chainlet = \w+\.ColocatedHost\(glue=colocated_ColocatedGlue, "
+            r"middle=colocated_ColocatedMiddle\)",
+            load_src,
+        )
+
+
+def test_raises_colocated_different_docker_image():
+    match = r"Co-located dependency `ColocatedNumpy` runs in the docker image of"
+    with pytest.raises(public_types.ChainsUsageError, match=match), _raise_errors():
+
+        class ColocatedNumpy(chains.ChainletBase):
+            remote_config = chains.RemoteConfig(
+                docker_image=chains.DockerImage(pip_requirements=["numpy"]),
+                options=chains.ChainletOptions(colocate=True),
+            )
+
+            def run_remote(self) -> str:
+                return "numpy"
+
+        class Host(chains.ChainletBase):
+            def __init__(self, numpy=chains.depends(ColocatedNumpy)):
+                self._numpy = numpy
+
+            def run_remote(self) -> str:
+                return self._numpy.run_remote()
+
+
+def test_raises_colocated_websocket():
+    match = r"chainlets serving websockets cannot be co-located"
+    with pytest.raises(public_types.ChainsUsageError, match=match), _raise_errors():
+
+        class ColocatedWebsocket(chains.ChainletBase):
+            remote_config = chains.RemoteConfig(
+                options=chains.ChainletOptions(colocate=True)
+            )
+
+            async def run_remote(self, websocket: chains.WebSocketProtocol) -> None:
+                pass
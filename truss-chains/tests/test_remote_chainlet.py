@@ -1,12 +1,20 @@
 import asyncio
+import contextlib
+import importlib.util
 import logging
+import pathlib
 import re
 import threading
 import time
+from typing import Any, AsyncIterator
 
+import prometheus_client
+import pydantic
 import pytest
 
 import truss_chains as chains
+from truss_chains import framework
+from truss_chains.deployment import code_gen
 
 
 @pytest.fixture
@@ -160,3 +168,307 @@ async def test_no_waiting_logging_async(stub_session, caplog):
     logs = [r.message for r in caplog.records]
 
     assert any("No queueing" in m for m in logs), logs
+
+
+@pytest.mark.asyncio
+async def test_predict_async_binary_tensors():
+    np = pytest.importorskip("numpy")
+    from aiohttp import web
+
+    from truss.templates.shared import serialization
+
+    received = []
+
+    async def echo(request: web.Request) -> web.Response:
+        body = await request.read()
+        received.append((request.headers, body))
+        return web.Response(body=body, content_type="application/octet-stream")
+
+    app = web.Application()
+    app.router.add_post("/predict", echo)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        stub = chains.StubBase.from_url(
+            f"http://127.0.0.1:{port}/predict",
+            "dummy-API-key",
+            options=chains.RPCOptions(use_binary=True, use_binary_tensors=True),
+        )
+        array = np.arange(1000, dtype=np.float32).reshape(10, 100)
+        result = await stub.predict_async({"array": array, "text": "hi"})
+    finally:
+        await runner.cleanup()
+
+    headers, body = received[0]
+    assert serialization.is_tensor_frame(body)
+    assert int(headers["Content-Length"]) == len(body)
+    assert result["text"] == "hi"
+    np.testing.assert_array_equal(result["array"], array)
+
+
+@contextlib.asynccontextmanager
+async def _streaming_server() -> AsyncIterator[tuple[str, asyncio.Event]]:
+    from aiohttp import web
+
+    release_stream = asyncio.Event()
+
+    async def stream(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(b"first")
+        await release_stream.wait()
+        await response.write(b"last")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/predict", stream)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}/predict", release_stream
+    finally:
+        release_stream.set()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_predict_async_stream_holds_slot_until_exhausted():
+    async with _streaming_server() as (url, release_stream):
+        stub = chains.StubBase.from_url(
+            url, "dummy-API-key", options=chains.RPCOptions(concurrency_limit=1)
+        )
+        wrapper = stub._async_semaphore_wrapper
+
+        stream = await stub.predict_async_stream({})
+        assert await stream.__anext__() == b"first"
+        assert wrapper.ongoing_requests == 1
+        # Counted in the request metrics, and in the stream request metrics.
+        labels = {"dependency_chainlet": wrapper._dependency_chainlet_name}
+        for name in [
+            "dependency_chainlet_ongoing_requests",
+            "dependency_chainlet_ongoing_stream_requests",
+        ]:
+            assert prometheus_client.REGISTRY.get_sample_value(name, labels) == 1
+
+        second = asyncio.create_task(stub.predict_async_stream({}))
+        await asyncio.sleep(0.1)
+        assert not second.done()
+        assert wrapper.queued_requests == 1
+
+        release_stream.set()
+        assert [chunk async for chunk in stream] == [b"last"]
+        assert stream.closed
+        async with await second as second_stream:
+            assert b"".join([chunk async for chunk in second_stream]) == b"firstlast"
+        assert wrapper.ongoing_requests == 0
+        assert (
+            prometheus_client.REGISTRY.get_sample_value(
+                "dependency_chainlet_stream_requests_total", labels
+            )
+            == 2
+        )
+
+
+@pytest.mark.asyncio
+async def test_predict_async_stream_releases_slot_on_cancel_and_close():
+    async with _streaming_server() as (url, _):
+        stub = chains.StubBase.from_url(
+            url, "dummy-API-key", options=chains.RPCOptions(concurrency_limit=1)
+        )
+        wrapper = stub._async_semaphore_wrapper
+
+        async def consume() -> None:
+            async for _ in await stub.predict_async_stream({}):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.1)
+        assert wrapper.ongoing_requests == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert wrapper.ongoing_requests == 0
+
+        async with await stub.predict_async_stream({}) as stream:
+            assert await stream.__anext__() == b"first"
+        assert stream.closed
+        assert wrapper.ongoing_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_predict_async_stream_read_timeout():
+    async with _streaming_server() as (url, _):
+        stub = chains.StubBase.from_url(url, "dummy-API-key")
+
+        stream = await stub.predict_async_stream({}, read_timeout_sec=0.2)
+        assert await stream.__anext__() == b"first"
+        with pytest.raises(TimeoutError, match="Timeout streaming"):
+            await stream.__anext__()
+        assert stream.closed
+        assert stub._async_semaphore_wrapper.ongoing_requests == 0
+
+
+@contextlib.asynccontextmanager
+async def _doubling_server(failing: set[int]) -> AsyncIterator[tuple[str, list[Any]]]:
+    """Doubles `x` of each input (or list of inputs), fails once for `failing`."""
+    from aiohttp import web
+
+    received: list[Any] = []
+
+    async def double(request: web.Request) -> web.Response:
+        body = await request.json()
+        received.append(body)
+        batched = "items" in body
+        items = body["items"] if batched else [body]
+        if failed := failing.intersection(item["x"] for item in items):
+            failing.difference_update(failed)
+            return web.json_response({"error": "flaky"}, status=503)
+        # Finish later inputs first, to check the ordering.
+        await asyncio.sleep(0.01 * (10 - items[0]["x"] % 10))
+        outputs = [{"x": item["x"] * 2} for item in items]
+        return web.json_response(outputs if batched else outputs[0])
+
+    app = web.Application()
+    app.router.add_post("/predict", double)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}/predict", received
+    finally:
+        await runner.cleanup()
+
+
+class _Value(pydantic.BaseModel):
+    x: int
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size", [None, 4])
+async def test_predict_async_many_ordered(batch_size):
+    async with _doubling_server(failing={3}) as (url, received):
+        stub = chains.StubBase.from_url(
+            url, "dummy-API-key", options=chains.RPCOptions(retries=2)
+        )
+        results = [
+            result
+            async for result in stub.predict_async_many(
+                [_Value(x=i) for i in range(10)],
+                output_model=_Value,
+                max_in_flight=3,
+                batch_size=batch_size,
+                batch_inputs=(lambda items: {"items": items}) if batch_size else None,
+            )
+        ]
+
+    assert results == [(i, _Value(x=2 * i)) for i in range(10)]
+    if batch_size:
+        # Three batches, only the failed one is sent again.
+        assert sorted([item["x"] for item in body["items"]] for body in received) == [
+            [0, 1, 2, 3],
+            [0, 1, 2, 3],
+            [4, 5, 6, 7],
+            [8, 9],
+        ]
+    else:
+        assert sorted(item["x"] for item in received) == sorted([*range(10), 3])
+
+
+@pytest.mark.asyncio
+async def test_predict_async_many_as_completed_and_errors():
+    async with _doubling_server(failing={2}) as (url, _):
+        stub = chains.StubBase.from_url(url, "dummy-API-key")
+        results = stub.predict_async_many(
+            [{"x": i} for i in range(2)], max_in_flight=2, ordered=False
+        )
+        assert [index async for index, _ in results] == [1, 0]
+
+        # Without retries, outputs before the failed input are still yielded.
+        indices = []
+        with pytest.raises(Exception, match="503"):
+            async for index, _ in stub.predict_async_many([{"x": i} for i in range(4)]):
+                indices.append(index)
+        assert indices == [0, 1]
+
+
+class BatchDoubler(chains.ChainletBase):
+    failing = {3}
+
+    async def run_remote(self, values: list[int], factor: int = 2) -> list[int]:
+        if failed := self.failing.intersection(values):
+            self.failing.difference_update(failed)
+            raise ValueError("flaky")
+        return [value * factor for value in values]
+
+
+@contextlib.asynccontextmanager
+async def _generated_chainlet_server(
+    chainlet_cls: type[chains.ChainletBase], gen_dir: pathlib.Path
+) -> AsyncIterator[str]:
+    """Serves the truss model generated for `chainlet_cls`."""
+    from aiohttp import web
+
+    if (
+        chainlet_cls.name
+        not in framework._global_chainlet_registry.get_chainlet_names()
+    ):
+        # Other test modules clear the registry of module-level chainlets.
+        framework.validate_and_register_cls(chainlet_cls)
+    descriptor = framework.get_descriptor(chainlet_cls)
+    model_file = code_gen._gen_truss_chainlet_file(gen_dir, descriptor, [])
+    spec = importlib.util.spec_from_file_location("generated_model", model_file)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Skips `__init__`, which sets up the deployment context.
+    model = module.TrussChainletModel.__new__(module.TrussChainletModel)
+    model.load()
+    input_model = getattr(module, f"{descriptor.name}Input")
+
+    async def predict(request: web.Request) -> web.Response:
+        inputs = input_model.model_validate(await request.json())
+        try:
+            output = await model.predict(inputs, request)
+        except Exception as e:
+            return web.json_response({"error": str(e)}, status=500)
+        return web.json_response(output.model_dump(mode="json"))
+
+    app = web.Application()
+    app.router.add_post("/predict", predict)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}/predict"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_predict_async_many_batched_generated_chainlet(tmp_path):
+    async with _generated_chainlet_server(BatchDoubler, tmp_path) as url:
+        stub = chains.StubBase.from_url(
+            url, "dummy-API-key", options=chains.RPCOptions(retries=2)
+        )
+        results = [
+            result
+            async for result in stub.predict_async_many(
+                range(10),
+                batch_size=4,
+                batch_inputs=lambda values: {"values": values, "factor": 3},
+            )
+        ]
+
+    assert results == [(i, 3 * i) for i in range(10)]
+    assert not BatchDoubler.failing
@@ -199,3 +199,81 @@ async def test_reading_footer_with_no_items():
 
     read_footer = await reader.read_footer()
     assert read_footer == footer
+
+
+class AudioFrame(pydantic.BaseModel):
+    seq: int
+    pcm: bytes
+
+
+def _rechunk(data_stream, chunk_size: int) -> list[bytes]:
+    data = b"".join(data_stream)
+    return [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ["json", "msgpack"])
+@pytest.mark.parametrize("chunk_size", [None, 1, 7, 1000])
+async def test_streaming_encoding_and_chunking(encoding, chunk_size):
+    types = streaming.stream_types(
+        item_type=MyDataChunk, header_type=Header, footer_type=Footer, encoding=encoding
+    )
+    writer = streaming.stream_writer(types)
+    header = Header(time=123.456, msg="Start of stream")
+    items = [MyDataChunk(words=["hello", "world"]), MyDataChunk(words=[])]
+    footer = Footer(time=789.012, duration_sec=665.556, msg="End of stream")
+
+    data_stream = [writer.yield_header(header)]
+    for item in items:
+        data_stream.append(writer.yield_item(item))
+    data_stream.append(writer.yield_footer(footer))
+    if chunk_size:
+        data_stream = _rechunk(data_stream, chunk_size)
+
+    reader = streaming.stream_reader(types, to_bytes_iterator(data_stream))
+    assert await reader.read_header() == header
+    assert [item async for item in reader.read_items()] == items
+    assert await reader.read_footer() == footer
+
+
+@pytest.mark.asyncio
+async def test_streaming_msgpack_binary_items():
+    types = streaming.stream_types(item_type=AudioFrame, encoding="msgpack")
+    writer = streaming.stream_writer(types)
+    items = [AudioFrame(seq=i, pcm=bytes(range(i, i + 64))) for i in range(3)]
+    data_stream = [writer.yield_item(item) for item in items]
+    # Binary data is sent as is, not base64 / escaped.
+    assert len(data_stream[0]) < 64 + 20
+
+    reader = streaming.stream_reader(types, to_bytes_iterator(data_stream))
+    assert [item async for item in reader.read_items()] == items
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ["json", "msgpack"])
+async def test_streaming_raw_items(encoding):
+    types = streaming.stream_types(item_type=MyDataChunk, encoding=encoding)
+    writer = streaming.stream_writer(types)
+    items = [MyDataChunk(words=["hello", "world"]), MyDataChunk(words=["baz"])]
+    data_stream = _rechunk([writer.yield_item(item) for item in items], 5)
+
+    reader = streaming.stream_reader(types, to_bytes_iterator(data_stream))
+    raw_items = [item async for item in reader.read_raw_items()]
+    assert raw_items == [item.model_dump() for item in items]
+
+
+@pytest.mark.asyncio
+async def test_streaming_truncated():
+    types = streaming.stream_types(item_type=MyDataChunk)
+    writer = streaming.stream_writer(types)
+    data = writer.yield_item(MyDataChunk(words=["hello", "world"]))
+
+    reader = streaming.stream_reader(types, to_bytes_iterator([data[:-3]]))
+    with pytest.raises(asyncio.IncompleteReadError):
+        async for item in reader.read_items():
+            pass
+
+
+def test_stream_types_invalid_encoding():
+    with pytest.raises(ValueError, match="Unsupported stream encoding"):
+        streaming.stream_types(item_type=MyDataChunk, encoding="pickle")  # type: ignore[arg-type]
@@ -312,13 +312,16 @@ def _stub_endpoint_body_src(
 
     else:
         if endpoint.is_async:
+            # Closing the stream releases the concurrency slot also if this
+            # generator is not consumed to the end.
             parts.append(
-                f"async for data in await self.predict_async_stream({inputs}):"
+                f"async with await self.predict_async_stream({inputs}) as stream:"
             )
+            parts.append(_indent("async for data in stream:"))
             if endpoint.streaming_type.is_string:
-                parts.append(_indent("yield data.decode()"))
+                parts.append(_indent("yield data.decode()", 2))
             else:
-                parts.append(_indent("yield data"))
+                parts.append(_indent("yield data", 2))
         else:
             raise NotImplementedError(
                 "`Streaming endpoints (containing `yield` statements) are only "
@@ -448,30 +451,55 @@ class _SpecifyChainletTypeAnnotation(libcst.CSTTransformer):
         return updated_node.with_changes(body=tuple(new_body))
 
 
-def _gen_load_src(chainlet_descriptor: private_types.ChainletAPIDescriptor) -> _Source:
-    imports = {"from truss_chains.remote_chainlet import stub", "import logging"}
-    stub_args = []
+def _gen_chainlet_init_args(
+    chainlet_descriptor: private_types.ChainletAPIDescriptor,
+    colocated_instances: Mapping[str, str],
+) -> str:
+    init_args = []
     for name, dep in chainlet_descriptor.dependencies.items():
         # `dep.name` is the class name, while `name` is the argument name.
-        stub_args.append(f"{name}=stub.factory({dep.name}, self._context)")
+        if dep.name in colocated_instances:
+            init_args.append(f"{name}={colocated_instances[dep.name]}")
+        else:
+            init_args.append(f"{name}=stub.factory({dep.name}, self._context)")
 
     if chainlet_descriptor.has_context:
-        if stub_args:
-            init_args = f"{', '.join(stub_args)}, context=self._context"
-        else:
-            init_args = "context=self._context"
-    else:
-        init_args = ", ".join(stub_args)
+        init_args.append("context=self._context")
+    return ", ".join(init_args)
+
+
+def _gen_load_src(chainlet_descriptor: private_types.ChainletAPIDescriptor) -> _Source:
+    """Generates the `load` method, instantiating the chainlet and its dependencies.
+
+    Co-located dependencies are instantiated in-process (once, also if several
+    chainlets depend on them) and injected directly instead of a stub, e.g.:
+    ```
+    def load(self) -> None:
+        logging.info(f"Loading Chainlet `Entry`.")
+        colocated_SplitText = main.SplitText(context=self._context)
+        self._chainlet = main.Entry(
+            splitter=colocated_SplitText,
+            llm=stub.factory(LLM, self._context),
+            context=self._context,
+        )
+    ```
+    """
+    imports = {"from truss_chains.remote_chainlet import stub", "import logging"}
+    lines = [f"logging.info(f'Loading Chainlet `{chainlet_descriptor.name}`.')"]
+    colocated_instances: dict[str, str] = {}
+    for dep in framework.get_colocated_dependencies(chainlet_descriptor):
+        dep_ref = _gen_chainlet_import_and_ref(dep)
+        imports.update(dep_ref.imports)
+        instance_name = f"colocated_{dep.name}"
+        init_args = _gen_chainlet_init_args(dep, colocated_instances)
+        lines.append(f"{instance_name} = {dep_ref.src}({init_args})")
+        colocated_instances[dep.name] = instance_name
 
     user_chainlet_ref = _gen_chainlet_import_and_ref(chainlet_descriptor)
     imports.update(user_chainlet_ref.imports)
-    body = _indent(
-        "\n".join(
-            [f"logging.info(f'Loading Chainlet `{chainlet_descriptor.name}`.')"]
-            + [f"self._chainlet = {user_chainlet_ref.src}({init_args})"]
-        )
-    )
-    src = "\n".join(["def load(self) -> None:", body])
+    init_args = _gen_chainlet_init_args(chainlet_descriptor, colocated_instances)
+    lines.append(f"self._chainlet = {user_chainlet_ref.src}({init_args})")
+    src = "\n".join(["def load(self) -> None:", _indent("\n".join(lines))])
     return _Source(src=src, imports=imports)
 
 
@@ -853,6 +881,11 @@ def _gen_truss_config(
 
     assets = remote_config.get_asset_spec()
     config.secrets = {k: v for k, v in assets.secrets.items()}
+    # Co-located chainlets run in this truss and access secrets from its context.
+    for colocated in framework.get_colocated_dependencies(chainlet_descriptor):
+        colocated_assets = colocated.chainlet_cls.remote_config.get_asset_spec()
+        for k, v in colocated_assets.secrets.items():
+            config.secrets.setdefault(k, v)
     config.runtime.enable_tracing_data = remote_config.options.enable_b10_tracing
     config.runtime.enable_debug_logs = remote_config.options.enable_debug_logs
     config.runtime.streaming_read_timeout = remote_config.options.streaming_read_timeout
@@ -948,8 +981,9 @@ def gen_truss_chainlet(
     use_local_src: bool = False,
 ) -> pathlib.Path:
     # Filter needed services and customize options.
+    remote_deps = framework.get_remote_dependencies(chainlet_descriptor)
     dep_services = {}
-    for dep in chainlet_descriptor.dependencies.values():
+    for dep in remote_deps:
         dep_services[dep.name] = private_types.ServiceDescriptor(
             name=dep.name, display_name=dep.display_name, options=dep.options
         )
@@ -992,10 +1026,15 @@ def gen_truss_chainlet(
             raise public_types.ChainsUsageError(
                 f"Python file name `{_MODEL_FILENAME}` is reserved and cannot be used."
             )
+    if colocated := framework.get_colocated_dependencies(chainlet_descriptor):
+        logging.info(
+            f"Co-locating {[dep.name for dep in colocated]} in "
+            f"`{chainlet_descriptor.name}`, they use its docker image and compute."
+        )
     chainlet_file = _gen_truss_chainlet_file(
         chainlet_dir,
         chainlet_descriptor,
-        framework.get_dependencies(chainlet_descriptor),
+        [framework.get_descriptor(dep.chainlet_cls) for dep in remote_deps],
     )
     remote_config = chainlet_descriptor.chainlet_cls.remote_config
     if remote_config.docker_image.data_dir:
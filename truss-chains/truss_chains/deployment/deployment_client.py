@@ -45,18 +45,25 @@ if TYPE_CHECKING:
 
 def _get_ordered_dependencies(
     chainlets: Iterable[Type[private_types.ABCChainlet]],
+    include_colocated: bool = False,
 ) -> Iterable[private_types.ChainletAPIDescriptor]:
-    """Gather all Chainlets needed and returns a topologically ordered list."""
+    """Gather all Chainlets needed and returns a topologically ordered list.
+
+    Co-located chainlets run inside the chainlets depending on them and are not
+    deployed separately, they are only included if `include_colocated` is set.
+    """
     needed_chainlets: set[private_types.ChainletAPIDescriptor] = set()
 
     def add_needed_chainlets(chainlet: private_types.ChainletAPIDescriptor):
-        needed_chainlets.add(chainlet)
         for chainlet_descriptor in framework.get_dependencies(chainlet):
-            needed_chainlets.add(chainlet_descriptor)
+            if include_colocated or not framework.is_colocated(chainlet_descriptor):
+                needed_chainlets.add(chainlet_descriptor)
             add_needed_chainlets(chainlet_descriptor)
 
     for chainlet_cls in chainlets:
-        add_needed_chainlets(framework.get_descriptor(chainlet_cls))
+        chainlet_descriptor = framework.get_descriptor(chainlet_cls)
+        needed_chainlets.add(chainlet_descriptor)
+        add_needed_chainlets(chainlet_descriptor)
     # Get dependencies in topological order.
     return [
         descr
@@ -562,7 +569,9 @@ def _create_baseten_chain(
         # This ensures that when users download the chain, all external
         # dependencies are included in the artifact.
         all_external_dirs = _collect_external_package_dirs(
-            _get_ordered_dependencies([entrypoint_descriptor.chainlet_cls])
+            _get_ordered_dependencies(
+                [entrypoint_descriptor.chainlet_cls], include_colocated=True
+            )
         )
         if all_external_dirs:
             chain_root = gather_chain(chain_root, all_external_dirs)
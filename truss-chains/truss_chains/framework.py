@@ -962,6 +962,35 @@ def _validate_transport_options(
             )
 
 
+def _validate_colocation(
+    cls: Type[private_types.ABCChainlet],
+    descriptor: private_types.EndpointAPIDescriptor,
+    dependencies: Iterable[private_types.DependencyDescriptor],
+    location: _ErrorLocation,
+) -> None:
+    # Co-located dependencies run in the docker image of `cls`.
+    for dep in dependencies:
+        dep_config = dep.chainlet_cls.remote_config
+        if dep_config.options.colocate and (
+            dep_config.docker_image != cls.remote_config.docker_image
+        ):
+            _collect_error(
+                f"Co-located dependency `{dep.name}` runs in the docker image of "
+                f"`{cls.name}` and must use the same `DockerImage` config.",
+                _ErrorKind.INVALID_CONFIG_ERROR,
+                location,
+            )
+    if not cls.remote_config.options.colocate:
+        return
+    if is_engine_builder_chainlet(cls) or descriptor.is_websocket:
+        _collect_error(
+            "Engine-Builder chainlets and chainlets serving websockets cannot be "
+            "co-located, they must be deployed separately.",
+            _ErrorKind.INVALID_CONFIG_ERROR,
+            location,
+        )
+
+
 def validate_and_register_cls(cls: Type[private_types.ABCChainlet]) -> None:
     """Note that validation errors will only be collected, not raised, and Chainlets.
     with issues, are still added to the registry.  Use `raise_validation_errors` to
@@ -1009,6 +1038,12 @@ def validate_and_register_cls(cls: Type[private_types.ABCChainlet]) -> None:
     _validate_transport_options(
         cls.remote_config, chainlet_descriptor.endpoint, location
     )
+    _validate_colocation(
+        cls,
+        chainlet_descriptor.endpoint,
+        chainlet_descriptor.dependencies.values(),
+        location,
+    )
     logging.debug(
         f"Descriptor for {cls}:\n{pprint.pformat(chainlet_descriptor, indent=4)}\n"
     )
@@ -1103,6 +1138,47 @@ def get_descriptor(
     return _global_chainlet_registry.get_descriptor(chainlet_cls)
 
 
+def is_colocated(chainlet: private_types.ChainletAPIDescriptor) -> bool:
+    return chainlet.chainlet_cls.remote_config.options.colocate
+
+
+def get_colocated_dependencies(
+    chainlet: private_types.ChainletAPIDescriptor,
+) -> list[private_types.ChainletAPIDescriptor]:
+    """Co-located chainlets that run in the process of `chainlet`.
+
+    Includes co-located dependencies of co-located dependencies. Ordered such that
+    dependencies come before the chainlets that depend on them.
+    """
+    colocated: set[private_types.ChainletAPIDescriptor] = set()
+
+    def add_colocated(descriptor: private_types.ChainletAPIDescriptor) -> None:
+        for dep in get_dependencies(descriptor):
+            if is_colocated(dep) and dep not in colocated:
+                colocated.add(dep)
+                add_colocated(dep)
+
+    add_colocated(chainlet)
+    return [descr for descr in get_ordered_descriptors() if descr in colocated]
+
+
+def get_remote_dependencies(
+    chainlet: private_types.ChainletAPIDescriptor,
+) -> list[private_types.DependencyDescriptor]:
+    """Dependencies that are called via RPCs from the process of `chainlet`.
+
+    These are the separately deployed dependencies of `chainlet` and of its
+    co-located dependencies. For a chainlet that is used by several of them, the
+    options of the first one apply.
+    """
+    remote: dict[str, private_types.DependencyDescriptor] = {}
+    for descriptor in [chainlet] + get_colocated_dependencies(chainlet):
+        for dep in descriptor.dependencies.values():
+            if not is_colocated(get_descriptor(dep.chainlet_cls)):
+                remote.setdefault(dep.name, dep)
+    return list(remote.values())
+
+
 def get_ordered_descriptors() -> list[private_types.ChainletAPIDescriptor]:
     return _global_chainlet_registry.chainlet_descriptors
 
@@ -142,6 +142,14 @@ class AbsPath:
         self._creating_module = creating_module
         self._original_path = original_path
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AbsPath):
+            return NotImplemented
+        return self._abs_file_path == other._abs_file_path
+
+    def __hash__(self) -> int:
+        return hash(self._abs_file_path)
+
     def _raise_if_not_exists(self, abs_path: str) -> None:
         path = pathlib.Path(abs_path)
         if not (path.is_file() or (path.is_dir() and any(path.iterdir()))):
@@ -457,6 +465,15 @@ class ChainletOptions(custom_types.SafeModelNonSerializable):
         metadata: Arbitrary JSON object to describe chainlet.
         streaming_read_timeout: Amount of time (in seconds) between each streamed chunk before a timeout is triggered.
         transport: Allows to customize certain transport protocols, e.g. websocket pings.
+        colocate: Runs this chainlet in the process of each chainlet that depends on
+          it, instead of deploying it separately. Calls to it are then direct calls
+          on the instance, without HTTP requests or serialization, with the same
+          ``chains.depends()`` API. Intended for light-weight glue chainlets: a
+          co-located chainlet uses the docker image, compute and deployment context
+          of the chainlet it runs in, only its secrets are added. Its ``DockerImage``
+          must be the same as that of the chainlets depending on it. Inputs and outputs
+          are passed by reference, ``RPCOptions`` and remote error wrapping do not
+          apply. Has no effect on the entrypoint.
     """
 
     enable_b10_tracing: bool = False
@@ -466,6 +483,7 @@ class ChainletOptions(custom_types.SafeModelNonSerializable):
     metadata: Optional[JsonType] = None
     streaming_read_timeout: int = 60
     transport: Optional[truss_config.Transport] = None
+    colocate: bool = False
 
 
 class RemoteConfig(custom_types.SafeModelNonSerializable):
@@ -518,6 +536,10 @@ class RPCOptions(custom_types.SafeModel):
          speedup and message size reduction (~25%) for numpy arrays. Use
          ``NumpyArrayField`` as a field type on pydantic models for integration and set
          this option to ``True``. For simple text data, there is no significant benefit.
+        use_binary_tensors: Only applies if ``use_binary`` is set. Sends numpy arrays
+         as raw, aligned buffers instead of ``msgpack_numpy``, which avoids copies
+         when serializing and allows zero-copy deserialization of large arrays. The
+         remote chainlet must be deployed with a truss version supporting this format.
         concurrency_limit: The maximum number of concurrent requests to send to the
           remote chainlet. Excessive requests will be queued and a warning
           will be shown. Try to design your algorithm in a way that spreads requests
@@ -527,6 +549,7 @@ class RPCOptions(custom_types.SafeModel):
     retries: int = 1
     timeout_sec: float = DEFAULT_TIMEOUT_SEC
     use_binary: bool = False
+    use_binary_tensors: bool = False
     concurrency_limit: int = DEFAULT_CONCURRENCY_LIMIT
 
 
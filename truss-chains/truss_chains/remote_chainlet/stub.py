@@ -1,6 +1,9 @@
 import abc
 import asyncio
+import collections
 import contextlib
+import dataclasses
+import functools
 import json
 import logging
 import threading
@@ -9,11 +12,14 @@ from typing import (
     TYPE_CHECKING,
     Any,
     AsyncIterator,
+    Callable,
     ClassVar,
     Dict,
+    Iterable,
     Iterator,
     Mapping,
     Optional,
+    Sequence,
     Type,
     TypeVar,
     Union,
@@ -51,6 +57,114 @@ async def _safe_close(session: "aiohttp.ClientSession", timeout_sec: float) -> N
         logging.info(f"Unexpected error while closing cycled-out aiohttp session: {e}")
 
 
+@functools.lru_cache(maxsize=None)
+def _tensor_frame_payload_cls() -> Type["aiohttp.payload.Payload"]:
+    import aiohttp
+
+    class TensorFramePayload(aiohttp.payload.Payload):
+        """Writes tensor frame chunks one by one, without joining them."""
+
+        _value: serialization.TensorFrameChunks
+
+        def __init__(self, chunks: serialization.TensorFrameChunks) -> None:
+            super().__init__(chunks, content_type="application/octet-stream")
+            self._size = sum(len(chunk) for chunk in chunks)
+
+        def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+            return b"".join(self._value).decode(encoding, errors)
+
+        async def write(self, writer: "aiohttp.abc.AbstractStreamWriter") -> None:
+            for chunk in self._value:
+                await writer.write(chunk)
+
+    return TensorFramePayload
+
+
+class ChainletStream(AsyncIterator[bytes]):
+    """Response chunks of a streaming RPC to a remote chainlet.
+
+    Holds the connection and a concurrency slot of the remote chainlet until the
+    stream is exhausted, fails, times out, is cancelled or closed. Use it as async
+    context manager (or call ``aclose``) when not consuming it to the end, otherwise
+    the slot is only released once the object is garbage collected.
+    """
+
+    def __init__(
+        self,
+        response: "aiohttp.ClientResponse",
+        release_slot: Callable[[], None],
+        remote_name: str,
+        timeout_sec: Optional[float],
+    ) -> None:
+        self._response = response
+        self._chunks = response.content.iter_any()
+        self._release_slot = release_slot
+        self._remote_name = remote_name
+        self._timeout_sec = timeout_sec
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __aiter__(self) -> "ChainletStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._close(exhausted=True)
+            raise
+        except asyncio.TimeoutError:
+            self._close(exhausted=False)
+            msg = (
+                f"Timeout streaming from remote Chainlet `{self._remote_name}` "
+                f"({self._timeout_sec} seconds limit)."
+            )
+            logging.warning(msg)
+            raise TimeoutError(msg) from None  # Prune error stack trace (TMI).
+        except BaseException:  # Includes cancellation.
+            self._close(exhausted=False)
+            raise
+
+    def _close(self, exhausted: bool) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if exhausted:
+                # Returns the connection to the pool.
+                self._response.release()
+            else:
+                self._response.close()
+        finally:
+            self._release_slot()
+
+    async def aclose(self) -> None:
+        self._close(exhausted=False)
+
+    async def __aenter__(self) -> "ChainletStream":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    def __del__(self) -> None:
+        if not getattr(self, "_closed", True):
+            self._close(exhausted=False)
+
+
+@dataclasses.dataclass
+class _BatchUnit:
+    """Inputs sent in one request by `predict_async_many`."""
+
+    start: int
+    items: list[Any]
+
+
 class BasetenSession:
     """Provides configured HTTP clients, retries, queueing etc."""
 
@@ -154,8 +268,7 @@ class BasetenSession:
         with self._sync_semaphore_wrapper():
             yield client
 
-    @contextlib.asynccontextmanager
-    async def _client_async(self) -> AsyncIterator["aiohttp.ClientSession"]:
+    async def _get_client_async(self) -> "aiohttp.ClientSession":
         try:
             import aiohttp
         except ImportError:
@@ -192,8 +305,11 @@ class BasetenSession:
                         int(time.time()),
                     )
         assert self._cached_async_client is not None
-        client = self._cached_async_client[0]
+        return self._cached_async_client[0]
 
+    @contextlib.asynccontextmanager
+    async def _client_async(self) -> AsyncIterator["aiohttp.ClientSession"]:
+        client = await self._get_client_async()
         async with self._async_semaphore_wrapper():
             yield client
 
@@ -288,6 +404,14 @@ class StubBase(BasetenSession, abc.ABC):
             api_key=api_key,
         )
 
+    def _serialize_binary(self, data: Any, for_httpx: bool) -> Any:
+        if not self._service_descriptor.options.use_binary_tensors:
+            return serialization.truss_msgpack_serialize(data)
+        chunks = serialization.truss_tensor_serialize_chunks(data)
+        if for_httpx:
+            return b"".join(chunks)
+        return _tensor_frame_payload_cls()(chunks)
+
     def _make_request_params(
         self, inputs: InputT, for_httpx: bool = False
     ) -> Mapping[str, Any]:
@@ -304,7 +428,7 @@ class StubBase(BasetenSession, abc.ABC):
             if self._service_descriptor.options.use_binary:
                 data_dict = inputs.model_dump(mode="python")
                 data_key = "content" if for_httpx else "data"
-                kwargs[data_key] = serialization.truss_msgpack_serialize(data_dict)
+                kwargs[data_key] = self._serialize_binary(data_dict, for_httpx)
                 headers["Content-Type"] = "application/octet-stream"
             else:
                 data_key = "content" if for_httpx else "data"
@@ -313,7 +437,7 @@ class StubBase(BasetenSession, abc.ABC):
         else:  # inputs is JSON dict.
             if self._service_descriptor.options.use_binary:
                 data_key = "content" if for_httpx else "data"
-                kwargs[data_key] = serialization.truss_msgpack_serialize(inputs)
+                kwargs[data_key] = self._serialize_binary(inputs, for_httpx)
                 headers["Content-Type"] = "application/octet-stream"
             else:
                 kwargs["json"] = inputs
@@ -388,15 +512,8 @@ class StubBase(BasetenSession, abc.ABC):
         retry = self._make_retry_policy(tenacity.AsyncRetrying)
         params = self._make_request_params(inputs)
 
-        async def _rpc() -> bytes:
-            client: "aiohttp.ClientSession"
-            async with self._client_async() as client:
-                async with client.post(self._target_url, **params) as response:
-                    await utils.async_response_raise_errors(response, self.name)
-                    return await response.read()
-
         try:
-            response_bytes: bytes = await retry(_rpc)
+            response_bytes: bytes = await retry(self._post_async, params)
         except asyncio.TimeoutError:
             msg = (
                 f"Timeout calling remote Chainlet `{self.name}` "
@@ -409,23 +526,203 @@ class StubBase(BasetenSession, abc.ABC):
             return self._response_to_pydantic(response_bytes, output_model)
         return self._response_to_json(response_bytes)
 
-    async def predict_async_stream(self, inputs: InputT) -> AsyncIterator[bytes]:
+    async def _post_async(self, params: Mapping[str, Any]) -> bytes:
+        client: "aiohttp.ClientSession"
+        async with self._client_async() as client:
+            async with client.post(self._target_url, **params) as response:
+                await utils.async_response_raise_errors(response, self.name)
+                return await response.read()
+
+    def _make_batch_request_params(
+        self, batch: Sequence[InputT], batch_inputs: Callable[[list[Any]], InputT]
+    ) -> Mapping[str, Any]:
+        dump_mode = "python" if self._service_descriptor.options.use_binary else "json"
+        items = [
+            item.model_dump(mode=dump_mode)
+            if isinstance(item, pydantic.BaseModel)
+            else item
+            for item in batch
+        ]
+        return self._make_request_params(batch_inputs(items))
+
+    async def _predict_unit(
+        self,
+        unit: _BatchUnit,
+        batch_inputs: Optional[Callable[[list[Any]], InputT]],
+        output_model: Optional[Type[OutputModelT]],
+    ) -> list[Any]:
+        if batch_inputs is None:
+            params = self._make_request_params(unit.items[0])
+            response_bytes = await self._post_async(params)
+            if output_model:
+                return [self._response_to_pydantic(response_bytes, output_model)]
+            return [self._response_to_json(response_bytes)]
+
+        params = self._make_batch_request_params(unit.items, batch_inputs)
+        outputs = self._response_to_json(await self._post_async(params))
+        if not isinstance(outputs, list) or len(outputs) != len(unit.items):
+            raise ValueError(
+                f"Remote Chainlet `{self.name}` must return a list with one output "
+                f"per input for batched calls, got: `{type(outputs).__name__}` for "
+                f"{len(unit.items)} inputs."
+            )
+        if output_model:
+            return [output_model.model_validate(output) for output in outputs]
+        return outputs
+
+    async def predict_async_many(
+        self,
+        inputs: Iterable[InputT],
+        output_model: Optional[Type[OutputModelT]] = None,
+        max_in_flight: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_inputs: Optional[Callable[[list[Any]], InputT]] = None,
+        ordered: bool = True,
+    ) -> AsyncIterator[tuple[int, Any]]:
+        """Calls the remote chainlet for many inputs, yields ``(index, output)``.
+
+        Requests are pipelined over the pooled HTTP session, instead of one
+        coroutine per input. Each request is retried like ``predict_async``. A
+        failed batch is sent again as a whole, so the remote chainlet must tolerate
+        inputs being processed more than once. If a request still fails, its error
+        is raised when its inputs are reached (with ``ordered``, all outputs of
+        earlier inputs have been yielded) and the remaining requests are cancelled.
+
+        Args:
+            inputs: Pydantic models or JSON dicts.
+            output_model: Validates each output as this model, if given.
+            max_in_flight: Maximal number of concurrent requests, also bounded by
+              ``concurrency_limit``. Defaults to ``concurrency_limit``.
+            batch_size: If set, sends up to this many inputs in one request, see
+              ``batch_inputs``.
+            batch_inputs: Required with ``batch_size``, makes the inputs of one
+              request from a list of inputs (pydantic inputs are dumped to dicts).
+              E.g. ``lambda items: {"items": items}`` for a remote chainlet with
+              ``run_remote(self, items: list[Item]) -> list[Output]``. The remote
+              chainlet must return a list with one output per input.
+            ordered: Whether to yield outputs in the order of the inputs or as soon as
+              they are completed.
+        """
+        if (batch_size is None) != (batch_inputs is None):
+            raise ValueError("`batch_size` and `batch_inputs` must be set together.")
+        items = list(inputs)
+        if not items:
+            return
+        options = self._service_descriptor.options
+        max_in_flight = max_in_flight or options.concurrency_limit
+        size = batch_size or 1
+        if size < 1:
+            raise ValueError(f"`batch_size` must be positive, got {batch_size}.")
+        pending = collections.deque(
+            _BatchUnit(start, items[start : start + size])
+            for start in range(0, len(items), size)
+        )
+        num_units = len(pending)
+        results: asyncio.Queue[tuple[_BatchUnit, Union[list[Any], Exception]]] = (
+            asyncio.Queue()
+        )
+
+        async def _worker() -> None:
+            while pending:
+                unit = pending.popleft()
+                retry = self._make_retry_policy(tenacity.AsyncRetrying)
+                try:
+                    outputs: list[Any] = await retry(
+                        self._predict_unit, unit, batch_inputs, output_model
+                    )
+                except asyncio.TimeoutError:
+                    msg = (
+                        f"Timeout calling remote Chainlet `{self.name}` "
+                        f"({options.timeout_sec} seconds limit)."
+                    )
+                    logging.warning(msg)
+                    results.put_nowait((unit, TimeoutError(msg)))
+                except Exception as e:
+                    results.put_nowait((unit, e))
+                else:
+                    results.put_nowait((unit, outputs))
+
+        workers = [
+            asyncio.create_task(_worker()) for _ in range(min(max_in_flight, num_units))
+        ]
+        try:
+            done: dict[int, tuple[_BatchUnit, Union[list[Any], Exception]]] = {}
+            next_start = 0
+            for _ in range(num_units):
+                unit, outcome = await results.get()
+                if ordered:
+                    done[unit.start] = (unit, outcome)
+                    ready = []
+                    while next_start in done:
+                        ready.append(done.pop(next_start))
+                        next_start += len(ready[-1][0].items)
+                else:
+                    ready = [(unit, outcome)]
+                for unit, outcome in ready:
+                    if isinstance(outcome, Exception):
+                        raise outcome
+                    for offset, output in enumerate(outcome):
+                        yield unit.start + offset, output
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def predict_async_stream(
+        self,
+        inputs: InputT,
+        timeout_sec: Optional[float] = None,
+        read_timeout_sec: Optional[float] = None,
+    ) -> ChainletStream:
+        """Returns the response chunks of a streaming endpoint.
+
+        The call counts towards ``concurrency_limit`` until the returned stream is
+        exhausted or closed.
+
+        Args:
+            inputs: Pydantic model or JSON dict.
+            timeout_sec: Limit for the whole call, including consuming the stream.
+              Defaults to ``timeout_sec`` of the RPC options.
+            read_timeout_sec: Limit for waiting on each chunk. Defaults to no limit.
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            raise chains_utils.make_optional_import_error("aiohttp")
+
         retry = self._make_retry_policy(tenacity.AsyncRetrying)
         params = self._make_request_params(inputs)
+        if timeout_sec is None:
+            timeout_sec = self._service_descriptor.options.timeout_sec
+        timeout = aiohttp.ClientTimeout(total=timeout_sec, sock_read=read_timeout_sec)
+        release_slot = functools.partial(
+            self._async_semaphore_wrapper.release, stream=True
+        )
 
-        async def _rpc() -> AsyncIterator[bytes]:
-            client: "aiohttp.ClientSession"
-            async with self._client_async() as client:
-                response = await client.post(self._target_url, **params)
+        async def _rpc() -> ChainletStream:
+            client = await self._get_client_async()
+            await self._async_semaphore_wrapper.acquire(stream=True)
+            try:
+                response = await client.post(
+                    self._target_url, timeout=timeout, **params
+                )
+            except BaseException:
+                release_slot()
+                raise
+            stream = ChainletStream(response, release_slot, self.name, timeout_sec)
+            try:
                 await utils.async_response_raise_errors(response, self.name)
-                return response.content.iter_any()
+            except BaseException:
+                await stream.aclose()
+                raise
+            return stream
 
         try:
             return await retry(_rpc)
         except asyncio.TimeoutError:
             msg = (
                 f"Timeout calling remote Chainlet `{self.name}` "
-                f"({self._service_descriptor.options.timeout_sec} seconds limit)."
+                f"({timeout_sec} seconds limit)."
             )
             logging.warning(msg)
             raise TimeoutError(msg) from None  # Prune error stack trace (TMI).
@@ -115,6 +115,35 @@ _REQUESTS_TOTAL = prometheus_client.Counter(
     labelnames=["dependency_chainlet"],
 )
 
+# Streaming calls hold their slot until the stream is exhausted or closed. They are
+# counted in the metrics above and, separately, in these.
+_ONGOING_STREAM_REQUESTS = prometheus_client.Gauge(
+    name="dependency_chainlet_ongoing_stream_requests",
+    documentation="Number of ongoing (streaming) requests to dependency Chainlet.",
+    labelnames=["dependency_chainlet"],
+)
+_QUEUED_STREAM_REQUESTS = prometheus_client.Gauge(
+    name="dependency_chainlet_queued_stream_requests",
+    documentation="Number of queued (waiting) streaming requests to dependency Chainlet.",
+    labelnames=["dependency_chainlet"],
+)
+_TOTAL_STREAM_REQUESTS = prometheus_client.Gauge(
+    name="dependency_chainlet_total_stream_requests",
+    documentation="Total number of streaming requests (ongoing + queued) to dependency Chainlet.",
+    labelnames=["dependency_chainlet"],
+)
+_STREAM_REQUESTS_TOTAL = prometheus_client.Counter(
+    name="dependency_chainlet_stream_requests_total",
+    documentation="Total number of streaming requests to dependency Chainlet.",
+    labelnames=["dependency_chainlet"],
+)
+_STREAM_METRICS: Mapping[Any, Any] = {
+    _ONGOING_REQUESTS: _ONGOING_STREAM_REQUESTS,
+    _QUEUED_REQUESTS: _QUEUED_STREAM_REQUESTS,
+    _TOTAL_REQUESTS: _TOTAL_STREAM_REQUESTS,
+    _REQUESTS_TOTAL: _STREAM_REQUESTS_TOTAL,
+}
+
 
 def populate_chainlet_service_predict_urls(
     chainlet_to_service: Mapping[str, private_types.ServiceDescriptor],
@@ -256,45 +285,58 @@ class AsyncSemaphoreWrapper(_BaseSemaphoreWrapper[asyncio.Lock, asyncio.Semaphor
         self._lock = asyncio.Lock()
         self._semaphore = asyncio.Semaphore(concurrency_limit)
 
-    @contextlib.asynccontextmanager
-    async def __call__(self) -> AsyncIterator[None]:
-        _REQUESTS_TOTAL.labels(dependency_chainlet=self._dependency_chainlet_name).inc()
-        _QUEUED_REQUESTS.labels(
-            dependency_chainlet=self._dependency_chainlet_name
-        ).inc()
-        _TOTAL_REQUESTS.labels(dependency_chainlet=self._dependency_chainlet_name).inc()
+    def _update_metrics(self, stream: bool, inc: tuple = (), dec: tuple = ()) -> None:
+        for metrics, amount in ((inc, 1), (dec, -1)):
+            for metric in metrics:
+                metric.labels(dependency_chainlet=self._dependency_chainlet_name).inc(
+                    amount
+                )
+                if stream:
+                    _STREAM_METRICS[metric].labels(
+                        dependency_chainlet=self._dependency_chainlet_name
+                    ).inc(amount)
+
+    async def acquire(self, stream: bool = False) -> None:
+        """Waits for a slot. Each successful call must be paired with `release`."""
+        self._update_metrics(
+            stream, inc=(_REQUESTS_TOTAL, _QUEUED_REQUESTS, _TOTAL_REQUESTS)
+        )
 
         start_time = time.perf_counter()
 
         async with self._lock:
             self._pending_count += 1
 
-        async with self._semaphore:
-            wait_duration = time.perf_counter() - start_time
-            _QUEUED_REQUESTS.labels(
-                dependency_chainlet=self._dependency_chainlet_name
-            ).dec()
-            _ONGOING_REQUESTS.labels(
-                dependency_chainlet=self._dependency_chainlet_name
-            ).inc()
+        try:
+            await self._semaphore.acquire()
+        except BaseException:  # E.g. cancelled while queued.
+            self._pending_count -= 1
+            self._update_metrics(stream, dec=(_QUEUED_REQUESTS, _TOTAL_REQUESTS))
+            raise
+
+        wait_duration = time.perf_counter() - start_time
+        self._update_metrics(stream, inc=(_ONGOING_REQUESTS,), dec=(_QUEUED_REQUESTS,))
+
+        # Not using `self._lock` here: a cancellation while waiting for it would
+        # leak the acquired slot. All updates happen on the event loop anyway.
+        self._pending_count -= 1
+        self._wait_times.append(wait_duration)
+        self._maybe_log_stats(
+            ongoing_requests=self.ongoing_requests, queued_requests=self.queued_requests
+        )
 
-            async with self._lock:
-                self._pending_count -= 1
-                self._wait_times.append(wait_duration)
-                self._maybe_log_stats(
-                    ongoing_requests=self.ongoing_requests,
-                    queued_requests=self.queued_requests,
-                )
+    def release(self, stream: bool = False) -> None:
+        """Releases a slot, synchronous so that it can be called from any cleanup."""
+        self._semaphore.release()
+        self._update_metrics(stream, dec=(_ONGOING_REQUESTS, _TOTAL_REQUESTS))
 
-            try:
-                yield
-            finally:
-                _ONGOING_REQUESTS.labels(
-                    dependency_chainlet=self._dependency_chainlet_name
-                ).dec()
-                _TOTAL_REQUESTS.labels(
-                    dependency_chainlet=self._dependency_chainlet_name
-                ).dec()
+    @contextlib.asynccontextmanager
+    async def __call__(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
 
 
 class ThreadSemaphoreWrapper(
@@ -1,14 +1,31 @@
 import asyncio
+import collections
 import dataclasses
 import enum
 import struct
 import sys
 from collections.abc import AsyncIterator
-from typing import Generic, Optional, Protocol, Type, TypeVar, overload
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Literal,
+    Optional,
+    Protocol,
+    Type,
+    TypeVar,
+    overload,
+)
 
 import pydantic
+import pydantic_core
+
+from truss.templates.shared import serialization
 
 _TAG_SIZE = 5  # uint8 + uint32.
+_TAG_STRUCT = struct.Struct(">BI")
+
+StreamEncoding = Literal["json", "msgpack"]
 
 _T = TypeVar("_T")
 
@@ -46,28 +63,41 @@ class StreamTypes(Generic[ItemT, HeaderTT, FooterTT]):
     item_type: Type[ItemT]
     header_type: HeaderTT  # Is either `Type[HeaderT]` or `None`.
     footer_type: FooterTT  # Is either `Type[FooterT]` or `None`.
+    encoding: StreamEncoding = "json"
 
 
 @overload
 def stream_types(
-    item_type: Type[ItemT], *, header_type: Type[HeaderT], footer_type: Type[FooterT]
+    item_type: Type[ItemT],
+    *,
+    header_type: Type[HeaderT],
+    footer_type: Type[FooterT],
+    encoding: StreamEncoding = "json",
 ) -> StreamTypes[ItemT, HeaderT, FooterT]: ...
 
 
 @overload
 def stream_types(
-    item_type: Type[ItemT], *, header_type: Type[HeaderT]
+    item_type: Type[ItemT],
+    *,
+    header_type: Type[HeaderT],
+    encoding: StreamEncoding = "json",
 ) -> StreamTypes[ItemT, HeaderT, None]: ...
 
 
 @overload
 def stream_types(
-    item_type: Type[ItemT], *, footer_type: Type[FooterT]
+    item_type: Type[ItemT],
+    *,
+    footer_type: Type[FooterT],
+    encoding: StreamEncoding = "json",
 ) -> StreamTypes[ItemT, None, FooterT]: ...
 
 
 @overload
-def stream_types(item_type: Type[ItemT]) -> StreamTypes[ItemT, None, None]: ...
+def stream_types(
+    item_type: Type[ItemT], *, encoding: StreamEncoding = "json"
+) -> StreamTypes[ItemT, None, None]: ...
 
 
 def stream_types(
@@ -75,11 +105,20 @@ def stream_types(
     *,
     header_type: Optional[Type[HeaderT]] = None,
     footer_type: Optional[Type[FooterT]] = None,
+    encoding: StreamEncoding = "json",
 ) -> StreamTypes:
     """Creates a bundle of item type and potentially header/footer types,
-    each as pydantic model."""
+    each as pydantic model.
+
+    With `encoding="msgpack"`, data is sent as msgpack instead of JSON. This is more
+    compact and faster for items with binary (`bytes`) or numeric content, e.g. audio
+    frames or token ids. Writer and reader must use the same encoding."""
+    if encoding not in ("json", "msgpack"):
+        raise ValueError(
+            f"Unsupported stream encoding `{encoding}`, use `json` or `msgpack`."
+        )
     # This indirection for creating `StreamTypes` is needed to get generic typing.
-    return StreamTypes(item_type, header_type, footer_type)
+    return StreamTypes(item_type, header_type, footer_type, encoding)
 
 
 # Reading ##############################################################################
@@ -93,6 +132,10 @@ class _Delimiter(enum.IntEnum):
     END = enum.auto()
 
 
+_DELIMITERS = {delimiter.value: delimiter for delimiter in _Delimiter}
+_ModelT = TypeVar("_ModelT", bound=pydantic.BaseModel)
+
+
 class _Streamer(Generic[ItemT, HeaderTT, FooterTT]):
     _stream_types: StreamTypes[ItemT, HeaderTT, FooterTT]
 
@@ -104,40 +147,79 @@ class _Streamer(Generic[ItemT, HeaderTT, FooterTT]):
 
 
 class _ByteReader:
-    """Helper to provide `readexactly` API for an async bytes iterator."""
+    """Helper to provide `readexactly` API for an async bytes iterator.
+
+    Received chunks are queued as they are, with an offset into the first chunk.
+    Reads within a chunk return a view into it without copying, only reads that span
+    chunks are joined."""
 
     def __init__(self, source: AsyncIterator[bytes]) -> None:
         self._source = source
-        self._buffer = bytearray()
+        self._chunks: collections.deque[memoryview] = collections.deque()
+        self._offset = 0  # Read position in `self._chunks[0]`.
+        self._num_buffered = 0
 
-    async def readexactly(self, num_bytes: int) -> bytes:
-        while len(self._buffer) < num_bytes:
+    async def readexactly(self, num_bytes: int) -> memoryview:
+        while self._num_buffered < num_bytes:
             try:
                 chunk = await anext(self._source)
             except StopAsyncIteration:
                 break
-            self._buffer.extend(chunk)
+            if chunk:
+                view = memoryview(chunk).cast("B")
+                self._chunks.append(view)
+                self._num_buffered += len(view)
 
-        if len(self._buffer) < num_bytes:
-            if len(self._buffer) == 0:
+        if self._num_buffered < num_bytes:
+            if self._num_buffered == 0:
                 raise EOFError()
-            raise asyncio.IncompleteReadError(self._buffer, num_bytes)
-
-        result = bytes(self._buffer[:num_bytes])
-        del self._buffer[:num_bytes]
-        return result
+            partial = bytes(self._take(self._num_buffered))
+            raise asyncio.IncompleteReadError(partial, num_bytes)
+
+        return self._take(num_bytes)
+
+    def _take(self, num_bytes: int) -> memoryview:
+        self._num_buffered -= num_bytes
+        chunk = self._chunks[0]
+        start = self._offset
+        end = start + num_bytes
+        if end < len(chunk):
+            self._offset = end
+            return chunk[start:end]
+        self._chunks.popleft()
+        self._offset = 0
+        if end == len(chunk):
+            return chunk[start:end]
+
+        parts = [chunk[start:]]
+        num_bytes = end - len(chunk)
+        while num_bytes:
+            chunk = self._chunks[0]
+            if num_bytes < len(chunk):
+                parts.append(chunk[:num_bytes])
+                self._offset = num_bytes
+                break
+            parts.append(chunk)
+            self._chunks.popleft()
+            num_bytes -= len(chunk)
+        return memoryview(b"".join(parts))
 
 
 class _StreamReaderProtocol(Protocol[ItemT, HeaderTT, FooterTT]):
     _stream_types: StreamTypes[ItemT, HeaderTT, FooterTT]
-    _footer_data: Optional[bytes]
+    _footer_data: Optional[memoryview]
+
+    def _validator(self, model: Type[_ModelT]) -> Callable[[memoryview], _ModelT]: ...
 
-    async def _read(self) -> tuple[_Delimiter, bytes]: ...
+    async def _read(self) -> tuple[_Delimiter, memoryview]: ...
+
+
+_EMPTY = memoryview(b"")
 
 
 class _StreamReader(_Streamer[ItemT, HeaderTT, FooterTT]):
     _stream: _ByteReader
-    _footer_data: Optional[bytes]
+    _footer_data: Optional[memoryview]
 
     def __init__(
         self,
@@ -148,27 +230,53 @@ class _StreamReader(_Streamer[ItemT, HeaderTT, FooterTT]):
         self._stream = _ByteReader(stream)
         self._footer_data = None
 
+    def _decode(self, data: memoryview) -> Any:
+        if self._stream_types.encoding == "msgpack":
+            return serialization.truss_msgpack_deserialize(data)
+        return pydantic_core.from_json(bytes(data))
+
+    def _validator(self, model: Type[_ModelT]) -> Callable[[memoryview], _ModelT]:
+        if self._stream_types.encoding == "msgpack":
+            return lambda data: model.model_validate(
+                serialization.truss_msgpack_deserialize(data)
+            )
+        return lambda data: model.model_validate_json(bytes(data))
+
     @staticmethod
-    def _unpack_tag(tag: bytes) -> tuple[_Delimiter, int]:
-        enum_value, length = struct.unpack(">BI", tag)
-        return _Delimiter(enum_value), length
+    def _unpack_tag(tag: memoryview) -> tuple[_Delimiter, int]:
+        enum_value, length = _TAG_STRUCT.unpack(tag)
+        try:
+            return _DELIMITERS[enum_value], length
+        except KeyError:
+            raise ValueError(f"{enum_value} is not a valid stream delimiter.")
 
-    async def _read(self) -> tuple[_Delimiter, bytes]:
+    async def _read(self) -> tuple[_Delimiter, memoryview]:
         try:
             tag = await self._stream.readexactly(_TAG_SIZE)
         # It's ok to read nothing (end of stream), but unexpected to read partial.
         except asyncio.IncompleteReadError:
             raise
         except EOFError:
-            return _Delimiter.END, b""
+            return _Delimiter.END, _EMPTY
 
         delimiter, length = self._unpack_tag(tag)
         if not length:
-            return delimiter, b""
+            return delimiter, _EMPTY
         data_bytes = await self._stream.readexactly(length)
         return delimiter, data_bytes
 
-    async def read_items(self) -> AsyncIterator[ItemT]:
+    def read_items(self) -> AsyncIterator[ItemT]:
+        return self._iter_items(self._validator(self._stream_types.item_type))
+
+    def read_raw_items(self) -> AsyncIterator[Any]:
+        """Like `read_items`, but yields the decoded JSON / msgpack data of items
+        (e.g. dicts) without validating them into the pydantic item type. Use this
+        for high-rate streams, where validating each item is too expensive."""
+        return self._iter_items(self._decode)
+
+    async def _iter_items(
+        self, decode: Callable[[memoryview], Any]
+    ) -> AsyncIterator[Any]:
         delimiter, data_bytes = await self._read()
         if delimiter == _Delimiter.HEADER:
             raise ValueError(
@@ -181,7 +289,7 @@ class _StreamReader(_Streamer[ItemT, HeaderTT, FooterTT]):
 
         assert delimiter == _Delimiter.ITEM
         while True:
-            yield self._stream_types.item_type.model_validate_json(data_bytes)
+            yield decode(data_bytes)
             # We don't know if the next data is another item, footer or the end.
             delimiter, data_bytes = await self._read()
             if delimiter == _Delimiter.END:
@@ -198,11 +306,11 @@ class _HeaderReadMixin(_Streamer[ItemT, HeaderT, FooterTT]):
         delimiter, data_bytes = await self._read()
         if delimiter != _Delimiter.HEADER:
             raise ValueError("Stream does not contain header.")
-        return self._stream_types.header_type.model_validate_json(data_bytes)
+        return self._validator(self._stream_types.header_type)(data_bytes)
 
 
 class _FooterReadMixin(_Streamer[ItemT, HeaderTT, FooterT]):
-    _footer_data: Optional[bytes]
+    _footer_data: Optional[memoryview]
 
     async def read_footer(
         self: _StreamReaderProtocol[ItemT, HeaderTT, FooterT],
@@ -213,7 +321,7 @@ class _FooterReadMixin(_Streamer[ItemT, HeaderTT, FooterT]):
                 raise ValueError("Stream does not contain footer.")
             self._footer_data = data_bytes
 
-        footer = self._stream_types.footer_type.model_validate_json(self._footer_data)
+        footer = self._validator(self._stream_types.footer_type)(self._footer_data)
         self._footer_data = None
         return footer
 
@@ -287,17 +395,25 @@ class _StreamWriter(_Streamer[ItemT, HeaderTT, FooterTT]):
         super().__init__(types)
         self._last_sent = _Delimiter.NOT_SET
         self._stream_types = types
+        self._packer = (
+            serialization.truss_msgpack_packer()
+            if types.encoding == "msgpack"
+            else None
+        )
 
     @staticmethod
     def _pack_tag(delimiter: _Delimiter, length: int) -> bytes:
-        return struct.pack(">BI", delimiter.value, length)
+        return _TAG_STRUCT.pack(delimiter.value, length)
+
+    def _encode(self, obj: pydantic.BaseModel) -> bytes:
+        if self._packer:
+            return self._packer.pack(obj.model_dump(mode="python"))
+        # Same as `model_dump_json`, but without the round trip through `str`.
+        return obj.__pydantic_serializer__.to_json(obj)
 
     def _serialize(self, obj: pydantic.BaseModel, delimiter: _Delimiter) -> bytes:
-        data_bytes = obj.model_dump_json().encode()
-        data = bytearray(self._pack_tag(delimiter, len(data_bytes)))
-        data.extend(data_bytes)
-        # Starlette cannot handle byte array, but view works..
-        return memoryview(data)
+        data_bytes = self._encode(obj)
+        return self._pack_tag(delimiter, len(data_bytes)) + data_bytes
 
     def yield_item(self, item: ItemT) -> bytes:
         if self._last_sent in (_Delimiter.FOOTER, _Delimiter.END):
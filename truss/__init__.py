@@ -1,5 +1,7 @@
+import importlib
 import importlib.metadata
 import pathlib
+from typing import TYPE_CHECKING, Any
 
 import tomlkit
 
@@ -25,8 +27,34 @@ def _get_version() -> str:
 __version__ = _get_version()
 
 
-from truss.api import login, push, whoami
-from truss.base import truss_config
-from truss.truss_handle.build import load  # TODO: Refactor all usages and remove.
+if TYPE_CHECKING:
+    from truss.api import login, push, whoami
+    from truss.base import truss_config
+    from truss.truss_handle.build import load  # TODO: Refactor all usages and remove.
 
 __all__ = ["push", "login", "load", "whoami", "truss_config"]
+
+# The public API is imported on first access, so that importing a submodule (e.g. the
+# CLI) does not import the API and all its dependencies.
+_LAZY_ATTRIBUTES = {
+    "push": "truss.api",
+    "login": "truss.api",
+    "whoami": "truss.api",
+    "load": "truss.truss_handle.build",
+}
+_LAZY_SUBMODULES = {"truss_config": "truss.base.truss_config"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        value = importlib.import_module(_LAZY_SUBMODULES[name])
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES, *_LAZY_SUBMODULES])
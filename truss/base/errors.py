@@ -40,5 +40,9 @@ class ContainerAPINoResponseError(Error):
     pass
 
 
+class DownloadError(Error):
+    pass
+
+
 class RemoteNetworkError(Exception):
     pass
@@ -623,6 +623,87 @@ class RemoteSSH(custom_types.ConfigModel):
     )
 
 
+class Batching(custom_types.ConfigModel):
+    """Server-side dynamic batching of concurrent predict requests."""
+
+    enabled: bool = pydantic.Field(
+        default=False,
+        description="If true, concurrent predict requests are gathered into batches and passed to the model's `predict_batch` method. Pre- and postprocessing still run per request.",
+    )
+    max_batch_size: int = pydantic.Field(
+        default=8, ge=1, description="The maximum number of requests in one batch."
+    )
+    max_wait_ms: float = pydantic.Field(
+        default=5.0,
+        ge=0,
+        description="The maximum time in milliseconds to wait for more requests after the first request of a batch arrived.",
+    )
+
+
+class AdaptiveConcurrency(custom_types.ConfigModel):
+    """Adaptive adjustment of the predict concurrency based on observed latency."""
+
+    enabled: bool = pydantic.Field(
+        default=False,
+        description="If true, the number of concurrent predict requests starts at `predict_concurrency` and is adjusted between `min_concurrency` and `max_concurrency`: it is increased additively while predict latency stays close to the lowest observed latency and decreased multiplicatively when latency rises above it. The current limit, queue depth and queue wait time are exported as Prometheus metrics.",
+    )
+    min_concurrency: int = pydantic.Field(
+        default=1, ge=1, description="The lower bound for the concurrency limit."
+    )
+    max_concurrency: Optional[int] = pydantic.Field(
+        default=None,
+        ge=1,
+        description="The upper bound for the concurrency limit. Defaults to `predict_concurrency`.",
+    )
+    latency_tolerance: float = pydantic.Field(
+        default=2.0,
+        gt=1,
+        description="The limit is decreased if predict latency exceeds the lowest observed latency by more than this factor.",
+    )
+    backoff_ratio: float = pydantic.Field(
+        default=0.9,
+        gt=0,
+        lt=1,
+        description="The factor by which the limit is multiplied when it is decreased.",
+    )
+    max_queue_wait_ms: Optional[float] = pydantic.Field(
+        default=None,
+        gt=0,
+        description="If set, predict requests are rejected with status 429 if their expected wait time for a free slot exceeds this many milliseconds. Does not apply to batched requests.",
+    )
+
+    @pydantic.model_validator(mode="after")
+    def _validate_bounds(self) -> "AdaptiveConcurrency":
+        if self.max_concurrency is not None and (
+            self.max_concurrency < self.min_concurrency
+        ):
+            raise ValueError(
+                f"max_concurrency ({self.max_concurrency}) must not be smaller than "
+                f"min_concurrency ({self.min_concurrency})."
+            )
+        return self
+
+
+class Streaming(custom_types.ConfigModel):
+    """Buffering of streamed responses between the model and the client."""
+
+    coalesce_max_bytes: int = pydantic.Field(
+        default=0,
+        ge=0,
+        description="If positive, consecutive `str` or `bytes` chunks are merged into chunks of up to this size before being sent to the client. Reduces per-chunk overhead for high-rate streams (e.g. LLM tokens), but chunk boundaries seen by the client change.",
+    )
+    coalesce_max_wait_ms: float = pydantic.Field(
+        default=0.0,
+        ge=0,
+        description="If coalescing is enabled, the time in milliseconds to wait for more chunks before sending a partial chunk. By default, only chunks that are already produced are merged, which adds no latency.",
+    )
+    max_buffer_bytes: Optional[int] = pydantic.Field(
+        default=None,
+        ge=1,
+        description="If set, the model's generator is paused while this many bytes are buffered and not yet sent to the client. By default, the buffer is unbounded so that the predict concurrency slot is released as soon as the generator is exhausted, irrespective of the client's read speed.",
+    )
+
+
 class Runtime(custom_types.ConfigModel):
     """Runtime settings for your model instance."""
 
@@ -637,10 +718,20 @@ class Runtime(custom_types.ConfigModel):
         default=False,
         description="If true, enables trace data export with built-in OTEL instrumentation. May add performance overhead.",
     )
+    tracing_sample_ratio: float = pydantic.Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of requests for which trace data is exported if `enable_tracing_data` is set. Requests that are part of an incoming trace follow its sampling decision.",
+    )
     enable_debug_logs: bool = pydantic.Field(
         default=False,
         description="If true, sets the Truss server log level to DEBUG instead of INFO.",
     )
+    enable_phase_metrics: bool = pydantic.Field(
+        default=True,
+        description="If true (the default), exports histograms of the time spent in each phase of handling requests (queueing, body read, deserialization, pre-/post-processing, predict, serialization, streaming) as `truss_request_phase_seconds` on `/metrics`.",
+    )
     transport: Transport = pydantic.Field(
         default_factory=HTTPOptions,
         description="The transport protocol for your model. Supports http (default), websocket, and grpc.",
@@ -657,6 +748,18 @@ class Runtime(custom_types.ConfigModel):
         default_factory=RemoteSSH,
         description="Configuration for SSH access to running model instances.",
     )
+    batching: Batching = pydantic.Field(
+        default_factory=Batching,
+        description="Configuration for server-side dynamic batching of predict requests.",
+    )
+    streaming: Streaming = pydantic.Field(
+        default_factory=Streaming,
+        description="Configuration for buffering of streamed responses.",
+    )
+    adaptive_concurrency: AdaptiveConcurrency = pydantic.Field(
+        default_factory=AdaptiveConcurrency,
+        description="Configuration for adapting the predict concurrency to observed latency.",
+    )
     truss_server_version_override: Optional[str] = pydantic.Field(
         None,
         description="By default, truss servers are built from the same release as the "
@@ -914,6 +1017,10 @@ class ExternalDataItem(custom_types.ConfigModel):
         default=None,
         description="Optional name for the download. Path relative to data directory.",
     )
+    sha256: Optional[str] = pydantic.Field(
+        default=None,
+        description="Optional hex SHA-256 digest of the file, verified after download.",
+    )
 
 
 class ExternalData(pydantic.RootModel[list[ExternalDataItem]]):
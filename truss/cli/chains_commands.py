@@ -13,7 +13,6 @@ from InquirerPy import inquirer
 from rich import progress
 
 from truss.cli import remote_cli
-from truss.cli.cli import truss_cli
 from truss.cli.resolvers.chain_team_resolver import resolve_chain_team_name
 from truss.cli.utils import common, output
 from truss.cli.utils.output import console
@@ -32,9 +31,6 @@ def chains():
     """Subcommands for truss chains"""
 
 
-truss_cli.add_command(chains)
-
-
 def _load_example_chainlet_code() -> str:
     try:
         from truss_chains.reference_code import reference_chainlet
@@ -6,54 +6,25 @@ import tarfile
 import threading
 import time
 from pathlib import Path
-from typing import Optional, cast
+from typing import TYPE_CHECKING, Optional, cast
 
-import requests
-import rich.table
 import rich_click as click
-import yaml
-from rich import console as rich_console
-from rich import progress
 
 import truss
-from truss.base.constants import (
-    PRODUCTION_ENVIRONMENT_NAME,
-    TRTLLM_MIN_MEMORY_REQUEST_GI,
-)
-from truss.base.trt_llm_config import TrussTRTLLMQuantizationType
-from truss.base.truss_config import Build, ModelServer, TransportKind, TrussConfig
-from truss.cli import remote_cli
-from truss.cli.auth import auth_group, do_login
-from truss.cli.logs import utils as cli_log_utils
-from truss.cli.logs.model_log_watcher import ModelDeploymentLogWatcher
-from truss.cli.resolvers.model_team_resolver import (
-    resolve_model_for_watch,
-    resolve_model_team_name,
-)
-from truss.cli.utils import common, self_upgrade
+from truss.cli.utils import common
+from truss.cli.utils.lazy_group import LazyGroup
 from truss.cli.utils.output import console, error_console, json_command
-from truss.remote.baseten.core import (
-    ACTIVE_STATUS,
-    DEPLOYING_STATUSES,
-    ModelId,
-    ModelIdentifier,
-    ModelName,
-    ModelVersionId,
-    get_dev_version_from_versions,
-)
-from truss.remote.baseten.remote import BasetenRemote
-from truss.remote.baseten.service import BasetenService, URLConfig
 from truss.remote.baseten.user_agent import set_client_name
-from truss.remote.remote_factory import USER_TRUSSRC_PATH, RemoteFactory
-from truss.trt_llm.config_checks import (
-    has_no_tags_trt_llm_builder,
-    memory_updated_for_trt_llm_builder,
-    uses_trt_llm_builder,
-)
-from truss.truss_handle.build import cleanup as _cleanup
-from truss.truss_handle.build import init_directory as _init
-from truss.truss_handle.build import load
-from truss.util import docker, user_config
+
+# Everything else is imported in the commands that use it, and the subcommand modules
+# are only imported when they run (see `LazyGroup`), to keep CLI startup fast. This is
+# checked by `truss/tests/cli/test_cli_import_time.py`.
+if TYPE_CHECKING:
+    import rich.table
+    from rich import console as rich_console
+
+    from truss.remote.baseten.core import ModelIdentifier
+    from truss.remote.baseten.remote import BasetenRemote
 
 click.rich_click.COMMAND_GROUPS = {
     "truss": [
@@ -90,6 +61,8 @@ def _get_truss_from_directory(
     target_directory: Optional[str] = None, config: Optional[str] = None
 ):
     """Gets Truss from directory. If none, use the current directory"""
+    from truss.truss_handle.build import load
+
     if target_directory is None:
         target_directory = os.getcwd()
     config_path = Path(config) if config else None
@@ -103,8 +76,11 @@ def _get_truss_from_directory(
 
 
 def _start_tail(
-    remote: BasetenRemote, model_id: str, version_id: str, in_background: bool
+    remote: "BasetenRemote", model_id: str, version_id: str, in_background: bool
 ) -> None:
+    from truss.cli.logs import utils as cli_log_utils
+    from truss.cli.logs.model_log_watcher import ModelDeploymentLogWatcher
+
     log_watcher = ModelDeploymentLogWatcher(remote.api, model_id, version_id)
 
     def _tail_logs():
@@ -127,7 +103,7 @@ def _start_tail(
 def _start_watch_mode(
     target_directory: str,
     model_name: str,
-    remote_provider: BasetenRemote,
+    remote_provider: "BasetenRemote",
     resolved_model: dict,
     resolved_versions: list,
     console: "rich_console.Console",
@@ -161,8 +137,20 @@ def _start_watch_mode(
 
 @click.group(
     name="truss",
+    cls=LazyGroup,
     invoke_without_command=True,
     context_settings=dict(help_option_names=["-h", "--help"]),
+    lazy_subcommands={
+        "auth": ("truss.cli.auth:auth_group", "Manage authentication."),
+        "chains": ("truss.cli.chains_commands:chains", "Subcommands for truss chains"),
+        "loops": ("truss.cli.loops_commands:loops", "Subcommands for truss loops"),
+        "migrate": (
+            "truss.cli.migrate_commands:migrate",
+            "Migrate model_cache and external_data to the new weights API.",
+        ),
+        "ssh": ("truss.cli.ssh_commands:ssh", "SSH access to Baseten workloads."),
+        "train": ("truss.cli.train_commands:train", "Subcommands for truss train"),
+    },
 )  # type: ignore
 @click.pass_context
 @click.version_option(truss.__version__)
@@ -185,10 +173,9 @@ def truss_cli(ctx) -> None:
 @click.option("--remote", type=str, default=None, help="Remote name to create.")
 @common.common_options()
 def login(browser: bool, api_key: Optional[str], remote: Optional[str]):
-    do_login(browser=browser, api_key=api_key, remote=remote)
-
+    from truss.cli.auth import do_login
 
-truss_cli.add_command(auth_group)
+    do_login(browser=browser, api_key=api_key, remote=remote)
 
 
 @truss_cli.command()
@@ -197,12 +184,16 @@ truss_cli.add_command(auth_group)
 @click.pass_context
 def upgrade(ctx: click.Context, version: Optional[str]) -> None:
     """Upgrade truss to the latest (or specified) version."""
+    from truss.cli.utils import self_upgrade
+
     interactive = not ctx.obj.get("non_interactive", False)
     self_upgrade.run_upgrade(version, interactive=interactive)
 
 
-def _create_oidc_table(oidc_info) -> rich.table.Table:
+def _create_oidc_table(oidc_info) -> "rich.table.Table":
     """Creates an OIDC information table."""
+    import rich.table
+
     table = rich.table.Table(
         show_header=False,
         title="OIDC Configuration for Workload Identity",
@@ -254,6 +245,9 @@ def whoami(remote: Optional[str], show_oidc: bool):
     Shows user information and exit.
     """
     from truss.api import whoami
+    from truss.cli import remote_cli
+    from truss.remote.baseten.remote import BasetenRemote
+    from truss.remote.remote_factory import RemoteFactory
 
     if not remote:
         remote = remote_cli.inquire_remote_name()
@@ -276,6 +270,8 @@ def whoami(remote: Optional[str], show_oidc: bool):
 
 @truss_cli.command()
 def configure():
+    from truss.remote.remote_factory import USER_TRUSSRC_PATH
+
     original_content = (
         USER_TRUSSRC_PATH.read_text() if USER_TRUSSRC_PATH.exists() else ""
     )
@@ -300,11 +296,16 @@ def cleanup() -> None:
     such as for building docker images. This command clears
     that data to free up disk space.
     """
-    _cleanup()
+    from truss.truss_handle.build import cleanup
+
+    cleanup()
 
 
 ### Truss (model) commands. ############################################################
 
+# Values of `truss_config.ModelServer`, which is not imported here as that is slow.
+_MODEL_SERVERS = ["TrussServer", "TRT_LLM"]
+
 
 @truss_cli.command()
 @click.argument("target_directory", required=True)
@@ -312,8 +313,8 @@ def cleanup() -> None:
     "-b",
     "--backend",
     show_default=True,
-    default=ModelServer.TrussServer.value,
-    type=click.Choice([server.value for server in ModelServer]),
+    default="TrussServer",
+    type=click.Choice(_MODEL_SERVERS),
 )
 @click.option("-n", "--name", type=click.STRING)
 @click.option(
@@ -327,6 +328,10 @@ def init(target_directory, backend, name, python_config) -> None:
 
     TARGET_DIRECTORY: A Truss is created in this directory
     """
+    from truss.base.truss_config import Build, ModelServer
+    from truss.cli import remote_cli
+    from truss.truss_handle.build import init_directory
+
     if os.path.isdir(target_directory):
         raise click.ClickException(
             f"Error: Directory '{target_directory}' already exists "
@@ -338,7 +343,7 @@ def init(target_directory, backend, name, python_config) -> None:
         model_name = name
     else:
         model_name = remote_cli.inquire_model_name()
-    _init(
+    init_directory(
         target_directory=target_directory,
         build_config=build_config,
         model_name=model_name,
@@ -352,13 +357,15 @@ def _extract_and_validate_model_identifier(
     model_id: Optional[str],
     model_version_id: Optional[str],
     published: Optional[bool],
-) -> ModelIdentifier:
+) -> "ModelIdentifier":
+    from truss.remote.baseten.core import ModelId, ModelName, ModelVersionId
+
     if published and (model_id or model_version_id):
         raise click.UsageError(
             "Cannot use --published with --model or --model-deployment."
         )
 
-    model_identifier: ModelIdentifier
+    model_identifier: "ModelIdentifier"
     if model_version_id:
         model_identifier = ModelVersionId(model_version_id)
     elif model_id:
@@ -450,6 +457,10 @@ def predict(
 
     REQUEST_FILE: Path to json file containing the request
     """
+    from truss.cli import remote_cli
+    from truss.remote.baseten.service import BasetenService
+    from truss.remote.remote_factory import RemoteFactory
+
     if not remote:
         remote = remote_cli.inquire_remote_name()
 
@@ -750,6 +761,29 @@ def push(
     TARGET_DIRECTORY: A Truss directory. If none, use current directory.
 
     """
+    from rich import progress
+
+    from truss.base.constants import (
+        PRODUCTION_ENVIRONMENT_NAME,
+        TRTLLM_MIN_MEMORY_REQUEST_GI,
+    )
+    from truss.base.trt_llm_config import TrussTRTLLMQuantizationType
+    from truss.base.truss_config import TransportKind
+    from truss.cli import remote_cli
+    from truss.cli.resolvers.model_team_resolver import (
+        resolve_model_for_watch,
+        resolve_model_team_name,
+    )
+    from truss.remote.baseten.core import ACTIVE_STATUS, DEPLOYING_STATUSES
+    from truss.remote.baseten.remote import BasetenRemote
+    from truss.remote.baseten.service import BasetenService
+    from truss.remote.remote_factory import RemoteFactory
+    from truss.trt_llm.config_checks import (
+        has_no_tags_trt_llm_builder,
+        memory_updated_for_trt_llm_builder,
+        uses_trt_llm_builder,
+    )
+    from truss.util import user_config
 
     if publish:
         console.print(
@@ -1068,10 +1102,14 @@ def model_logs(
     """
     Fetches logs for the packaged model
     """
+    from truss.cli import remote_cli
+    from truss.cli.logs import utils as cli_log_utils
+    from truss.cli.logs.model_log_watcher import ModelDeploymentLogWatcher
+    from truss.remote.remote_factory import RemoteFactory
 
     if not remote:
         remote = remote_cli.inquire_remote_name()
-    remote_provider = cast(BasetenRemote, RemoteFactory.create(remote=remote))
+    remote_provider = cast("BasetenRemote", RemoteFactory.create(remote=remote))
     if not tail:
         logs = remote_provider.api.get_model_deployment_logs(model_id, deployment_id)
         for log in cli_log_utils.parse_logs(logs):
@@ -1120,6 +1158,11 @@ def download(
     """
     Downloads the truss for a deployed model.
     """
+    import requests
+
+    from truss.cli import remote_cli
+    from truss.remote.remote_factory import RemoteFactory
+
     if out_file and out_dir:
         raise click.UsageError("Cannot specify both --out-file and --out-dir.")
 
@@ -1143,7 +1186,7 @@ def download(
 
     if not remote:
         remote = remote_cli.inquire_remote_name()
-    remote_provider = cast(BasetenRemote, RemoteFactory.create(remote=remote))
+    remote_provider = cast("BasetenRemote", RemoteFactory.create(remote=remote))
 
     console.print("Fetching download URL...")
     download_url = remote_provider.api.get_deployment_download_url(
@@ -1199,9 +1242,15 @@ def model_config(
     """
     Fetches the config of a deployed model.
     """
+    import yaml
+
+    from truss.base.truss_config import TrussConfig
+    from truss.cli import remote_cli
+    from truss.remote.remote_factory import RemoteFactory
+
     if not remote:
         remote = remote_cli.inquire_remote_name()
-    remote_provider = cast(BasetenRemote, RemoteFactory.create(remote=remote))
+    remote_provider = cast("BasetenRemote", RemoteFactory.create(remote=remote))
 
     response = remote_provider.api.get_deployment_config(model_id, deployment_id)
 
@@ -1279,11 +1328,17 @@ def watch(
 
     TARGET_DIRECTORY: A Truss directory. If none, use current directory.
     """
+    from truss.cli import remote_cli
+    from truss.cli.resolvers.model_team_resolver import resolve_model_for_watch
+    from truss.remote.baseten.core import get_dev_version_from_versions
+    from truss.remote.baseten.service import URLConfig
+    from truss.remote.remote_factory import RemoteFactory
+
     # TODO: ensure that provider support draft
     if not remote:
         remote = remote_cli.inquire_remote_name()
 
-    remote_provider = cast(BasetenRemote, RemoteFactory.create(remote=remote))
+    remote_provider = cast("BasetenRemote", RemoteFactory.create(remote=remote))
 
     tr = _get_truss_from_directory(target_directory=target_directory, config=config)
     model_name = model_name or tr.spec.config.model_name
@@ -1494,14 +1549,6 @@ def kill(target_directory: str) -> None:
 @container.command()  # type: ignore
 def kill_all() -> None:
     """Kills all truss containers that are not manually persisted."""
-    docker.kill_all()
-
+    from truss.util import docker
 
-# These imports are needed to register the subcommands
-from truss.cli import (  # noqa: F401
-    chains_commands,
-    loops_commands,
-    migrate_commands,
-    ssh_commands,
-    train_commands,
-)
+    docker.kill_all()
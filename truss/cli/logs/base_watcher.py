@@ -1,5 +1,5 @@
 import contextlib
-import hashlib
+import heapq
 import time
 from abc import ABC, abstractmethod
 from typing import Any, Iterator, List, Optional
@@ -13,21 +13,56 @@ POLL_INTERVAL_SEC = 2
 CLOCK_SKEW_BUFFER_MS = 60000
 
 
+class _RecentLogs:
+    """Identities of logs seen recently, bucketed by timestamp.
+
+    Logs are only compared with logs of the same timestamp, so most lookups are a
+    single dict miss. Per log, only a (non-cryptographic) hash of message and
+    replica is kept, and buckets older than the window that can still be fetched
+    again are dropped with `prune`.
+    """
+
+    def __init__(self) -> None:
+        self._hashes_by_timestamp: dict[int, set[int]] = {}
+        self._timestamps: list[int] = []  # Min-heap of the keys above.
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, timestamp_ns: int, log: ParsedLog) -> bool:
+        """Returns whether the log is new, i.e. was not added before."""
+        log_hash = hash((log.message, log.replica))
+        hashes = self._hashes_by_timestamp.get(timestamp_ns)
+        if hashes is None:
+            self._hashes_by_timestamp[timestamp_ns] = {log_hash}
+            heapq.heappush(self._timestamps, timestamp_ns)
+        elif log_hash in hashes:
+            return False
+        else:
+            hashes.add(log_hash)
+        self._size += 1
+        return True
+
+    def prune(self, before_ns: int) -> None:
+        while self._timestamps and self._timestamps[0] < before_ns:
+            timestamp_ns = heapq.heappop(self._timestamps)
+            self._size -= len(self._hashes_by_timestamp.pop(timestamp_ns))
+
+
 class LogWatcher(ABC):
     api: BasetenApi
     # NB(nikhil): we add buffer for clock skew, so this helps us detect duplicates.
-    # TODO(nikhil): clean up hashes so this doesn't grow indefinitely.
-    _log_hashes: set[str] = set()
+    _recent_logs: _RecentLogs
+    _has_logs: bool
 
     _last_poll_time_ms: Optional[int] = None
     _last_log_time_ms: Optional[int] = None
 
     def __init__(self, api: BasetenApi):
         self.api = api
-
-    def _hash_log(self, log: ParsedLog) -> str:
-        log_str = f"{log.timestamp}-{log.message}-{log.replica}"
-        return hashlib.sha256(log_str.encode("utf-8")).hexdigest()
+        self._recent_logs = _RecentLogs()
+        self._has_logs = False
 
     def get_start_epoch_ms(self, now_ms: int) -> Optional[int]:
         if self._last_poll_time_ms:
@@ -45,9 +80,8 @@ class LogWatcher(ABC):
         parsed_logs = parse_logs(api_logs)
 
         for log in parsed_logs:
-            if (h := self._hash_log(log)) not in self._log_hashes:
-                self._log_hashes.add(h)
-
+            if self._recent_logs.add(int(log.timestamp), log):
+                self._has_logs = True
                 yield log
 
     def poll(self) -> Iterator[ParsedLog]:
@@ -64,6 +98,10 @@ class LogWatcher(ABC):
             self._last_log_time_ms = int(epoch_ns / 1e6)
 
         self._last_poll_time_ms = now_ms
+        # Logs from before the start of the next poll can't be fetched again.
+        next_start_epoch_ms = self.get_start_epoch_ms(int(time.time() * 1000))
+        if next_start_epoch_ms is not None:
+            self._recent_logs.prune(next_start_epoch_ms * 1_000_000)
 
     def watch(self, show_spinner: bool = True) -> Iterator[ParsedLog]:
         self.before_polling()
@@ -75,7 +113,7 @@ class LogWatcher(ABC):
             while True:
                 for log in self.poll():
                     yield log
-                if self._log_hashes:
+                if self._has_logs:
                     break
                 time.sleep(POLL_INTERVAL_SEC)
 
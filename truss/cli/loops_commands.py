@@ -6,7 +6,6 @@ import rich.table
 import rich_click as click
 
 from truss.cli import remote_cli
-from truss.cli.cli import truss_cli
 from truss.cli.utils import common
 from truss.cli.utils.output import console
 from truss.remote.baseten.remote import BasetenRemote
@@ -21,9 +20,6 @@ def loops():
     """Subcommands for truss loops"""
 
 
-truss_cli.add_command(loops)
-
-
 @loops.command(name="push")
 @click.argument("base_model", type=str)
 @click.option(
@@ -17,7 +17,6 @@ from rich.syntax import Syntax
 
 from truss.base.constants import MODEL_CACHE_PATH
 from truss.base.truss_config import ExternalDataItem, ModelRepo, ModelRepoSourceKind
-from truss.cli.cli import truss_cli
 from truss.cli.utils import common
 
 console = Console()
@@ -197,7 +196,7 @@ def show_diff(original_yaml: str, migrated_yaml: str) -> None:
         console.print("[yellow]No changes detected.[/yellow]")
 
 
-@truss_cli.command()
+@click.command()
 @click.argument("target_directory", required=False, default=os.getcwd())
 @common.common_options()
 def migrate(target_directory: str) -> None:
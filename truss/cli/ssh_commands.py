@@ -3,7 +3,6 @@ from typing import Optional
 import rich_click as click
 from InquirerPy import inquirer
 
-from truss.cli.cli import truss_cli
 from truss.cli.ssh import (
     ensure_ssh_keypair,
     install_proxy_command_script,
@@ -20,9 +19,6 @@ def ssh():
     """SSH access to Baseten workloads."""
 
 
-truss_cli.add_command(ssh)
-
-
 @ssh.command(name="setup")
 @click.option(
     "--python",
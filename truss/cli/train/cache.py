@@ -3,10 +3,12 @@ import json
 import os
 import sys
 from abc import ABC, abstractmethod
+from operator import attrgetter
 from typing import Any, Callable, Optional
 
 import rich
 
+from truss.cli.train.file_tree import FileTree
 from truss.cli.utils import common as cli_common
 from truss.cli.utils.output import console
 from truss.remote.baseten.custom_types import (
@@ -34,13 +36,30 @@ OUTPUT_FORMAT_JSON = "json"
 def calculate_directory_sizes(
     files: list[FileSummary], max_depth: int = 100
 ) -> dict[str, int]:
-    """Calculate total sizes for directories based on their file contents."""
-    directory_sizes = {}
+    """Calculate total sizes for directories based on their file contents.
+
+    Only files less than `max_depth` levels below a directory count towards its size.
+    """
+    directory_sizes = {f.path: 0 for f in files if f.file_type == "directory"}
+    tree = FileTree(files, path=attrgetter("path"), size=attrgetter("size_bytes"))
+    if tree.height >= max_depth:
+        return _walk_directory_sizes(files, directory_sizes, max_depth)
 
     for file_info in files:
-        if file_info.file_type == "directory":
-            directory_sizes[file_info.path] = 0
+        # The size of a directory entry itself counts towards its total size.
+        if file_info.path in directory_sizes:
+            directory_sizes[file_info.path] += file_info.size_bytes
+    for path in directory_sizes:
+        node = tree.get(path)
+        if node:
+            directory_sizes[path] += node.total_size
+    return directory_sizes
 
+
+def _walk_directory_sizes(
+    files: list[FileSummary], directory_sizes: dict[str, int], max_depth: int
+) -> dict[str, int]:
+    """Add the size of each file to its directories up to `max_depth - 1` levels up."""
     for file_info in files:
         current_path = file_info.path
         for i in range(max_depth):
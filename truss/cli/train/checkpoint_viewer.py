@@ -23,6 +23,7 @@ from pygments import highlight
 from pygments.formatters import TerminalFormatter
 from pygments.lexers import get_lexer_for_filename
 
+from truss.cli.train.file_tree import FileTree
 from truss.cli.utils import common as cli_common
 from truss.cli.utils.output import console
 from truss.remote.baseten.remote import BasetenRemote
@@ -192,6 +193,15 @@ class JSONCheckpointViewer(CheckpointListViewer):
         print(json.dumps(output, indent=2))
 
 
+def _build_file_tree(files: list[dict]) -> FileTree[dict]:
+    """Index file dicts with a "_rel_path" key by their path."""
+    return FileTree(
+        files,
+        path=lambda f: f.get("_rel_path", ""),
+        size=lambda f: f.get("size_bytes", 0),
+    )
+
+
 def _build_directory_listing(
     files: list[dict],
     current_path: str,
@@ -212,44 +222,39 @@ def _build_directory_listing(
           and optionally "checkpoint_type", "base_model", "size_bytes"}
         - dir_files: list of original file dicts that are direct children of current_path
     """
-    dir_stats: dict[str, dict] = {}
-    dir_files: list[dict] = []
+    return _list_directory(_build_file_tree(files), current_path, checkpoint_lookup)
 
-    prefix = current_path + "/" if current_path else ""
-
-    for f in files:
-        rel = f.get("_rel_path", "")
-        if not rel.startswith(prefix):
-            continue
-        remainder = rel[len(prefix) :]
-        if not remainder:
-            continue
-
-        if "/" in remainder:
-            # File belongs to a subdirectory
-            subdir_name = remainder.split("/", 1)[0]
-            if subdir_name not in dir_stats:
-                dir_stats[subdir_name] = {
-                    "name": subdir_name,
-                    "total_size": 0,
-                    "file_count": 0,
-                }
-            dir_stats[subdir_name]["total_size"] += f.get("size_bytes", 0)
-            dir_stats[subdir_name]["file_count"] += 1
-        else:
-            # Direct child file
-            dir_files.append(f)
+
+def _list_directory(
+    file_tree: FileTree[dict],
+    current_path: str,
+    checkpoint_lookup: Optional[dict[str, dict]] = None,
+) -> tuple[list[dict], list[dict]]:
+    """Like `_build_directory_listing`, for files indexed with `_build_file_tree`."""
+    dirs: list[dict] = []
+    dir_files: list[dict] = []
+    node = file_tree.get(current_path)
+    if node:
+        dirs = [
+            {
+                "name": child.name,
+                "total_size": child.total_size,
+                "file_count": child.file_count,
+            }
+            for child in node.children.values()
+        ]
+        dir_files = list(node.entries)
 
     # Annotate directories that match detected checkpoints
     if checkpoint_lookup:
-        for d in dir_stats.values():
+        for d in dirs:
             ckpt_meta = checkpoint_lookup.get(d["name"])
             if ckpt_meta:
                 d["checkpoint_type"] = ckpt_meta.get("checkpoint_type", "")
                 d["base_model"] = ckpt_meta.get("base_model", "")
                 d["size_bytes"] = ckpt_meta.get("size_bytes", 0)
 
-    return list(dir_stats.values()), dir_files
+    return dirs, dir_files
 
 
 _DIR_STYLE = get_style({"dir": "#30B77E", "fuzzy_match": "#c678dd bold"})
@@ -406,9 +411,9 @@ def _explore_files(
     initial_path: Optional[str] = None,
 ) -> None:
     """Interactive file explorer starting from the root of the checkpoint volume."""
-    prepared_files = [
-        {**f, "_rel_path": f.get("relative_file_name", "")} for f in files
-    ]
+    file_tree = _build_file_tree(
+        [{**f, "_rel_path": f.get("relative_file_name", "")} for f in files]
+    )
 
     path_stack: list[str] = (
         [p for p in initial_path.split("/") if p and p != "."] if initial_path else []
@@ -417,9 +422,7 @@ def _explore_files(
 
     while True:
         current_path = "/".join(path_stack)
-        dirs, dir_files = _build_directory_listing(
-            prepared_files, current_path, checkpoint_lookup
-        )
+        dirs, dir_files = _list_directory(file_tree, current_path, checkpoint_lookup)
 
         console.clear()
         display_path = job_id + "/" + current_path if current_path else job_id + "/"
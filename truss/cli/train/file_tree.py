@@ -0,0 +1,102 @@
+import os
+from typing import Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _dirname(path: str) -> str:
+    """`os.path.dirname`, without its overhead for the common case."""
+    head, _, _ = path.rpartition("/")
+    if head and not head.endswith("/"):
+        return head
+    return os.path.dirname(path)
+
+
+class FileTreeNode(Generic[T]):
+    """A directory in a `FileTree`."""
+
+    __slots__ = (
+        "path",
+        "name",
+        "parent",
+        "depth",
+        "children",
+        "entries",
+        "total_size",
+        "file_count",
+    )
+
+    def __init__(self, path: str, parent: Optional["FileTreeNode[T]"]) -> None:
+        self.path = path
+        self.name = os.path.basename(path)
+        self.parent = parent
+        self.depth: int = parent.depth + 1 if parent else 0
+        self.children: Dict[str, "FileTreeNode[T]"] = {}
+        # Entries directly in this directory.
+        self.entries: List[T] = []
+        # Size and number of the entries at any depth below this directory.
+        self.total_size = 0
+        self.file_count = 0
+
+
+class FileTree(Generic[T]):
+    """Prefix tree index over a flat listing of files, e.g. a training cache or
+    checkpoint volume.
+
+    Built once per listing: every directory containing an entry and its parents (as
+    given by `os.path.dirname`) get a node, and the sizes and counts of the entries
+    below each directory are aggregated bottom-up. Listing a directory is then
+    O(children) instead of a scan of all entries. Entries at a root path ("" or "/")
+    are not part of any directory and are skipped.
+    """
+
+    def __init__(
+        self, entries: Iterable[T], path: Callable[[T], str], size: Callable[[T], int]
+    ) -> None:
+        # Parents are always inserted before their children.
+        self._nodes: Dict[str, FileTreeNode[T]] = {}
+        for entry in entries:
+            entry_path = path(entry)
+            directory = _dirname(entry_path)
+            if directory == entry_path:
+                continue
+            node = self._nodes.get(directory)
+            if node is None:
+                node = self._create_node(directory)
+            node.entries.append(entry)
+            node.total_size += size(entry)
+            node.file_count += 1
+
+        # Depth of the deepest entry, with entries in a root directory at depth 1.
+        self.height = 0
+        for node in reversed(self._nodes.values()):
+            if node.parent:
+                node.parent.total_size += node.total_size
+                node.parent.file_count += node.file_count
+            self.height = max(self.height, node.depth + 1)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __getitem__(self, path: str) -> FileTreeNode[T]:
+        return self._nodes[path]
+
+    def get(self, path: str) -> Optional[FileTreeNode[T]]:
+        return self._nodes.get(path)
+
+    def _create_node(self, path: str) -> FileTreeNode[T]:
+        missing = [path]
+        parent_path = _dirname(path)
+        while parent_path != missing[-1] and parent_path not in self._nodes:
+            missing.append(parent_path)
+            parent_path = _dirname(parent_path)
+        # `dirname` of a root ("" or "/") is the root itself.
+        parent = self._nodes.get(parent_path) if parent_path != missing[-1] else None
+
+        for node_path in reversed(missing):
+            node = FileTreeNode(node_path, parent)
+            if parent:
+                parent.children[node.name] = node
+            self._nodes[node_path] = node
+            parent = node
+        return node
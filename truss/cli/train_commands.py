@@ -11,7 +11,6 @@ import rich_click as click
 import truss.cli.train.core as train_cli
 from truss.base.constants import TRAINING_TEMPLATE_DIR
 from truss.cli import remote_cli
-from truss.cli.cli import truss_cli
 from truss.cli.logs import utils as cli_log_utils
 from truss.cli.logs.training_log_watcher import TrainingLogWatcher
 from truss.cli.resolvers.training_project_team_resolver import (
@@ -35,7 +34,7 @@ from truss.cli.train.cache import (
 from truss.cli.train.types import DeploySuccessResult
 from truss.cli.utils import common
 from truss.cli.utils.output import console, error_console
-from truss.remote.baseten.core import get_training_job_logs_with_pagination
+from truss.remote.baseten.core import ConcurrentTrainingLogsFetcher
 from truss.remote.baseten.custom_types import TeamType
 from truss.remote.baseten.remote import BasetenRemote
 from truss.remote.remote_factory import RemoteFactory
@@ -48,9 +47,6 @@ def train():
     """Subcommands for truss train"""
 
 
-truss_cli.add_command(train)
-
-
 def _print_training_job_success_message(
     job_id: str,
     project_id: str,
@@ -396,11 +392,12 @@ def get_job_logs(
 
     if not tail:
         # Non-tail mode: Display all logs
-        logs = get_training_job_logs_with_pagination(
+        logs_fetcher = ConcurrentTrainingLogsFetcher(
             remote_provider.api, project_id, job_id
         )
-        for log in cli_log_utils.parse_logs(logs):
-            cli_log_utils.output_log(log)
+        for batch_logs in logs_fetcher:
+            for log in cli_log_utils.parse_logs(batch_logs):
+                cli_log_utils.output_log(log)
     else:
         # Tail mode: Stream logs continuously
         log_watcher = TrainingLogWatcher(remote_provider.api, project_id, job_id)
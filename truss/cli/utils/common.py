@@ -10,24 +10,17 @@ from functools import wraps
 from typing import TYPE_CHECKING, Any, Callable, Optional
 
 import pydantic
-import requests as requests_lib
 import rich
-import rich.live
 import rich.logging
-import rich.spinner
-import rich.table
-import rich.traceback
 import rich_click as click
 from rich.markup import escape
 
 import truss
-from truss.cli.utils import self_upgrade
 
 if TYPE_CHECKING:
     from truss.cli.cli import rich_console
+    from truss.remote.baseten.remote import BasetenRemote
 from truss.cli.utils.output import console
-from truss.remote.baseten.core import ACTIVE_STATUS, DEPLOYING_STATUSES
-from truss.remote.baseten.remote import BasetenRemote
 
 logger = logging.getLogger(__name__)
 
@@ -169,6 +162,8 @@ def _error_handling(f: Callable[..., object]) -> Callable[..., object]:
 
 
 def upgrade_dialogue():
+    from truss.cli.utils import self_upgrade
+
     try:
         self_upgrade.notify_if_outdated(truss.__version__)
     except Exception as e:
@@ -263,16 +258,18 @@ def wait_for_development_model_ready(
     model_hostname: str,
     model_id: str,
     dev_version_id: str,
-    remote_provider: BasetenRemote,
+    remote_provider: "BasetenRemote",
     console: "rich_console.Console",
 ) -> None:
+    import requests
+
+    from truss.remote.baseten.core import ACTIVE_STATUS, DEPLOYING_STATUSES
+
     # Wake the model in case it's scaled to zero
     wake_url = f"{model_hostname}/development/wake"
     try:
-        requests_lib.post(
-            wake_url, headers=remote_provider.fetch_auth_header(), timeout=10
-        )
-    except requests_lib.RequestException:
+        requests.post(wake_url, headers=remote_provider.fetch_auth_header(), timeout=10)
+    except requests.RequestException:
         # best effort
         pass
 
@@ -327,6 +324,8 @@ def keepalive_loop(
     header_provider: Callable[[], dict[str, str]],
     stop_event: threading.Event,
 ) -> None:
+    import requests
+
     consecutive_failures = 0
     start_time = time.time()
     keepalive_url = f"{model_hostname}/development/sync/v1/models/model"
@@ -353,9 +352,7 @@ def keepalive_loop(
             warning_emitted = True
 
         try:
-            resp = requests_lib.get(
-                keepalive_url, headers=header_provider(), timeout=10
-            )
+            resp = requests.get(keepalive_url, headers=header_provider(), timeout=10)
             if resp.status_code == 200:
                 consecutive_failures = 0
             elif 400 <= resp.status_code < 500:
@@ -364,7 +361,7 @@ def keepalive_loop(
             else:
                 # Count 5xx errors as failures
                 consecutive_failures += 1
-        except requests_lib.RequestException:
+        except requests.RequestException:
             consecutive_failures += 1
 
         if consecutive_failures >= _KEEPALIVE_MAX_CONSECUTIVE_FAILURES:
@@ -0,0 +1,60 @@
+import contextlib
+import importlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import rich_click as click
+
+
+class LazyGroup(click.RichGroup):
+    """Group whose subcommands are imported from their modules on first use.
+
+    `lazy_subcommands` maps command names to `("module:attribute", short help)`.
+    Listing the commands in the help or for shell completion uses the short help and
+    does not import them, so that e.g. `truss --help` does not pay for importing all
+    subcommands and their dependencies.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+        self._listing_commands = False
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            import_path, short_help = self.lazy_subcommands[cmd_name]
+            if self._listing_commands:
+                return click.RichCommand(name=cmd_name, short_help=short_help)
+            self.add_command(_import_command(import_path), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_help(self, ctx, formatter) -> None:
+        with self._listing():
+            super().format_help(ctx, formatter)
+
+    def shell_complete(self, ctx: click.Context, incomplete: str):
+        with self._listing():
+            return super().shell_complete(ctx, incomplete)
+
+    @contextlib.contextmanager
+    def _listing(self) -> Iterator[None]:
+        self._listing_commands = True
+        try:
+            yield
+        finally:
+            self._listing_commands = False
+
+
+def _import_command(import_path: str) -> click.Command:
+    module_name, attribute = import_path.split(":")
+    command = getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(command, click.Command):
+        raise TypeError(f"`{import_path}` is not a click command.")
+    return command
@@ -4,7 +4,6 @@ import json
 import sys
 from typing import Any, Dict
 
-import requests
 import rich
 import rich.live
 import rich.logging
@@ -73,6 +72,8 @@ def console_to_stderr():
 
 def _format_json_error(exc: Exception) -> Dict[str, Any]:
     """Format an exception as a JSON-serializable error dict."""
+    import requests
+
     error: Dict[str, Any] = {"message": str(exc)}
 
     if isinstance(exc, requests.HTTPError) and exc.response is not None:
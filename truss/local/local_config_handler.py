@@ -5,6 +5,7 @@ from typing import Optional
 
 from truss.base import truss_config
 from truss.local.local_config import LocalConfig
+from truss.truss_handle.patch.hash import str_hash_str
 
 
 class LocalConfigHandler:
@@ -88,6 +89,14 @@ class LocalConfigHandler:
     def _signatures_dir_path():
         return LocalConfigHandler.TRUSS_CONFIG_DIR / "signatures"
 
+    @staticmethod
+    def file_hash_cache_path(truss_dir: Path) -> Path:
+        """Path of the persisted file hash cache for `truss_dir`."""
+        dir_key = str_hash_str(str(truss_dir.resolve()))
+        return (
+            LocalConfigHandler.TRUSS_CONFIG_DIR / "file_hash_cache" / f"{dir_key}.json"
+        )
+
     @staticmethod
     def shadow_trusses_dir_path():
         return LocalConfigHandler.TRUSS_CONFIG_DIR / "shadow_trusses"
@@ -1,5 +1,24 @@
 # flake8: noqa
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from truss.remote.baseten.auth import AuthService
-from truss.remote.baseten.remote import BasetenRemote
-from truss.remote.baseten.service import BasetenService
+if TYPE_CHECKING:
+    from truss.remote.baseten.auth import AuthService
+    from truss.remote.baseten.remote import BasetenRemote
+    from truss.remote.baseten.service import BasetenService
+
+# Imported on first access, so that importing a submodule (e.g. `core` or `error`)
+# does not import the remote and its dependencies.
+_LAZY_ATTRIBUTES = {
+    "AuthService": "truss.remote.baseten.auth",
+    "BasetenRemote": "truss.remote.baseten.remote",
+    "BasetenService": "truss.remote.baseten.service",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
@@ -995,13 +995,20 @@ class BasetenApi:
         return resp_json
 
     def _fetch_log_batch(
-        self, project_id: str, job_id: str, query_params: Dict[str, Any]
+        self,
+        project_id: str,
+        job_id: str,
+        query_params: Dict[str, Any],
+        session: Optional[requests.Session] = None,
     ) -> List[Any]:
         """
-        Fetch a single batch of logs from the API.
+        Fetch a single batch of logs from the API, optionally reusing the connections
+        of `session`.
         """
         resp_json = self._rest_api_client.post(
-            f"v1/training_projects/{project_id}/jobs/{job_id}/logs", body=query_params
+            f"v1/training_projects/{project_id}/jobs/{job_id}/logs",
+            body=query_params,
+            session=session,
         )
         return resp_json["logs"]
 
@@ -1,11 +1,27 @@
+import collections
 import datetime
 import json
 import logging
 import pathlib
 import textwrap
-from typing import IO, TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple, Type
+import time
+from concurrent import futures
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from truss.base.errors import ValidationError
 from truss.cli.utils.output import console
@@ -18,9 +34,15 @@ from truss.base.constants import PRODUCTION_ENVIRONMENT_NAME
 from truss.remote.baseten import custom_types as b10_types
 from truss.remote.baseten.api import BasetenApi
 from truss.remote.baseten.error import ApiError
-from truss.remote.baseten.utils.tar import create_tar_with_progress_bar
+from truss.remote.baseten.utils.tar import (
+    TAR_COMPRESSION_NONE,
+    create_tar_with_progress_bar,
+)
 from truss.remote.baseten.utils.time import iso_to_millis
-from truss.remote.baseten.utils.transfer import multipart_upload_boto3
+from truss.remote.baseten.utils.transfer import (
+    multipart_upload_boto3,
+    stream_tar_upload,
+)
 from truss.util.path import load_trussignore_patterns_from_truss_dir
 
 logger = logging.getLogger(__name__)
@@ -42,6 +64,19 @@ MAX_BATCH_SIZE = 1000
 NANOSECONDS_PER_MILLISECOND = 1_000_000
 MILLISECONDS_PER_HOUR = 60 * 60 * 1000
 
+# Maximum time delta of a log request allowed by the API
+LOG_WINDOW_MILLIS = 2 * MILLISECONDS_PER_HOUR
+# Number of log windows fetched concurrently
+DEFAULT_LOG_FETCH_WORKERS = 8
+# Logs can be ingested shortly after a training job reached its final status
+LOG_INGESTION_GRACE_MILLIS = 5 * 60 * 1000
+TRAINING_JOB_FINAL_STATUSES = {
+    "TRAINING_JOB_COMPLETED",
+    "TRAINING_JOB_FAILED",
+    "TRAINING_JOB_STOPPED",
+    "TRAINING_JOB_DEPLOY_FAILED",
+}
+
 
 class ModelIdentifier:
     value: str
@@ -377,6 +412,50 @@ def upload_truss(
     return s3_key
 
 
+def upload_truss_streaming(
+    api: BasetenApi,
+    dir: pathlib.Path,
+    progress_bar: Optional[Type["progress.Progress"]] = None,
+    config_yaml_override: Optional[bytes] = None,
+    compression: str = TAR_COMPRESSION_NONE,
+    compression_level: Optional[int] = None,
+) -> str:
+    """
+    Pack and upload a Truss directory to the Baseten remote in one pass.
+
+    Combines ``archive_dir`` and ``upload_truss``, but streams the archive into a
+    multipart upload while it is packed, instead of writing it to a temporary file
+    first.
+
+    Args:
+        api: BasetenApi instance
+        dir: Root directory to pack.
+        progress_bar: Optional Rich progress bar type.
+        config_yaml_override: See ``archive_dir``.
+        compression: ``none`` or ``gzip``.
+        compression_level: Compression level, defaults to the compressor's default.
+
+    Returns:
+        The S3 key of the uploaded file
+    """
+    ignore_patterns = load_trussignore_patterns_from_truss_dir(dir)
+    temp_credentials_s3_upload = api.model_s3_upload_credentials()
+    s3_key = temp_credentials_s3_upload.pop("s3_key")
+    s3_bucket = temp_credentials_s3_upload.pop("s3_bucket")
+    stream_tar_upload(
+        dir,
+        s3_bucket,
+        s3_key,
+        temp_credentials_s3_upload,
+        ignore_patterns=ignore_patterns,
+        config_yaml_override=config_yaml_override,
+        compression=compression,
+        compression_level=compression_level,
+        progress_bar=progress_bar,
+    )
+    return s3_key
+
+
 def upload_chain_artifact(
     api: BasetenApi,
     serialize_file: IO,
@@ -761,3 +840,162 @@ def get_training_job_logs_with_pagination(
     logging.info(f"Completed pagination for job {job_id}. Total logs: {len(all_logs)}")
 
     return all_logs
+
+
+def _training_job_log_range(training_job: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Time range in milliseconds since epoch that contains all logs of a training job:
+    from its creation until its last update if it is done, until now otherwise.
+    """
+    start_time = iso_to_millis(training_job["created_at"])
+    updated_at = training_job.get("updated_at")
+    if updated_at and training_job.get("current_status") in TRAINING_JOB_FINAL_STATUSES:
+        end_time = iso_to_millis(updated_at) + LOG_INGESTION_GRACE_MILLIS
+    else:
+        end_time = int(time.time() * 1000)
+    return start_time, max(start_time, end_time)
+
+
+def _fetch_log_window(
+    api: BasetenApi,
+    project_id: str,
+    job_id: str,
+    start_time: int,
+    end_time: int,
+    batch_size: int,
+    session: Optional[requests.Session] = None,
+) -> Tuple[List[Any], bool]:
+    """
+    Fetch the logs with timestamps in [start_time, end_time) with time-based
+    pagination, halving the batch size on server errors.
+
+    Returns:
+        Tuple of (logs in chronological order, whether all logs of the window were
+        fetched)
+    """
+    logs: List[Any] = []
+    iteration = 0
+    while start_time < end_time:
+        if iteration >= MAX_ITERATIONS:
+            logging.warning(
+                f"Reached maximum iteration limit ({MAX_ITERATIONS}) while paginating "
+                f"training job logs for project_id={project_id}, job_id={job_id}."
+            )
+            return logs, False
+
+        query_params = _build_log_query_params(start_time, end_time, batch_size)
+        try:
+            batch_logs = api._fetch_log_batch(
+                project_id, job_id, query_params, session=session
+            )
+        except requests.HTTPError as e:
+            if 500 <= e.response.status_code < 600:
+                if batch_size <= MIN_BATCH_SIZE:
+                    logging.error(
+                        "Failed to fetch all training job logs due to persistent server errors. "
+                        "Please try again later or contact support if the issue persists."
+                    )
+                    return logs, False
+                batch_size = _handle_server_error_backoff(
+                    e, job_id, iteration, batch_size
+                )
+                # Retry the same iteration with reduced batch size
+                continue
+            logging.error(
+                f"HTTP error fetching logs for job {job_id} at iteration {iteration}: {e}"
+            )
+            return logs, False
+        except Exception as e:
+            logging.error(
+                f"Error fetching logs for job {job_id} at iteration {iteration}: {e}"
+            )
+            return logs, False
+
+        # Logs at the end of the window belong to the next one, whether or not the
+        # API treats the end time as inclusive.
+        batch_logs = [
+            log
+            for log in batch_logs
+            if int(log["timestamp"]) // NANOSECONDS_PER_MILLISECOND < end_time
+        ]
+        should_continue, next_start_time, _ = _process_batch_logs(
+            batch_logs, job_id, iteration, batch_size
+        )
+        if not should_continue:
+            break
+        logs.extend(batch_logs)
+        start_time = next_start_time  # type: ignore[assignment]
+        iteration += 1
+
+    return logs, True
+
+
+class ConcurrentTrainingLogsFetcher:
+    """
+    Iterator for fetching training job logs concurrently in time windows.
+
+    The time range of the job is split into windows of the maximum time delta allowed
+    by the API, which are paginated independently, each with its own batch size
+    backoff, by a bounded pool of threads sharing one HTTP session. The logs of each
+    window are yielded in chronological order as soon as all earlier windows are
+    fetched, at most `2 * max_workers` windows are fetched ahead. Stops at the first
+    window that could not be fetched completely, so the logs never have gaps.
+    """
+
+    def __init__(
+        self,
+        api: BasetenApi,
+        project_id: str,
+        job_id: str,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_workers: int = DEFAULT_LOG_FETCH_WORKERS,
+    ):
+        self.api = api
+        self.project_id = project_id
+        self.job_id = job_id
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        training_job = self.api.get_training_job(self.project_id, self.job_id)
+        start_time, end_time = _training_job_log_range(training_job["training_job"])
+        window_starts = iter(range(start_time, end_time + 1, LOG_WINDOW_MILLIS))
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        pending: Deque[futures.Future] = collections.deque()
+
+        def submit_next_window() -> None:
+            window_start = next(window_starts, None)
+            if window_start is not None:
+                pending.append(
+                    executor.submit(
+                        _fetch_log_window,
+                        self.api,
+                        self.project_id,
+                        self.job_id,
+                        window_start,
+                        window_start + LOG_WINDOW_MILLIS,
+                        self.batch_size,
+                        session,
+                    )
+                )
+
+        with session, futures.ThreadPoolExecutor(self.max_workers) as executor:
+            try:
+                for _ in range(2 * self.max_workers):
+                    submit_next_window()
+                while pending:
+                    logs, complete = pending.popleft().result()
+                    submit_next_window()
+                    if logs:
+                        yield logs
+                    if not complete:
+                        return
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        logging.info(f"Completed fetching logs for job {self.job_id}.")
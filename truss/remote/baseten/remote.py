@@ -49,6 +49,7 @@ from truss.remote.baseten.core import (
     get_truss_watch_state,
     upload_chain_artifact,
     upload_truss,
+    upload_truss_streaming,
     validate_truss_config_against_backend,
 )
 from truss.remote.baseten.error import ApiError, AuthorizationError, RemoteError
@@ -69,6 +70,11 @@ if TYPE_CHECKING:
 # Server-side cap on raw config.yaml; payloads larger than this are dropped.
 RAW_CONFIG_MAX_BYTES = 100 * 1024
 
+# Opt-in streaming pack-and-upload of trusses, the value is the compression (`none`
+# or `gzip`), which the backend must be able to unpack.
+UPLOAD_COMPRESSION_ENV = "TRUSS_UPLOAD_COMPRESSION"
+UPLOAD_COMPRESSION_LEVEL_ENV = "TRUSS_UPLOAD_COMPRESSION_LEVEL"
+
 
 class PatchStatus(enum.Enum):
     SUCCESS = enum.auto()
@@ -423,12 +429,24 @@ class BasetenRemote(TrussRemote):
                 f"{RAW_CONFIG_MAX_BYTES} byte cap; proceeding without uploading raw config."
             )
             raw_config_bytes = None
-        temp_file = archive_dir(
-            truss_handle._truss_dir,
-            progress_bar,
-            config_yaml_override=config_yaml_override,
-        )
-        s3_key = upload_truss(self._api, temp_file, progress_bar)
+        upload_compression = os.environ.get(UPLOAD_COMPRESSION_ENV)
+        if upload_compression:
+            compression_level = os.environ.get(UPLOAD_COMPRESSION_LEVEL_ENV)
+            s3_key = upload_truss_streaming(
+                self._api,
+                truss_handle._truss_dir,
+                progress_bar,
+                config_yaml_override=config_yaml_override,
+                compression=upload_compression,
+                compression_level=int(compression_level) if compression_level else None,
+            )
+        else:
+            temp_file = archive_dir(
+                truss_handle._truss_dir,
+                progress_bar,
+                config_yaml_override=config_yaml_override,
+            )
+            s3_key = upload_truss(self._api, temp_file, progress_bar)
 
         return FinalPushData(
             model_name=model_name,
@@ -1,4 +1,4 @@
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 import requests
 
@@ -33,10 +33,9 @@ class RestAPIClient:
         self._handle_error(resp)
         return resp.json()
 
-    def post(self, path: str, body: Any):
-        resp = requests.post(
-            f"{self.base_url}/{path}", headers=self._headers(), json=body
-        )
+    def post(self, path: str, body: Any, session: Optional[requests.Session] = None):
+        post = session.post if session else requests.post
+        resp = post(f"{self.base_url}/{path}", headers=self._headers(), json=body)
         self._handle_error(resp)
         return resp.json()
 
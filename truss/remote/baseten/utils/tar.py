@@ -1,9 +1,10 @@
 import contextlib
+import gzip
 import io
 import tarfile
 import tempfile
 from pathlib import Path
-from typing import IO, TYPE_CHECKING, Any, Callable, List, Optional, Type
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterator, List, Optional, Type
 
 if TYPE_CHECKING:
     from rich import progress
@@ -28,13 +29,19 @@ class ReadProgressIndicatorFileHandle:
         return getattr(self._file, attr)
 
 
-def create_tar_with_progress_bar(
+TAR_COMPRESSION_NONE = "none"
+TAR_COMPRESSION_GZIP = "gzip"
+TAR_COMPRESSIONS = (TAR_COMPRESSION_NONE, TAR_COMPRESSION_GZIP)
+
+DEFAULT_GZIP_LEVEL = 6
+
+
+def collect_tar_files(
     source_dir: Path,
     ignore_patterns: Optional[List[str]] = None,
-    delete=True,
-    progress_bar: Optional[Type["progress.Progress"]] = None,
     config_yaml_override: Optional[bytes] = None,
-):
+) -> tuple[List[Path], int]:
+    """Returns the files to pack and the total number of bytes to read."""
     files_to_include = collect_files(source_dir, ignore_patterns)
     config_rel = Path(CONFIG_FILE)
     if config_yaml_override is not None:
@@ -45,6 +52,81 @@ def create_tar_with_progress_bar(
     total_size = sum(f.stat().st_size for f in files_to_include)
     if config_yaml_override is not None:
         total_size += len(config_yaml_override)
+    return files_to_include, total_size
+
+
+@contextlib.contextmanager
+def _compressed_writer(
+    fileobj: IO[bytes], compression: str, compression_level: Optional[int]
+) -> Iterator[IO[bytes]]:
+    if compression == TAR_COMPRESSION_NONE:
+        yield fileobj
+    elif compression == TAR_COMPRESSION_GZIP:
+        level = DEFAULT_GZIP_LEVEL if compression_level is None else compression_level
+        # `mtime=0` makes the output reproducible.
+        with gzip.GzipFile(
+            fileobj=fileobj, mode="wb", compresslevel=level, mtime=0
+        ) as writer:
+            yield writer  # type: ignore[misc]
+    else:
+        raise ValueError(
+            f"Unknown compression `{compression}`, expected one of {TAR_COMPRESSIONS}."
+        )
+
+
+def write_tar_stream(
+    fileobj: IO[bytes],
+    source_dir: Path,
+    files_to_include: List[Path],
+    config_yaml_override: Optional[bytes] = None,
+    compression: str = TAR_COMPRESSION_NONE,
+    compression_level: Optional[int] = None,
+    read_progress_callback: Optional[Callable[[int], Any]] = None,
+) -> None:
+    """Writes a (compressed) tar of `files_to_include` to `fileobj` as it is read.
+
+    Unlike `create_tar_with_progress_bar`, nothing is buffered on disk and `fileobj`
+    only needs to be writable, so packing can feed e.g. an upload directly. The
+    archive has the same members as the one of `create_tar_with_progress_bar`.
+
+    `read_progress_callback` is called with the number of source bytes read.
+    """
+    with (
+        _compressed_writer(fileobj, compression, compression_level) as writer,
+        tarfile.open(fileobj=writer, mode="w|") as tar,
+    ):
+        for file_path in files_to_include:
+            arcname = str(file_path.relative_to(source_dir))
+            with file_path.open("rb") as file_obj:
+                tarinfo = tar.gettarinfo(name=str(file_path), arcname=arcname)
+                tar.addfile(
+                    tarinfo=tarinfo,
+                    fileobj=(
+                        ReadProgressIndicatorFileHandle(  # type: ignore[arg-type]
+                            file_obj, read_progress_callback
+                        )
+                        if read_progress_callback
+                        else file_obj
+                    ),
+                )
+        if config_yaml_override is not None:
+            tarinfo = tarfile.TarInfo(name=CONFIG_FILE)
+            tarinfo.size = len(config_yaml_override)
+            tar.addfile(tarinfo, fileobj=io.BytesIO(config_yaml_override))
+            if read_progress_callback:
+                read_progress_callback(len(config_yaml_override))
+
+
+def create_tar_with_progress_bar(
+    source_dir: Path,
+    ignore_patterns: Optional[List[str]] = None,
+    delete=True,
+    progress_bar: Optional[Type["progress.Progress"]] = None,
+    config_yaml_override: Optional[bytes] = None,
+):
+    files_to_include, total_size = collect_tar_files(
+        source_dir, ignore_patterns, config_yaml_override
+    )
     temp_file = tempfile.NamedTemporaryFile(suffix=".tgz", delete=delete)
 
     progress_context = (
@@ -1,12 +1,21 @@
 import base64
 import contextlib
+import io
 import json
 import os
-from typing import TYPE_CHECKING, Optional, Type
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional, Type
 
 import boto3
 from boto3.s3.transfer import TransferConfig
 
+from truss.remote.baseten.utils.tar import (
+    TAR_COMPRESSION_NONE,
+    collect_tar_files,
+    write_tar_stream,
+)
 from truss.util.env_vars import modify_env_vars
 
 if TYPE_CHECKING:
@@ -17,6 +26,12 @@ def base64_encoded_json_str(obj):
     return base64.b64encode(str.encode(json.dumps(obj))).decode("utf-8")
 
 
+# S3 requires all parts but the last one to be at least 5MiB.
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+UPLOAD_MAX_CONCURRENCY = 10
+
+
 def multipart_upload_boto3(
     file_path,
     bucket_name: str,
@@ -52,3 +67,196 @@ def multipart_upload_boto3(
                 Config=TransferConfig(max_concurrency=10, use_threads=True),
                 Callback=callback,
             )
+
+
+class MultipartUploadWriter(io.RawIOBase):
+    """Writable stream that uploads what is written as parts of a multipart upload.
+
+    Full parts are uploaded on a thread pool while the writer keeps producing. At
+    most `max_concurrency` parts are in flight, `write` blocks once that many are
+    pending, so memory use is bounded by about `(max_concurrency + 1) * part_size`.
+    `complete` uploads the remaining bytes and finishes the upload, `abort` cancels
+    it. Errors of part uploads are raised from the next `write` or `complete`.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        bucket_name: str,
+        key: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = UPLOAD_MAX_CONCURRENCY,
+        on_part_uploaded: Optional[Callable[[int], Any]] = None,
+    ) -> None:
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"`part_size` must be at least {MIN_PART_SIZE} bytes.")
+        self._client = s3_client
+        self._bucket_name = bucket_name
+        self._key = key
+        self._part_size = part_size
+        self._on_part_uploaded = on_part_uploaded
+        self._buffer = bytearray()
+        self._futures: List[Future] = []
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="truss-upload-part"
+        )
+        self.bytes_written = 0
+        self._upload_id = s3_client.create_multipart_upload(
+            Bucket=bucket_name, Key=key
+        )["UploadId"]
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._raise_if_failed()
+        self._buffer += data
+        size = len(data)
+        self.bytes_written += size
+        while len(self._buffer) >= self._part_size:
+            part = bytes(self._buffer[: self._part_size])
+            del self._buffer[: self._part_size]
+            self._submit(part)
+        return size
+
+    def _raise_if_failed(self) -> None:
+        for future in self._futures:
+            if future.done() and future.exception():
+                raise future.exception()  # type: ignore[misc]
+
+    def _submit(self, part: bytes) -> None:
+        self._slots.acquire()
+        self._raise_if_failed()
+        future = self._executor.submit(self._upload_part, len(self._futures) + 1, part)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _upload_part(self, part_number: int, part: bytes) -> dict:
+        response = self._client.upload_part(
+            Bucket=self._bucket_name,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=part,
+        )
+        if self._on_part_uploaded:
+            self._on_part_uploaded(len(part))
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    def complete(self) -> None:
+        if self._buffer or not self._futures:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        parts = [future.result() for future in self._futures]
+        self._executor.shutdown()
+        self._client.complete_multipart_upload(
+            Bucket=self._bucket_name,
+            Key=self._key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+
+    def abort(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+        self._client.abort_multipart_upload(
+            Bucket=self._bucket_name, Key=self._key, UploadId=self._upload_id
+        )
+
+
+@contextlib.contextmanager
+def multipart_upload_writer(
+    bucket_name: str,
+    key: str,
+    credentials: dict,
+    part_size: int = DEFAULT_PART_SIZE,
+    max_concurrency: int = UPLOAD_MAX_CONCURRENCY,
+    on_part_uploaded: Optional[Callable[[int], Any]] = None,
+) -> Iterator[MultipartUploadWriter]:
+    """Yields a `MultipartUploadWriter`, completing the upload on exit.
+
+    The upload is aborted if the block or an upload of a part fails.
+    """
+    # See `multipart_upload_boto3`.
+    aws_env_vars = set(
+        env_var for env_var in os.environ.keys() if env_var.startswith("AWS_")
+    )
+    with modify_env_vars(deletions=aws_env_vars):
+        s3_client = boto3.client("s3", **credentials)
+    writer = MultipartUploadWriter(
+        s3_client,
+        bucket_name,
+        key,
+        part_size=part_size,
+        max_concurrency=max_concurrency,
+        on_part_uploaded=on_part_uploaded,
+    )
+    try:
+        yield writer
+        writer.complete()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def stream_tar_upload(
+    source_dir: Path,
+    bucket_name: str,
+    key: str,
+    credentials: dict,
+    ignore_patterns: Optional[List[str]] = None,
+    config_yaml_override: Optional[bytes] = None,
+    compression: str = TAR_COMPRESSION_NONE,
+    compression_level: Optional[int] = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    progress_bar: Optional[Type["progress.Progress"]] = None,
+) -> int:
+    """Packs `source_dir` into a (compressed) tar and uploads it as it is written.
+
+    Reading, compressing and uploading of parts overlap, and no temporary archive
+    is written to disk. The packing progress counts source bytes read, the upload
+    progress counts archive bytes uploaded out of the bytes packed so far, as the
+    size of the compressed archive is only known at the end. Returns the size of the
+    uploaded archive.
+    """
+    files_to_include, total_size = collect_tar_files(
+        source_dir, ignore_patterns, config_yaml_override
+    )
+    progress = progress_bar(transient=True) if progress_bar else None
+    if progress is not None:
+        # Trailing spaces are to align with the upload message.
+        pack_task_id = progress.add_task("[cyan]Packing Truss  ", total=total_size)
+        upload_task_id = progress.add_task("[cyan]Uploading Truss", total=0)
+
+    def on_part_uploaded(num_bytes: int) -> None:
+        if progress is not None:
+            progress.update(upload_task_id, advance=num_bytes)
+
+    with (
+        progress or contextlib.nullcontext(),
+        multipart_upload_writer(
+            bucket_name,
+            key,
+            credentials,
+            part_size=part_size,
+            on_part_uploaded=on_part_uploaded,
+        ) as writer,
+    ):
+
+        def on_read(num_bytes: int) -> None:
+            if progress is not None:
+                progress.update(pack_task_id, advance=num_bytes)
+                progress.update(upload_task_id, total=writer.bytes_written)
+
+        write_tar_stream(
+            writer,  # type: ignore[arg-type]
+            source_dir,
+            files_to_include,
+            config_yaml_override=config_yaml_override,
+            compression=compression,
+            compression_level=compression_level,
+            read_progress_callback=on_read if progress is not None else None,
+        )
+        if progress is not None:
+            progress.update(upload_task_id, total=writer.bytes_written)
+    return writer.bytes_written
@@ -23,6 +23,10 @@ from starlette.datastructures import State
 from starlette.middleware.base import BaseHTTPMiddleware
 
 SANITIZED_EXCEPTION_FRAMES = 2
+INFERENCE_SERVER_PROBE_TIMEOUT_SECS = 5.0
+# The inference server answers the probe as soon as the model finished loading, but
+# at latest after this long poll.
+INFERENCE_SERVER_LOADED_WAIT_SECS = 30.0
 
 
 # NB(nikhil): SanitizedExceptionMiddleware reduces the noise of control server
@@ -125,6 +129,7 @@ def create_app(base_config: dict):
         app_state.inference_server_process_args,
         app_state.inference_server_port,
         app_logger=app_logger,
+        use_zygote=getattr(app_state, "inference_server_zygote", False),
     )
 
     limits = httpx.Limits(max_keepalive_connections=8, max_connections=32)
@@ -156,6 +161,11 @@ def create_app(base_config: dict):
                 app_state.inference_server_controller, app_logger
             )
         )
+        readiness_watcher = asyncio.create_task(
+            app_state.inference_server_process_controller.watch_inference_server_readiness(
+                lambda: _is_inference_server_loaded(app_state.proxy_client)
+            )
+        )
         try:
             yield
         finally:
@@ -166,6 +176,7 @@ def create_app(base_config: dict):
             # behavior for control server.
             app.state.logger.info("Term signal received, shutting down.")
             app.state.inference_server_process_controller.terminate_with_wait()
+            readiness_watcher.cancel()
 
     app = FastAPI(title="Truss Live Reload Server", lifespan=lifespan)
     app.state = app_state
@@ -175,5 +186,18 @@ def create_app(base_config: dict):
     return app
 
 
+async def _is_inference_server_loaded(client: httpx.AsyncClient) -> bool:
+    try:
+        resp = await client.get(
+            "/v1/models/model/loaded",
+            params={"wait_secs": INFERENCE_SERVER_LOADED_WAIT_SECS},
+            timeout=INFERENCE_SERVER_LOADED_WAIT_SECS
+            + INFERENCE_SERVER_PROBE_TIMEOUT_SECS,
+        )
+    except httpx.HTTPError:
+        return False
+    return resp.status_code == http.HTTPStatus.OK
+
+
 def _camel_to_snake_case(camel_cased: str) -> str:
     return re.sub(r"(?<!^)(?=[A-Z])", "_", camel_cased).lower()
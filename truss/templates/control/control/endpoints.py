@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import Any, Callable, Optional, Protocol
+import tempfile
+from collections.abc import AsyncIterator
+from typing import Any, Callable, Optional, Protocol, Union
 
 import httpx
 from fastapi import APIRouter, WebSocket
@@ -11,10 +13,19 @@ from httpx_ws import _exceptions as httpx_ws_exceptions
 from starlette.requests import ClientDisconnect, Request
 from starlette.responses import Response
 from starlette.websockets import WebSocketDisconnect as StartletteWebSocketDisconnect
-from tenacity import RetryCallState, Retrying, retry_if_exception_type, wait_fixed
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception_type, wait_fixed
 from wsproto.events import BytesMessage, TextMessage
 
 INFERENCE_SERVER_START_WAIT_SECS = 60
+# Upper bound for how long a failed request waits for the inference server to become
+# ready before it is retried.
+INFERENCE_SERVER_RETRY_WAIT_SECS = 1
+# Request bodies larger than this (or of unknown length) are streamed to the inference
+# server instead of being read completely first.
+STREAM_REQUEST_BODY_MIN_BYTES = 1 << 20
+# Streamed bodies are spooled for retries, in memory up to this size, then on disk.
+REQUEST_BODY_SPOOL_MAX_MEMORY_BYTES = 16 << 20
+REQUEST_BODY_SPOOL_READ_CHUNK_BYTES = 1 << 16
 BASE_RETRY_EXCEPTIONS = (
     retry_if_exception_type(httpx.ConnectError)
     | retry_if_exception_type(httpx.RemoteProtocolError)
@@ -41,6 +52,44 @@ def index():
     return {}
 
 
+class _ReplayableRequestBody:
+    """Streams a request body while spooling it, so that it can be re-sent.
+
+    Each iteration first replays the part of the body that was already received and
+    then continues reading from the client. This way, the proxy does not need to
+    hold the complete body before forwarding it, but can still retry if the
+    inference server is not up yet.
+    """
+
+    def __init__(self, request: Request) -> None:
+        self._source = request.stream()
+        self._spool = tempfile.SpooledTemporaryFile(
+            max_size=REQUEST_BODY_SPOOL_MAX_MEMORY_BYTES
+        )
+        self._source_exhausted = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        self._spool.seek(0)
+        while chunk := self._spool.read(REQUEST_BODY_SPOOL_READ_CHUNK_BYTES):
+            yield chunk
+        if self._source_exhausted:
+            return
+        async for chunk in self._source:
+            self._spool.write(chunk)
+            yield chunk
+        self._source_exhausted = True
+
+    def close(self) -> None:
+        self._spool.close()
+
+
+def _should_stream_request_body(request: Request) -> bool:
+    content_length = request.headers.get("content-length")
+    if content_length is None:
+        return request.method != "GET"
+    return int(content_length) > STREAM_REQUEST_BODY_MIN_BYTES
+
+
 async def proxy_http(request: Request):
     inference_server_process_controller = (
         request.app.state.inference_server_process_controller
@@ -53,11 +102,15 @@ async def proxy_http(request: Request):
     # 2 min connect timeouts, no timeout for requests.
     # We don't want requests to fail due to timeout on the proxy
     timeout = httpx.Timeout(None, connect=2 * 60.0)
-    try:
-        request_body = await request.body()
-    except ClientDisconnect:
-        # If the client disconnects, we don't need to proxy the request
-        return Response(status_code=499)
+    request_body: Union[bytes, _ReplayableRequestBody]
+    if _should_stream_request_body(request):
+        request_body = _ReplayableRequestBody(request)
+    else:
+        try:
+            request_body = await request.body()
+        except ClientDisconnect:
+            # If the client disconnects, we don't need to proxy the request
+            return Response(status_code=499)
 
     inf_serv_req = client.build_request(
         request.method,
@@ -66,9 +119,25 @@ async def proxy_http(request: Request):
         content=request_body,
         timeout=timeout,
     )
+    try:
+        return await _send_with_retries(
+            inf_serv_req, client, inference_server_process_controller, path
+        )
+    except ClientDisconnect:
+        return Response(status_code=499)
+    finally:
+        if isinstance(request_body, _ReplayableRequestBody):
+            request_body.close()
+
 
+async def _send_with_retries(
+    inf_serv_req: httpx.Request,
+    client: httpx.AsyncClient,
+    inference_server_process_controller,
+    path: str,
+) -> Response:
     # Wait a bit for inference server to start
-    for attempt in inference_retries():
+    async for attempt in inference_retries(inference_server_process_controller):
         with attempt:
             try:
                 if inference_server_process_controller.is_inference_server_intentionally_stopped():
@@ -76,6 +145,7 @@ async def proxy_http(request: Request):
                 resp = await client.send(inf_serv_req, stream=True)
 
                 if await _is_model_not_ready(resp):
+                    inference_server_process_controller.mark_inference_server_not_ready()
                     # If this is a health check request, don't raise an error so that a stack
                     # trace isn't logged upon deploying a model with a long load time.
                     if _is_health_check(path):
@@ -113,12 +183,26 @@ async def proxy_http(request: Request):
 
 
 def inference_retries(
+    inference_server_process_controller,
     retry_condition: Callable[[RetryCallState], bool] = BASE_RETRY_EXCEPTIONS,
-):
-    yield from Retrying(
+) -> AsyncRetrying:
+    async def wait_for_ready(seconds: float) -> None:
+        # Instead of sleeping, park until the inference server is ready, so that
+        # all waiting requests resume as soon as it is.
+        await inference_server_process_controller.wait_for_inference_server_ready(
+            seconds
+        )
+
+    return AsyncRetrying(
         retry=retry_condition,
         stop=_custom_stop_strategy,
-        wait=wait_fixed(1),
+        wait=wait_fixed(INFERENCE_SERVER_RETRY_WAIT_SECS),
+        sleep=wait_for_ready,
+        # A failed attempt means the server is not (or no longer) ready, waiting
+        # requests then park until readiness is confirmed again.
+        before_sleep=lambda _: (
+            inference_server_process_controller.mark_inference_server_not_ready()
+        ),
         reraise=True,
     )
 
@@ -199,8 +283,11 @@ async def _attempt_websocket_proxy(
 async def proxy_ws(client_ws: WebSocket):
     proxy_client: httpx.AsyncClient = client_ws.app.state.proxy_client
     logger = client_ws.app.state.logger
+    inference_server_process_controller = (
+        client_ws.app.state.inference_server_process_controller
+    )
 
-    for attempt in inference_retries():
+    async for attempt in inference_retries(inference_server_process_controller):
         with attempt:
             try:
                 await _attempt_websocket_proxy(client_ws, proxy_client, logger)
@@ -1,3 +1,4 @@
+import itertools
 import logging
 import os
 import threading
@@ -15,6 +16,12 @@ from helpers.inference_server_process_controller import InferenceServerProcessCo
 from helpers.truss_patch.model_container_patch_applier import ModelContainerPatchApplier
 
 INFERENCE_SERVER_CHECK_INTERVAL_SECS = 10
+# Patches after which the imports preloaded by the inference server zygote are stale.
+ZYGOTE_RESET_PATCH_TYPES = {
+    PatchType.SYSTEM_PACKAGE,
+    PatchType.PYTHON_REQUIREMENT,
+    PatchType.ENVIRONMENT_VARIABLE,
+}
 
 
 class InferenceServerController:
@@ -93,11 +100,33 @@ class InferenceServerController:
             if not hot_reload:
                 self._process_controller.stop()
             patches.sort(key=_patch_sort_key_fn)
+            self._patch_applier.reset_config_cache()
             try:
                 patches_executed = 0
-                for patch in patches:
-                    self._patch_applier(patch, self._inf_env)
-                    patches_executed += 1
+                for patch_type, patch_group in itertools.groupby(
+                    patches, key=lambda patch: patch.type
+                ):
+                    batch = list(patch_group)
+                    if patch_type in ZYGOTE_RESET_PATCH_TYPES:
+                        self._process_controller.reset_zygote()
+                    if patch_type == PatchType.PYTHON_REQUIREMENT and len(batch) > 1:
+                        try:
+                            self._patch_applier.apply_python_requirement_patches(
+                                [patch.body for patch in batch]
+                            )
+                            patches_executed += len(batch)
+                            continue
+                        except Exception as exc:
+                            # Apply them one by one to find out which requirement
+                            # fails, and whether the failure leaves the requirements
+                            # partially applied.
+                            self._app_logger.warning(
+                                f"Failed to apply python requirement patches together,"
+                                f" applying them one by one: {exc}"
+                            )
+                    for patch in batch:
+                        self._patch_applier(patch, self._inf_env)
+                        patches_executed += 1
             except Exception as exc:
                 if patches_executed > 0:
                     # In this case we leave inference server stopped, to reflect
@@ -1,24 +1,38 @@
+import asyncio
 import logging
 import subprocess
 import time
+from collections.abc import Awaitable
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Union
 
 from helpers.context_managers import current_directory
+from helpers.inference_server_zygote import (
+    ForkedInferenceServer,
+    InferenceServerZygote,
+    ZygoteError,
+)
 from shared.util import kill_child_processes
 
 INFERENCE_SERVER_FAILED_FILE = Path("~/inference_server_crashed.txt").expanduser()
 TERMINATION_TIMEOUT_SECS = 120.0
 TERMINATION_CHECK_INTERVAL_SECS = 0.5
+READINESS_PROBE_INTERVAL_SECS = 0.1
 
 
 class InferenceServerProcessController:
-    _inference_server_process: Optional[subprocess.Popen] = None
+    _inference_server_process: Optional[
+        Union[subprocess.Popen, ForkedInferenceServer]
+    ] = None
+    _zygote: Optional[InferenceServerZygote] = None
     _inference_server_port: int
     _inference_server_home: str
     _app_logger: logging.Logger
     _inference_server_process_args: list[str]
     _logged_unrecoverable_since_last_restart: bool
+    _inference_server_ready: bool
+    _ready_event: Optional[asyncio.Event] = None
+    _ready_event_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def __init__(
         self,
@@ -26,6 +40,7 @@ class InferenceServerProcessController:
         inference_server_process_args: list[str],
         inference_server_port: int,
         app_logger: logging.Logger,
+        use_zygote: bool = False,
     ) -> None:
         self._inference_server_home = inference_server_home
         self._inference_server_process_args = inference_server_process_args
@@ -34,19 +49,47 @@ class InferenceServerProcessController:
         self._inference_server_ever_started = False
         self._inference_server_terminated = False
         self._logged_unrecoverable_since_last_restart = False
+        self._inference_server_ready = False
+        self._inference_server_start_count = 0
         self._app_logger = app_logger
+        if use_zygote:
+            # Restarts fork from a process with preloaded imports instead of starting
+            # a new interpreter.
+            self._zygote = InferenceServerZygote(
+                inference_server_process_args[0], inference_server_home, app_logger
+            )
 
     def start(self, inf_env: dict):
+        self.mark_inference_server_not_ready()
         with current_directory(self._inference_server_home):
             inf_env["INFERENCE_SERVER_PORT"] = str(self._inference_server_port)
-            self._inference_server_process = subprocess.Popen(
-                self._inference_server_process_args, env=inf_env
-            )
+            self._inference_server_process = self._start_process(inf_env)
 
             self._inference_server_started = True
             self._inference_server_ever_started = True
+            self._inference_server_start_count += 1
             self._logged_unrecoverable_since_last_restart = False
 
+    def _start_process(
+        self, inf_env: dict
+    ) -> Union[subprocess.Popen, ForkedInferenceServer]:
+        if self._zygote is not None:
+            try:
+                return self._zygote.fork(
+                    self._inference_server_process_args[1:], inf_env
+                )
+            except ZygoteError as e:
+                self._app_logger.warning(
+                    f"{e}, starting inference server without zygote from now on."
+                )
+                self._zygote = None
+        return subprocess.Popen(self._inference_server_process_args, env=inf_env)
+
+    def reset_zygote(self) -> None:
+        """Discards the preloaded imports, e.g. after installed packages changed."""
+        if self._zygote is not None:
+            self._zygote.reset()
+
     def _terminate_children_and_process(self) -> None:
         """Kill child processes first, then parent. Prevents port binding conflicts."""
         if self._inference_server_process is None:
@@ -57,6 +100,7 @@ class InferenceServerProcessController:
         self._inference_server_process.terminate()
 
     def stop(self):
+        self.mark_inference_server_not_ready()
         if self._inference_server_process is not None:
             self._terminate_children_and_process()
             self._inference_server_process.wait()
@@ -67,6 +111,8 @@ class InferenceServerProcessController:
         # Always flip the terminated flag so the non-daemon overseer thread in
         # InferenceServerController can exit, even when no process was started.
         self._inference_server_terminated = True
+        self.mark_inference_server_not_ready()
+        self.reset_zygote()
         if self._inference_server_process is None:
             return
         self._terminate_children_and_process()
@@ -102,6 +148,91 @@ class InferenceServerProcessController:
     def is_inference_server_terminated(self) -> bool:
         return self._inference_server_terminated
 
+    def is_inference_server_ready(self) -> bool:
+        return self._inference_server_ready
+
+    def mark_inference_server_ready(self) -> None:
+        self._set_inference_server_ready(True)
+
+    def mark_inference_server_not_ready(self) -> None:
+        self._set_inference_server_ready(False)
+
+    def _set_inference_server_ready(self, ready: bool) -> None:
+        # Can be called from any thread (e.g. while applying patches), the event is
+        # only touched on the event loop it belongs to.
+        self._inference_server_ready = ready
+        loop = self._ready_event_loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running_loop: Optional[asyncio.AbstractEventLoop] = (
+                asyncio.get_running_loop()
+            )
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            self._sync_ready_event()
+        else:
+            loop.call_soon_threadsafe(self._sync_ready_event)
+
+    def _sync_ready_event(self) -> None:
+        # Reads the flag instead of taking it as argument, so that the event ends up
+        # in the latest state regardless of the order of scheduled callbacks.
+        if self._ready_event is None:
+            return
+        if self._inference_server_ready:
+            self._ready_event.set()
+        else:
+            self._ready_event.clear()
+
+    def _get_ready_event(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._ready_event is None or self._ready_event_loop is not loop:
+            self._ready_event = asyncio.Event()
+            self._ready_event_loop = loop
+            self._sync_ready_event()
+        return self._ready_event
+
+    async def wait_for_inference_server_ready(self, timeout: float) -> bool:
+        """Waits until the inference server is ready, at most `timeout` seconds.
+
+        All waiting requests share one event, set only once
+        `watch_inference_server_readiness` confirms the server is ready, so they
+        resume together instead of each polling on its own.
+        """
+        ready_event = self._get_ready_event()
+        try:
+            await asyncio.wait_for(ready_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def watch_inference_server_readiness(
+        self,
+        probe: Callable[[], Awaitable[bool]],
+        interval_secs: float = READINESS_PROBE_INTERVAL_SECS,
+    ) -> None:
+        """Marks the inference server ready once `probe` succeeds.
+
+        Probing only happens while the server is started but not marked ready, e.g.
+        during model load or after a restart.
+        """
+        self._get_ready_event()
+        while not self._inference_server_terminated:
+            if self._inference_server_started and not self._inference_server_ready:
+                start_count = self._inference_server_start_count
+                try:
+                    # Ignore the result if the server was restarted while probing.
+                    if (
+                        await probe()
+                        and self._inference_server_started
+                        and start_count == self._inference_server_start_count
+                    ):
+                        self.mark_inference_server_ready()
+                except Exception as e:
+                    self._app_logger.debug(f"Inference server readiness probe: {e}")
+            await asyncio.sleep(interval_secs)
+
     def check_and_recover_inference_server(self, inf_env: dict):
         if (
             self.inference_server_started()
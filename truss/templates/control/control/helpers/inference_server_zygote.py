@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import signal
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import psutil
+import yaml
+from helpers.truss_patch.requirement_name_identifier import (
+    identify_requirement_name,
+    is_url_based_requirement,
+)
+
+ZYGOTE_SCRIPT = Path(__file__).parent.parent / "zygote.py"
+WAIT_INTERVAL_SECS = 0.1
+
+
+class ZygoteError(Exception):
+    pass
+
+
+class ForkedInferenceServer:
+    """Handle of an inference server process forked by the zygote.
+
+    Provides the parts of the `subprocess.Popen` interface used by
+    `InferenceServerProcessController`.
+    """
+
+    def __init__(self, zygote: "InferenceServerZygote", pid: int) -> None:
+        self._zygote = zygote
+        self.pid = pid
+        self.returncode: Optional[int] = None
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            self.returncode = self._zygote.poll(self.pid)
+        return self.returncode
+
+    def wait(self) -> int:
+        while (returncode := self.poll()) is None:
+            time.sleep(WAIT_INTERVAL_SECS)
+        return returncode
+
+    def terminate(self) -> None:
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+class InferenceServerZygote:
+    """Forks inference server processes from a process with preloaded imports.
+
+    The zygote (see `zygote.py`) is started on first use, with the python executable
+    and environment of the inference server. It imports the truss server and the
+    packages of the requirements in the truss config. Since these imports are not
+    refreshed, `reset` must be called if the installed packages or the environment
+    change. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        python_executable: str,
+        inference_server_home: str,
+        app_logger: logging.Logger,
+    ) -> None:
+        self._python_executable = python_executable
+        self._inference_server_home = str(inference_server_home)
+        self._app_logger = app_logger
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._socket: Optional[socket.socket] = None
+        self._reader: Any = None
+
+    def fork(self, argv: list[str], env: dict) -> ForkedInferenceServer:
+        with self._lock:
+            try:
+                if self._process is None or self._process.poll() is not None:
+                    self._start(env)
+                response = self._request(
+                    {
+                        "fork": {
+                            "argv": argv,
+                            "cwd": self._inference_server_home,
+                            "env": env,
+                        }
+                    }
+                )
+            except (ZygoteError, OSError) as e:
+                self._stop()
+                raise ZygoteError(f"Failed to fork inference server: {e}") from e
+        return ForkedInferenceServer(self, response["pid"])
+
+    def poll(self, pid: int) -> Optional[int]:
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                try:
+                    return self._request({"poll": pid})["returncode"]
+                except ZygoteError:
+                    pass
+        # Without the zygote, its children are reparented to init (or to this process
+        # if it runs as PID 1, then exited children must be reaped here).
+        try:
+            if psutil.Process(pid).status() != psutil.STATUS_ZOMBIE:
+                return None
+        except psutil.NoSuchProcess:
+            return -1
+        try:
+            os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            pass
+        return -1
+
+    def reset(self) -> None:
+        """Stops the zygote, the next fork starts a new one."""
+        with self._lock:
+            self._stop()
+
+    def _start(self, env: dict) -> None:
+        self._stop()
+        parent_socket, child_socket = socket.socketpair()
+        t0 = time.perf_counter()
+        try:
+            self._process = subprocess.Popen(
+                [
+                    self._python_executable,
+                    str(ZYGOTE_SCRIPT),
+                    str(child_socket.fileno()),
+                    self._inference_server_home,
+                    *self._requirement_names(),
+                ],
+                env=env,
+                cwd=self._inference_server_home,
+                pass_fds=(child_socket.fileno(),),
+            )
+        finally:
+            child_socket.close()
+        self._socket = parent_socket
+        self._reader = parent_socket.makefile("rb")
+        ready = self._receive()
+        self._app_logger.info(
+            f"Started inference server zygote in {time.perf_counter() - t0:.1f}s, "
+            f"preloaded: {', '.join(ready['preloaded'])}."
+        )
+
+    def _stop(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._socket is not None:
+            # The zygote exits once the socket is closed.
+            self._socket.close()
+            self._socket = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+
+    def _request(self, command: dict) -> dict:
+        assert self._socket is not None
+        try:
+            self._socket.sendall(json.dumps(command).encode() + b"\n")
+        except OSError as e:
+            raise ZygoteError(f"Inference server zygote is not reachable: {e}") from e
+        return self._receive()
+
+    def _receive(self) -> dict:
+        line = self._reader.readline()
+        if not line:
+            raise ZygoteError("Inference server zygote exited.")
+        return json.loads(line)
+
+    def _requirement_names(self) -> list[str]:
+        home = Path(self._inference_server_home)
+        try:
+            config = yaml.safe_load((home / "config.yaml").read_text()) or {}
+        except FileNotFoundError:
+            return []
+        requirements = list(config.get("requirements") or [])
+        if requirements_file := config.get("requirements_file"):
+            try:
+                requirements.extend((home / requirements_file).read_text().splitlines())
+            except OSError:
+                pass
+        return [
+            identify_requirement_name(req)
+            for req in requirements
+            if req.strip()
+            and not req.strip().startswith(("#", "-"))
+            and not is_url_based_requirement(req)
+        ]
@@ -35,6 +35,7 @@ class ModelContainerPatchApplier:
         uv_path: Optional[str] = None,  # Only meant for testing
     ) -> None:
         self._inference_server_home = inference_server_home
+        self._truss_config_cached: Optional[TrussConfig] = None
         self._model_module_dir = (
             self._inference_server_home / self._truss_config.model_module_dir
         )
@@ -64,7 +65,7 @@ class ModelContainerPatchApplier:
             apply_code_patch(self._model_module_dir, model_code_patch, self._app_logger)
         elif isinstance(patch.body, PythonRequirementPatch):
             py_req_patch: PythonRequirementPatch = patch.body
-            self._apply_python_requirement_patch(py_req_patch)
+            self.apply_python_requirement_patches([py_req_patch])
         elif isinstance(patch.body, SystemPackagePatch):
             raise UnsupportedPatch(
                 "System package patches are not supported for model container, please run truss push again"
@@ -86,9 +87,18 @@ class ModelContainerPatchApplier:
         else:
             raise UnsupportedPatch(f"Unknown patch type {patch.type}")
 
+    def reset_config_cache(self) -> None:
+        """Makes the next use of the config read `config.yaml` again."""
+        self._truss_config_cached = None
+
     @property
     def _truss_config(self) -> TrussConfig:
-        return TrussConfig.from_yaml(self._inference_server_home / "config.yaml")
+        # Reset by config patches and at the start of each patch request.
+        if self._truss_config_cached is None:
+            self._truss_config_cached = TrussConfig.from_yaml(
+                self._inference_server_home / "config.yaml"
+            )
+        return self._truss_config_cached
 
     @property
     def _uv_path(self) -> str:
@@ -96,47 +106,61 @@ class ModelContainerPatchApplier:
             self._uv_path_cached = _identify_uv_path()
         return self._uv_path_cached
 
-    def _apply_python_requirement_patch(
-        self, python_requirement_patch: PythonRequirementPatch
+    def apply_python_requirement_patches(
+        self, python_requirement_patches: list[PythonRequirementPatch]
     ):
-        self._app_logger.debug(
-            f"Applying python requirement patch {python_requirement_patch.to_dict()}"
-        )
-        action = python_requirement_patch.action
+        """Applies python requirement patches with a single uninstall and a single
+        install, so that requirements are resolved only once.
+
+        Removals are applied before additions and updates, like they are ordered by
+        `calc_truss_patch`.
+        """
+        to_uninstall = []
+        to_install = []
+        for python_requirement_patch in python_requirement_patches:
+            self._app_logger.debug(
+                f"Applying python requirement patch {python_requirement_patch.to_dict()}"
+            )
+            action = python_requirement_patch.action
+            if action == Action.REMOVE:
+                to_uninstall.append(python_requirement_patch.requirement)
+            elif action in [Action.ADD, Action.UPDATE]:
+                to_install.append(python_requirement_patch.requirement)
+            else:
+                raise ValueError(f"Unknown python requirement patch action {action}")
 
-        if action == Action.REMOVE:
+        if to_uninstall:
             subprocess.run(
                 [
                     self._uv_path,
                     "pip",
                     "uninstall",
-                    python_requirement_patch.requirement,
+                    *to_uninstall,
                     "--python",
                     self._python_executable,
                 ],
                 check=True,
             )
-        elif action in [Action.ADD, Action.UPDATE]:
+        if to_install:
             subprocess.run(
                 [
                     self._uv_path,
                     "pip",
                     "install",
-                    python_requirement_patch.requirement,
+                    *to_install,
                     "--upgrade",
                     "--python",
                     self._python_executable,
                 ],
                 check=True,
             )
-        else:
-            raise ValueError(f"Unknown python requirement patch action {action}")
 
     def _apply_config_patch(self, config_patch: ConfigPatch):
         self._app_logger.debug(f"Applying config patch {config_patch.to_dict()}")
         TrussConfig.from_dict(config_patch.config).write_to_yaml_file(
             Path(self._inference_server_home / config_patch.path)
         )
+        self.reset_config_cache()
 
     def _apply_env_var_patch(self, env_var_patch: EnvVarPatch, inf_env: dict):
         self._app_logger.debug(
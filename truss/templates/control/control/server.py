@@ -8,6 +8,11 @@ from application import create_app
 
 CONTROL_SERVER_PORT = int(os.environ.get("CONTROL_SERVER_PORT", "8080"))
 INFERENCE_SERVER_PORT = int(os.environ.get("INFERENCE_SERVER_PORT", "8090"))
+# Restart the inference server by forking from a process with preloaded imports.
+INFERENCE_SERVER_ZYGOTE = os.environ.get("INFERENCE_SERVER_ZYGOTE", "").lower() in (
+    "1",
+    "true",
+)
 
 
 def _identify_python_executable_path() -> str:
@@ -24,12 +29,14 @@ class ControlServer:
         inf_serv_home: str,
         control_server_port: int,
         inference_server_port: int,
+        inference_server_zygote: bool = False,
     ):
         super().__init__()
         self._python_executable_path = python_executable_path
         self._inf_serv_home = inf_serv_home
         self._control_server_port = control_server_port
         self._inference_server_port = inference_server_port
+        self._inference_server_zygote = inference_server_zygote
 
         config_path = pathlib.Path(self._inf_serv_home) / "config.yaml"
         if config_path.exists():
@@ -48,6 +55,7 @@ class ControlServer:
                 "control_server_host": "0.0.0.0",
                 "control_server_port": self._control_server_port,
                 "inference_server_port": self._inference_server_port,
+                "inference_server_zygote": self._inference_server_zygote,
             }
         )
 
@@ -86,5 +94,6 @@ if __name__ == "__main__":
         inf_serv_home=os.environ["APP_HOME"],
         control_server_port=CONTROL_SERVER_PORT,
         inference_server_port=INFERENCE_SERVER_PORT,
+        inference_server_zygote=INFERENCE_SERVER_ZYGOTE,
     )
     control_server.run()
@@ -0,0 +1,142 @@
+"""Fork server for the inference server, run with the inference server's python.
+
+Imports the truss server and the packages of the model's requirements once, then
+forks a new inference server process from this warm state for each (re)start, so that
+restarts only pay for importing and loading the model itself.
+
+Usage: zygote.py <socket fd> <inference server home> [requirement name ...]
+
+Commands and responses are JSON lines on the socket:
+
+* `{"fork": {"argv": [...], "cwd": ..., "env": {...}}}` -> `{"pid": ...}`
+* `{"poll": pid}` -> `{"returncode": ...}`, `null` while the process runs.
+
+The zygote exits when the socket is closed. Only the standard library may be used
+here, since this runs in the inference server's environment.
+"""
+
+import importlib
+import importlib.metadata
+import json
+import os
+import re
+import runpy
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Optional
+
+# Always preloaded, imports the server framework (fastapi, uvicorn, pydantic, ...).
+SERVER_MODULES = ["truss_server"]
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _modules_for(requirement_names: list[str]) -> list[str]:
+    """Top-level modules of the given distributions."""
+    modules_by_distribution: dict[str, list[str]] = {}
+    packages_distributions = getattr(importlib.metadata, "packages_distributions", dict)
+    for module, distributions in packages_distributions().items():
+        for distribution in distributions:
+            modules_by_distribution.setdefault(_normalize(distribution), []).append(
+                module
+            )
+    modules = []
+    for name in requirement_names:
+        normalized = _normalize(name)
+        modules.extend(
+            sorted(
+                modules_by_distribution.get(normalized, [normalized.replace("-", "_")])
+            )
+        )
+    return [m for m in modules if m.isidentifier() and not m.startswith("_")]
+
+
+def _preload(modules: list[str]) -> list[str]:
+    preloaded = []
+    for module in modules:
+        try:
+            importlib.import_module(module)
+            preloaded.append(module)
+        except BaseException as e:
+            print(f"Zygote: not preloading `{module}`: {e!r}.", file=sys.stderr)
+    return preloaded
+
+
+def _run_child(
+    sock: socket.socket, argv: list[str], cwd: str, env: dict, base_path: list[str]
+) -> None:
+    sock.close()
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    sys.argv = list(argv)
+    # Like running the script directly.
+    sys.path[:] = [os.path.dirname(os.path.abspath(argv[0]))] + base_path
+    exit_code = 0
+    try:
+        runpy.run_path(argv[0], run_name="__main__")
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            exit_code = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)
+
+
+def _poll(pid: int, exited: dict[int, int]) -> Optional[int]:
+    if pid in exited:
+        return exited[pid]
+    try:
+        waited_pid, status = os.waitpid(pid, os.WNOHANG)
+    except ChildProcessError:
+        return -1
+    if waited_pid == 0:
+        return None
+    exited[pid] = os.waitstatus_to_exitcode(status)
+    return exited[pid]
+
+
+def main() -> None:
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    # Drop this script's directory, which would shadow the inference server's modules
+    # and leak into the children, and import as if running from the server's home.
+    base_path = sys.path[1:]
+    sys.path[:] = [sys.argv[2]] + base_path
+    t0 = time.perf_counter()
+    preloaded = _preload(SERVER_MODULES + _modules_for(sys.argv[3:]))
+    reader = sock.makefile("rb")
+
+    def send(message: dict) -> None:
+        sock.sendall(json.dumps(message).encode() + b"\n")
+
+    send({"preloaded": preloaded, "duration_secs": time.perf_counter() - t0})
+    exited: dict[int, int] = {}
+    for line in reader:
+        command = json.loads(line)
+        if "fork" in command:
+            fork = command["fork"]
+            pid = os.fork()
+            if pid == 0:
+                reader.close()
+                _run_child(sock, fork["argv"], fork["cwd"], fork["env"], base_path)
+            send({"pid": pid})
+        elif "poll" in command:
+            send({"returncode": _poll(command["poll"], exited)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import asyncio
+import contextvars
+import dataclasses
+import heapq
+import itertools
+import math
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from common import errors
+from common.concurrency import ConcurrencyLimiter
+from opentelemetry import trace
+
+BatchFn = Callable[[list[Any], list[trace.Span]], Awaitable[list[Any]]]
+
+
+@dataclasses.dataclass
+class _PendingItem:
+    inputs: Any
+    span: trace.Span
+    future: asyncio.Future
+
+
+def _expire(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_exception(
+            errors.DeadlineExceeded("Deadline passed while waiting for a batch.")
+        )
+
+
+class DynamicBatcher:
+    """Gathers concurrently submitted items into batches for a single model call.
+
+    A batch is dispatched as soon as `max_batch_size` items are queued or
+    `max_wait_ms` passed since the first item of the batch was picked up. Collection
+    of a batch only starts once `limiter` has a free slot, so while the model is
+    busy, requests accumulate and the next batch is formed from them right away.
+
+    Like the predict concurrency limiter, queued items are picked by descending
+    `priority`, then by earliest `deadline`, then in arrival order. Items whose
+    `deadline` passes before they are picked fail with `DeadlineExceeded`.
+
+    `batch_fn` must return one result per input. A result that is an exception
+    instance is raised only to the caller of the corresponding item, an exception
+    raised by `batch_fn` itself is raised to all callers of the batch.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        max_batch_size: int,
+        max_wait_ms: float,
+        limiter: ConcurrencyLimiter,
+    ) -> None:
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait_secs = max_wait_ms / 1000
+        self._limiter = limiter
+        # Heap of (-priority, deadline, arrival, item).
+        self._pending: list[tuple[int, float, int, _PendingItem]] = []
+        self._arrivals = itertools.count()
+        self._item_queued: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        inputs: Any,
+        span: trace.Span,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """Returns the result for `inputs`, `deadline` is `time.monotonic()` based."""
+        if deadline is not None and time.monotonic() >= deadline:
+            raise errors.DeadlineExceeded("Deadline passed before the request started.")
+        item_queued = self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(
+            self._pending,
+            (
+                -priority,
+                math.inf if deadline is None else deadline,
+                next(self._arrivals),
+                _PendingItem(inputs=inputs, span=span, future=future),
+            ),
+        )
+        item_queued.set()
+        timer = (
+            loop.call_later(deadline - time.monotonic(), _expire, future)
+            if deadline is not None
+            else None
+        )
+        # If the awaiting request is cancelled or expires, the future is done and
+        # the item is skipped when the next batch is collected.
+        try:
+            return await future
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def _ensure_worker(self) -> asyncio.Event:
+        if self._item_queued is None:
+            self._item_queued = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            # The worker outlives the request that happens to start it, so it must
+            # not inherit that request's context (request ID, active spans).
+            loop = asyncio.get_running_loop()
+            self._worker = contextvars.Context().run(loop.create_task, self._run())
+        return self._item_queued
+
+    async def _run(self) -> None:
+        while True:
+            # Requests are queued here already, so the limiter must not shed.
+            acquired_at = await self._limiter.acquire(shed=False)
+            try:
+                batch = await self._collect_batch()
+            except BaseException:
+                self._limiter.release(acquired_at)
+                raise
+            task = asyncio.create_task(self._run_batch(batch, acquired_at))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _next_item(
+        self, timeout: Optional[float] = None
+    ) -> Optional[_PendingItem]:
+        """Pops the next queued item, `None` if there is none within `timeout`."""
+        assert self._item_queued is not None
+        while not self._pending:
+            self._item_queued.clear()
+            if timeout is None:
+                await self._item_queued.wait()
+                continue
+            if timeout <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._item_queued.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        return heapq.heappop(self._pending)[-1]
+
+    async def _collect_batch(self) -> list[_PendingItem]:
+        batch: list[_PendingItem] = []
+        while not batch:
+            item = await self._next_item()
+            if item is not None and not item.future.done():
+                batch.append(item)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_wait_secs
+        while len(batch) < self._max_batch_size:
+            item = await self._next_item(timeout=deadline - loop.time())
+            if item is None:
+                break
+            if not item.future.done():
+                batch.append(item)
+        return batch
+
+    async def _run_batch(self, batch: list[_PendingItem], acquired_at: float) -> None:
+        try:
+            results = await self._batch_fn(
+                [item.inputs for item in batch], [item.span for item in batch]
+            )
+        except Exception as e:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+        else:
+            for item, result in zip(batch, results):
+                if item.future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    item.future.set_exception(result)
+                else:
+                    item.future.set_result(result)
+        finally:
+            self._limiter.release(acquired_at)
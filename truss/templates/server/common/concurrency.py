@@ -0,0 +1,325 @@
+import abc
+import asyncio
+import functools
+import heapq
+import itertools
+import math
+import time
+from typing import Awaitable, Callable, NamedTuple, Optional, Union
+
+from common import errors
+from prometheus_client import Counter, Gauge, Histogram
+
+# Weight of a new sample in the smoothed predict latency.
+_LATENCY_SMOOTHING = 0.2
+# Weight of a new sample in the baseline latency, if it is above the baseline. Lets
+# the baseline follow lasting latency increases (e.g. longer inputs) slowly, a lower
+# latency replaces the baseline immediately.
+_BASELINE_DRIFT = 0.01
+# Interval at which queued requests check whether their client is still connected.
+_DISCONNECT_POLL_SECS = 0.5
+
+
+def _expire(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_exception(
+            errors.DeadlineExceeded("Deadline passed while waiting for a predict slot.")
+        )
+
+
+class _SlotQueue(abc.ABC):
+    """Concurrency slots, handed to waiting requests by priority.
+
+    Waiters are served by descending `priority`, then by earliest `deadline`, then in
+    arrival order. Not thread-safe, must be used from the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight = 0
+        # Heap of (-priority, deadline, arrival, waiter).
+        self._waiters: list[tuple[int, float, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+    @property
+    @abc.abstractmethod
+    def limit(self) -> int:
+        """Maximal number of slots in use at the same time."""
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(
+        self,
+        shed: bool = True,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        check_disconnected: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> float:
+        """Waits for a free slot and returns the time it was acquired.
+
+        With `shed=False`, the request is queued irrespective of the expected wait.
+        `deadline` is a `time.monotonic()` timestamp, `DeadlineExceeded` is raised if
+        it passes before a slot is acquired. While waiting, `check_disconnected` is
+        awaited periodically, raising from it abandons the wait.
+        """
+        if deadline is not None and time.monotonic() >= deadline:
+            raise errors.DeadlineExceeded("Deadline passed before the request started.")
+        if self._in_flight < self.limit and not self._waiters:
+            self._take_slot()
+            return time.monotonic()
+        if shed:
+            self._maybe_shed()
+        return await self._wait(priority, deadline, check_disconnected)
+
+    def release(self, acquired_at: float) -> None:
+        self._release_slot()
+
+    async def _wait(
+        self,
+        priority: int,
+        deadline: Optional[float],
+        check_disconnected: Optional[Callable[[], Awaitable[None]]],
+    ) -> float:
+        queued_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        entry = (
+            -priority,
+            math.inf if deadline is None else deadline,
+            next(self._arrivals),
+            waiter,
+        )
+        heapq.heappush(self._waiters, entry)
+        self._publish()
+        timer = (
+            loop.call_later(deadline - queued_at, _expire, waiter)
+            if deadline is not None
+            else None
+        )
+        try:
+            if check_disconnected is None:
+                await waiter
+            else:
+                while not waiter.done():
+                    await asyncio.wait((waiter,), timeout=_DISCONNECT_POLL_SECS)
+                    if not waiter.done():
+                        await check_disconnected()
+                waiter.result()
+        except BaseException:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # The slot was handed over concurrently with the exception.
+                self._release_slot()
+            else:
+                self._remove_waiter(entry)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        acquired_at = time.monotonic()
+        self._observe_queue_wait(acquired_at - queued_at)
+        return acquired_at
+
+    def _remove_waiter(self, entry: tuple[int, float, int, asyncio.Future]) -> None:
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self._waiters)
+        self._publish()
+
+    def _take_slot(self) -> None:
+        self._in_flight += 1
+        self._publish()
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.limit:
+            waiter = heapq.heappop(self._waiters)[-1]
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+        self._publish()
+
+    def _maybe_shed(self) -> None:
+        pass
+
+    def _observe_queue_wait(self, secs: float) -> None:
+        pass
+
+    def _publish(self) -> None:
+        pass
+
+
+class FixedConcurrencyLimiter(_SlotQueue):
+    """A fixed number of concurrent predict slots (`predict_concurrency`)."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__()
+        self._limit = limit
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+
+class _Metrics(NamedTuple):
+    limit: Gauge
+    in_flight: Gauge
+    queue_depth: Gauge
+    queue_wait: Histogram
+    shed: Counter
+
+
+@functools.lru_cache(maxsize=None)
+def _metrics() -> _Metrics:
+    # Created on first use, so that they are only exported if adaptive concurrency is
+    # enabled.
+    return _Metrics(
+        limit=Gauge(
+            "truss_predict_concurrency_limit", "Current predict concurrency limit."
+        ),
+        in_flight=Gauge(
+            "truss_predict_concurrency_in_flight", "Predict requests holding a slot."
+        ),
+        queue_depth=Gauge(
+            "truss_predict_queue_depth", "Predict requests waiting for a slot."
+        ),
+        queue_wait=Histogram(
+            "truss_predict_queue_wait_seconds",
+            "Time predict requests waited for a slot.",
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+        ),
+        shed=Counter(
+            "truss_predict_requests_shed",
+            "Predict requests rejected because the expected wait was too long.",
+        ),
+    )
+
+
+class AdaptiveConcurrencyLimiter(_SlotQueue):
+    """Predict slots with a limit that adapts to the observed latency (AIMD).
+
+    The latency of a request is measured from acquiring to releasing its slot. While
+    latency stays within `latency_tolerance` times the baseline (the lowest observed
+    latency, slowly following lasting increases) and the slots are in use, the limit
+    grows by about one per `limit` completed requests. If latency exceeds it, the
+    limit is multiplied by `backoff_ratio`, at most once per smoothed latency, so that
+    requests started before the decrease do not decrease it again.
+
+    If `max_queue_wait_secs` is set, `acquire` raises `ConcurrencyLimitExceeded`
+    instead of queueing if the expected wait, estimated from the queue depth, limit
+    and smoothed latency, exceeds it.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_tolerance: float,
+        backoff_ratio: float,
+        max_queue_wait_secs: Optional[float] = None,
+    ) -> None:
+        super().__init__()
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._latency_tolerance = latency_tolerance
+        self._backoff_ratio = backoff_ratio
+        self._max_queue_wait_secs = max_queue_wait_secs
+        self._baseline_latency: Optional[float] = None
+        self._smoothed_latency: Optional[float] = None
+        self._last_decrease_at = 0.0
+        self._metrics = _metrics()
+        self._metrics.limit.set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def expected_wait_secs(self) -> Optional[float]:
+        """Estimated wait for a slot of a request queued now, `None` if unknown."""
+        if self._in_flight < self.limit and not self._waiters:
+            return 0.0
+        if self._smoothed_latency is None:
+            return None
+        return (len(self._waiters) + 1) * self._smoothed_latency / self.limit
+
+    def release(self, acquired_at: float) -> None:
+        now = time.monotonic()
+        self._update_limit(now - acquired_at, now)
+        self._release_slot()
+
+    def _maybe_shed(self) -> None:
+        if self._max_queue_wait_secs is None:
+            return
+        expected_wait_secs = self.expected_wait_secs()
+        if (
+            expected_wait_secs is not None
+            and expected_wait_secs > self._max_queue_wait_secs
+        ):
+            self._metrics.shed.inc()
+            raise errors.ConcurrencyLimitExceeded(
+                f"Expected wait for a free predict slot ({expected_wait_secs:.2f}s) "
+                f"exceeds {self._max_queue_wait_secs:.2f}s."
+            )
+
+    def _observe_queue_wait(self, secs: float) -> None:
+        self._metrics.queue_wait.observe(secs)
+
+    def _publish(self) -> None:
+        self._metrics.in_flight.set(self._in_flight)
+        self._metrics.queue_depth.set(len(self._waiters))
+
+    def _update_limit(self, latency: float, now: float) -> None:
+        if self._baseline_latency is None or latency < self._baseline_latency:
+            self._baseline_latency = latency
+        else:
+            self._baseline_latency += (
+                latency - self._baseline_latency
+            ) * _BASELINE_DRIFT
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency
+        else:
+            self._smoothed_latency += (
+                latency - self._smoothed_latency
+            ) * _LATENCY_SMOOTHING
+
+        if latency > self._baseline_latency * self._latency_tolerance:
+            if now - self._last_decrease_at > self._smoothed_latency:
+                self._limit = max(self._limit * self._backoff_ratio, self._min_limit)
+                self._last_decrease_at = now
+        elif self._in_flight >= self._limit / 2:
+            # Only grow if the current limit is actually used.
+            self._limit = min(self._limit + 1 / self._limit, self._max_limit)
+        self._metrics.limit.set(self.limit)
+
+
+ConcurrencyLimiter = Union[FixedConcurrencyLimiter, AdaptiveConcurrencyLimiter]
+
+
+def make_predict_limiter(runtime: dict, default_concurrency: int) -> ConcurrencyLimiter:
+    """Creates the limiter for `predict` from the `runtime` section of the config."""
+    predict_concurrency = runtime.get("predict_concurrency", default_concurrency)
+    adaptive = runtime.get("adaptive_concurrency", {})
+    if not adaptive.get("enabled", False):
+        return FixedConcurrencyLimiter(predict_concurrency)
+
+    min_limit = adaptive.get("min_concurrency", 1)
+    max_queue_wait_ms = adaptive.get("max_queue_wait_ms")
+    return AdaptiveConcurrencyLimiter(
+        initial_limit=predict_concurrency,
+        min_limit=min_limit,
+        max_limit=adaptive.get("max_concurrency")
+        or max(predict_concurrency, min_limit),
+        latency_tolerance=adaptive.get("latency_tolerance", 2.0),
+        backoff_ratio=adaptive.get("backoff_ratio", 0.9),
+        max_queue_wait_secs=(
+            max_queue_wait_ms / 1000 if max_queue_wait_ms is not None else None
+        ),
+    )
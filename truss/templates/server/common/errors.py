@@ -57,6 +57,14 @@ class ModelDefinitionError(TypeError):
     """When the user-defined truss model does not meet the contract."""
 
 
+class ConcurrencyLimitExceeded(Exception):
+    """When a request is shed because it would wait too long for a predict slot."""
+
+
+class DeadlineExceeded(Exception):
+    """When the deadline of a request passes before it gets a predict slot."""
+
+
 def _make_baseten_error_headers(error_code: int) -> Mapping[str, str]:
     return {
         "X-BASETEN-ERROR-SOURCE": f"{_TRUSS_SERVER_SERVICE_ID:02}",
@@ -108,6 +116,14 @@ async def exception_handler(_: fastapi.Request, exc: Exception) -> fastapi.Respo
         return _make_baseten_response(
             HTTPStatus.NOT_FOUND.value, exc, _BASETEN_CLIENT_ERROR_CODE
         )
+    if isinstance(exc, ConcurrencyLimitExceeded):
+        return _make_baseten_response(
+            HTTPStatus.TOO_MANY_REQUESTS.value, exc, _BASETEN_DOWNSTREAM_ERROR_CODE
+        )
+    if isinstance(exc, DeadlineExceeded):
+        return _make_baseten_response(
+            HTTPStatus.GATEWAY_TIMEOUT.value, exc, _BASETEN_DOWNSTREAM_ERROR_CODE
+        )
     if isinstance(exc, fastapi.HTTPException):
         # This is a pass through, but additionally adds our custom error headers.
         return _make_baseten_response(
@@ -130,6 +146,8 @@ HANDLED_EXCEPTIONS = {
     ModelDefinitionError,
     fastapi.HTTPException,
     ModelMethodNotImplemented,
+    ConcurrencyLimitExceeded,
+    DeadlineExceeded,
 }
 
 
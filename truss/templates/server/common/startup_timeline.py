@@ -0,0 +1,47 @@
+import contextlib
+import threading
+import time
+from typing import Iterator, Optional
+
+import psutil
+
+
+class StartupTimeline:
+    """Records how long the phases of the model startup take.
+
+    Phases are recorded in the order they complete, e.g. `setup` (secrets, patches,
+    extensions), `import` (model module), `init` (model `__init__`) and `load`
+    (model `load`). The time until the model is first ready is measured from the
+    start of the process, so that it includes interpreter and server startup.
+
+    Served as JSON by `/v1/models/{model_name}/startup`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._process_started_at = psutil.Process().create_time()
+        self._phases: dict[str, float] = {}
+        self._ready_after_secs: Optional[float] = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Records the duration of the block, if it does not raise."""
+        start = time.perf_counter()
+        yield
+        duration = time.perf_counter() - start
+        with self._lock:
+            self._phases[name] = duration
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            if self._ready_after_secs is not None:
+                return
+            self._ready_after_secs = time.time() - self._process_started_at
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "process_started_at": self._process_started_at,
+                "phases": dict(self._phases),
+                "ready_after_secs": self._ready_after_secs,
+            }
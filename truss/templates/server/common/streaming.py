@@ -0,0 +1,287 @@
+import asyncio
+import collections
+import inspect
+import threading
+import time
+import weakref
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+    Optional,
+    Union,
+    cast,
+)
+
+from anyio import to_thread
+
+# Polling interval while waiting for more chunks to coalesce.
+COALESCE_POLL_INTERVAL_SECS = 0.001
+
+# Keeps references to producer tasks, the event loop only holds weak ones.
+_producer_tasks: set[asyncio.Task] = set()
+
+
+def _chunk_size(chunk: Any) -> int:
+    if isinstance(chunk, (bytes, bytearray, memoryview, str)):
+        return len(chunk)
+    return 0
+
+
+class StreamBuffer:
+    """Buffer between a producing generator and the response that consumes it.
+
+    Chunks can be added from the event loop or from a producer thread. The consumer
+    is woken up at most once per batch of chunks added in between two iterations of
+    the event loop and takes all buffered chunks at once, merging consecutive `str` or
+    `bytes` chunks up to `coalesce_max_bytes`.
+
+    If `max_buffer_bytes` is set, producers wait while that many bytes are buffered.
+    Once the consumer is closed, `put` returns `False` so the producer can stop.
+    """
+
+    def __init__(
+        self,
+        coalesce_max_bytes: int = 0,
+        coalesce_max_wait_ms: float = 0.0,
+        max_buffer_bytes: Optional[int] = None,
+    ) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._coalesce_max_bytes = coalesce_max_bytes
+        self._coalesce_max_wait_secs = coalesce_max_wait_ms / 1000
+        self._max_buffer_bytes = max_buffer_bytes
+        self._lock = threading.Lock()
+        self._space_available = threading.Condition(self._lock)
+        self._chunks: collections.deque = collections.deque()
+        self._buffered_bytes = 0
+        self._producer_done = False
+        self._consumer_closed = False
+        self._wakeup_scheduled = False
+        self._data_event = asyncio.Event()
+        self._async_space_event = asyncio.Event()
+
+    def _has_space(self) -> bool:
+        return (
+            self._max_buffer_bytes is None
+            or self._buffered_bytes < self._max_buffer_bytes
+            or not self._chunks
+        )
+
+    def _schedule_wakeup(self, in_loop: bool) -> None:
+        # Called with lock held.
+        if self._wakeup_scheduled:
+            return
+        self._wakeup_scheduled = True
+        if in_loop:
+            self._data_event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._data_event.set)
+
+    def _append(self, chunk: Any, in_loop: bool) -> None:
+        # Called with lock held.
+        self._chunks.append(chunk)
+        self._buffered_bytes += _chunk_size(chunk)
+        self._schedule_wakeup(in_loop)
+
+    async def put(self, chunk: Any) -> bool:
+        """Adds a chunk from the event loop, waiting for space in bounded mode."""
+        while True:
+            with self._lock:
+                if self._consumer_closed:
+                    return False
+                if self._has_space():
+                    self._append(chunk, in_loop=True)
+                    return True
+                self._async_space_event.clear()
+            await self._async_space_event.wait()
+
+    def put_threadsafe(self, chunk: Any) -> bool:
+        """Adds a chunk from a producer thread, blocking for space in bounded mode."""
+        with self._lock:
+            while not self._consumer_closed and not self._has_space():
+                self._space_available.wait()
+            if self._consumer_closed:
+                return False
+            self._append(chunk, in_loop=False)
+            return True
+
+    def close_producer(self, in_loop: bool = True) -> None:
+        with self._lock:
+            self._producer_done = True
+            self._schedule_wakeup(in_loop)
+
+    def close_consumer(self) -> None:
+        """Drops buffered chunks and stops producers. Can be called from any thread."""
+        with self._lock:
+            self._consumer_closed = True
+            self._chunks.clear()
+            self._buffered_bytes = 0
+            self._space_available.notify_all()
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._async_space_event.set()
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._async_space_event.set)
+        except RuntimeError:  # Event loop already closed.
+            pass
+
+    def close_consumer_when_collected(self, consumer: object) -> None:
+        """Closes the consumer once `consumer` is garbage collected.
+
+        Covers responses that are dropped without ever being iterated, e.g. because
+        the client disconnected before the response started. `iter_chunks` then never
+        runs, and bounded producers would wait for space forever.
+        """
+        weakref.finalize(consumer, self.close_consumer)
+
+    def _take_all(self) -> tuple[list[Any], bool]:
+        with self._lock:
+            chunks = list(self._chunks)
+            self._chunks.clear()
+            self._buffered_bytes = 0
+            self._wakeup_scheduled = False
+            self._data_event.clear()
+            producer_done = self._producer_done
+            self._space_available.notify_all()
+        self._async_space_event.set()
+        return chunks, producer_done
+
+    def _coalesce(self, chunks: list[Any]) -> list[Any]:
+        if self._coalesce_max_bytes <= 0 or len(chunks) < 2:
+            return chunks
+        merged: list[Any] = []
+        pending: list[Any] = []
+        pending_size = 0
+
+        def flush() -> None:
+            nonlocal pending_size
+            if not pending:
+                return
+            if len(pending) == 1:
+                merged.append(pending[0])
+            elif isinstance(pending[0], str):
+                merged.append("".join(pending))
+            else:
+                merged.append(b"".join(pending))
+            pending.clear()
+            pending_size = 0
+
+        for chunk in chunks:
+            size = _chunk_size(chunk)
+            mergeable = isinstance(chunk, (bytes, str))
+            if (
+                not mergeable
+                or (pending and type(chunk) is not type(pending[0]))
+                or pending_size + size > self._coalesce_max_bytes
+            ):
+                flush()
+            if mergeable:
+                pending.append(chunk)
+                pending_size += size
+            else:
+                merged.append(chunk)
+        flush()
+        return merged
+
+    async def iter_chunks(self, read_timeout: float) -> AsyncGenerator[Any, None]:
+        """Yields buffered chunks until the producer is done.
+
+        Raises `asyncio.TimeoutError` if no chunk arrives for `read_timeout` seconds.
+        """
+        try:
+            while True:
+                await asyncio.wait_for(self._data_event.wait(), timeout=read_timeout)
+                if self._coalesce_max_bytes > 0 and self._coalesce_max_wait_secs > 0:
+                    await self._wait_for_coalescing()
+                chunks, producer_done = self._take_all()
+                for chunk in self._coalesce(chunks):
+                    yield chunk
+                if producer_done:
+                    # Chunks added after the producer is done are not possible.
+                    return
+        finally:
+            self.close_consumer()
+
+    async def _wait_for_coalescing(self) -> None:
+        deadline = time.monotonic() + self._coalesce_max_wait_secs
+        while True:
+            with self._lock:
+                if (
+                    self._producer_done
+                    or self._buffered_bytes >= self._coalesce_max_bytes
+                ):
+                    return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, COALESCE_POLL_INTERVAL_SECS))
+
+
+def _produce_sync(
+    generator: Generator[Any, None, None],
+    buffer: StreamBuffer,
+    on_error: Callable[[Exception], None],
+) -> None:
+    try:
+        for chunk in generator:
+            if not buffer.put_threadsafe(chunk):
+                generator.close()
+                return
+    except Exception as e:
+        on_error(e)
+    finally:
+        buffer.close_producer(in_loop=False)
+
+
+async def _produce_async(
+    generator: AsyncGenerator[Any, None],
+    buffer: StreamBuffer,
+    on_error: Callable[[Exception], None],
+) -> None:
+    try:
+        async for chunk in generator:
+            if not await buffer.put(chunk):
+                await generator.aclose()
+                return
+    except Exception as e:
+        on_error(e)
+    finally:
+        buffer.close_producer()
+
+
+def start_producer(
+    generator: Union[Generator[Any, None, None], AsyncGenerator[Any, None]],
+    buffer: StreamBuffer,
+    on_error: Callable[[Exception], None],
+    on_done: Callable[[], None],
+) -> None:
+    """Runs `generator` in the background, writing its chunks to `buffer`.
+
+    Async generators run as task on the event loop. Sync generators run on one
+    worker thread for their whole lifetime, instead of a thread hop per chunk. Like
+    other sync model code, they use the default `to_thread` limiter, so they wait for
+    a free thread if all are busy. The event loop is only woken up once for all
+    chunks produced in between two of its iterations.
+
+    `on_error` is called from within the `except` block (on the worker thread for
+    sync generators). `on_done` is called on the event loop once the generator is
+    exhausted, failed or stopped because the consumer was closed.
+    """
+    coro: Awaitable[None]
+    if inspect.isasyncgen(generator):
+        coro = _produce_async(generator, buffer, on_error)
+    else:
+        # Runs in the caller's context (tracing, request ID), copied by the task.
+        coro = to_thread.run_sync(
+            _produce_sync, cast(Generator[Any, None, None], generator), buffer, on_error
+        )
+    task = asyncio.create_task(coro)
+    _producer_tasks.add(task)
+    task.add_done_callback(_producer_tasks.discard)
+    task.add_done_callback(lambda _: on_done())
@@ -1,5 +1,4 @@
 import contextlib
-import json
 import logging
 import os
 import pathlib
@@ -11,6 +10,7 @@ import opentelemetry.exporter.otlp.proto.http.trace_exporter as oltp_exporter
 import opentelemetry.sdk.resources as resources
 import opentelemetry.sdk.trace as sdk_trace
 import opentelemetry.sdk.trace.export as trace_export
+import opentelemetry.sdk.trace.sampling as sampling
 from opentelemetry import context, trace
 from shared import secrets_resolver
 
@@ -26,10 +26,20 @@ HONEYCOMB_DATASET = "HONEYCOMB_DATASET"
 HONEYCOMB_API_KEY = "HONEYCOMB_API_KEY"
 
 DEFAULT_ENABLE_TRACING_DATA = False  # This should be in sync with truss_config.py.
+DEFAULT_TRACING_SAMPLE_RATIO = 1.0  # This should be in sync with truss_config.py.
+# Spans are written to the NDJSON file in batches from a background thread, at
+# least this often. Spans are dropped if more than `NDJSON_MAX_QUEUE_SIZE` are
+# pending.
+NDJSON_FLUSH_INTERVAL_MS = 1000
+NDJSON_MAX_QUEUE_SIZE = 8192
 
 
 class JSONFileExporter(trace_export.SpanExporter):
-    """Writes spans to newline-delimited JSON file for debugging / testing."""
+    """Writes spans to newline-delimited JSON file for debugging / testing.
+
+    Writes each batch of spans at once, use with a `BatchSpanProcessor` to keep file
+    IO off the request path.
+    """
 
     def __init__(self, file_path: pathlib.Path):
         self._file = file_path.open("a")
@@ -37,10 +47,8 @@ class JSONFileExporter(trace_export.SpanExporter):
     def export(
         self, spans: Sequence[sdk_trace.ReadableSpan]
     ) -> trace_export.SpanExportResult:
-        for span in spans:
-            # Get rid of newlines and whitespace.
-            self._file.write(json.dumps(json.loads(span.to_json())))
-            self._file.write("\n")
+        # Without indentation, the JSON of a span does not contain newlines.
+        self._file.write("".join(f"{span.to_json(indent=None)}\n" for span in spans))
         self._file.flush()
         return trace_export.SpanExportResult.SUCCESS
 
@@ -62,6 +70,9 @@ def get_truss_tracer(secrets: secrets_resolver.Secrets, config) -> trace.Tracer:
     enable_tracing_data = config.get("runtime", {}).get(
         "enable_tracing_data", DEFAULT_ENABLE_TRACING_DATA
     )
+    sample_ratio = config.get("runtime", {}).get(
+        "tracing_sample_ratio", DEFAULT_TRACING_SAMPLE_RATIO
+    )
 
     global _truss_tracer
     if _truss_tracer:
@@ -79,7 +90,11 @@ def get_truss_tracer(secrets: secrets_resolver.Secrets, config) -> trace.Tracer:
         if enable_tracing_data:
             logger.info(f"Exporting trace data to file `{tracing_log_file}`.")
         json_file_exporter = JSONFileExporter(pathlib.Path(tracing_log_file))
-        file_processor = sdk_trace.export.SimpleSpanProcessor(json_file_exporter)
+        file_processor = sdk_trace.export.BatchSpanProcessor(
+            json_file_exporter,
+            max_queue_size=NDJSON_MAX_QUEUE_SIZE,
+            schedule_delay_millis=NDJSON_FLUSH_INTERVAL_MS,
+        )
         span_processors.append(file_processor)
 
     if (
@@ -100,7 +115,13 @@ def get_truss_tracer(secrets: secrets_resolver.Secrets, config) -> trace.Tracer:
     if span_processors and enable_tracing_data:
         logger.info("Instantiating truss tracer.")
         resource = resources.Resource.create({resources.SERVICE_NAME: "truss-server"})
-        trace_provider = sdk_trace.TracerProvider(resource=resource)
+        # Otherwise the SDK default, which can be configured by `OTEL_TRACES_SAMPLER`.
+        sampler = (
+            sampling.ParentBased(sampling.TraceIdRatioBased(sample_ratio))
+            if sample_ratio < 1
+            else None
+        )
+        trace_provider = sdk_trace.TracerProvider(resource=resource, sampler=sampler)
         for sp in span_processors:
             trace_provider.add_span_processor(sp)
         tracer = trace_provider.get_tracer("truss_server")
@@ -6,44 +6,64 @@ import importlib.util
 import inspect
 import json
 import logging
+import math
 import os
 import pathlib
 import sys
+import tempfile
 import time
 import weakref
-from collections.abc import AsyncGenerator, Awaitable, Generator
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Generator,
+    Sequence,
+)
 from contextlib import asynccontextmanager
-from functools import cached_property
+from functools import cached_property, partial
 from multiprocessing import Lock
 from pathlib import Path
 from threading import Thread
-from typing import Any, Callable, Optional, Union, cast
+from types import ModuleType
+from typing import IO, Any, BinaryIO, Callable, Optional, Union, cast, get_origin
 
 import opentelemetry.sdk.trace as sdk_trace
 import pydantic
 import starlette.requests
 import starlette.responses
-from anyio import Semaphore, to_thread
-from common import errors, tracing
+from anyio import to_thread
+from common import errors, phase_metrics, tracing
+from common.batching import DynamicBatcher
+from common.concurrency import ConcurrencyLimiter, make_predict_limiter
 from common.patches import apply_patches
 from common.retry import retry
 from common.schema import TrussSchema
+from common.startup_timeline import StartupTimeline
+from common.streaming import StreamBuffer, start_producer
 from fastapi import HTTPException, WebSocket
 from opentelemetry import trace
 from shared import dynamic_config_resolver, serialization
 from shared.lazy_data_resolver import LazyDataResolverV2
-from shared.secrets_resolver import SecretsResolver
+from shared.secrets_resolver import Secrets, SecretsResolver
 
 MODEL_BASENAME = "model"
 
 NUM_LOAD_RETRIES = int(os.environ.get("NUM_LOAD_RETRIES_TRUSS", "1"))
 STREAMING_RESPONSE_QUEUE_READ_TIMEOUT_SECS = 60
 DEFAULT_PREDICT_CONCURRENCY = 1
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_BATCH_WAIT_MS = 5.0
 EXTENSIONS_DIR_NAME = "extensions"
 EXTENSION_CLASS_NAME = "Extension"
 EXTENSION_FILE_NAME = "extension"
 TRT_LLM_EXTENSION_NAME = "trt_llm"
 POLL_FOR_ENVIRONMENT_UPDATES_TIMEOUT_SECS = 30
+# Requests with higher priority get a predict slot first, the default is 0.
+PRIORITY_HEADER = "x-baseten-priority"
+# Requests still waiting for a predict slot after this timeout are rejected.
+TIMEOUT_MS_HEADER = "x-baseten-timeout-ms"
 
 
 class MethodName(str, enum.Enum):
@@ -59,6 +79,7 @@ class MethodName(str, enum.Enum):
     MESSAGES = enum.auto()
     POSTPROCESS = enum.auto()
     PREDICT = enum.auto()
+    PREDICT_BATCH = enum.auto()
     PREPROCESS = enum.auto()
     RESPONSES = enum.auto()
     SETUP_ENVIRONMENT = enum.auto()
@@ -82,21 +103,31 @@ ModelFn = Callable[..., Union[OutputType, Awaitable[OutputType]]]
 
 @asynccontextmanager
 async def deferred_semaphore_and_span(
-    semaphore: Semaphore, span: trace.Span
+    semaphore: ConcurrencyLimiter,
+    span: trace.Span,
+    priority: int = 0,
+    deadline: Optional[float] = None,
+    check_disconnected: Optional[Callable[[], Awaitable[None]]] = None,
 ) -> AsyncGenerator[Callable[[], Callable[[], None]], None]:
     """
-    Context manager that allows deferring the release of a semaphore and the ending of a
-    trace span.
+    Context manager that allows deferring the release of a concurrency slot and the
+    ending of a trace span.
 
-    Yields a function that, when called, releases the semaphore and ends the span.
+    Yields a function that, when called, releases the slot and ends the span.
     If that function is not called, the resources are cleand up when exiting.
     """
-    await semaphore.acquire()
+    try:
+        acquired_at = await semaphore.acquire(
+            priority=priority, deadline=deadline, check_disconnected=check_disconnected
+        )
+    except BaseException:
+        span.end()
+        raise
     trace.use_span(span, end_on_exit=False)
     deferred = False
 
     def release_and_end() -> None:
-        semaphore.release()
+        semaphore.release(acquired_at)
         span.end()
 
     def defer() -> Callable[[], None]:
@@ -144,6 +175,31 @@ async def raise_if_disconnected(
         raise HTTPException(status_code=499, detail=error_message)
 
 
+def parse_scheduling_headers(
+    request: starlette.requests.Request, received_at: float
+) -> tuple[int, Optional[float]]:
+    """Returns priority and deadline (`time.monotonic()` based) of a request."""
+    priority = request.headers.get(PRIORITY_HEADER)
+    timeout_ms = request.headers.get(TIMEOUT_MS_HEADER)
+    try:
+        parsed_priority = int(priority) if priority is not None else 0
+    except ValueError as e:
+        raise errors.InputParsingError(
+            f"Invalid `{PRIORITY_HEADER}` header, expected an integer: `{priority}`."
+        ) from e
+    if timeout_ms is None:
+        return parsed_priority, None
+    try:
+        parsed_timeout_ms = float(timeout_ms)
+    except ValueError:
+        parsed_timeout_ms = math.nan
+    if not math.isfinite(parsed_timeout_ms):
+        raise errors.InputParsingError(
+            f"Invalid `{TIMEOUT_MS_HEADER}` header, expected a number: `{timeout_ms}`."
+        )
+    return parsed_priority, received_at + parsed_timeout_ms / 1000
+
+
 class ArgConfig(enum.Enum):
     NONE = enum.auto()
     INPUTS_ONLY = enum.auto()
@@ -203,6 +259,28 @@ class ArgConfig(enum.Enum):
         return args
 
 
+class BodyInput(enum.Enum):
+    """How the raw request body is passed to models that don't want parsed inputs.
+
+    Declared by annotating the inputs argument of `preprocess` (or `predict`) as
+    `AsyncIterator[bytes]` (body chunks as they arrive) or as a file type like
+    `BinaryIO` or `SpooledTemporaryFile` (body spooled to memory, or to disk if
+    large).
+    """
+
+    ASYNC_ITERATOR = enum.auto()
+    SPOOLED_FILE = enum.auto()
+
+    @classmethod
+    def from_annotation(cls, annotation: Any) -> Optional["BodyInput"]:
+        origin = get_origin(annotation) or annotation
+        if origin in (AsyncIterator, AsyncIterable):
+            return cls.ASYNC_ITERATOR
+        if origin in (tempfile.SpooledTemporaryFile, BinaryIO, IO):
+            return cls.SPOOLED_FILE
+        return None
+
+
 @dataclasses.dataclass
 class MethodDescriptor:
     is_async: bool
@@ -237,6 +315,7 @@ class MethodDescriptor:
 class ModelDescriptor:
     preprocess: Optional[MethodDescriptor]
     predict: Optional[MethodDescriptor]  # Websocket may replace predict.
+    predict_batch: Optional[MethodDescriptor]
     postprocess: Optional[MethodDescriptor]
     truss_schema: Optional[TrussSchema]
     setup_environment: Optional[MethodDescriptor]
@@ -259,6 +338,17 @@ class ModelDescriptor:
             )
         )
 
+    @cached_property
+    def body_input(self) -> Optional[BodyInput]:
+        first_method = self.preprocess or self.predict
+        if not first_method or first_method.arg_config not in (
+            ArgConfig.INPUTS_ONLY,
+            ArgConfig.INPUTS_AND_REQUEST,
+        ):
+            return None
+        parameters = list(inspect.signature(first_method.method).parameters.values())
+        return BodyInput.from_annotation(parameters[0].annotation)
+
     @classmethod
     def _gen_truss_schema(
         cls,
@@ -303,6 +393,9 @@ class ModelDescriptor:
             )
         websocket = cls._safe_extract_descriptor(model_cls, MethodName.WEBSOCKET)
         predict = cls._safe_extract_descriptor(model_cls, MethodName.PREDICT)
+        predict_batch = cls._safe_extract_descriptor(
+            model_cls, MethodName.PREDICT_BATCH
+        )
         truss_schema, preprocess, postprocess = None, None, None
 
         preprocess = cls._safe_extract_descriptor(model_cls, MethodName.PREPROCESS)
@@ -345,6 +438,18 @@ class ModelDescriptor:
                     f"argument (because the result of `{MethodName.PREDICT}` would be discarded)."
                 )
 
+            if predict_batch:
+                if predict_batch.arg_config != ArgConfig.INPUTS_ONLY:
+                    raise errors.ModelDefinitionError(
+                        f"`{MethodName.PREDICT_BATCH}` must have exactly one argument: "
+                        "the list of inputs."
+                    )
+                if predict_batch.is_generator:
+                    raise errors.ModelDefinitionError(
+                        f"`{MethodName.PREDICT_BATCH}` cannot be a generator, it must "
+                        "return a list with one result per input."
+                    )
+
             truss_schema = cls._gen_truss_schema(
                 predict=predict, preprocess=preprocess, postprocess=postprocess
             )
@@ -358,6 +463,7 @@ class ModelDescriptor:
         return cls(
             preprocess=preprocess,
             predict=predict,
+            predict_batch=predict_batch,
             postprocess=postprocess,
             truss_schema=truss_schema,
             setup_environment=setup,
@@ -378,9 +484,14 @@ class ModelWrapper:
     _maybe_model_descriptor: Optional[ModelDescriptor]
     _logger: logging.Logger
     _status: "ModelWrapper.Status"
-    _predict_semaphore: Semaphore
+    _predict_semaphore: ConcurrencyLimiter
+    _batcher: Optional[DynamicBatcher]
     _poll_for_environment_updates_task: Optional[asyncio.Task]
     _environment: Optional[dict]
+    _load_done: Optional[asyncio.Event]
+    _loop: Optional[asyncio.AbstractEventLoop]
+    _startup_timeline: StartupTimeline
+    _phase_histograms: phase_metrics.PhaseHistograms
 
     class Status(enum.Enum):
         NOT_READY = 0
@@ -403,13 +514,28 @@ class ModelWrapper:
         self.name = MODEL_BASENAME
         self._load_lock = Lock()
         self._status = ModelWrapper.Status.NOT_READY
-        self._predict_semaphore = Semaphore(
-            self._config.get("runtime", {}).get(
-                "predict_concurrency", DEFAULT_PREDICT_CONCURRENCY
-            )
+        self._predict_semaphore = make_predict_limiter(
+            self._config.get("runtime", {}), DEFAULT_PREDICT_CONCURRENCY
         )
+        self._batcher = None
+        batching = self._config.get("runtime", {}).get("batching", {})
+        if batching.get("enabled", False):
+            self._batcher = DynamicBatcher(
+                self._predict_batch,
+                max_batch_size=batching.get("max_batch_size", DEFAULT_MAX_BATCH_SIZE),
+                max_wait_ms=batching.get("max_wait_ms", DEFAULT_MAX_BATCH_WAIT_MS),
+                limiter=self._predict_semaphore,
+            )
         self._poll_for_environment_updates_task = None
         self._environment = None
+        # Set on the event loop once loading finished, successfully or not.
+        # Created on the server's event loop, which does not run yet here.
+        self._load_done = None
+        self._loop = None
+        self._startup_timeline = StartupTimeline()
+        self._phase_histograms = phase_metrics.PhaseHistograms(
+            enabled=self._config.get("runtime", {}).get("enable_phase_metrics", True)
+        )
 
     @property
     def _model(self) -> Any:
@@ -433,6 +559,14 @@ class ModelWrapper:
     def ready(self) -> bool:
         return self._status == ModelWrapper.Status.READY
 
+    @property
+    def startup_timeline(self) -> StartupTimeline:
+        return self._startup_timeline
+
+    @property
+    def phase_histograms(self) -> phase_metrics.PhaseHistograms:
+        return self._phase_histograms
+
     @property
     def model_file_name(self) -> str:
         return self._config["model_class_filename"]
@@ -441,6 +575,10 @@ class ModelWrapper:
     def skip_input_parsing(self) -> bool:
         return self.model_descriptor.skip_input_parsing
 
+    @property
+    def body_input(self) -> Optional[BodyInput]:
+        return self.model_descriptor.body_input
+
     @property
     def truss_schema(self) -> Optional[TrussSchema]:
         return self.model_descriptor.truss_schema
@@ -448,9 +586,41 @@ class ModelWrapper:
     def start_load_thread(self):
         # Don't retry failed loads.
         if self._status == ModelWrapper.Status.NOT_READY:
+            self._get_load_done_event()
             thread = Thread(target=self.load)
             thread.start()
 
+    def _set_load_done(self, status: "ModelWrapper.Status") -> None:
+        self._status = status
+        if status == ModelWrapper.Status.READY:
+            self._startup_timeline.mark_ready()
+        if self._loop is not None and self._load_done is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._load_done.set)
+            except RuntimeError:  # Event loop already closed.
+                pass
+
+    def _get_load_done_event(self) -> asyncio.Event:
+        # On Python < 3.10 events are bound to the loop current at creation.
+        loop = asyncio.get_running_loop()
+        if self._load_done is None or self._loop is not loop:
+            self._load_done = asyncio.Event()
+            self._loop = loop
+        return self._load_done
+
+    async def wait_for_load(self, timeout: Optional[float] = None) -> bool:
+        """Waits until loading finished or failed, returns whether it did in time.
+
+        Only works if loading was started with `start_load_thread`.
+        """
+        if self._status in (ModelWrapper.Status.READY, ModelWrapper.Status.FAILED):
+            return True
+        try:
+            await asyncio.wait_for(self._get_load_done_event().wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
     def load(self):
         if self.ready:
             return
@@ -462,15 +632,72 @@ class ModelWrapper:
             try:
                 start_time = time.perf_counter()
                 self._load_impl()
-                self._status = ModelWrapper.Status.READY
+                self._set_load_done(ModelWrapper.Status.READY)
                 self._logger.info(
                     f"Completed model.load() execution in {_elapsed_ms(start_time)} ms"
                 )
             except Exception:
                 self._logger.exception("Exception while loading model")
-                self._status = ModelWrapper.Status.FAILED
+                self._set_load_done(ModelWrapper.Status.FAILED)
 
     def _load_impl(self):
+        timeline = self._startup_timeline
+        with timeline.phase("setup"):
+            data_dir, secrets, lazy_data_resolver, extensions = self._setup_for_load()
+
+        model_class_file_path = (
+            Path(self._config["model_module_dir"])
+            / self._config["model_class_filename"]
+        )
+        if model_class_file_path.exists():
+            self._logger.info("Loading truss model from file.")
+            with timeline.phase("import"):
+                module = self._import_model_module(model_class_file_path)
+
+            with timeline.phase("init"):
+                model_class = getattr(module, self._config["model_class_name"])
+                model_init_params = _prepare_init_args(
+                    model_class, self._config, data_dir, secrets, lazy_data_resolver
+                )
+                signature = inspect.signature(model_class)
+                for ext_name, ext in extensions.items():
+                    if _signature_accepts_keyword_arg(signature, ext_name):
+                        model_init_params[ext_name] = ext.model_args()
+                self._maybe_model = model_class(**model_init_params)
+
+        elif TRT_LLM_EXTENSION_NAME in extensions:
+            self._logger.info("Loading TRT LLM extension as model.")
+            # trt_llm extension allows model.py to be absent. It supplies its
+            # own model class in that case.
+            trt_llm_extension = extensions["trt_llm"]
+            with timeline.phase("init"):
+                self._maybe_model = trt_llm_extension.model_override()
+        else:
+            raise RuntimeError("No module class file found")
+
+        self._maybe_model_descriptor = ModelDescriptor.from_model(self._model)
+        if self._batcher and not self._maybe_model_descriptor.predict_batch:
+            raise errors.ModelDefinitionError(
+                f"Batching is enabled in the config, but the model has no "
+                f"`{MethodName.PREDICT_BATCH}` method."
+            )
+
+        with timeline.phase("load"):
+            if self._maybe_model_descriptor.setup_environment:
+                self._initialize_environment_before_load()
+            if hasattr(self._model, "load"):
+                retry(
+                    self._model.load,
+                    NUM_LOAD_RETRIES,
+                    self._logger.warning,
+                    "Failed to load model.",
+                    gap_seconds=1.0,
+                )
+            lazy_data_resolver.raise_if_not_collected()
+
+    def _setup_for_load(
+        self,
+    ) -> tuple[Path, Secrets, LazyDataResolverV2, dict[str, Any]]:
         data_dir = Path("data")
         data_dir.mkdir(exist_ok=True)
 
@@ -492,74 +719,38 @@ class ModelWrapper:
         )
         for extension in extensions.values():
             extension.load()
-
-        model_class_file_path = (
-            Path(self._config["model_module_dir"])
-            / self._config["model_class_filename"]
-        )
-        if model_class_file_path.exists():
-            self._logger.info("Loading truss model from file.")
-            module_path = pathlib.Path(model_class_file_path).resolve()
-            module_name = module_path.stem  # Use the file's name as the module name
-            if not os.path.isfile(module_path):
-                raise ImportError(
-                    f"`{module_path}` is not a file. You must point to a python file where "
-                    "the entrypoint chainlet is defined."
-                )
-            import_error_msg = f"Could not import `{module_path}`. Check path."
-            spec = importlib.util.spec_from_file_location(module_name, module_path)
-            if not spec:
-                raise ImportError(import_error_msg)
-            if not spec.loader:
-                raise ImportError(import_error_msg)
-            module = importlib.util.module_from_spec(spec)
-            try:
-                spec.loader.exec_module(module)
-            except ImportError as e:
-                if "attempted relative import" in str(e):
-                    raise ImportError(
-                        f"During import of `{model_class_file_path}`. "
-                        f"Since Truss v0.9.36 relative imports (starting with '.') in "
-                        "the top-level model file are no longer supported. Please "
-                        "replace them with absolute imports. For guidance on importing "
-                        "custom packages refer to our documentation "
-                        "https://docs.baseten.co/truss-reference/config#packages"
-                    ) from e
-
-                raise
-
-            model_class = getattr(module, self._config["model_class_name"])
-            model_init_params = _prepare_init_args(
-                model_class, self._config, data_dir, secrets, lazy_data_resolver
+        return data_dir, secrets, lazy_data_resolver, extensions
+
+    def _import_model_module(self, model_class_file_path: Path) -> ModuleType:
+        module_path = pathlib.Path(model_class_file_path).resolve()
+        module_name = module_path.stem  # Use the file's name as the module name
+        if not os.path.isfile(module_path):
+            raise ImportError(
+                f"`{module_path}` is not a file. You must point to a python file where "
+                "the entrypoint chainlet is defined."
             )
-            signature = inspect.signature(model_class)
-            for ext_name, ext in extensions.items():
-                if _signature_accepts_keyword_arg(signature, ext_name):
-                    model_init_params[ext_name] = ext.model_args()
-            self._maybe_model = model_class(**model_init_params)
-
-        elif TRT_LLM_EXTENSION_NAME in extensions:
-            self._logger.info("Loading TRT LLM extension as model.")
-            # trt_llm extension allows model.py to be absent. It supplies its
-            # own model class in that case.
-            trt_llm_extension = extensions["trt_llm"]
-            self._maybe_model = trt_llm_extension.model_override()
-        else:
-            raise RuntimeError("No module class file found")
-
-        self._maybe_model_descriptor = ModelDescriptor.from_model(self._model)
+        import_error_msg = f"Could not import `{module_path}`. Check path."
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        if not spec:
+            raise ImportError(import_error_msg)
+        if not spec.loader:
+            raise ImportError(import_error_msg)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except ImportError as e:
+            if "attempted relative import" in str(e):
+                raise ImportError(
+                    f"During import of `{model_class_file_path}`. "
+                    f"Since Truss v0.9.36 relative imports (starting with '.') in "
+                    "the top-level model file are no longer supported. Please "
+                    "replace them with absolute imports. For guidance on importing "
+                    "custom packages refer to our documentation "
+                    "https://docs.baseten.co/truss-reference/config#packages"
+                ) from e
 
-        if self._maybe_model_descriptor.setup_environment:
-            self._initialize_environment_before_load()
-        if hasattr(self._model, "load"):
-            retry(
-                self._model.load,
-                NUM_LOAD_RETRIES,
-                self._logger.warning,
-                "Failed to load model.",
-                gap_seconds=1.0,
-            )
-        lazy_data_resolver.raise_if_not_collected()
+            raise
+        return module
 
     def setup_polling_for_environment_updates(self):
         self._poll_for_environment_updates_task = asyncio.create_task(
@@ -681,6 +872,60 @@ class ModelWrapper:
         )
         return await self._execute_user_model_fn(inputs, request, descriptor)
 
+    async def _predict_batch(
+        self, inputs: list[Any], request_spans: list[trace.Span]
+    ) -> list[Any]:
+        descriptor = self.model_descriptor.predict_batch
+        assert descriptor, (
+            f"`{MethodName.PREDICT_BATCH}` must only be called if model has it."
+        )
+        # Each request keeps its own span, the batch span links to all of them.
+        links = [trace.Link(span.get_span_context()) for span in request_spans]
+        with self._tracer.start_as_current_span(
+            "call-predict-batch", links=links, attributes={"batch_size": len(inputs)}
+        ) as span_batch:
+            with tracing.section_as_event(span_batch, "predict-batch", detach=True):
+                with errors.intercept_exceptions(self._logger, self.model_file_name):
+                    if descriptor.is_async:
+                        results = await cast(
+                            Awaitable[Sequence[Any]], descriptor.method(inputs)
+                        )
+                    else:
+                        results = await to_thread.run_sync(descriptor.method, inputs)
+
+        if not isinstance(results, Sequence) or len(results) != len(inputs):
+            raise errors.ModelDefinitionError(
+                f"`{MethodName.PREDICT_BATCH}` must return a list with one result "
+                f"per input. Got {type(results).__name__} for {len(inputs)} inputs."
+            )
+        # Exceptions returned in place of a result fail only the respective request.
+        item_results: list[Any] = []
+        for result in results:
+            if isinstance(result, Exception):
+                self._logger.error(errors.MODEL_ERROR_MESSAGE, exc_info=result)
+                result = errors.UserCodeError(str(result))
+            item_results.append(result)
+        return item_results
+
+    async def _predict_batched(
+        self,
+        inputs: Any,
+        request: starlette.requests.Request,
+        priority: int,
+        deadline: Optional[float],
+    ) -> Any:
+        assert self._batcher
+        await raise_if_disconnected(request, MethodName.PREDICT_BATCH)
+        span_predict = self._tracer.start_span("call-predict")
+        with trace.use_span(span_predict, end_on_exit=True):
+            with (
+                tracing.section_as_event(span_predict, "predict-batched"),
+                self._phase_histograms.time(MethodName.PREDICT, phase_metrics.PREDICT),
+            ):
+                return await self._batcher.submit(
+                    inputs, span_predict, priority=priority, deadline=deadline
+                )
+
     async def postprocess(
         self, result: Union[InputType, Any], request: starlette.requests.Request
     ) -> OutputType:
@@ -694,23 +939,11 @@ class ModelWrapper:
         )
         return await self._execute_user_model_fn(result, request, descriptor)
 
-    async def _write_response_to_queue(
-        self,
-        queue: asyncio.Queue,
-        generator: AsyncGenerator[bytes, None],
-        span: trace.Span,
-    ) -> None:
-        with tracing.section_as_event(span, "write_response_to_queue"):
-            try:
-                async for chunk in generator:
-                    await queue.put(chunk)
-            except Exception as e:
-                self._logger.exception(
-                    f"Exception while generating streamed response: {str(e)}",
-                    exc_info=errors.filter_traceback(self.model_file_name),
-                )
-            finally:
-                await queue.put(SENTINEL)
+    def _log_stream_error(self, e: Exception) -> None:
+        self._logger.exception(
+            f"Exception while generating streamed response: {str(e)}",
+            exc_info=errors.filter_traceback(self.model_file_name),
+        )
 
     async def _stream_with_background_task(
         self,
@@ -718,47 +951,58 @@ class ModelWrapper:
         span: trace.Span,
         trace_ctx: trace.Context,
         cleanup_fn: Callable[[], None],
+        endpoint: MethodName,
     ) -> AsyncGenerator[bytes, None]:
+        runtime = self._config.get("runtime", {})
         # The streaming read timeout is the amount of time in between streamed chunk
         # before a timeout is triggered.
-        streaming_read_timeout = self._config.get("runtime", {}).get(
+        streaming_read_timeout = runtime.get(
             "streaming_read_timeout", STREAMING_RESPONSE_QUEUE_READ_TIMEOUT_SECS
         )
-        async_generator = _force_async_generator(generator)
-        # To ensure that a partial read from a client does not keep  the semaphore
-        # claimed, we write all the data from the stream to the queue as it is produced,
-        # irrespective of how fast it is consumed.
-        # We then return a new generator that reads from the queue, and then
-        # exits the semaphore block.
-        response_queue: asyncio.Queue = asyncio.Queue()
-
-        # `write_response_to_queue` keeps running the background until completion.
-        gen_task = asyncio.create_task(
-            self._write_response_to_queue(response_queue, async_generator, span)
+        streaming = runtime.get("streaming", {})
+        # To ensure that a partial read from a client does not keep the semaphore
+        # claimed, the generator is consumed in the background as it produces data,
+        # irrespective of how fast the response is read (unless the buffer is
+        # bounded). The semaphore is released once the generator is done.
+        buffer = StreamBuffer(
+            coalesce_max_bytes=streaming.get("coalesce_max_bytes", 0),
+            coalesce_max_wait_ms=streaming.get("coalesce_max_wait_ms", 0.0),
+            max_buffer_bytes=streaming.get("max_buffer_bytes"),
         )
-        # Defer the release of the semaphore until the write_response_to_queue task.
-        gen_task.add_done_callback(lambda _: cleanup_fn())
+        span.add_event("write_response_to_buffer")
+        stream_start = time.perf_counter()
+        start_producer(
+            generator, buffer, on_error=self._log_stream_error, on_done=cleanup_fn
+        )
+        phase_histograms = self._phase_histograms
 
-        # The gap between responses in a stream must be < streaming_read_timeout
         # TODO: this whole buffering might be superfluous and sufficiently done by
         #   by the FastAPI server already. See `test_limit_concurrency_with_sse`.
         async def _buffered_response_generator() -> AsyncGenerator[bytes, None]:
-            # `span` is tied to the "producer" `gen_task` which might complete before
+            # `span` is tied to the producer which might complete before the
             # "consume" part here finishes, therefore a dedicated span is required.
             # Because all of this code is inside a `detach_context` block, we
             # explicitly propagate the tracing context for this span.
             with self._tracer.start_as_current_span(
                 "buffered-response-generator", context=trace_ctx
             ):
-                while True:
-                    chunk = await asyncio.wait_for(
-                        response_queue.get(), timeout=streaming_read_timeout
-                    )
-                    if chunk == SENTINEL:
-                        return
+                first_chunk = True
+                async for chunk in buffer.iter_chunks(streaming_read_timeout):
+                    if first_chunk:
+                        first_chunk = False
+                        phase_histograms.observe(
+                            endpoint,
+                            phase_metrics.FIRST_CHUNK,
+                            time.perf_counter() - stream_start,
+                        )
                     yield chunk
+                phase_histograms.observe(
+                    endpoint, phase_metrics.STREAM, time.perf_counter() - stream_start
+                )
 
-        return _buffered_response_generator()
+        response_generator = _buffered_response_generator()
+        buffer.close_consumer_when_collected(response_generator)
+        return response_generator
 
     async def _execute_user_model_fn(
         self,
@@ -787,14 +1031,17 @@ class ModelWrapper:
         """
         await raise_if_disconnected(request, descriptor.method_name)
         fn_span = self._tracer.start_span(f"call-{descriptor.method_name}")
-        with tracing.section_as_event(
-            fn_span, descriptor.method_name, detach=True
-        ) as detached_ctx:
+        with (
+            tracing.section_as_event(
+                fn_span, descriptor.method_name, detach=True
+            ) as detached_ctx,
+            self._phase_histograms.time(descriptor.method_name, phase_metrics.PREDICT),
+        ):
             result = await self._execute_user_model_fn(inputs, request, descriptor)
 
         if inspect.isgenerator(result) or inspect.isasyncgen(result):
             return await self._handle_generator_response(
-                request, result, fn_span, detached_ctx
+                request, result, fn_span, detached_ctx, descriptor.method_name
             )
 
         return result
@@ -815,13 +1062,18 @@ class ModelWrapper:
         generator: Union[Generator[bytes, None, None], AsyncGenerator[bytes, None]],
         span: trace.Span,
         trace_ctx: trace.Context,
+        endpoint: MethodName,
         get_cleanup_fn: Callable[[], Callable[[], None]] = lambda: lambda: None,
     ):
         if self._should_gather_generator(request):
             return await _gather_generator(generator)
         else:
             return await self._stream_with_background_task(
-                generator, span, trace_ctx, cleanup_fn=get_cleanup_fn()
+                generator,
+                span,
+                trace_ctx,
+                cleanup_fn=get_cleanup_fn(),
+                endpoint=endpoint,
             )
 
     def _get_descriptor_or_raise(
@@ -840,20 +1092,46 @@ class ModelWrapper:
         """
         Returns result from: preprocess -> predictor -> postprocess.
         """
+        received_at = time.monotonic()
         if self.model_descriptor.preprocess:
             with self._tracer.start_as_current_span("call-pre") as span_pre:
-                with tracing.section_as_event(span_pre, "preprocess", detach=True):
+                with (
+                    tracing.section_as_event(span_pre, "preprocess", detach=True),
+                    self._phase_histograms.time(
+                        MethodName.PREDICT, phase_metrics.PREPROCESS
+                    ),
+                ):
                     preprocess_result = await self.preprocess(inputs, request)
         else:
             preprocess_result = inputs
 
+        priority, deadline = parse_scheduling_headers(request, received_at)
+        if self._batcher:
+            predict_result = await self._predict_batched(
+                preprocess_result, request, priority, deadline
+            )
+            return await self._maybe_postprocess(predict_result, request)
+
         span_predict = self._tracer.start_span("call-predict")
+        queued_at = time.perf_counter()
         async with deferred_semaphore_and_span(
-            self._predict_semaphore, span_predict
+            self._predict_semaphore,
+            span_predict,
+            priority=priority,
+            deadline=deadline,
+            check_disconnected=partial(
+                raise_if_disconnected, request, MethodName.PREDICT
+            ),
         ) as get_defer_fn:
-            with tracing.section_as_event(
-                span_predict, "predict", detach=True
-            ) as detached_ctx:
+            self._phase_histograms.observe(
+                MethodName.PREDICT, phase_metrics.QUEUE, time.perf_counter() - queued_at
+            )
+            with (
+                tracing.section_as_event(
+                    span_predict, "predict", detach=True
+                ) as detached_ctx,
+                self._phase_histograms.time(MethodName.PREDICT, phase_metrics.PREDICT),
+            ):
                 # To prevent span pollution, we need to make sure spans created by user
                 # code don't inherit context from our spans (which happens even if
                 # different tracer instances are used).
@@ -887,6 +1165,7 @@ class ModelWrapper:
                     predict_result,
                     span_predict,
                     detached_ctx,
+                    MethodName.PREDICT,
                     get_cleanup_fn=get_defer_fn,
                 )
 
@@ -909,9 +1188,19 @@ class ModelWrapper:
 
                 return predict_result
 
+        return await self._maybe_postprocess(predict_result, request)
+
+    async def _maybe_postprocess(
+        self, predict_result: Any, request: starlette.requests.Request
+    ) -> OutputType:
         if self.model_descriptor.postprocess:
             with self._tracer.start_as_current_span("call-post") as span_post:
-                with tracing.section_as_event(span_post, "postprocess", detach=True):
+                with (
+                    tracing.section_as_event(span_post, "postprocess", detach=True),
+                    self._phase_histograms.time(
+                        MethodName.PREDICT, phase_metrics.POSTPROCESS
+                    ),
+                ):
                     postprocess_result = await self.postprocess(predict_result, request)
                 return postprocess_result
         else:
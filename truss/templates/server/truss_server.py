@@ -5,7 +5,9 @@ import logging
 import logging.config
 import os
 import signal
-from collections.abc import AsyncGenerator, Awaitable, Generator
+import tempfile
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Generator
 from http import HTTPStatus
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Optional, Union
@@ -13,7 +15,7 @@ from typing import TYPE_CHECKING, Callable, Optional, Union
 import pydantic
 import uvicorn
 import yaml
-from common import errors, tracing
+from common import errors, phase_metrics, tracing
 from common.schema import TrussSchema
 from fastapi import (
     Depends,
@@ -26,7 +28,7 @@ from fastapi import (
 from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.routing import APIRoute as FastAPIRoute
 from fastapi.routing import APIWebSocketRoute as FastAPIWebSocketRoute
-from model_wrapper import ModelWrapper
+from model_wrapper import BodyInput, ModelWrapper
 from opentelemetry import propagate as otel_propagate
 from opentelemetry import trace
 from opentelemetry.sdk import trace as sdk_trace
@@ -55,6 +57,10 @@ INFERENCE_SERVER_FAILED_FILE = Path("~/inference_server_crashed.txt").expanduser
 # TODO(bryanzhang) Align this with other websocket components so it's not so
 # difficult to change.
 WS_MAX_MSG_SZ_BYTES = 100 * (1 << 20)
+# Upper bound for long polls on the loaded endpoint.
+MAX_LOADED_WAIT_SECS = 60.0
+# Request bodies passed to the model as file are kept in memory up to this size.
+BODY_SPOOL_MAX_MEMORY_BYTES = 16 * (1 << 20)
 
 if TYPE_CHECKING:
     from model_wrapper import InputType, OutputType
@@ -64,12 +70,68 @@ async def parse_body(request: Request) -> bytes:
     """
     Used by FastAPI to read body in an asynchronous manner
     """
+    start = time.perf_counter()
     try:
-        return await request.body()
+        body = await request.body()
     except ClientDisconnect as exc:
         error_message = "Client disconnected while reading request."
         logging.warning(error_message)
         raise HTTPException(status_code=499, detail=error_message) from exc
+    model: Optional[ModelWrapper] = getattr(request.app.state, "model", None)
+    endpoint = request.scope.get("endpoint")
+    if model is not None and endpoint is not None:
+        model.phase_histograms.observe(
+            endpoint.__name__, phase_metrics.BODY_READ, time.perf_counter() - start
+        )
+    return body
+
+
+async def parse_predict_body(request: Request) -> Optional[bytes]:
+    """
+    Like `parse_body`, but leaves the body unread (returning `None`) if the model
+    consumes the raw body as stream or file.
+    """
+    model: Optional[ModelWrapper] = getattr(request.app.state, "model", None)
+    if model is not None and model.ready and model.body_input:
+        return None
+    return await parse_body(request)
+
+
+class _BodyStreamingRequest(Request):
+    """Request for which the body is passed to the model as it arrives.
+
+    Starlette's `is_disconnected` receives a message from the ASGI channel, which
+    would drop a body chunk if the body is not consumed yet. Until then, disconnects
+    are only detected while reading the body.
+    """
+
+    async def is_disconnected(self) -> bool:
+        if not self._stream_consumed:
+            return self._is_disconnected
+        return await super().is_disconnected()
+
+
+async def _iter_body(request: Request) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                yield chunk
+    except ClientDisconnect as exc:
+        error_message = "Client disconnected while reading request."
+        logging.warning(error_message)
+        raise HTTPException(status_code=499, detail=error_message) from exc
+
+
+async def _spool_body(request: Request) -> tempfile.SpooledTemporaryFile:
+    spool = tempfile.SpooledTemporaryFile(max_size=BODY_SPOOL_MAX_MEMORY_BYTES)
+    try:
+        async for chunk in _iter_body(request):
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
 
 
 async def _safe_close_websocket(
@@ -110,10 +172,18 @@ class BasetenEndpoints:
 
         return {}
 
-    async def model_loaded(self, model_name: str) -> dict:
+    async def model_loaded(self, model_name: str, wait_secs: float = 0.0) -> dict:
+        """With `wait_secs`, answers as soon as loading finished (long poll)."""
+        if wait_secs > 0:
+            await self._model.wait_for_load(
+                timeout=min(wait_secs, MAX_LOADED_WAIT_SECS)
+            )
         self.check_healthy()
         return {}
 
+    async def startup_timeline(self, model_name: str) -> dict:
+        return self._model.startup_timeline.as_dict()
+
     async def invocations_ready(self) -> dict[str, Union[str, bool]]:
         """
         This method provides compatibility with Sagemaker hosting for the 'ping' endpoint.
@@ -125,7 +195,7 @@ class BasetenEndpoints:
         return {}
 
     async def invocations(
-        self, request: Request, body_raw: bytes = Depends(parse_body)
+        self, request: Request, body_raw: Optional[bytes] = Depends(parse_predict_body)
     ) -> Response:
         """
         This method provides compatibility with Sagemaker hosting for the 'invocations' endpoint.
@@ -141,7 +211,10 @@ class BasetenEndpoints:
     ) -> "InputType":
         if self.is_binary(request):
             with tracing.section_as_event(span, "binary-deserialize"):
-                inputs = serialization.truss_msgpack_deserialize(body_raw)
+                try:
+                    inputs = serialization.truss_msgpack_deserialize(body_raw)
+                except serialization.TensorFrameError as e:
+                    raise errors.InputParsingError(str(e)) from e
             if truss_schema and truss_schema.input_type:
                 try:
                     with tracing.section_as_event(span, "parse-pydantic"):
@@ -174,7 +247,7 @@ class BasetenEndpoints:
         self,
         method: Callable[["InputType", Request], Awaitable["OutputType"]],
         request: Request,
-        body_raw: bytes,
+        body_raw: Optional[bytes],
     ) -> Response:
         """
         Executes a predictive endpoint
@@ -193,18 +266,41 @@ class BasetenEndpoints:
         trace_ctx = otel_propagate.extract(request.headers) or None
         # This is the top-level span in the truss-server, so we set the context here.
         # Nested spans "inherit" context automatically.
+        endpoint = method.__name__
+        phase_histograms = self._model.phase_histograms
         with self._tracer.start_as_current_span(
-            f"{method.__name__}-endpoint", context=trace_ctx
+            f"{endpoint}-endpoint", context=trace_ctx
         ) as span:
             inputs: Optional["InputType"]
+            body_file: Optional[tempfile.SpooledTemporaryFile] = None
             if self._model.skip_input_parsing:
                 inputs = None
+            elif body_raw is None:
+                # Body was left unread by `parse_predict_body`.
+                request = _BodyStreamingRequest(request.scope, request.receive)
+                if self._model.body_input == BodyInput.ASYNC_ITERATOR:
+                    inputs = _iter_body(request)
+                else:
+                    with (
+                        tracing.section_as_event(span, "spool-body"),
+                        phase_histograms.time(endpoint, phase_metrics.BODY_READ),
+                    ):
+                        inputs = body_file = await _spool_body(request)
             else:
-                inputs = await self._parse_body(
-                    request, body_raw, self._model.truss_schema, span
-                )
-            with tracing.section_as_event(span, "model-call"):
-                result: "OutputType" = await method(inputs, request)
+                with phase_histograms.time(endpoint, phase_metrics.DESERIALIZE):
+                    inputs = await self._parse_body(
+                        request, body_raw, self._model.truss_schema, span
+                    )
+            result: "OutputType" = None
+            try:
+                with tracing.section_as_event(span, "model-call"):
+                    result = await method(inputs, request)
+            finally:
+                # Generators may still read from the file, it is closed when collected.
+                if body_file is not None and not isinstance(
+                    result, (AsyncGenerator, Generator, StreamingResponse)
+                ):
+                    body_file.close()
 
             # In the case that the model returns a Generator object, return a
             # StreamingResponse instead.
@@ -215,10 +311,21 @@ class BasetenEndpoints:
                 if result.status_code >= HTTPStatus.MULTIPLE_CHOICES.value:
                     errors.add_error_headers_to_user_response(result)
                 return result
-            return self._serialize_result(result, self.is_binary(request), span)
+            # Clients that send tensor frames also get tensor frames back.
+            is_binary = self.is_binary(request)
+            tensor_frame = (
+                is_binary
+                and body_raw is not None
+                and serialization.is_tensor_frame(body_raw)
+            )
+            with phase_histograms.time(endpoint, phase_metrics.SERIALIZE):
+                return self._serialize_result(result, is_binary, span, tensor_frame)
 
     async def predict(
-        self, model_name: str, request: Request, body_raw: bytes = Depends(parse_body)
+        self,
+        model_name: str,
+        request: Request,
+        body_raw: Optional[bytes] = Depends(parse_predict_body),
     ) -> Response:
         return await self._execute_request(
             method=self._model.predict, request=request, body_raw=body_raw
@@ -305,7 +412,11 @@ class BasetenEndpoints:
                     raise  # Re raise to let `intercept_exceptions` deal with it.
 
     def _serialize_result(
-        self, result: "OutputType", is_binary: bool, span: trace.Span
+        self,
+        result: "OutputType",
+        is_binary: bool,
+        span: trace.Span,
+        tensor_frame: bool = False,
     ) -> Response:
         response_headers = {}
         if is_binary:
@@ -320,7 +431,10 @@ class BasetenEndpoints:
             # dict / nested structure).
             if not isinstance(result, bytes):
                 with tracing.section_as_event(span, "binary-serialize"):
-                    result = serialization.truss_msgpack_serialize(result)
+                    if tensor_frame:
+                        result = serialization.truss_tensor_serialize(result)
+                    else:
+                        result = serialization.truss_msgpack_serialize(result)
 
             response_headers["Content-Type"] = "application/octet-stream"
             return Response(content=result, headers=response_headers)
@@ -418,13 +532,11 @@ class TrussServer:
         self._model.setup_polling_for_environment_updates()
 
     async def _shutdown_if_load_fails(self):
-        while not self._model.ready:
-            await asyncio.sleep(0.5)
-            if self._model.load_failed:
-                assert self._server is not None
-                logging.info("Trying shut down after failed model load.")
-                self._server.should_exit = True
-                return
+        await self._model.wait_for_load()
+        if self._model.load_failed:
+            assert self._server is not None
+            logging.info("Trying shut down after failed model load.")
+            self._server.should_exit = True
 
     def create_application(self):
         @contextlib.asynccontextmanager
@@ -451,6 +563,12 @@ class TrussServer:
                     self._endpoints.model_loaded,
                     tags=["V1"],
                 ),
+                FastAPIRoute(
+                    r"/v1/models/{model_name}/startup",
+                    self._endpoints.startup_timeline,
+                    methods=["GET"],
+                    tags=["V1"],
+                ),
                 FastAPIRoute(
                     r"/v1/models/{model_name}/schema",
                     self._endpoints.schema,
@@ -515,6 +633,8 @@ class TrussServer:
                 exc: errors.exception_handler for exc in errors.HANDLED_EXCEPTIONS
             },
         )
+        # Used by `parse_predict_body` to decide whether the body is read upfront.
+        app.state.model = self._model
         # Above `exception_handlers` only triggers on exact exception classes.
         # This here is a fallback to add our custom headers in all other cases.
         app.add_exception_handler(Exception, errors.exception_handler)
@@ -523,6 +643,8 @@ class TrussServer:
         REGISTRY.unregister(process_collector.PROCESS_COLLECTOR)
         REGISTRY.unregister(platform_collector.PLATFORM_COLLECTOR)
         REGISTRY.unregister(gc_collector.GC_COLLECTOR)
+        if self._model.phase_histograms.enabled:
+            REGISTRY.register(self._model.phase_histograms)
         # Disable exporting _created metrics
         metrics.disable_created_metrics()
         # Add prometheus asgi middleware to route /metrics requests
@@ -1,13 +1,22 @@
 import contextvars
 import logging
 import os
+import queue
+import sys
+import threading
 import urllib.parse
 from collections.abc import Mapping
-from typing import Any, Optional
+from typing import IO, Any, Optional
 
 from pythonjsonlogger import json as json_logger
 
 LOCAL_DATE_FORMAT = "%H:%M:%S"
+# Records beyond this many waiting to be written are dropped in queued mode.
+DEFAULT_LOG_QUEUE_SIZE = 10000
+# How long closing a queued handler waits for the remaining records to be written.
+LOG_QUEUE_CLOSE_TIMEOUT_SECS = 5.0
+
+_HEALTH_CHECK_PATHS = frozenset(["/", "/v1/models/model", "/v1/models/model/loaded"])
 
 request_id_context: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
     "request_id", default=None
@@ -21,29 +30,67 @@ def _disable_json_logging() -> bool:
     return bool(os.environ.get("DISABLE_JSON_LOGGING"))
 
 
-class _HealthCheckFilter(logging.Filter):
-    def filter(self, record: logging.LogRecord) -> bool:
-        excluded_paths = {
-            "GET / ",
-            "GET /v1/models/model ",
-            "GET /v1/models/model/loaded ",
-        }
-        msg = record.getMessage()
-        return not any(path in msg for path in excluded_paths)
+def _queued_logging() -> bool:
+    return bool(os.environ.get("TRUSS_QUEUED_LOGGING"))
+
+
+def _log_queue_size() -> int:
+    return int(os.environ.get("TRUSS_LOG_QUEUE_SIZE", DEFAULT_LOG_QUEUE_SIZE))
+
+
+class _MessageFilter(logging.Filter):
+    """Drops noisy records, resolving the message at most once per record.
+
+    Uvicorn access records are checked on their `(addr, method, path, version,
+    status)` args directly, without formatting the message. Their query string is
+    ignored, e.g. for long polls on the loaded endpoint.
+    """
 
+    def __init__(
+        self,
+        health_checks: bool = False,
+        metrics: bool = False,
+        websocket_open: bool = False,
+    ) -> None:
+        super().__init__()
+        self._health_checks = health_checks
+        self._metrics = metrics
+        self._websocket_open = websocket_open
 
-class _WebsocketOpenFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
+        if (
+            record.name == "uvicorn.access"
+            and isinstance(record.args, tuple)
+            and len(record.args) == 5
+        ):
+            _, method, raw_path, _, _ = record.args
+            path = str(raw_path).split("?", 1)[0]
+            if self._health_checks and method == "GET" and path in _HEALTH_CHECK_PATHS:
+                return False
+            return not (self._metrics and "/metrics" in path)
+
         msg = record.getMessage()
+        if self._health_checks and any(
+            f"GET {path} " in msg for path in _HEALTH_CHECK_PATHS
+        ):
+            return False
+        if self._metrics and "/metrics" in msg:
+            return False
         # There is already the line
         # `('172.17.0.1', 54024) - "WebSocket /v1/websocket" [accepted]`
         # So we filter this additional log for open.
-        return "connection open" not in msg
+        if self._websocket_open and "connection open" in msg:
+            return False
+        return True
 
 
-class _MetricsFilter(logging.Filter):
-    def filter(self, record: logging.LogRecord) -> bool:
-        return "/metrics" not in record.getMessage()
+def _request_ids(record: logging.LogRecord) -> tuple[Optional[str], Optional[str]]:
+    # Set by `_QueuedStreamHandler`, the context is not available in its thread.
+    request_id = getattr(record, "request_id", None) or request_id_context.get()
+    chain_request_id = (
+        getattr(record, "chain_request_id", None) or chain_request_id_context.get()
+    )
+    return request_id, chain_request_id
 
 
 class _AccessJsonFormatter(json_logger.JsonFormatter):
@@ -51,9 +98,10 @@ class _AccessJsonFormatter(json_logger.JsonFormatter):
         self, log_record: dict, record: logging.LogRecord, message_dict: dict
     ) -> None:
         super().add_fields(log_record, record, message_dict)
-        if request_id := request_id_context.get():
+        request_id, chain_request_id = _request_ids(record)
+        if request_id:
             log_record["request_id"] = request_id
-        if chain_request_id := chain_request_id_context.get():
+        if chain_request_id:
             log_record["chain_request_id"] = chain_request_id
 
     def format(self, record: logging.LogRecord) -> str:
@@ -77,9 +125,10 @@ class _DefaultJsonFormatter(json_logger.JsonFormatter):
         self, log_record: dict, record: logging.LogRecord, message_dict: dict
     ) -> None:
         super().add_fields(log_record, record, message_dict)
-        if request_id := request_id_context.get():
+        request_id, chain_request_id = _request_ids(record)
+        if request_id:
             log_record["request_id"] = request_id
-        if chain_request_id := chain_request_id_context.get():
+        if chain_request_id:
             log_record["chain_request_id"] = chain_request_id
 
 
@@ -96,6 +145,105 @@ class _AccessFormatter(logging.Formatter):
         return super().format(record)
 
 
+_IMMUTABLE_ARG_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+class _QueuedStreamHandler(logging.Handler):
+    """Formats and writes records to a stream on a dedicated thread.
+
+    `emit` only puts the record into a bounded queue, so logging does not block
+    the event loop on formatting and writes. If the queue is full, the record is
+    dropped and counted. The number of dropped records is written to the stream
+    with the next record that fits.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None, max_size: int = 0) -> None:
+        super().__init__()
+        self._stream = stream or sys.stderr
+        self._queue: queue.Queue[Optional[logging.LogRecord]] = queue.Queue(
+            max_size or _log_queue_size()
+        )
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        self._closed = False
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive a fork, a forked child starts its own.
+        if self._thread is not None and self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread_pid == os.getpid():
+                return
+            self._thread = threading.Thread(
+                target=self._write_records, name="truss-log-writer", daemon=True
+            )
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _prepare(self, record: logging.LogRecord) -> None:
+        if request_id := request_id_context.get():
+            record.request_id = request_id
+        if chain_request_id := chain_request_id_context.get():
+            record.chain_request_id = chain_request_id
+        # Mutable args could change before the writer thread formats the message.
+        args = record.args
+        if args and not (
+            isinstance(args, tuple)
+            and all(isinstance(arg, _IMMUTABLE_ARG_TYPES) for arg in args)
+        ):
+            record.msg = record.getMessage()
+            record.args = ()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._closed:
+            return
+        try:
+            self._prepare(record)
+            self._ensure_thread()
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def _write_records(self) -> None:
+        reported_dropped = 0
+        while (record := self._queue.get()) is not None:
+            try:
+                lines = []
+                if (dropped := self._dropped) != reported_dropped:
+                    lines.append(
+                        f"Dropped {dropped - reported_dropped} log records, the "
+                        "log queue was full."
+                    )
+                    reported_dropped = dropped
+                lines.append(self.format(record))
+                self._stream.write("\n".join(lines) + "\n")
+                if self._queue.empty():
+                    self._stream.flush()
+            except Exception:
+                self.handleError(record)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            if self._thread is not None and self._thread_pid == os.getpid():
+                try:
+                    self._queue.put(None, timeout=LOG_QUEUE_CLOSE_TIMEOUT_SECS)
+                except queue.Full:
+                    pass
+                else:
+                    self._thread.join(timeout=LOG_QUEUE_CLOSE_TIMEOUT_SECS)
+        super().close()
+
+
 def make_log_config(log_level: str) -> Mapping[str, Any]:
     # Warning: `ModelWrapper` depends on correctly setup `uvicorn` logger,
     # if you change/remove that logger, make sure `ModelWrapper` has a suitable
@@ -125,24 +273,34 @@ def make_log_config(log_level: str) -> Mapping[str, Any]:
         }
     )
 
+    # In queued mode, records are formatted and written by a thread per handler.
+    handler_class = (
+        f"{__name__}._QueuedStreamHandler"
+        if _queued_logging()
+        else "logging.StreamHandler"
+    )
     log_config = {
         "version": 1,
         "disable_existing_loggers": False,
         "filters": {
-            "health_check_filter": {"()": _HealthCheckFilter},
-            "websocket_filter": {"()": _WebsocketOpenFilter},
-            "metrics_filter": {"()": _MetricsFilter},
+            "access_filter": {
+                "()": _MessageFilter,
+                "health_checks": True,
+                "metrics": True,
+            },
+            "websocket_filter": {"()": _MessageFilter, "websocket_open": True},
+            "metrics_filter": {"()": _MessageFilter, "metrics": True},
         },
         "formatters": formatters,
         "handlers": {
             "default_handler": {
                 "formatter": "default_formatter",
-                "class": "logging.StreamHandler",
+                "class": handler_class,
                 "stream": "ext://sys.stderr",
             },
             "access_handler": {
                 "formatter": "access_formatter",
-                "class": "logging.StreamHandler",
+                "class": handler_class,
                 "stream": "ext://sys.stdout",
             },
         },
@@ -163,7 +321,7 @@ def make_log_config(log_level: str) -> Mapping[str, Any]:
                 "handlers": ["access_handler"],
                 "level": "INFO",
                 "propagate": False,
-                "filters": ["health_check_filter", "metrics_filter"],
+                "filters": ["access_filter"],
             },
             "httpx": {
                 "handlers": ["default_handler"],
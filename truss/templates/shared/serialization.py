@@ -1,10 +1,14 @@
+import functools
 import json
+import math
+import struct
 import uuid
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 if TYPE_CHECKING:
+    import msgpack
     from numpy.typing import NDArray
 
 
@@ -103,15 +107,235 @@ def truss_msgpack_serialize(obj: MsgPackType) -> bytes:
     )
 
 
-def truss_msgpack_deserialize(data: bytes) -> MsgPackType:
+def truss_msgpack_packer() -> "msgpack.Packer":
+    """Returns a packer that serializes like `truss_msgpack_serialize`, for packing
+    many objects without setting up a packer each time. Not thread-safe."""
+    import msgpack
+    import msgpack_numpy as mp_np
+
+    return msgpack.Packer(
+        default=functools.partial(_truss_msgpack_encoder, chain=mp_np.encode)
+    )
+
+
+def truss_msgpack_deserialize(data: Union[bytes, bytearray, memoryview]) -> MsgPackType:
+    """Deserializes plain msgpack payloads as well as tensor frames.
+
+    Arrays of tensor frames are views into `data`, read-only if `data` is immutable
+    (e.g. `bytes`). Raises `TensorFrameError` for malformed tensor frames.
+    """
     import msgpack
     import msgpack_numpy as mp_np
 
+    if is_tensor_frame(data):
+        return _truss_tensor_deserialize(data)
+
     return msgpack.unpackb(
         data, object_hook=lambda x: _truss_msgpack_decoder(x, chain=mp_np.decode)
     )
 
 
+# Tensor frames are an alternative binary wire format for payloads with large numpy
+# arrays. The msgpack document only holds array metadata (as ext type) and the raw
+# array buffers are appended after it, aligned to `_TENSOR_ALIGNMENT` bytes. This
+# allows writing arrays without joining them into one message and decoding them with
+# `np.frombuffer` as views into the received payload, without copying.
+#
+# Layout: MAGIC | version (u8) | header length (u32 LE) | msgpack header | padding |
+#   aligned array buffers.
+#
+# The magic starts with `0xc1`, which is never used in msgpack, so tensor frames
+# and plain msgpack payloads can be told apart by their first byte.
+TENSOR_FRAME_MAGIC = b"\xc1TNSR"
+_TENSOR_FRAME_VERSION = 1
+_TENSOR_FRAME_PREFIX = struct.Struct("<BI")
+_TENSOR_ALIGNMENT = 64
+_TENSOR_EXT_CODE = 1
+_SCALAR_EXT_CODE = 2
+
+TensorFrameChunks = list[Union[bytes, memoryview]]
+
+
+class TensorFrameError(ValueError):
+    """A tensor frame is malformed, e.g. its buffers exceed the payload."""
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _TENSOR_ALIGNMENT) * _TENSOR_ALIGNMENT
+
+
+def _encode_scalar_ext(obj: Any) -> Optional["msgpack.ExtType"]:
+    import msgpack
+    import numpy as np
+
+    # Special types are encoded as ext types (instead of tagged dicts like in
+    # `_truss_msgpack_encoder`), so that decoding does not need an `object_hook`.
+    if isinstance(obj, datetime):
+        payload: list = ["datetime", obj.isoformat()]
+    elif isinstance(obj, date):
+        payload = ["date", obj.isoformat()]
+    elif isinstance(obj, time):
+        if obj.utcoffset() is not None:
+            raise ValueError("Cannot represent timezone-aware times.")
+        payload = ["time", obj.isoformat()]
+    elif isinstance(obj, timedelta):
+        payload = ["timedelta", [obj.days, obj.seconds, obj.microseconds]]
+    elif isinstance(obj, Decimal):
+        payload = ["decimal", str(obj)]
+    elif isinstance(obj, uuid.UUID):
+        payload = ["uuid", str(obj)]
+    elif isinstance(obj, np.generic) and obj.dtype.kind not in "OV":
+        payload = ["numpy", obj.dtype.str, obj.tobytes()]
+    else:
+        return None
+    return msgpack.ExtType(_SCALAR_EXT_CODE, msgpack.packb(payload))
+
+
+def _decode_scalar_ext(payload: bytes) -> Any:
+    import msgpack
+    import numpy as np
+
+    kind, *data = msgpack.unpackb(payload)
+    if kind == "datetime":
+        return datetime.fromisoformat(data[0])
+    elif kind == "date":
+        return date.fromisoformat(data[0])
+    elif kind == "time":
+        return time.fromisoformat(data[0])
+    elif kind == "timedelta":
+        days, seconds, microseconds = data[0]
+        return timedelta(days=days, seconds=seconds, microseconds=microseconds)
+    elif kind == "decimal":
+        return Decimal(data[0])
+    elif kind == "uuid":
+        return uuid.UUID(data[0])
+    elif kind == "numpy":
+        dtype_str, raw = data
+        return np.frombuffer(raw, dtype=np.dtype(dtype_str))[0]
+    raise ValueError(f"Unknown scalar type in tensor frame: `{kind}`.")
+
+
+def is_tensor_frame(data: Union[bytes, bytearray, memoryview]) -> bool:
+    return bytes(data[: len(TENSOR_FRAME_MAGIC)]) == TENSOR_FRAME_MAGIC
+
+
+def truss_tensor_serialize_chunks(obj: MsgPackType) -> TensorFrameChunks:
+    """Serializes `obj` into a tensor frame, returned as a list of chunks.
+
+    Array chunks are memoryviews of the (contiguous) arrays. The chunks can be written
+    to a socket or request body one by one; joining them yields the complete frame.
+    """
+    import msgpack
+    import numpy as np
+
+    arrays: list[tuple[int, "NDArray"]] = []
+    data_size = 0
+
+    def _default(x: Any) -> Any:
+        nonlocal data_size
+        if isinstance(x, np.ndarray):
+            if x.dtype.kind in "OV":
+                raise TypeError(
+                    f"Arrays of dtype `{x.dtype}` cannot be sent as tensor frames."
+                )
+            # Not `np.ascontiguousarray`, it turns 0-d arrays into 1-d arrays.
+            array = x if x.flags.c_contiguous else x.copy(order="C")
+            offset = _aligned(data_size)
+            data_size = offset + array.nbytes
+            arrays.append((offset, array))
+            meta = [array.dtype.str, list(array.shape), offset, array.nbytes]
+            return msgpack.ExtType(_TENSOR_EXT_CODE, msgpack.packb(meta))
+        ext = _encode_scalar_ext(x)
+        if ext is None:
+            raise TypeError(f"Cannot serialize object of type `{type(x).__name__}`.")
+        return ext
+
+    header = msgpack.packb(obj, default=_default)
+    prefix = TENSOR_FRAME_MAGIC + _TENSOR_FRAME_PREFIX.pack(
+        _TENSOR_FRAME_VERSION, len(header)
+    )
+    header_end = len(prefix) + len(header)
+    chunks: TensorFrameChunks = [prefix, header]
+    position = _aligned(header_end)
+    if arrays:
+        chunks.append(b"\x00" * (position - header_end))
+    data_start = position
+    for offset, array in arrays:
+        if array.nbytes == 0:
+            continue
+        if (padding := data_start + offset - position) > 0:
+            chunks.append(b"\x00" * padding)
+        chunks.append(memoryview(array).cast("B"))
+        position = data_start + offset + array.nbytes
+    return chunks
+
+
+def truss_tensor_serialize(obj: MsgPackType) -> bytes:
+    return b"".join(truss_tensor_serialize_chunks(obj))
+
+
+def _truss_tensor_deserialize(data: Union[bytes, bytearray, memoryview]) -> Any:
+    import msgpack
+    import numpy as np
+
+    view = memoryview(data)
+    header_start = len(TENSOR_FRAME_MAGIC) + _TENSOR_FRAME_PREFIX.size
+    if len(view) < header_start:
+        raise TensorFrameError("Tensor frame is truncated.")
+    version, header_len = _TENSOR_FRAME_PREFIX.unpack_from(
+        view, len(TENSOR_FRAME_MAGIC)
+    )
+    if version != _TENSOR_FRAME_VERSION:
+        raise TensorFrameError(f"Unsupported tensor frame version: {version}.")
+    header_end = header_start + header_len
+    if header_end > len(view):
+        raise TensorFrameError(
+            f"Tensor frame header of {header_len} bytes exceeds the payload."
+        )
+    data_start = _aligned(header_end)
+
+    def _decode_array(payload: bytes) -> "NDArray":
+        dtype_str, shape, offset, nbytes = msgpack.unpackb(payload)
+        dtype = np.dtype(dtype_str)
+        shape = tuple(shape)
+        if dtype.kind in "OV" or any(
+            not isinstance(n, int) or n < 0 for n in (*shape, offset, nbytes)
+        ):
+            raise TensorFrameError(f"Invalid array metadata: {dtype_str}, {shape}.")
+        if nbytes != math.prod(shape) * dtype.itemsize:
+            raise TensorFrameError(
+                f"Array of {nbytes} bytes does not match shape {shape} and dtype "
+                f"`{dtype}`."
+            )
+        if nbytes == 0:
+            return np.empty(shape, dtype=dtype)
+        start = data_start + offset
+        if start + nbytes > len(view):
+            raise TensorFrameError(
+                f"Array buffer at {start}-{start + nbytes} exceeds the payload of "
+                f"{len(view)} bytes."
+            )
+        # A view into `data`, read-only if `data` is immutable.
+        return np.frombuffer(
+            view, dtype=dtype, count=nbytes // dtype.itemsize, offset=start
+        ).reshape(shape)
+
+    def _ext_hook(code: int, payload: bytes) -> Any:
+        if code == _TENSOR_EXT_CODE:
+            return _decode_array(payload)
+        elif code == _SCALAR_EXT_CODE:
+            return _decode_scalar_ext(payload)
+        return msgpack.ExtType(code, payload)
+
+    try:
+        return msgpack.unpackb(view[header_start:header_end], ext_hook=_ext_hook)
+    except TensorFrameError:
+        raise
+    except (ValueError, TypeError) as e:
+        # E.g. invalid msgpack, dtypes or scalars.
+        raise TensorFrameError(f"Invalid tensor frame: {e}") from e
+
+
 class DeepNumpyEncoder(json.JSONEncoder):
     def default(self, obj):
         import numpy as np
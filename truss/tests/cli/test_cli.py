@@ -1,3 +1,4 @@
+import contextlib
 import json
 import threading
 from unittest.mock import MagicMock, Mock, patch
@@ -14,6 +15,13 @@ from truss.remote.baseten.service import BasetenService
 from truss.remote.truss_remote import RemoteUser
 
 
+@contextlib.contextmanager
+def _patch_requests():
+    # The CLI imports `requests` where it is used, so its functions are patched.
+    with patch("requests.get") as get, patch("requests.post") as post:
+        yield Mock(get=get, post=post)
+
+
 def test_push_with_grpc_transport_fails_for_development_deployment():
     mock_truss = Mock()
     mock_truss.spec.config.runtime.transport.kind = "grpc"
@@ -66,7 +74,7 @@ def test_successful_ping_resets_failure_count():
             resp.status_code = 200
         return resp
 
-    with patch("truss.cli.utils.common.requests_lib.get", side_effect=mock_get):
+    with patch("requests.get", side_effect=mock_get):
         with patch("truss.cli.utils.common.console"):
             # Use a very short wait so the test runs fast
             with patch.object(stop_event, "wait", side_effect=lambda timeout: None):
@@ -83,7 +91,7 @@ def test_exits_after_max_consecutive_failures():
     stop_event = threading.Event()
     mock_resp = Mock()
     mock_resp.status_code = 500
-    with patch("truss.cli.utils.common.requests_lib.get", return_value=mock_resp):
+    with patch("requests.get", return_value=mock_resp):
         with patch("truss.cli.utils.common.console") as _mock_console:
             with patch(
                 "truss.cli.utils.common.os._exit",
@@ -103,8 +111,7 @@ def test_request_exception_counts_as_failure():
     stop_event = threading.Event()
 
     with patch(
-        "truss.cli.utils.common.requests_lib.get",
-        side_effect=requests.RequestException("connection error"),
+        "requests.get", side_effect=requests.RequestException("connection error")
     ):
         with patch("truss.cli.utils.common.console"):
             with patch(
@@ -138,7 +145,7 @@ def test_model_not_ready_does_not_count_as_failure():
             resp.status_code = 200
         return resp
 
-    with patch("truss.cli.utils.common.requests_lib.get", side_effect=mock_get):
+    with patch("requests.get", side_effect=mock_get):
         with patch("truss.cli.utils.common.console"):
             with patch(
                 "truss.cli.utils.common.os._exit",
@@ -160,7 +167,7 @@ def test_5xx_errors_count_as_failures():
     mock_resp = Mock()
     mock_resp.status_code = 503  # Service unavailable
 
-    with patch("truss.cli.utils.common.requests_lib.get", return_value=mock_resp):
+    with patch("requests.get", return_value=mock_resp):
         with patch("truss.cli.utils.common.console"):
             with patch(
                 "truss.cli.utils.common.os._exit",
@@ -198,7 +205,7 @@ def test_keepalive_loop_emits_30min_warning():
         return False
 
     with patch("truss.cli.utils.common.time.time", side_effect=mock_time):
-        with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+        with _patch_requests() as mock_requests:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_requests.get.return_value = mock_response
@@ -258,22 +265,31 @@ def _patch_watch_common(
 
     stack = ExitStack()
     stack.enter_context(
-        patch("truss.cli.cli.RemoteFactory.create", return_value=remote_provider)
+        patch(
+            "truss.remote.remote_factory.RemoteFactory.create",
+            return_value=remote_provider,
+        )
     )
     stack.enter_context(
         patch("truss.cli.cli._get_truss_from_directory", return_value=mock_tr)
     )
     stack.enter_context(
         patch(
-            "truss.cli.cli.resolve_model_for_watch",
+            "truss.cli.resolvers.model_team_resolver.resolve_model_for_watch",
             return_value=(resolved_model, versions),
         )
     )
     stack.enter_context(
-        patch("truss.cli.cli.get_dev_version_from_versions", return_value=dev_version)
+        patch(
+            "truss.remote.baseten.core.get_dev_version_from_versions",
+            return_value=dev_version,
+        )
     )
     stack.enter_context(
-        patch("truss.cli.cli.RemoteFactory.get_remote_team", return_value=None)
+        patch(
+            "truss.remote.remote_factory.RemoteFactory.get_remote_team",
+            return_value=None,
+        )
     )
     stack.enter_context(patch("truss.cli.cli.time.sleep"))
     return stack
@@ -289,8 +305,8 @@ def test_watch_sends_wake_request():
     with _patch_watch_common(
         remote_provider, mock_tr, resolved_model, versions, dev_version
     ):
-        # Need to patch requests_lib in common.py now since wake is called from there
-        with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+        # Need to patch requests in common.py now since wake is called from there
+        with _patch_requests() as mock_requests:
             mock_requests.post.return_value = Mock(status_code=202)
             mock_requests.RequestException = requests.RequestException
             with patch("truss.cli.utils.common.start_keepalive"):
@@ -318,7 +334,7 @@ def test_watch_no_sleep_starts_keepalive_thread():
     with _patch_watch_common(
         remote_provider, mock_tr, resolved_model, versions, dev_version
     ):
-        with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+        with _patch_requests() as mock_requests:
             mock_requests.post.return_value = Mock(status_code=202)
             mock_requests.get.return_value = Mock(status_code=200)
             mock_requests.RequestException = requests.RequestException
@@ -350,7 +366,7 @@ def test_keepalive_loop_constructs_correct_url():
         # First call: start_time, subsequent calls: still within duration
         mock_time.side_effect = [0.0, 100.0, 200.0]
 
-        with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+        with _patch_requests() as mock_requests:
             mock_requests.RequestException = requests.RequestException
             mock_response = Mock(status_code=200)
             mock_requests.get.return_value = mock_response
@@ -390,7 +406,7 @@ def test_watch_no_sleep_waits_for_active_status():
     with _patch_watch_common(
         remote_provider, mock_tr, resolved_model, versions, dev_version
     ):
-        with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+        with _patch_requests() as mock_requests:
             mock_requests.post.return_value = Mock(status_code=202)
             mock_requests.get.return_value = Mock(status_code=200)
             mock_requests.RequestException = requests.RequestException
@@ -418,7 +434,7 @@ def test_watch_no_sleep_exits_on_failed_deployment():
     with _patch_watch_common(
         remote_provider, mock_tr, resolved_model, versions, dev_version
     ):
-        with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+        with _patch_requests() as mock_requests:
             mock_requests.post.return_value = Mock(status_code=202)
             mock_requests.RequestException = requests.RequestException
             result = runner.invoke(
@@ -439,7 +455,7 @@ def test_watch_without_no_sleep_does_not_start_thread():
     with _patch_watch_common(
         remote_provider, mock_tr, resolved_model, versions, dev_version
     ):
-        with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+        with _patch_requests() as mock_requests:
             mock_requests.post.return_value = Mock(status_code=202)
             mock_requests.RequestException = requests.RequestException
             with patch(
@@ -472,7 +488,7 @@ def test_watch_with_tail_starts_background_tail():
     with _patch_watch_common(
         remote_provider, mock_tr, resolved_model, versions, dev_version
     ):
-        with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+        with _patch_requests() as mock_requests:
             mock_requests.post.return_value = Mock(status_code=202)
             mock_requests.RequestException = requests.RequestException
             with patch("truss.cli.cli._start_tail") as mock_start_tail:
@@ -494,7 +510,7 @@ def test_keepalive_loop_continues_before_max_duration():
     """Keepalive loop should keep running before 24 hours."""
     stop_event = threading.Event()
 
-    with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+    with _patch_requests() as mock_requests:
         mock_requests.get.return_value = Mock(status_code=200)
         mock_requests.RequestException = requests.RequestException
 
@@ -531,9 +547,12 @@ def test_cli_push_passes_deploy_timeout_minutes_to_create_truss_service(
     mock_create_truss_service,
 ):
     runner = CliRunner()
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             result = runner.invoke(
                 truss_cli,
                 [
@@ -562,9 +581,12 @@ def test_cli_push_passes_none_deploy_timeout_minutes_when_not_specified(
     mock_create_truss_service,
 ):
     runner = CliRunner()
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             result = runner.invoke(
                 truss_cli,
                 [
@@ -591,9 +613,12 @@ def test_cli_push_integration_deploy_timeout_minutes_propagated(
     mock_create_truss_service,
 ):
     runner = CliRunner()
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             result = runner.invoke(
                 truss_cli,
                 [
@@ -630,7 +655,7 @@ def test_cli_push_api_integration_deploy_timeout_minutes_propagated(
 
     runner = CliRunner()
     with patch(
-        "truss.cli.cli.RemoteFactory.get_available_config_names",
+        "truss.remote.remote_factory.RemoteFactory.get_available_config_names",
         return_value=["baseten"],
     ):
         result = runner.invoke(
@@ -689,7 +714,10 @@ def test_whoami_with_show_oidc():
 
     with patch("truss.cli.remote_cli.inquire_remote_name", return_value="baseten"):
         with patch("truss.api.whoami", return_value=mock_user):
-            with patch("truss.cli.cli.RemoteFactory.create", return_value=mock_remote):
+            with patch(
+                "truss.remote.remote_factory.RemoteFactory.create",
+                return_value=mock_remote,
+            ):
                 result = runner.invoke(
                     truss_cli, ["whoami", "--remote", "baseten", "--show-oidc"]
                 )
@@ -713,9 +741,12 @@ def test_push_defaults_to_published(
 ):
     """Test that push defaults to published deployment (is_draft=False)."""
     runner = CliRunner()
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             result = runner.invoke(
                 truss_cli,
                 [
@@ -747,9 +778,12 @@ def test_push_no_cache_sets_build_no_cache_on_config(
     mock_service.logs_url = "https://example.com/logs"
     remote.push = Mock(return_value=mock_service)
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             result = runner.invoke(
                 truss_cli,
                 [
@@ -782,9 +816,12 @@ def test_push_without_no_cache_leaves_build_no_cache_false(
     mock_service.logs_url = "https://example.com/logs"
     remote.push = Mock(return_value=mock_service)
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             result = runner.invoke(
                 truss_cli,
                 [
@@ -812,9 +849,12 @@ def test_push_publish_flag_shows_deprecation_warning(
 ):
     """Test that --publish flag shows deprecation warning."""
     runner = CliRunner()
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             result = runner.invoke(
                 truss_cli,
                 [
@@ -849,9 +889,12 @@ def test_push_watch_creates_development_deployment(
     mock_service.poll_deployment.return_value = iter([{"status": "MODEL_READY"}])
     remote.push = Mock(return_value=mock_service)
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             with patch.object(remote, "sync_truss_to_dev_version_by_name"):
                 _result = runner.invoke(
                     truss_cli,
@@ -966,10 +1009,16 @@ def test_push_watch_with_tail_starts_background_tail(
         )
     )
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
-            with patch("truss.cli.cli.resolve_model_for_watch", mock_resolve):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
+            with patch(
+                "truss.cli.resolvers.model_team_resolver.resolve_model_for_watch",
+                mock_resolve,
+            ):
                 with patch("truss.cli.cli._start_watch_mode"):
                     with patch("truss.cli.cli._start_tail") as mock_start_tail:
                         result = runner.invoke(
@@ -1084,10 +1133,16 @@ def test_push_watch_no_sleep_starts_keepalive(
     mock_start_watch = Mock()
     mock_start_keepalive = Mock()
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
-            with patch("truss.cli.cli.resolve_model_for_watch", mock_resolve):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
+            with patch(
+                "truss.cli.resolvers.model_team_resolver.resolve_model_for_watch",
+                mock_resolve,
+            ):
                 with patch("truss.cli.cli._start_watch_mode", mock_start_watch):
                     with patch(
                         "truss.cli.cli.common.start_keepalive", mock_start_keepalive
@@ -1130,9 +1185,12 @@ def test_push_wait_with_tail_starts_background_tail(
     mock_service.poll_deployment.return_value = iter([{"status": "ACTIVE"}])
     remote.push = Mock(return_value=mock_service)
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             with patch("truss.cli.cli._start_tail") as mock_start_tail:
                 result = runner.invoke(
                     truss_cli,
@@ -1186,10 +1244,16 @@ def test_push_watch_enters_watch_mode_on_deploying_status(
     )
     mock_start_watch = Mock()
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
-            with patch("truss.cli.cli.resolve_model_for_watch", mock_resolve):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
+            with patch(
+                "truss.cli.resolvers.model_team_resolver.resolve_model_for_watch",
+                mock_resolve,
+            ):
                 with patch("truss.cli.cli._start_watch_mode", mock_start_watch):
                     with patch("truss.cli.cli.common.start_keepalive"):
                         result = runner.invoke(
@@ -1227,9 +1291,12 @@ def test_push_watch_still_exits_on_deploy_failed(
     )
     remote.push = Mock(return_value=mock_service)
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             result = runner.invoke(
                 truss_cli,
                 [
@@ -1256,9 +1323,12 @@ def test_push_with_model_name_flag_does_not_write_to_config(
 ):
     """--model-name should be used for the push but not written back to config.yaml."""
     runner = CliRunner()
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             with patch(
                 "truss.base.truss_config.TrussConfig.write_to_yaml_file"
             ) as mock_write:
@@ -1294,9 +1364,11 @@ def test_watch_model_name_flag_overrides_config(
     with _patch_watch_common(
         remote_provider, mock_tr, resolved_model, versions, dev_version
     ):
-        with patch("truss.cli.cli.resolve_model_for_watch") as mock_resolve:
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_for_watch"
+        ) as mock_resolve:
             mock_resolve.return_value = (resolved_model, versions)
-            with patch("truss.cli.utils.common.requests_lib") as mock_requests:
+            with _patch_requests() as mock_requests:
                 mock_requests.post.return_value = Mock(status_code=202)
                 mock_requests.RequestException = __import__("requests").RequestException
                 with patch("truss.cli.utils.common.start_keepalive"):
@@ -1348,9 +1420,12 @@ def _invoke_push_json(runner, truss_dir, remote, extra_args=None):
     if extra_args:
         args.extend(extra_args)
 
-    with patch("truss.cli.cli.RemoteFactory.create", return_value=remote):
+    with patch("truss.remote.remote_factory.RemoteFactory.create", return_value=remote):
         remote.api.get_teams = Mock(return_value={})
-        with patch("truss.cli.cli.resolve_model_team_name", return_value=(None, None)):
+        with patch(
+            "truss.cli.resolvers.model_team_resolver.resolve_model_team_name",
+            return_value=(None, None),
+        ):
             return runner.invoke(truss_cli, args)
 
 
@@ -1486,9 +1561,11 @@ def test_download_allows_existing_empty_dir(tmp_path):
     mock_response = MagicMock()
     mock_response.raw = MagicMock()
     with (
-        patch("truss.cli.cli.RemoteFactory.create", return_value=mock_remote),
+        patch(
+            "truss.remote.remote_factory.RemoteFactory.create", return_value=mock_remote
+        ),
         patch("truss.cli.remote_cli.inquire_remote_name", return_value="remote1"),
-        patch("truss.cli.cli.requests.get", return_value=mock_response),
+        patch("requests.get", return_value=mock_response),
         patch("truss.cli.cli.tarfile.open"),
     ):
         result = _invoke_download(
@@ -1514,7 +1591,9 @@ def test_model_config_text_prefers_raw():
         {"config": {"model_name": "foo"}, "raw_config": "model_name: foo  # neat\n"}
     )
     with (
-        patch("truss.cli.cli.RemoteFactory.create", return_value=mock_remote),
+        patch(
+            "truss.remote.remote_factory.RemoteFactory.create", return_value=mock_remote
+        ),
         patch("truss.cli.remote_cli.inquire_remote_name", return_value="remote1"),
     ):
         result = _invoke_model_config(["--model-id", "m", "--deployment-id", "d"])
@@ -1528,7 +1607,9 @@ def test_model_config_text_falls_back_to_parsed_when_raw_null():
         {"config": {"model_name": "foo", "resources": {"cpu": "1"}}, "raw_config": None}
     )
     with (
-        patch("truss.cli.cli.RemoteFactory.create", return_value=mock_remote),
+        patch(
+            "truss.remote.remote_factory.RemoteFactory.create", return_value=mock_remote
+        ),
         patch("truss.cli.remote_cli.inquire_remote_name", return_value="remote1"),
     ):
         result = _invoke_model_config(["--model-id", "m", "--deployment-id", "d"])
@@ -1544,7 +1625,9 @@ def test_model_config_text_falls_back_to_parsed_when_raw_null():
 def test_model_config_text_with_empty_config_and_no_raw():
     mock_remote = _patch_model_config_remote({"config": {}, "raw_config": None})
     with (
-        patch("truss.cli.cli.RemoteFactory.create", return_value=mock_remote),
+        patch(
+            "truss.remote.remote_factory.RemoteFactory.create", return_value=mock_remote
+        ),
         patch("truss.cli.remote_cli.inquire_remote_name", return_value="remote1"),
     ):
         result = _invoke_model_config(["--model-id", "m", "--deployment-id", "d"])
@@ -1559,7 +1642,9 @@ def test_model_config_json_output():
     response = {"config": {"model_name": "foo"}, "raw_config": "model_name: foo\n"}
     mock_remote = _patch_model_config_remote(response)
     with (
-        patch("truss.cli.cli.RemoteFactory.create", return_value=mock_remote),
+        patch(
+            "truss.remote.remote_factory.RemoteFactory.create", return_value=mock_remote
+        ),
         patch("truss.cli.remote_cli.inquire_remote_name", return_value="remote1"),
     ):
         result = _invoke_model_config(
@@ -1573,7 +1658,9 @@ def test_model_config_json_output_on_error():
     mock_remote = MagicMock()
     mock_remote.api.get_deployment_config.side_effect = RuntimeError("boom")
     with (
-        patch("truss.cli.cli.RemoteFactory.create", return_value=mock_remote),
+        patch(
+            "truss.remote.remote_factory.RemoteFactory.create", return_value=mock_remote
+        ),
         patch("truss.cli.remote_cli.inquire_remote_name", return_value="remote1"),
     ):
         result = _invoke_model_config(
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+
+import pytest
+import rich_click as click
+
+from truss.base.truss_config import ModelServer
+from truss.cli import cli
+from truss.cli.cli import truss_cli
+from truss.cli.utils.lazy_group import _import_command
+
+# Modules that must only be imported when a command that needs them runs.
+HEAVY_MODULES = {
+    "boto3",
+    "google.cloud.storage",
+    "InquirerPy",
+    "requests",
+    "yaml",
+    "truss.api",
+    "truss.base.truss_config",
+    "truss.cli.chains_commands",
+    "truss.cli.train_commands",
+    "truss.remote.baseten.remote",
+}
+
+
+def _imports(args: tuple) -> set[str]:
+    """Modules imported when running the CLI with `args`."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "from truss.cli.cli import truss_cli; truss_cli()",
+            *args,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+
+
+# Wall-clock import times are too noisy to assert on, the heavy modules that are
+# not imported are what makes the CLI start fast.
+@pytest.mark.parametrize("args", [("--help",), ("predict", "--help")])
+def test_cli_import_time(args):
+    assert not HEAVY_MODULES & _imports(args)
+
+
+def test_lazy_subcommands():
+    for name, (import_path, short_help) in truss_cli.lazy_subcommands.items():
+        command = _import_command(import_path)
+        assert command.name == name
+        assert command.help.splitlines()[0] == short_help
+        with click.Context(truss_cli) as ctx:
+            assert truss_cli.get_command(ctx, name) is command
+
+
+def test_model_server_choices():
+    assert cli._MODEL_SERVERS == [server.value for server in ModelServer]
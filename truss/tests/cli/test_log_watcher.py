@@ -0,0 +1,70 @@
+from typing import Any, List, Optional
+from unittest.mock import MagicMock, patch
+
+from truss.cli.logs.base_watcher import CLOCK_SKEW_BUFFER_MS, LogWatcher
+
+
+class FakeLogWatcher(LogWatcher):
+    def __init__(self, logs: List[dict]):
+        super().__init__(MagicMock())
+        self.logs = logs
+
+    def fetch_logs(
+        self, start_epoch_millis: Optional[int], end_epoch_millis: Optional[int]
+    ) -> List[Any]:
+        start_ns = (start_epoch_millis or 0) * 1_000_000
+        return [log for log in self.logs if int(log["timestamp"]) >= start_ns]
+
+    def before_polling(self) -> None:
+        pass
+
+    def after_polling(self) -> None:
+        pass
+
+    def should_poll_again(self) -> bool:
+        return False
+
+    def post_poll(self) -> None:
+        pass
+
+
+def _log(time_ms: int, message: str, replica: str = "r1") -> dict:
+    return {
+        "timestamp": str(time_ms * 1_000_000),
+        "message": message,
+        "replica": replica,
+    }
+
+
+def _poll(watcher: LogWatcher, now_ms: int) -> List[str]:
+    with patch("truss.cli.logs.base_watcher.time.time", return_value=now_ms / 1000):
+        return [log.message for log in watcher.poll()]
+
+
+def test_log_watcher_deduplicates_overlapping_polls():
+    start_ms = 1_000_000_000
+    watcher = FakeLogWatcher(
+        [_log(start_ms, "a"), _log(start_ms, "b"), _log(start_ms, "a", replica="r2")]
+    )
+    assert _poll(watcher, start_ms + 1000) == ["a", "b", "a"]
+
+    watcher.logs.append(_log(start_ms + 1500, "c"))
+    assert _poll(watcher, start_ms + 2000) == ["c"]
+    assert len(watcher._recent_logs) == 4
+
+
+def test_log_watcher_prunes_logs_outside_overlap_window():
+    start_ms = 1_000_000_000
+    watcher = FakeLogWatcher([_log(start_ms, "old")])
+    assert _poll(watcher, start_ms + 1000) == ["old"]
+
+    later_ms = start_ms + 3 * CLOCK_SKEW_BUFFER_MS
+    watcher.logs = [_log(later_ms, "new")]
+    assert _poll(watcher, later_ms + 1000) == ["new"]
+    assert len(watcher._recent_logs) == 1
+
+
+def test_log_watchers_do_not_share_state():
+    logs = [_log(1_000_000_000, "a")]
+    assert _poll(FakeLogWatcher(logs), 1_000_001_000) == ["a"]
+    assert _poll(FakeLogWatcher(logs), 1_000_001_000) == ["a"]
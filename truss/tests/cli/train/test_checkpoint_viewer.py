@@ -18,10 +18,12 @@ from truss.cli.train.checkpoint_viewer import (
     TensorSummary,
     _build_directory_listing,
     _build_explorer_choices,
+    _build_file_tree,
     _explore_files,
     _fetch_and_display_file,
     _fetch_safetensor_header,
     _highlight_content,
+    _list_directory,
     _select_checkpoint,
     _view_safetensor_file,
     view_checkpoint_list,
@@ -328,6 +330,33 @@ def test_build_directory_listing_aggregates_size():
     assert len(dir_files) == 0
 
 
+def test_build_directory_listing_file_at_directory_path():
+    files = [
+        {"_rel_path": "rank-0", "size_bytes": 7},
+        {"_rel_path": "rank-0/a.bin", "size_bytes": 1000},
+    ]
+    dirs, dir_files = _build_directory_listing(files, "")
+    assert dirs == [{"name": "rank-0", "total_size": 1000, "file_count": 1}]
+    assert dir_files == [files[0]]
+
+
+def test_list_directory():
+    files = [
+        {"_rel_path": "ckpt-001/rank-0/a.bin", "size_bytes": 1000},
+        {"_rel_path": "ckpt-001/rank-0/b.bin", "size_bytes": 2000},
+        {"_rel_path": "ckpt-001/config.json", "size_bytes": 100},
+    ]
+    file_tree = _build_file_tree(files)
+
+    dirs, dir_files = _list_directory(file_tree, "ckpt-001")
+    assert dirs == [{"name": "rank-0", "total_size": 3000, "file_count": 2}]
+    assert dir_files == [files[2]]
+    dirs, dir_files = _list_directory(file_tree, "ckpt-001/rank-0")
+    assert dirs == []
+    assert dir_files == files[:2]
+    assert _list_directory(file_tree, "missing") == ([], [])
+
+
 # ---------------------------------------------------------------------------
 # _build_explorer_choices
 # ---------------------------------------------------------------------------
@@ -0,0 +1,44 @@
+from truss.cli.train.file_tree import FileTree
+
+
+def _tree(paths_and_sizes: dict) -> FileTree:
+    return FileTree(paths_and_sizes.items(), path=lambda e: e[0], size=lambda e: e[1])
+
+
+def test_file_tree_aggregates_sizes_and_counts():
+    tree = _tree(
+        {
+            "rank-0/weights.bin": 1000,
+            "rank-0/sub/deep.bin": 500,
+            "rank-0/sub/deeper/a.bin": 10,
+            "rank-1/data.bin": 300,
+            "args.json": 20,
+        }
+    )
+
+    root = tree[""]
+    assert root.total_size == 1830
+    assert root.file_count == 5
+    assert list(root.children) == ["rank-0", "rank-1"]
+    assert root.entries == [("args.json", 20)]
+    assert tree["rank-0"].total_size == 1510
+    assert tree["rank-0"].file_count == 3
+    assert tree["rank-0/sub"].total_size == 510
+    assert tree["rank-0/sub"].parent is tree["rank-0"]
+    assert tree["rank-0/sub/deeper"].depth == 3
+    assert tree.height == 4
+    assert tree.get("rank-2") is None
+    assert tree.get("args.json") is None
+
+
+def test_file_tree_absolute_paths():
+    tree = _tree(
+        {"/": 1, "/root": 4, "/root/file.txt": 100, "/root/subdir/file.txt": 200}
+    )
+
+    assert tree["/"].total_size == 304
+    assert tree["/"].parent is None
+    assert tree["/root"].total_size == 300
+    assert list(tree["/root"].children) == ["subdir"]
+    assert tree.get("") is None
+    assert len(tree) == 3
@@ -1,11 +1,15 @@
+import os
 import random
 import string
 from pathlib import Path
 from typing import Callable, List
+from unittest.mock import patch
 
 import pytest
 
+from truss.truss_handle.patch.dir_signature import directory_content_signature
 from truss.truss_handle.patch.hash import (
+    FileHashCache,
     directory_content_hash,
     file_content_hash,
     file_content_hash_str,
@@ -161,6 +165,79 @@ def test_file_content_hash_str(tmp_path):
     assert final_hash == orig_hash
 
 
+def _make_old(file: Path):
+    # Recently modified files are not cached, as they could still change within the
+    # same mtime granularity.
+    os.utime(file, (1_600_000_000, 1_600_000_000))
+
+
+def test_file_hash_cache_only_rehashes_changed_files(tmp_path, dir_hash_test_dir):
+    files = [
+        dir_hash_test_dir / "target_file",
+        dir_hash_test_dir / "subdir" / "subdir_file",
+    ]
+    for file in files:
+        _make_old(file)
+    cache_file = tmp_path / "cache" / "hashes.json"
+    expected_hash = directory_content_hash(dir_hash_test_dir)
+
+    cache = FileHashCache(cache_file)
+    assert directory_content_hash(dir_hash_test_dir, cache=cache) == expected_hash
+    cache.save()
+
+    with patch(
+        "truss.truss_handle.patch.hash.file_content_hash_str",
+        wraps=file_content_hash_str,
+    ) as hash_mock:
+        cache = FileHashCache(cache_file)
+        assert directory_content_hash(dir_hash_test_dir, cache=cache) == expected_hash
+        assert hash_mock.call_count == 0
+
+        _update_file_content(files[0], content="changed")
+        _make_old(files[0])
+        cache = FileHashCache(cache_file)
+        changed_hash = directory_content_hash(dir_hash_test_dir, cache=cache)
+        assert changed_hash != expected_hash
+        assert [call.args[0] for call in hash_mock.call_args_list] == [
+            files[0].absolute()
+        ]
+        assert changed_hash == directory_content_hash(dir_hash_test_dir)
+
+
+def test_file_hash_cache_skips_recently_modified_files(tmp_path):
+    file = tmp_path / "file"
+    _update_file_content(file)
+    cache = FileHashCache(tmp_path / "hashes.json")
+    assert cache.file_hashes(tmp_path, ["file"]) == {
+        "file": file_content_hash_str(file)
+    }
+    cache.save()
+    assert not (tmp_path / "hashes.json").exists()
+
+
+def test_file_hash_cache_hashes_large_files_in_parallel(tmp_path):
+    names = [f"file{i}" for i in range(4)]
+    for name in names:
+        _update_file_content(tmp_path / name, _generate_random_string(2 * 1024 * 1024))
+    (tmp_path / "dir").mkdir()
+    assert FileHashCache().file_hashes(tmp_path, names + ["dir"]) == {
+        name: file_content_hash_str(tmp_path / name) for name in names
+    }
+
+
+def test_file_hash_cache_skips_dangling_symlinks(dir_hash_test_dir):
+    # Like directories, only the path of a dangling symlink is hashed.
+    (dir_hash_test_dir / "dangling").mkdir()
+    expected_hash = directory_content_hash(dir_hash_test_dir)
+    (dir_hash_test_dir / "dangling").rmdir()
+    (dir_hash_test_dir / "dangling").symlink_to(dir_hash_test_dir / "missing")
+
+    assert FileHashCache().file_hashes(dir_hash_test_dir, ["dangling"]) == {}
+    assert directory_content_hash(dir_hash_test_dir) == expected_hash
+    signature = directory_content_signature(dir_hash_test_dir)
+    assert signature["dangling"] is None
+
+
 def _verify_with_dir_modification(
     target_dir: Path,
     op: Callable[[Path], Path],
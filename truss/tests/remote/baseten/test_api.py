@@ -623,7 +623,9 @@ def test_fetch_log_batch(baseten_api):
 
     assert result == mock_logs
     mock_rest_client.post.assert_called_with(
-        "v1/training_projects/project-123/jobs/job-456/logs", body=query_params
+        "v1/training_projects/project-123/jobs/job-456/logs",
+        body=query_params,
+        session=None,
     )
 
 
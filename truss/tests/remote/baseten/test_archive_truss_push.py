@@ -1,11 +1,16 @@
+import gzip
+import io
 import shutil
 import tarfile
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
 import yaml
 
 from truss.base.constants import CONFIG_FILE
 from truss.remote.baseten.core import archive_dir
+from truss.remote.baseten.utils import transfer
 from truss.truss_handle.truss_handle import TrussHandle
 
 
@@ -40,3 +45,97 @@ def test_archive_dir_injects_config_yaml_override(
         assert member.read() == expected_bytes
 
     assert yaml.safe_load(expected_bytes)["model_name"] == "from_alternate_config"
+
+
+def _tar_contents(fileobj) -> dict:
+    fileobj.seek(0)
+    with tarfile.open(fileobj=fileobj, mode="r:") as tar:
+        return {
+            member.name: tar.extractfile(member).read()  # type: ignore[union-attr]
+            for member in tar.getmembers()
+        }
+
+
+class _FakeS3Client:
+    def __init__(self, fail_part: int = 0) -> None:
+        self.parts: dict = {}
+        self.completed = None
+        self.aborted = False
+        self._fail_part = fail_part
+
+    def create_multipart_upload(self, Bucket, Key):
+        return {"UploadId": "upload-id"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self._fail_part:
+            raise RuntimeError("Upload failed.")
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed = b"".join(
+            self.parts[part["PartNumber"]] for part in MultipartUpload["Parts"]
+        )
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_stream_tar_upload(
+    tmp_path: Path, test_data_path: Path, compression: str
+) -> None:
+    truss_dir = tmp_path / "truss"
+    shutil.copytree(test_data_path / "test_basic_truss", truss_dir)
+    (truss_dir / "data").mkdir(exist_ok=True)
+    (truss_dir / "data" / "weights.bin").write_bytes(
+        bytes(range(256)) * 60_000 + b"\x00" * 4_000_000
+    )
+    override = b"model_name: overridden\n"
+    client = _FakeS3Client()
+
+    with patch.object(transfer.boto3, "client", return_value=client):
+        size = transfer.stream_tar_upload(
+            truss_dir,
+            "bucket",
+            "key",
+            {},
+            config_yaml_override=override,
+            compression=compression,
+            part_size=transfer.MIN_PART_SIZE,
+        )
+
+    assert client.completed is not None and len(client.completed) == size
+    if compression == "none":
+        # Uploaded in several parts while packing.
+        assert len(client.parts) > 1
+    archive = archive_dir(truss_dir, config_yaml_override=override)
+    expected = _tar_contents(archive.file)
+    uploaded = _decompress(client.completed, compression)
+    assert _tar_contents(io.BytesIO(uploaded)) == expected
+
+
+def test_stream_tar_upload_aborts_on_failure(
+    tmp_path: Path, test_data_path: Path
+) -> None:
+    truss_dir = tmp_path / "truss"
+    shutil.copytree(test_data_path / "test_basic_truss", truss_dir)
+    (truss_dir / "data").mkdir(exist_ok=True)
+    (truss_dir / "data" / "weights.bin").write_bytes(
+        b"\x01" * 3 * transfer.MIN_PART_SIZE
+    )
+    client = _FakeS3Client(fail_part=1)
+
+    with patch.object(transfer.boto3, "client", return_value=client):
+        with pytest.raises(RuntimeError, match="Upload failed."):
+            transfer.stream_tar_upload(
+                truss_dir, "bucket", "key", {}, part_size=transfer.MIN_PART_SIZE
+            )
+    assert client.aborted
+    assert client.completed is None
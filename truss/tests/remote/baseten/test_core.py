@@ -1,4 +1,8 @@
+import contextlib
+import http.server
 import json
+import threading
+import time
 from tempfile import NamedTemporaryFile
 from unittest import mock
 from unittest.mock import MagicMock
@@ -10,8 +14,10 @@ from truss.base.constants import PRODUCTION_ENVIRONMENT_NAME
 from truss.base.errors import ValidationError
 from truss.remote.baseten import core
 from truss.remote.baseten import custom_types as b10_types
+from truss.remote.baseten.api import BasetenApi
 from truss.remote.baseten.core import (
     MAX_BATCH_SIZE,
+    ConcurrentTrainingLogsFetcher,
     create_bis_llm_service,
     create_truss_service,
     get_training_job_logs_with_pagination,
@@ -896,6 +902,187 @@ def test_get_training_job_logs_with_pagination_default_batch_size(baseten_api):
     assert query_params["limit"] == MAX_BATCH_SIZE
 
 
+class _FakeLogApi(http.server.ThreadingHTTPServer):
+    """Local training job logs endpoint that serves `logs` like the API, rejecting
+    requests with a limit above `max_batch_size` or a start time at or after
+    `fail_from_millis` with a server error."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        logs: list,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        fail_from_millis: float = float("inf"),
+        latency_secs: float = 0.0,
+    ):
+        super().__init__(("localhost", 0), _FakeLogApiHandler)
+        self.logs = logs
+        self.max_batch_size = max_batch_size
+        self.fail_from_millis = fail_from_millis
+        self.latency_secs = latency_secs
+        self.queries: list = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def fetch_logs(self, query: dict) -> list:
+        with self.lock:
+            self.queries.append(query)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency_secs)
+            start, end = query["start_epoch_millis"], query["end_epoch_millis"]
+            assert end - start <= core.LOG_WINDOW_MILLIS
+            if query["limit"] > self.max_batch_size or start >= self.fail_from_millis:
+                raise ValueError("Too many logs requested.")
+            # The end time is inclusive.
+            return [log for log in self.logs if start <= _millis(log) <= end][
+                : query["limit"]
+            ]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class _FakeLogApiHandler(http.server.BaseHTTPRequestHandler):
+    server: _FakeLogApi
+
+    def do_POST(self):
+        query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        try:
+            status, body = 200, {"logs": self.server.fetch_logs(query)}
+        except ValueError as e:
+            status, body = 503, {"message": str(e)}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _millis(log: dict) -> int:
+    return int(log["timestamp"]) // core.NANOSECONDS_PER_MILLISECOND
+
+
+def _make_logs(start_millis: int, offsets_minutes: list) -> list:
+    return [
+        {
+            "timestamp": str((start_millis + offset * 60_000) * 1_000_000),
+            "message": f"Log {i}",
+            "replica": f"node-{i % 2}",
+        }
+        for i, offset in enumerate(offsets_minutes)
+    ]
+
+
+@contextlib.contextmanager
+def _fake_log_api(mock_auth_service, logs: list, **kwargs):
+    server = _FakeLogApi(logs, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        api = BasetenApi("https://app.test.com", mock_auth_service)
+        api._rest_api_client.base_url = f"http://localhost:{server.server_port}"
+        api.get_training_job = mock.Mock(
+            return_value={
+                "training_job": {
+                    "created_at": "2022-01-01T00:00:00Z",
+                    "updated_at": "2022-01-01T09:30:00Z",
+                    "current_status": "TRAINING_JOB_COMPLETED",
+                }
+            }
+        )
+        yield api, server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+# Every 7 minutes for 4 hours, including a log on the first window boundary, and
+# after a gap of more than one window.
+_LOG_OFFSETS_MINUTES = [*range(0, 4 * 60, 7), 120, 7 * 60 + 1, 9 * 60 + 20]
+
+
+def _fetch_concurrently(api, **kwargs) -> list:
+    fetcher = ConcurrentTrainingLogsFetcher(api, "project-123", "job-456", **kwargs)
+    return [log for batch_logs in fetcher for log in batch_logs]
+
+
+def test_concurrent_training_logs_fetcher(mock_auth_service):
+    created_at = iso_to_millis("2022-01-01T00:00:00Z")
+    logs = sorted(_make_logs(created_at, _LOG_OFFSETS_MINUTES), key=_millis)
+
+    with _fake_log_api(mock_auth_service, logs, latency_secs=0.05) as (api, server):
+        result = _fetch_concurrently(api, batch_size=10, max_workers=3)
+
+    assert result == logs
+    assert 1 < server.max_in_flight <= 3
+    # 9.5 hours of job and 5 minutes of grace for log ingestion in 2 hour windows.
+    window_starts = {
+        query["start_epoch_millis"]
+        for query in server.queries
+        if (query["start_epoch_millis"] - created_at) % core.LOG_WINDOW_MILLIS == 0
+    }
+    assert len(window_starts) == 5
+
+
+def test_concurrent_training_logs_fetcher_backs_off_per_window(mock_auth_service):
+    created_at = iso_to_millis("2022-01-01T00:00:00Z")
+    logs = sorted(_make_logs(created_at, _LOG_OFFSETS_MINUTES), key=_millis)
+
+    with _fake_log_api(mock_auth_service, logs, max_batch_size=200) as (api, server):
+        result = _fetch_concurrently(api, batch_size=1000)
+
+    assert result == logs
+    limits = [query["limit"] for query in server.queries]
+    # Each of the 5 windows backs off from 1000 to 125 on its own.
+    assert limits.count(1000) == limits.count(500) == limits.count(250) == 5
+    assert set(limits) == {1000, 500, 250, 125}
+
+
+def test_concurrent_training_logs_fetcher_stops_at_failed_window(mock_auth_service):
+    created_at = iso_to_millis("2022-01-01T00:00:00Z")
+    logs = sorted(_make_logs(created_at, _LOG_OFFSETS_MINUTES), key=_millis)
+    fail_from_millis = created_at + 2 * core.LOG_WINDOW_MILLIS
+
+    with _fake_log_api(mock_auth_service, logs, fail_from_millis=fail_from_millis) as (
+        api,
+        _,
+    ):
+        result = _fetch_concurrently(api, batch_size=core.MIN_BATCH_SIZE)
+
+    # Logs after the failed window are dropped rather than returned with a gap.
+    assert result == [log for log in logs if _millis(log) < fail_from_millis]
+
+
+def test_training_job_log_range():
+    created_at = iso_to_millis("2022-01-01T00:00:00Z")
+    updated_at = iso_to_millis("2022-01-02T00:00:00Z")
+    training_job = {
+        "created_at": "2022-01-01T00:00:00Z",
+        "updated_at": "2022-01-02T00:00:00Z",
+        "current_status": "TRAINING_JOB_COMPLETED",
+    }
+    assert core._training_job_log_range(training_job) == (
+        created_at,
+        updated_at + core.LOG_INGESTION_GRACE_MILLIS,
+    )
+
+    training_job["current_status"] = "TRAINING_JOB_RUNNING"
+    with mock.patch("time.time", return_value=updated_at / 1000 + 60):
+        assert core._training_job_log_range(training_job) == (
+            created_at,
+            updated_at + 60_000,
+        )
+
+
 def test_create_truss_service_passes_deploy_timeout_minutes():
     """Test that deploy_timeout_minutes is passed through to create_model_version_from_truss"""
     api = MagicMock()
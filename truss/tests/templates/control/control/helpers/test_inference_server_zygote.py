@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import signal
+import sys
+
+import pytest
+import yaml
+
+from truss.tests.templates.control.control.conftest import setup_control_imports
+
+setup_control_imports()
+
+from helpers.inference_server_zygote import (  # noqa: E402
+    ZYGOTE_SCRIPT,
+    InferenceServerZygote,
+)
+
+MAIN_PY = """
+import json
+import os
+import sys
+import time
+
+with open("out.json", "w") as f:
+    json.dump(
+        {
+            "marker": os.environ["MARKER"],
+            "cwd": os.getcwd(),
+            "argv": sys.argv,
+            "yaml_preloaded": "yaml" in sys.modules,
+            "sys_path": sys.path,
+        },
+        f,
+    )
+time.sleep(float(os.environ.get("SLEEP_SECS", "0")))
+sys.exit(int(os.environ.get("EXIT_CODE", "0")))
+"""
+
+
+@pytest.fixture
+def home(tmp_path):
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump({"requirements": ["PyYAML"]}))
+    (tmp_path / "main.py").write_text(MAIN_PY)
+    return tmp_path
+
+
+@pytest.fixture
+def zygote(home):
+    zygote = InferenceServerZygote(sys.executable, home, logging.getLogger())
+    try:
+        yield zygote
+    finally:
+        zygote.reset()
+
+
+def test_fork_runs_main_with_preloaded_imports(home, zygote):
+    for i in range(2):
+        env = {**os.environ, "MARKER": str(i), "EXIT_CODE": str(i)}
+        process = zygote.fork(["main.py", "--flag"], env)
+        assert process.wait() == i
+
+        out = json.loads((home / "out.json").read_text())
+        # Like running `python main.py` in the home directory.
+        sys_path = out.pop("sys_path")
+        assert sys_path[0] == str(home)
+        assert str(ZYGOTE_SCRIPT.parent) not in sys_path
+        assert out == {
+            "marker": str(i),
+            "cwd": str(home),
+            "argv": ["main.py", "--flag"],
+            "yaml_preloaded": True,
+        }
+
+
+def test_terminate(zygote):
+    process = zygote.fork(["main.py"], {**os.environ, "MARKER": "", "SLEEP_SECS": "60"})
+    assert process.poll() is None
+    process.terminate()
+    assert process.wait() == -signal.SIGTERM
+
+
+def test_reset_starts_new_zygote(zygote):
+    env = {**os.environ, "MARKER": ""}
+    assert zygote.fork(["main.py"], env).wait() == 0
+    zygote.reset()
+    assert zygote.fork(["main.py"], env).wait() == 0
@@ -30,6 +30,7 @@ from helpers.custom_types import (  # noqa
     PackagePatch,
     Patch,
     PatchType,
+    PythonRequirementPatch,
 )
 
 
@@ -136,6 +137,20 @@ def test_patch_applier_config_patch_update(
     assert new_config.model_name == "foobar"
 
 
+def test_patch_applier_reset_config_cache(
+    patch_applier: ModelContainerPatchApplier, truss_container_fs
+):
+    config_path = truss_container_fs / "app" / "config.yaml"
+    config = TrussConfig.from_yaml(config_path)
+    assert patch_applier._truss_config.model_name == config.model_name
+    config.model_name = "changed-on-disk"
+    config.write_to_yaml_file(config_path)
+    assert patch_applier._truss_config.model_name != "changed-on-disk"
+
+    patch_applier.reset_config_cache()
+    assert patch_applier._truss_config.model_name == "changed-on-disk"
+
+
 def test_patch_applier_env_var_patch_update(patch_applier: ModelContainerPatchApplier):
     env_var_dict = {"FOO": "BAR"}
     patch = Patch(
@@ -183,3 +198,37 @@ def test_patch_applier_external_data_patch_add(
     )
     patch_applier(patch, os.environ.copy())
     assert (truss_container_fs / "app" / "data" / "truss_icon").exists()
+
+
+def test_patch_applier_python_requirement_patches(truss_container_fs):
+    patch_applier = ModelContainerPatchApplier(
+        truss_container_fs / "app", mock.Mock(), uv_path="uv"
+    )
+    with mock.patch("subprocess.run") as run:
+        patch_applier.apply_python_requirement_patches(
+            [
+                PythonRequirementPatch(action=Action.ADD, requirement="requests"),
+                PythonRequirementPatch(action=Action.REMOVE, requirement="pytz"),
+                PythonRequirementPatch(action=Action.UPDATE, requirement="numpy==2.0"),
+                PythonRequirementPatch(action=Action.REMOVE, requirement="six"),
+            ]
+        )
+    python = patch_applier._python_executable
+    assert run.call_args_list == [
+        mock.call(
+            ["uv", "pip", "uninstall", "pytz", "six", "--python", python], check=True
+        ),
+        mock.call(
+            [
+                "uv",
+                "pip",
+                "install",
+                "requests",
+                "numpy==2.0",
+                "--upgrade",
+                "--python",
+                python,
+            ],
+            check=True,
+        ),
+    ]
@@ -1,8 +1,10 @@
 import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, call, patch
 
+import httpx
 import pytest
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, Request, WebSocket
 from httpx import AsyncClient, Response
 from httpx_ws import AsyncWebSocketSession
 from httpx_ws import _exceptions as httpx_ws_exceptions
@@ -12,7 +14,15 @@ from truss.tests.templates.control.control.conftest import setup_control_imports
 
 setup_control_imports()
 
-from truss.templates.control.control.endpoints import proxy_ws
+from truss.templates.control.control.endpoints import (
+    _ReplayableRequestBody,
+    _send_with_retries,
+    _should_stream_request_body,
+    proxy_ws,
+)
+from truss.templates.control.control.helpers.inference_server_process_controller import (
+    InferenceServerProcessController,
+)
 
 
 @pytest.fixture
@@ -20,6 +30,9 @@ def app():
     app = FastAPI()
     app.state.proxy_client = AsyncClient(base_url="http://localhost:8080")
     app.state.logger = MagicMock()
+    app.state.inference_server_process_controller = MagicMock(
+        wait_for_inference_server_ready=AsyncMock(return_value=False)
+    )
     return app
 
 
@@ -111,3 +124,86 @@ async def test_proxy_ws_closes_client_upon_server_connection_error(client_ws):
 
     client_ws.close.assert_called_once()
     assert client_ws.app.state.logger.warning.called
+
+
+def _make_request(chunks, headers=()):
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {"type": "http", "method": "POST", "headers": list(headers)}
+    return Request(scope, receive)
+
+
+@pytest.mark.asyncio
+async def test_replayable_request_body_replays_received_chunks():
+    body = _ReplayableRequestBody(_make_request([b"abc", b"def", b"gh"]))
+    iterator = body.__aiter__()
+    assert await iterator.__anext__() == b"abc"
+    await iterator.aclose()  # E.g. connection error after sending the first chunk.
+
+    assert b"".join([chunk async for chunk in body]) == b"abcdefgh"
+    assert b"".join([chunk async for chunk in body]) == b"abcdefgh"
+    body.close()
+
+
+def test_should_stream_request_body():
+    assert _should_stream_request_body(_make_request([b""]))
+    assert not _should_stream_request_body(
+        _make_request([b""], headers=[(b"content-length", b"100")])
+    )
+    assert _should_stream_request_body(
+        _make_request([b""], headers=[(b"content-length", str(10 << 20).encode())])
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_with_retries_parks_until_inference_server_ready(tmp_path):
+    server_up = False
+
+    def handler(request):
+        if not server_up:
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    client = httpx.AsyncClient(
+        base_url="http://localhost:8080", transport=httpx.MockTransport(handler)
+    )
+    controller = InferenceServerProcessController(
+        str(tmp_path), [], 8080, app_logger=MagicMock()
+    )
+
+    async def send():
+        request = client.build_request("POST", "/v1/models/model:predict")
+        resp = await _send_with_retries(request, client, controller, "/predict")
+        return resp, time.monotonic()
+
+    # The event loop must stay responsive while requests wait for the server.
+    max_loop_lag = 0.0
+
+    async def measure_loop_lag():
+        nonlocal max_loop_lag
+        while True:
+            t0 = time.monotonic()
+            await asyncio.sleep(0.01)
+            max_loop_lag = max(max_loop_lag, time.monotonic() - t0 - 0.01)
+
+    lag_task = asyncio.create_task(measure_loop_lag())
+    requests = [asyncio.create_task(send()) for _ in range(50)]
+    await asyncio.sleep(0.3)
+    assert not any(request.done() for request in requests)
+
+    server_up = True
+    ready_at = time.monotonic()
+    controller.mark_inference_server_ready()
+    results = await asyncio.gather(*requests)
+    lag_task.cancel()
+
+    assert all(resp.status_code == 200 for resp, _ in results)
+    # Requests resume on the ready event, not after the next fixed retry interval.
+    assert max(done_at for _, done_at in results) - ready_at < 0.5
+    assert max_loop_lag < 0.1
@@ -46,7 +46,9 @@ def ports():
 
 
 @pytest.fixture
-def app(truss_container_fs, truss_original_hash, ports):
+def app(request, truss_container_fs, truss_original_hash, ports):
+    # Extra config can be passed by parametrizing the fixture indirectly.
+    extra_config = getattr(request, "param", {})
     with _env_var({"HASH_TRUSS": truss_original_hash}):
         inf_serv_home = truss_container_fs / "app"
         control_app = create_app(
@@ -58,6 +60,7 @@ def app(truss_container_fs, truss_original_hash, ports):
                 "inference_server_port": ports["inference_server_port"],
                 "oversee_inference_server": False,
                 "uv_path": "uv",
+                **extra_config,
             }
         )
         inference_server_controller = control_app.state.inference_server_controller
@@ -277,6 +280,36 @@ async def test_retries(client, app):
     assert resp.status_code == 500
 
 
+@pytest.mark.anyio
+@pytest.mark.parametrize("app", [{"inference_server_zygote": True}], indirect=True)
+async def test_patch_model_code_with_zygote(app, client):
+    for prediction in range(2):
+        patch = Patch(
+            type=PatchType.MODEL_CODE,
+            body=ModelCodePatch(
+                action=Action.UPDATE,
+                path="model.py",
+                content=f"""
+class Model:
+    def predict(self, request):
+        import os
+        return {{"prediction": {prediction}, "parent_pid": os.getppid()}}
+""",
+            ),
+        )
+        resp = await client.get("/control/truss_hash")
+        patch_request = PatchRequest(
+            hash=f"hash-{prediction}", prev_hash=resp.json()["result"], patches=[patch]
+        )
+        resp = await client.post("/control/patch", json=patch_request.to_dict())
+        assert "error" not in resp.json()
+        resp = await client.post("/v1/models/model:predict", json={})
+        assert resp.status_code == 200
+        # The inference server was forked from the zygote.
+        zygote_pid = app.state.inference_server_process_controller._zygote._process.pid
+        assert resp.json() == {"prediction": prediction, "parent_pid": zygote_pid}
+
+
 async def _verify_apply_patch_success(client, patch: Patch):
     resp = await client.get("/control/truss_hash")
     original_hash = resp.json()["result"]
@@ -232,7 +232,11 @@ class Model:
     resp = requests.get(f"{ctrl_url}/metrics")
     assert resp.status_code == 200
     metric_names = [family.name for family in text_string_to_metric_families(resp.text)]
-    assert metric_names == ["my_really_cool_metric"]
+    # Request phase histograms are exported by default, next to the model's metrics.
+    assert sorted(metric_names) == [
+        "my_really_cool_metric",
+        "truss_request_phase_seconds",
+    ]
     assert "my_really_cool_metric_total 20.0" in resp.text
 
 
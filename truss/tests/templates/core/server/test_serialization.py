@@ -0,0 +1,112 @@
+import datetime
+import decimal
+import uuid
+
+import msgpack
+import numpy as np
+import pytest
+
+from truss.templates.shared import serialization
+
+
+def test_tensor_frame_roundtrip():
+    obj = {
+        "image": np.arange(24, dtype=np.uint8).reshape(2, 3, 4),
+        "embeddings": [np.ones(5, dtype=np.float32), np.zeros((0, 3))],
+        "scalar_array": np.array(3.5),
+        "strided": np.arange(12).reshape(3, 4).T,
+        "big_endian": np.arange(3, dtype=">i4"),
+        "np_scalar": np.int8(4),
+        "text": "hello",
+        "number": 1.5,
+        "when": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "day": datetime.date(2024, 1, 2),
+        "delta": datetime.timedelta(days=1, seconds=2),
+        "id": uuid.UUID(int=7),
+        "amount": decimal.Decimal("1.25"),
+    }
+    data = serialization.truss_tensor_serialize(obj)
+    assert serialization.is_tensor_frame(data)
+    result = serialization.truss_msgpack_deserialize(data)
+
+    assert result.keys() == obj.keys()
+    for key, value in obj.items():
+        if isinstance(value, np.ndarray):
+            np.testing.assert_array_equal(result[key], value)
+            assert result[key].dtype == value.dtype
+            assert result[key].shape == value.shape
+        elif key == "embeddings":
+            for actual, expected in zip(result[key], value):
+                np.testing.assert_array_equal(actual, expected)
+                assert actual.dtype == expected.dtype
+        else:
+            assert result[key] == value
+            assert type(result[key]) is type(value)
+
+
+def test_tensor_frame_decodes_aligned_views():
+    arrays = [np.arange(n, dtype=np.float64) for n in (1, 7, 1000)]
+    data = serialization.truss_tensor_serialize({"arrays": arrays})
+    base_address = np.frombuffer(data, dtype=np.uint8).ctypes.data
+    for array in serialization.truss_msgpack_deserialize(data)["arrays"]:
+        assert not array.flags.owndata
+        assert not array.flags.writeable
+        assert np.shares_memory(array, np.frombuffer(data, dtype=np.uint8))
+        assert (array.ctypes.data - base_address) % 64 == 0
+
+
+def test_tensor_frame_chunks_join_to_frame():
+    array = np.arange(100, dtype=np.int16)
+    chunks = serialization.truss_tensor_serialize_chunks({"a": array, "b": array})
+    # Arrays are not copied into the chunks.
+    assert any(
+        isinstance(c, memoryview) and np.shares_memory(np.asarray(c), array)
+        for c in chunks
+    )
+    result = serialization.truss_msgpack_deserialize(b"".join(chunks))
+    np.testing.assert_array_equal(result["a"], array)
+    np.testing.assert_array_equal(result["b"], array)
+
+
+def test_tensor_frame_rejects_object_arrays():
+    with pytest.raises(TypeError, match="cannot be sent as tensor frames"):
+        serialization.truss_tensor_serialize({"a": np.array([{}, None])})
+
+
+def _frame(header: bytes, header_len=None, buffers: bytes = b"") -> bytes:
+    prefix = serialization._TENSOR_FRAME_PREFIX.pack(
+        1, len(header) if header_len is None else header_len
+    )
+    frame = serialization.TENSOR_FRAME_MAGIC + prefix + header
+    return frame + b"\x00" * (-len(frame) % 64) + buffers
+
+
+def _array_header(dtype_str, shape, offset, nbytes) -> bytes:
+    meta = msgpack.packb([dtype_str, shape, offset, nbytes])
+    return msgpack.packb({"a": msgpack.ExtType(1, meta)})
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        serialization.TENSOR_FRAME_MAGIC + b"\x01",
+        _frame(b"\x80", header_len=1000),
+        _frame(b"\xc1"),
+        _frame(_array_header("<f8", [10], 0, 80), buffers=b"\x00" * 40),
+        _frame(_array_header("<f8", [10], 64, 80), buffers=b"\x00" * 80),
+        _frame(_array_header("<f8", [10], 0, 8), buffers=b"\x00" * 80),
+        _frame(_array_header("<f8", [10], -8, 80), buffers=b"\x00" * 80),
+        _frame(_array_header("|O", [1], 0, 8), buffers=b"\x00" * 8),
+        _frame(_array_header("nope", [1], 0, 8), buffers=b"\x00" * 8),
+    ],
+)
+def test_tensor_frame_rejects_malformed_frames(frame):
+    with pytest.raises(serialization.TensorFrameError):
+        serialization.truss_msgpack_deserialize(frame)
+
+
+def test_msgpack_deserialize_still_accepts_msgpack_numpy():
+    data = serialization.truss_msgpack_serialize({"a": np.arange(3)})
+    assert not serialization.is_tensor_frame(data)
+    result = serialization.truss_msgpack_deserialize(data)
+    np.testing.assert_array_equal(result["a"], np.arange(3))
@@ -0,0 +1,193 @@
+import asyncio
+import gc
+import threading
+
+import pytest
+from anyio import to_thread
+
+from truss.templates.server.common.streaming import StreamBuffer, start_producer
+
+
+async def _consume(buffer: StreamBuffer) -> list:
+    return [chunk async for chunk in buffer.iter_chunks(read_timeout=5)]
+
+
+def _start(generator, buffer: StreamBuffer) -> tuple[asyncio.Event, list]:
+    done = asyncio.Event()
+    errors: list = []
+    start_producer(generator, buffer, on_error=errors.append, on_done=done.set)
+    return done, errors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_stream_buffer_passes_all_chunks(is_async):
+    def sync_gen():
+        for i in range(1000):
+            yield f"{i},"
+
+    async def async_gen():
+        for chunk in sync_gen():
+            yield chunk
+
+    buffer = StreamBuffer()
+    done, errors = _start(async_gen() if is_async else sync_gen(), buffer)
+    chunks = await _consume(buffer)
+    await done.wait()
+    assert "".join(chunks) == "".join(f"{i}," for i in range(1000))
+    assert not errors
+
+
+@pytest.mark.asyncio
+async def test_stream_buffer_coalesces_chunks():
+    produced = threading.Event()
+
+    def gen():
+        for _ in range(10):
+            yield b"ab"
+        produced.set()
+        yield "cd"
+        yield "ef"
+
+    buffer = StreamBuffer(coalesce_max_bytes=8)
+    done, _ = _start(gen(), buffer)
+    await asyncio.get_running_loop().run_in_executor(None, produced.wait)
+    await asyncio.sleep(0.05)
+    chunks = await _consume(buffer)
+    await done.wait()
+    assert chunks == [b"abababab", b"abababab", b"abab", "cdef"]
+
+
+@pytest.mark.asyncio
+async def test_stream_buffer_bounded_blocks_producer():
+    produced: list[int] = []
+
+    def gen():
+        for i in range(100):
+            produced.append(i)
+            yield b"x" * 10
+
+    buffer = StreamBuffer(max_buffer_bytes=50)
+    done, _ = _start(gen(), buffer)
+    await asyncio.sleep(0.1)
+    # The producer is paused once the buffer is full.
+    assert len(produced) <= 6
+    assert not done.is_set()
+
+    chunks = await _consume(buffer)
+    await done.wait()
+    assert len(chunks) == 100
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_stream_buffer_closed_consumer_stops_producer(is_async):
+    closed = threading.Event()
+
+    def sync_gen():
+        try:
+            while True:
+                yield b"x" * 10
+        finally:
+            closed.set()
+
+    async def async_gen():
+        try:
+            while True:
+                yield b"x" * 10
+        finally:
+            closed.set()
+
+    buffer = StreamBuffer(max_buffer_bytes=50)
+    done, _ = _start(async_gen() if is_async else sync_gen(), buffer)
+    chunks = buffer.iter_chunks(read_timeout=5)
+    assert await chunks.__anext__()
+    await chunks.aclose()
+
+    # Releasing e.g. the predict semaphore must not depend on the client.
+    await asyncio.wait_for(done.wait(), timeout=5)
+    assert closed.is_set()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_stream_buffer_dropped_consumer_stops_producer(is_async):
+    def sync_gen():
+        while True:
+            yield b"x" * 10
+
+    async def async_gen():
+        while True:
+            yield b"x" * 10
+
+    buffer = StreamBuffer(max_buffer_bytes=50)
+    done, _ = _start(async_gen() if is_async else sync_gen(), buffer)
+
+    async def response():
+        async for chunk in buffer.iter_chunks(read_timeout=5):
+            yield chunk
+
+    # E.g. the client disconnected before the response was started.
+    unread_response = response()
+    buffer.close_consumer_when_collected(unread_response)
+    await asyncio.sleep(0.05)
+    assert not done.is_set()
+    del unread_response
+    gc.collect()
+
+    await asyncio.wait_for(done.wait(), timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_sync_producers_share_thread_limiter():
+    running: list[int] = []
+    release = threading.Event()
+
+    def gen(i):
+        running.append(i)
+        release.wait()
+        yield b"x"
+
+    limiter = to_thread.current_default_thread_limiter()
+    total_tokens = limiter.total_tokens
+    limiter.total_tokens = 2
+    try:
+        buffers = [StreamBuffer() for _ in range(3)]
+        started = [_start(gen(i), buffer) for i, buffer in enumerate(buffers)]
+        await asyncio.sleep(0.1)
+        # The third stream waits for a free thread.
+        assert sorted(running) == [0, 1]
+        release.set()
+        for buffer, (done, _) in zip(buffers, started):
+            assert await _consume(buffer) == [b"x"]
+            await done.wait()
+    finally:
+        release.set()
+        limiter.total_tokens = total_tokens
+
+
+@pytest.mark.asyncio
+async def test_stream_buffer_reports_errors():
+    def gen():
+        yield b"a"
+        raise ValueError("boom")
+
+    buffer = StreamBuffer()
+    done, errors = _start(gen(), buffer)
+    assert await _consume(buffer) == [b"a"]
+    await done.wait()
+    assert isinstance(errors[0], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_stream_buffer_read_timeout():
+    async def gen():
+        yield b"a"
+        await asyncio.sleep(10)
+
+    buffer = StreamBuffer()
+    _start(gen(), buffer)
+    chunks = buffer.iter_chunks(read_timeout=0.1)
+    assert await chunks.__anext__() == b"a"
+    with pytest.raises(asyncio.TimeoutError):
+        await chunks.__anext__()
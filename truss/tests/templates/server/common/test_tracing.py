@@ -0,0 +1,37 @@
+import importlib
+import json
+
+import pytest
+
+
+@pytest.fixture
+def tracing(truss_container_fs, helpers, monkeypatch):
+    with helpers.sys_path(truss_container_fs / "app"):
+        tracing = importlib.import_module("common.tracing")
+        monkeypatch.setattr(tracing, "_truss_tracer", None)
+        yield tracing
+
+
+def _write_spans(tracing, traces_file, runtime: dict, num_spans: int) -> list[dict]:
+    tracer = tracing.get_truss_tracer({}, {"runtime": runtime})
+    for i in range(num_spans):
+        with tracer.start_as_current_span(f"span-{i}"):
+            pass
+    tracer.span_processor.shutdown()
+    return [json.loads(line) for line in traces_file.read_text().splitlines()]
+
+
+def test_ndjson_file_export(tracing, tmp_path, monkeypatch):
+    traces_file = tmp_path / "traces.ndjson"
+    monkeypatch.setenv(tracing.OTEL_TRACING_NDJSON_FILE, str(traces_file))
+
+    spans = _write_spans(tracing, traces_file, {"enable_tracing_data": True}, 100)
+    assert [span["name"] for span in spans] == [f"span-{i}" for i in range(100)]
+
+
+def test_ndjson_file_export_sampled(tracing, tmp_path, monkeypatch):
+    traces_file = tmp_path / "traces.ndjson"
+    monkeypatch.setenv(tracing.OTEL_TRACING_NDJSON_FILE, str(traces_file))
+
+    runtime = {"enable_tracing_data": True, "tracing_sample_ratio": 0.0}
+    assert _write_spans(tracing, traces_file, runtime, 100) == []
@@ -1,3 +1,4 @@
+import asyncio
 import importlib
 import os
 import sys
@@ -10,6 +11,7 @@ from unittest.mock import AsyncMock, MagicMock, Mock, patch
 import opentelemetry.sdk.trace as sdk_trace
 import pytest
 import yaml
+from fastapi import HTTPException
 from starlette.requests import Request
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 
@@ -22,6 +24,7 @@ def anyio_backend():
 @pytest.fixture
 def connected_request():
     mock_request = MagicMock(spec=Request)
+    mock_request.headers = {}
     mock_request.is_disconnected = AsyncMock(return_value=False)
     return mock_request
 
@@ -87,6 +90,69 @@ def test_model_wrapper_load_error_more_than_allowed(app_path, helpers):
         assert model_wrapper.load_failed
 
 
+@pytest.mark.anyio
+async def test_model_wrapper_wait_for_load(truss_container_fs, helpers):
+    app_path = truss_container_fs / "app"
+    model_file_content = """
+import time
+
+class Model:
+    def load(self):
+        time.sleep(0.5)
+
+    def predict(self, request):
+        return request
+    """
+    with (
+        _clear_model_load_modules(),
+        helpers.file_content(app_path / "model" / "model.py", model_file_content),
+        helpers.sys_path(app_path),
+        _change_directory(app_path),
+    ):
+        model_wrapper_module = importlib.import_module("model_wrapper")
+        config = yaml.safe_load((app_path / "config.yaml").read_text())
+        model_wrapper = model_wrapper_module.ModelWrapper(
+            config, sdk_trace.NoOpTracer()
+        )
+        model_wrapper.start_load_thread()
+        assert not await model_wrapper.wait_for_load(timeout=0.1)
+
+        assert await model_wrapper.wait_for_load(timeout=10)
+        assert model_wrapper.ready
+        timeline = model_wrapper.startup_timeline.as_dict()
+        assert list(timeline["phases"]) == ["setup", "import", "init", "load"]
+        assert timeline["phases"]["load"] >= 0.5
+        assert timeline["ready_after_secs"] > timeline["phases"]["load"]
+
+
+def test_model_wrapper_wait_for_load_in_new_event_loop(truss_container_fs, helpers):
+    # Like `TrussServer`, which creates the wrapper before starting its event loop.
+    app_path = truss_container_fs / "app"
+    model_file_content = """
+class Model:
+    def predict(self, request):
+        return request
+    """
+    with (
+        _clear_model_load_modules(),
+        helpers.file_content(app_path / "model" / "model.py", model_file_content),
+        helpers.sys_path(app_path),
+        _change_directory(app_path),
+    ):
+        model_wrapper_module = importlib.import_module("model_wrapper")
+        config = yaml.safe_load((app_path / "config.yaml").read_text())
+        model_wrapper = model_wrapper_module.ModelWrapper(
+            config, sdk_trace.NoOpTracer()
+        )
+
+        async def load_and_wait() -> bool:
+            model_wrapper.start_load_thread()
+            return await model_wrapper.wait_for_load(timeout=10)
+
+        assert asyncio.run(load_and_wait())
+        assert model_wrapper.ready
+
+
 @pytest.mark.anyio
 @pytest.mark.integration
 async def test_model_wrapper_streaming_timeout(app_path):
@@ -251,6 +317,412 @@ async def test_messages_endpoint(open_ai_container_fs, helpers, connected_reques
         assert responses_resp == "responses"
 
 
+@pytest.mark.anyio
+async def test_model_wrapper_batching(truss_container_fs, helpers, connected_request):
+    app_path = truss_container_fs / "app"
+    model_file_content = """
+class Model:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def preprocess(self, inputs):
+        return inputs["x"]
+
+    def predict(self, inputs):
+        return self.predict_batch([inputs])[0]
+
+    def predict_batch(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        return [ValueError("negative") if x < 0 else x * 2 for x in inputs]
+
+    def postprocess(self, result):
+        return {"y": result}
+"""
+    with (
+        _clear_model_load_modules(),
+        helpers.file_content(app_path / "model" / "model.py", model_file_content),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        model_wrapper_module = importlib.import_module("model_wrapper")
+        errors_module = sys.modules["common.errors"]
+        config = yaml.safe_load((app_path / "config.yaml").read_text())
+        config["runtime"]["batching"] = {
+            "enabled": True,
+            "max_batch_size": 4,
+            "max_wait_ms": 50,
+        }
+        model_wrapper = model_wrapper_module.ModelWrapper(
+            config, sdk_trace.NoOpTracer()
+        )
+        model_wrapper.load()
+
+        results = await asyncio.gather(
+            *(model_wrapper.predict({"x": x}, connected_request) for x in range(6)),
+            return_exceptions=True,
+        )
+        assert results == [{"y": x * 2} for x in range(6)]
+        assert model_wrapper._model.batch_sizes == [4, 2]
+
+        # An error for one item only fails the corresponding request.
+        results = await asyncio.gather(
+            model_wrapper.predict({"x": 1}, connected_request),
+            model_wrapper.predict({"x": -1}, connected_request),
+            return_exceptions=True,
+        )
+        assert results[0] == {"y": 2}
+        assert isinstance(results[1], errors_module.UserCodeError)
+        assert "negative" in str(results[1])
+
+
+def test_model_wrapper_batching_requires_predict_batch(truss_container_fs, helpers):
+    app_path = truss_container_fs / "app"
+    with (
+        _clear_model_load_modules(),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        model_wrapper_module = importlib.import_module("model_wrapper")
+        config = yaml.safe_load((app_path / "config.yaml").read_text())
+        config["runtime"]["batching"] = {"enabled": True}
+        model_wrapper = model_wrapper_module.ModelWrapper(
+            config, sdk_trace.NoOpTracer()
+        )
+        model_wrapper.load()
+        assert model_wrapper.load_failed
+
+
+@pytest.mark.anyio
+async def test_dynamic_batcher_scheduling(truss_container_fs, helpers):
+    app_path = truss_container_fs / "app"
+    with (
+        _clear_model_load_modules(),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        importlib.import_module("model_wrapper")
+        batching = sys.modules["common.batching"]
+        concurrency = sys.modules["common.concurrency"]
+        errors_module = sys.modules["common.errors"]
+        batches = []
+        unblock = asyncio.Event()
+
+        async def batch_fn(inputs, spans):
+            batches.append(inputs)
+            await unblock.wait()
+            return inputs
+
+        batcher = batching.DynamicBatcher(
+            batch_fn,
+            max_batch_size=3,
+            max_wait_ms=10,
+            limiter=concurrency.FixedConcurrencyLimiter(1),
+        )
+        span = sdk_trace.NoOpTracer().start_span("test")
+        # The first batch occupies the only slot, the others queue up meanwhile.
+        first = asyncio.create_task(batcher.submit("first", span))
+        await asyncio.sleep(0.05)
+
+        now = time.monotonic()
+        tasks = [
+            asyncio.create_task(batcher.submit(name, span, priority, deadline))
+            for name, priority, deadline in [
+                ("low", -1, None),
+                ("late", 0, now + 10),
+                ("early", 0, now + 5),
+                ("high", 1, None),
+                ("expiring", 2, now + 0.05),
+            ]
+        ]
+        await asyncio.sleep(0.1)
+        unblock.set()
+        results = await asyncio.gather(first, *tasks, return_exceptions=True)
+
+        assert batches == [["first"], ["high", "early", "late"], ["low"]]
+        assert results[:5] == ["first", "low", "late", "early", "high"]
+        assert isinstance(results[5], errors_module.DeadlineExceeded)
+
+        with pytest.raises(errors_module.DeadlineExceeded):
+            await batcher.submit("expired", span, deadline=time.monotonic())
+
+
+@pytest.mark.anyio
+async def test_adaptive_concurrency_limiter(truss_container_fs, helpers):
+    app_path = truss_container_fs / "app"
+    with (
+        _clear_model_load_modules(),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        importlib.import_module("model_wrapper")
+        concurrency = sys.modules["common.concurrency"]
+        errors_module = sys.modules["common.errors"]
+        limiter = concurrency.AdaptiveConcurrencyLimiter(
+            initial_limit=2,
+            min_limit=1,
+            max_limit=4,
+            latency_tolerance=2.0,
+            backoff_ratio=0.5,
+            max_queue_wait_secs=0.05,
+        )
+
+        # Additive increase while latency stays at the baseline and slots are used.
+        for _ in range(20):
+            slots = [await limiter.acquire() for _ in range(limiter.limit)]
+            for _ in slots:
+                limiter.release(time.monotonic() - 0.1)
+        assert limiter.limit == 4
+
+        # Multiplicative decrease if latency exceeds the tolerance.
+        acquired_at = await limiter.acquire()
+        limiter.release(acquired_at - 1.0)
+        assert limiter.limit == 2
+
+        # Full slots queue requests.
+        slots = [await limiter.acquire() for _ in range(limiter.limit)]
+        waiter = asyncio.ensure_future(limiter.acquire(shed=False))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert limiter.queue_depth == 1
+        limiter.release(slots.pop())
+        slots.append(await waiter)
+        assert limiter.queue_depth == 0
+
+        # Requests whose expected wait exceeds the deadline are shed.
+        with pytest.raises(errors_module.ConcurrencyLimitExceeded):
+            await limiter.acquire()
+        # Cancelled requests leave the queue.
+        waiter = asyncio.ensure_future(limiter.acquire(shed=False))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.queue_depth == 0
+        for acquired_at in slots:
+            limiter.release(acquired_at)
+        assert limiter.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_concurrency_limiter_scheduling(truss_container_fs, helpers):
+    app_path = truss_container_fs / "app"
+    with (
+        _clear_model_load_modules(),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        importlib.import_module("model_wrapper")
+        concurrency = sys.modules["common.concurrency"]
+        errors_module = sys.modules["common.errors"]
+        limiter = concurrency.FixedConcurrencyLimiter(1)
+        held = await limiter.acquire()
+
+        # Waiters are served by priority, then earliest deadline, then arrival.
+        order = []
+
+        async def wait(name, **kwargs):
+            acquired_at = await limiter.acquire(**kwargs)
+            order.append(name)
+            limiter.release(acquired_at)
+
+        far = time.monotonic() + 60
+        waiters = [
+            asyncio.ensure_future(wait("low")),
+            asyncio.ensure_future(wait("late", priority=1, deadline=far + 1)),
+            asyncio.ensure_future(wait("early", priority=1, deadline=far)),
+            asyncio.ensure_future(wait("high", priority=2)),
+            asyncio.ensure_future(wait("low-2")),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 5
+        limiter.release(held)
+        await asyncio.gather(*waiters)
+        assert order == ["high", "early", "late", "low", "low-2"]
+        assert limiter.in_flight == 0
+
+        # Requests past their deadline are rejected, also while queued.
+        with pytest.raises(errors_module.DeadlineExceeded):
+            await limiter.acquire(deadline=time.monotonic() - 1)
+        held = await limiter.acquire()
+        with pytest.raises(errors_module.DeadlineExceeded):
+            await limiter.acquire(deadline=time.monotonic() + 0.01)
+        assert limiter.queue_depth == 0
+
+        # Requests of disconnected clients leave the queue.
+        async def check_disconnected():
+            raise HTTPException(status_code=499)
+
+        with (
+            patch.object(concurrency, "_DISCONNECT_POLL_SECS", 0.01),
+            pytest.raises(HTTPException),
+        ):
+            await limiter.acquire(check_disconnected=check_disconnected)
+        assert limiter.queue_depth == 0
+        limiter.release(held)
+        assert limiter.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_model_wrapper_scheduling_headers(
+    truss_container_fs, helpers, connected_request
+):
+    app_path = truss_container_fs / "app"
+    with (
+        _clear_model_load_modules(),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        model_wrapper_module = importlib.import_module("model_wrapper")
+        errors_module = sys.modules["common.errors"]
+        config = yaml.safe_load((app_path / "config.yaml").read_text())
+        model_wrapper = model_wrapper_module.ModelWrapper(
+            config, sdk_trace.NoOpTracer()
+        )
+        model_wrapper.load()
+
+        connected_request.headers = {
+            "x-baseten-priority": "3",
+            "x-baseten-timeout-ms": "1000",
+        }
+        await model_wrapper.predict({}, connected_request)
+
+        connected_request.headers = {"x-baseten-timeout-ms": "-1"}
+        with pytest.raises(errors_module.DeadlineExceeded):
+            await model_wrapper.predict({}, connected_request)
+        assert model_wrapper._predict_semaphore.in_flight == 0
+
+        for headers in [{"x-baseten-priority": "high"}, {"x-baseten-timeout-ms": "x"}]:
+            connected_request.headers = headers
+            with pytest.raises(errors_module.InputParsingError):
+                await model_wrapper.predict({}, connected_request)
+
+
+@pytest.mark.anyio
+async def test_model_wrapper_adaptive_concurrency(
+    truss_container_fs, helpers, connected_request
+):
+    app_path = truss_container_fs / "app"
+    model_file_content = """
+import asyncio
+
+class Model:
+    async def predict(self, inputs):
+        await asyncio.sleep(0.05)
+        return inputs
+"""
+    with (
+        _clear_model_load_modules(),
+        helpers.file_content(app_path / "model" / "model.py", model_file_content),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        model_wrapper_module = importlib.import_module("model_wrapper")
+        errors_module = sys.modules["common.errors"]
+        config = yaml.safe_load((app_path / "config.yaml").read_text())
+        config["runtime"]["predict_concurrency"] = 2
+        config["runtime"]["adaptive_concurrency"] = {
+            "enabled": True,
+            "max_concurrency": 4,
+            "max_queue_wait_ms": 60,
+        }
+        model_wrapper = model_wrapper_module.ModelWrapper(
+            config, sdk_trace.NoOpTracer()
+        )
+        model_wrapper.load()
+        limiter = model_wrapper._predict_semaphore
+        assert limiter.limit == 2
+
+        assert await model_wrapper.predict({"x": 0}, connected_request) == {"x": 0}
+        results = await asyncio.gather(
+            *(model_wrapper.predict({"x": x}, connected_request) for x in range(8)),
+            return_exceptions=True,
+        )
+        shed = [r for r in results if isinstance(r, Exception)]
+        assert shed
+        assert all(isinstance(r, errors_module.ConcurrencyLimitExceeded) for r in shed)
+        assert [r for r in results if not isinstance(r, Exception)] == [
+            {"x": x} for x in range(len(results) - len(shed))
+        ]
+        assert limiter.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_model_wrapper_phase_metrics(
+    truss_container_fs, helpers, connected_request
+):
+    app_path = truss_container_fs / "app"
+    model_file_content = """
+class Model:
+    def preprocess(self, inputs):
+        return inputs
+
+    def predict(self, inputs):
+        return inputs
+
+    def postprocess(self, result):
+        return result
+
+    async def chat_completions(self, inputs):
+        for i in range(3):
+            yield str(i)
+"""
+    with (
+        _clear_model_load_modules(),
+        helpers.file_content(app_path / "model" / "model.py", model_file_content),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        model_wrapper_module = importlib.import_module("model_wrapper")
+        config = yaml.safe_load((app_path / "config.yaml").read_text())
+        model_wrapper = model_wrapper_module.ModelWrapper(
+            config, sdk_trace.NoOpTracer()
+        )
+        model_wrapper.load()
+
+        assert await model_wrapper.predict({"x": 1}, connected_request) == {"x": 1}
+        stream = await model_wrapper.chat_completions({}, connected_request)
+        assert [chunk async for chunk in stream] == ["0", "1", "2"]
+
+        (family,) = model_wrapper.phase_histograms.collect()
+        counts = {
+            (sample.labels["endpoint"], sample.labels["phase"]): sample.value
+            for sample in family.samples
+            if sample.name.endswith("_count")
+        }
+        assert counts == {
+            ("predict", "queue"): 1,
+            ("predict", "preprocess"): 1,
+            ("predict", "predict"): 1,
+            ("predict", "postprocess"): 1,
+            ("chat_completions", "predict"): 1,
+            ("chat_completions", "first_chunk"): 1,
+            ("chat_completions", "stream"): 1,
+        }
+
+
+@pytest.mark.anyio
+async def test_model_wrapper_phase_metrics_disabled(
+    truss_container_fs, helpers, connected_request
+):
+    app_path = truss_container_fs / "app"
+    with (
+        _clear_model_load_modules(),
+        helpers.sys_paths(app_path),
+        _change_directory(app_path),
+    ):
+        model_wrapper_module = importlib.import_module("model_wrapper")
+        config = yaml.safe_load((app_path / "config.yaml").read_text())
+        config["runtime"]["enable_phase_metrics"] = False
+        model_wrapper = model_wrapper_module.ModelWrapper(
+            config, sdk_trace.NoOpTracer()
+        )
+        model_wrapper.load()
+
+        await model_wrapper.predict({}, connected_request)
+        (family,) = model_wrapper.phase_histograms.collect()
+        assert family.samples == []
+
+
 @contextmanager
 def _change_directory(new_directory: Path):
     original_directory = os.getcwd()
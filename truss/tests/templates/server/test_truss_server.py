@@ -1,3 +1,4 @@
+import asyncio
 import importlib
 import json
 import os
@@ -141,6 +142,92 @@ async def test_websocket_sets_request_id_in_context(app_path):
         mock_request_id_context.set.assert_called_once_with(request_id)
 
 
+def _make_body_request(app_state, chunks):
+    """Create a real Request whose body arrives in `chunks`."""
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()  # Connection stays open.
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [],
+        "app": MagicMock(state=app_state),
+    }
+    from starlette.requests import Request
+
+    return Request(scope, receive)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "annotation, read_body",
+    [
+        ("AsyncIterator[bytes]", "b''.join([chunk async for chunk in body])"),
+        ("BinaryIO", "body.read()"),
+    ],
+)
+async def test_predict_streams_body_to_model(app_path, annotation, read_body):
+    (app_path / "model" / "model.py").write_text(f"""\
+from typing import AsyncIterator, BinaryIO
+
+class Model:
+    async def predict(self, body: {annotation}):
+        data = {read_body}
+        return {{"size": len(data), "chunk": data[:4].decode()}}
+""")
+
+    with _clear_truss_server_modules(), _change_directory(app_path):
+        endpoints = _get_endpoints(app_path)
+        truss_server_module = sys.modules["truss_server"]
+        request = _make_body_request(
+            MagicMock(model=endpoints._model), [b"abcd", b"ef" * 1000, b"gh"]
+        )
+
+        body_raw = await truss_server_module.parse_predict_body(request)
+        assert body_raw is None
+        resp = await endpoints.predict(
+            model_name="model", request=request, body_raw=body_raw
+        )
+        assert resp.status_code == 200, resp.body
+        assert json.loads(resp.body) == {"size": 2006, "chunk": "abcd"}
+
+
+@pytest.mark.anyio
+async def test_execute_request_observes_phases(app_path):
+    config = yaml.safe_load((app_path / "config.yaml").read_text())
+    config["runtime"]["enable_phase_metrics"] = True
+    (app_path / "config.yaml").write_text(yaml.safe_dump(config))
+
+    with _clear_truss_server_modules(), _change_directory(app_path):
+        endpoints = _get_endpoints(app_path)
+        truss_server_module = sys.modules["truss_server"]
+        request = _make_body_request(
+            MagicMock(model=endpoints._model), [b'{"x": ', b"1}"]
+        )
+        request.scope["endpoint"] = endpoints.predict
+
+        body_raw = await truss_server_module.parse_predict_body(request)
+        resp = await endpoints.predict(
+            model_name="model", request=request, body_raw=body_raw
+        )
+        assert resp.status_code == 200, resp.body
+
+        (family,) = endpoints._model.phase_histograms.collect()
+        phases = {
+            sample.labels["phase"]
+            for sample in family.samples
+            if sample.name.endswith("_count") and sample.labels["endpoint"] == "predict"
+        }
+        assert {"body_read", "deserialize", "queue", "predict", "serialize"} <= phases
+
+
 def _start_truss_server(
     stdout_capture_file_path: str, truss_container_fs: Path, port: int
 ):
@@ -0,0 +1,86 @@
+import io
+import logging
+import threading
+import time
+
+import pytest
+
+from truss.templates.shared import log_config
+
+
+def _access_record(method: str, path: str) -> logging.LogRecord:
+    return logging.LogRecord(
+        name="uvicorn.access",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg='%s - "%s %s HTTP/%s" %d',
+        args=("127.0.0.1:1234", method, path, "1.1", 200),
+        exc_info=None,
+    )
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "/", False),
+        ("GET", "/v1/models/model", False),
+        ("GET", "/v1/models/model/loaded?wait_secs=30", False),
+        ("GET", "/metrics", False),
+        ("POST", "/v1/models/model:predict", True),
+        ("GET", "/v1/models/model/schema", True),
+    ],
+)
+def test_access_filter(method, path, expected):
+    access_filter = log_config._MessageFilter(health_checks=True, metrics=True)
+    assert access_filter.filter(_access_record(method, path)) is expected
+
+
+def test_websocket_filter():
+    websocket_filter = log_config._MessageFilter(websocket_open=True)
+    record = logging.LogRecord(
+        "uvicorn.error", logging.INFO, __file__, 1, "connection open", None, None
+    )
+    assert not websocket_filter.filter(record)
+
+
+class _BlockingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.unblocked = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.unblocked.wait()
+        return super().write(text)
+
+
+def test_queued_handler_writes_off_thread_and_counts_drops():
+    stream = _BlockingStream()
+    handler = log_config._QueuedStreamHandler(stream, max_size=2)
+    handler.setFormatter(log_config._DefaultJsonFormatter("%(message)s"))
+    logger = logging.getLogger("test_queued_handler")
+    logger.propagate = False
+    logger.addHandler(handler)
+    token = log_config.request_id_context.set("req-1")
+    try:
+        logger.warning("line %d", 0)
+        # Wait until the first record is taken by the blocked writer.
+        while not handler._queue.empty():
+            time.sleep(0.001)
+        # Two records fit in the queue, the rest is dropped.
+        for i in range(1, 6):
+            logger.warning("line %d", i)
+        assert stream.getvalue() == ""
+        assert handler.dropped == 3
+    finally:
+        log_config.request_id_context.reset(token)
+        stream.unblocked.set()
+        handler.close()
+        logger.removeHandler(handler)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 4
+    assert '"request_id": "req-1"' in lines[0]
+    assert '"message": "line 0"' in lines[0]
+    assert "Dropped 3 log records" in lines[1]
+    assert '"message": "line 1"' in lines[2]
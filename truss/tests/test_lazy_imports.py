@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+import pytest
+
+import truss
+import truss.remote.baseten
+
+
+@pytest.mark.parametrize(
+    "module, name",
+    [("truss", name) for name in truss.__all__]
+    + [
+        ("truss.remote.baseten", name) for name in truss.remote.baseten._LAZY_ATTRIBUTES
+    ],
+)
+def test_lazy_import_in_clean_process(module, name):
+    # Each in a new process, so that no other import already loaded the module.
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import {module}; from {module} import {name}; "
+            f"assert getattr({module}, {name!r}) is {name}",
+        ],
+        check=True,
+    )
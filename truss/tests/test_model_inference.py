@@ -1398,6 +1398,8 @@ def test_streaming_truss_with_user_tracing(test_data_path, enable_tracing_data):
         )
         assert "transfer-encoding" not in predict_non_stream_response.headers
         assert predict_non_stream_response.json() == "01234"
+        # Truss spans are written to the file in batches, at least once per second.
+        time.sleep(2)
 
         with tempfile.TemporaryDirectory() as tmp_dir:
             truss_traces_file = pathlib.Path(tmp_dir) / "otel_traces.ndjson"
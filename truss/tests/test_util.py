@@ -1,9 +1,19 @@
+import hashlib
+import http.server
+import json
 import os
+import socket
+import struct
+import threading
 from unittest.mock import patch
 
+import pytest
+import requests
 import requests_mock
 
+from truss.base.errors import DownloadError
 from truss.base.truss_config import ExternalData
+from truss.util import download
 from truss.util.download import download_external_data
 
 TEST_DOWNLOAD_URL = "http://example.com/some-download-url"
@@ -37,3 +47,213 @@ def test_download_into_nested_subdir(tmp_path):
             content = f.read()
 
         assert content == mocked_download_content
+
+
+def _mock_range_url(m, url: str, data: bytes, ranges: list):
+    def content(request, context):
+        range_header = request.headers.get("Range")
+        if range_header is None:
+            ranges.append(None)
+            context.headers["Content-Length"] = str(len(data))
+            return data
+        start, end = range_header.removeprefix("bytes=").split("-")
+        end = int(end) if end else len(data) - 1
+        ranges.append((int(start), end))
+        context.status_code = 206
+        context.headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        context.headers["ETag"] = '"etag"'
+        return data[int(start) : end + 1]
+
+    m.get(url, content=content)
+
+
+def test_download_large_file_in_ranges(tmp_path):
+    data = os.urandom(10_000)
+    ranges: list = []
+    with (
+        patch.dict(os.environ, {}),
+        patch.object(download, "RANGE_CHUNK_SIZE", 1000),
+        patch.object(download, "RANGE_MIN_FILE_SIZE", 2000),
+        requests_mock.Mocker() as m,
+    ):
+        _mock_range_url(m, TEST_DOWNLOAD_URL, data, ranges)
+        external_data = ExternalData(
+            [
+                {
+                    "local_data_path": "weights",
+                    "url": TEST_DOWNLOAD_URL,
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                }
+            ]
+        )
+        results = download_external_data(external_data, tmp_path, max_workers=4)
+
+    assert (tmp_path / "weights").read_bytes() == data
+    assert sorted(ranges[1:]) == [(i, i + 999) for i in range(0, 10_000, 1000)]
+    assert results[0].num_bytes == len(data)
+    assert not (tmp_path / "weights.part").exists()
+    assert not (tmp_path / "weights.part.progress").exists()
+
+
+def test_download_resumes_partial_file(tmp_path):
+    data = os.urandom(10_000)
+    ranges: list = []
+    with (
+        patch.dict(os.environ, {}),
+        patch.object(download, "RANGE_CHUNK_SIZE", 1000),
+        patch.object(download, "RANGE_MIN_FILE_SIZE", 2000),
+        requests_mock.Mocker() as m,
+    ):
+        _mock_range_url(m, TEST_DOWNLOAD_URL, data, ranges)
+        external_data = ExternalData(
+            [{"local_data_path": "weights", "url": TEST_DOWNLOAD_URL}]
+        )
+        # Simulate an interrupted download, the first 3 chunks were downloaded.
+        part = bytearray(len(data))
+        part[:3000] = data[:3000]
+        (tmp_path / "weights.part").write_bytes(part)
+        state = {
+            "url": TEST_DOWNLOAD_URL,
+            "size": len(data),
+            "etag": '"etag"',
+            "chunk_size": 1000,
+        }
+        (tmp_path / "weights.part.progress").write_text(
+            json.dumps(state) + "\n0\n1\n2\n"
+        )
+        results = download_external_data(external_data, tmp_path)
+
+    assert (tmp_path / "weights").read_bytes() == data
+    assert sorted(ranges[1:]) == [(i, i + 999) for i in range(3000, 10_000, 1000)]
+    assert results[0].reused_bytes == 3000
+
+
+def test_download_retries_probe(tmp_path):
+    with patch.dict(os.environ, {}), requests_mock.Mocker() as m:
+        m.get(
+            TEST_DOWNLOAD_URL,
+            [
+                {"exc": requests.exceptions.ConnectionError},
+                {"content": b"mocked content"},
+                {"content": b"mocked content"},
+            ],
+        )
+        external_data = ExternalData(
+            [{"local_data_path": "foo", "url": TEST_DOWNLOAD_URL}]
+        )
+        download_external_data(external_data, tmp_path)
+
+    assert (tmp_path / "foo").read_bytes() == b"mocked content"
+    assert m.call_count == 3
+
+
+def test_download_retries_connection_reset_mid_body(tmp_path):
+    data = os.urandom(100_000)
+    ranges: list = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            range_header = self.headers.get("Range")
+            start, end = 0, len(data) - 1
+            if range_header is not None:
+                first, last = range_header.removeprefix("bytes=").split("-")
+                start, end = int(first), int(last) if last else end
+            ranges.append(range_header and (start, end))
+            if range_header is not None:
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(end + 1 - start))
+            self.end_headers()
+            body = data[start : end + 1]
+            if len(ranges) == 2:
+                # Reset the connection halfway through the first body.
+                self.wfile.write(body[: len(body) // 2])
+                self.wfile.flush()
+                self.connection.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+                )
+                self.connection.close()
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+
+        def finish(self):
+            try:
+                super().finish()
+            except OSError:
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/weights"
+        external_data = ExternalData([{"local_data_path": "weights", "url": url}])
+        download_external_data(external_data, tmp_path)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert (tmp_path / "weights").read_bytes() == data
+    # The retry resumes from what was written before the reset, if anything.
+    assert len(ranges) == 3
+    assert ranges[1] is None
+    assert ranges[2] is None or ranges[2][1] == len(data) - 1
+
+
+def test_download_checksum_mismatch(tmp_path):
+    with patch.dict(os.environ, {}), requests_mock.Mocker() as m:
+        m.get(TEST_DOWNLOAD_URL, content=b"mocked content")
+        external_data = ExternalData(
+            [
+                {
+                    "local_data_path": "foo",
+                    "url": TEST_DOWNLOAD_URL,
+                    "sha256": hashlib.sha256(b"other content").hexdigest(),
+                }
+            ]
+        )
+        with pytest.raises(DownloadError, match="Checksum mismatch"):
+            download_external_data(external_data, tmp_path)
+
+    assert not (tmp_path / "foo").exists()
+    assert not (tmp_path / "foo.part").exists()
+
+
+def test_download_skips_existing_file_with_matching_checksum(tmp_path):
+    (tmp_path / "foo").write_bytes(b"mocked content")
+    with patch.dict(os.environ, {}), requests_mock.Mocker() as m:
+        external_data = ExternalData(
+            [
+                {
+                    "local_data_path": "foo",
+                    "url": TEST_DOWNLOAD_URL,
+                    "sha256": hashlib.sha256(b"mocked content").hexdigest(),
+                }
+            ]
+        )
+        download_external_data(external_data, tmp_path)
+        assert not m.called
+
+
+def test_download_using_b10cp(tmp_path):
+    b10cp = tmp_path / "b10cp"
+    # Writes the source URL to the target.
+    b10cp.write_text('#!/bin/sh\nprintf "%s" "$2" > "$4"\n')
+    b10cp.chmod(0o755)
+    data_dir = tmp_path / "data"
+    external_data = ExternalData(
+        [
+            {"local_data_path": f"file_{i}", "url": f"{TEST_DOWNLOAD_URL}/{i}"}
+            for i in range(5)
+        ]
+    )
+    with patch.dict(os.environ, {download.B10CP_PATH_TRUSS_ENV_VAR_NAME: str(b10cp)}):
+        download_external_data(external_data, data_dir, max_workers=2)
+
+    for i in range(5):
+        assert (data_dir / f"file_{i}").read_text() == f"{TEST_DOWNLOAD_URL}/{i}"
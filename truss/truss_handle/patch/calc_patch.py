@@ -27,8 +27,11 @@ from truss.templates.control.control.helpers.truss_patch.system_packages import
     system_packages_set,
 )
 from truss.truss_handle.patch.custom_types import ChangedPaths, TrussSignature
-from truss.truss_handle.patch.hash import file_content_hash_str
-from truss.util.path import get_ignored_relative_paths
+from truss.truss_handle.patch.hash import FileHashCache
+from truss.util.path import (
+    get_ignored_relative_paths,
+    get_unignored_relative_paths_from_root,
+)
 
 logger: logging.Logger = logging.getLogger(__name__)
 PYCACHE_IGNORE_PATTERNS = ["**/__pycache__/**/*", "**/__pycache__/**"]
@@ -39,6 +42,7 @@ def calc_truss_patch(
     truss_dir: Path,
     previous_truss_signature: TrussSignature,
     ignore_patterns: Optional[List[str]] = None,
+    cache: Optional[FileHashCache] = None,
 ) -> Optional[List[Patch]]:
     """
     Calculate patch for a truss from a previous state.
@@ -60,7 +64,10 @@ def calc_truss_patch(
         ignore_patterns = PYCACHE_IGNORE_PATTERNS
 
     changed_paths = _calc_changed_paths(
-        truss_dir, previous_truss_signature.content_hashes_by_path, ignore_patterns
+        truss_dir,
+        previous_truss_signature.content_hashes_by_path,
+        ignore_patterns,
+        cache or FileHashCache(),
     )
 
     new_config = TrussConfig.from_yaml(truss_dir / CONFIG_FILE)
@@ -196,17 +203,16 @@ def _changed_path_is_requirements_file(changed_path: str, new_config: TrussConfi
 
 def _calc_changed_paths(
     root: Path,
-    previous_root_path_content_hashes: Dict[str, str],
+    previous_root_path_content_hashes: Dict[str, Optional[str]],
     ignore_patterns: Optional[List[str]],
+    cache: FileHashCache,
 ) -> ChangedPaths:
     """
     TODO(pankaj) add support for directory creation in patch
     """
-    root_relative_new_paths = set(
-        (str(path.relative_to(root)) for path in root.glob("**/*"))
-    )
-    unignored_new_paths = _calc_unignored_paths(
-        root_relative_new_paths, ignore_patterns
+    unignored_new_paths = set(
+        str(path)
+        for path in get_unignored_relative_paths_from_root(root, ignore_patterns)
     )
     previous_root_relative_paths = set(previous_root_path_content_hashes.keys())
     unignored_prev_paths = _calc_unignored_paths(
@@ -218,13 +224,10 @@ def _calc_changed_paths(
 
     updated_paths = set()
     common_paths = unignored_new_paths.intersection(unignored_prev_paths)
-    for path in common_paths:
-        full_path: Path = root / path
-        if full_path.is_file():
-            content_hash = file_content_hash_str(full_path)
-            previous_content_hash = previous_root_path_content_hashes[path]
-            if content_hash != previous_content_hash:
-                updated_paths.add(path)
+    content_hashes = cache.file_hashes(root, common_paths)
+    for path, content_hash in content_hashes.items():
+        if content_hash != previous_root_path_content_hashes[path]:
+            updated_paths.add(path)
 
     return {
         "added": list(added_paths),
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -18,7 +18,7 @@ class TrussSignature:
     config changes, such as add/update/remove of python requirements etc.
     """
 
-    content_hashes_by_path: Dict[str, str]
+    content_hashes_by_path: Dict[str, Optional[str]]
     config: str
     requirements_file_requirements: List[str] = field(default_factory=list)
 
@@ -1,13 +1,15 @@
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from truss.truss_handle.patch.hash import file_content_hash_str
+from truss.truss_handle.patch.hash import FileHashCache
 from truss.util.path import get_unignored_relative_paths_from_root
 
 
 def directory_content_signature(
-    root: Path, ignore_patterns: Optional[List[str]] = None
-) -> Dict[str, str]:
+    root: Path,
+    ignore_patterns: Optional[List[str]] = None,
+    cache: Optional[FileHashCache] = None,
+) -> Dict[str, Optional[str]]:
     """Calculate content signature of a filesystem directory.
 
     Sort all files by path, store file path with content hash.
@@ -19,9 +21,5 @@ def directory_content_signature(
     """
     paths = list(get_unignored_relative_paths_from_root(root, ignore_patterns))
     paths.sort()
-
-    def path_hash(pth: Path):
-        if pth.is_file():
-            return file_content_hash_str(pth)
-
-    return {str(path): path_hash(root / path) for path in paths}
+    file_hashes = (cache or FileHashCache()).file_hashes(root, paths)
+    return {str(path): file_hashes.get(path) for path in paths}
@@ -1,13 +1,155 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, List, Optional
+from stat import S_ISREG
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
 
 from blake3 import blake3
 
 from truss.util.path import get_unignored_relative_paths_from_root
 
+logger = logging.getLogger(__name__)
+
+RelativePath = TypeVar("RelativePath", bound=Union[str, Path])
+
+FILE_HASH_CACHE_VERSION = 1
+# Files at least this large are hashed on a thread pool.
+PARALLEL_HASH_MIN_FILE_BYTES = 1024 * 1024
+PARALLEL_HASH_MAX_WORKERS = min(8, os.cpu_count() or 1)
+# Files modified this recently may still be written to within the same mtime
+# granularity, so their hashes are not cached.
+FILE_HASH_CACHE_RACY_WINDOW_NS = 2 * 10**9
+
+
+class FileHashCache:
+    """Cache of file content hashes, keyed by (path, size, mtime_ns, inode).
+
+    Only files whose stat changed since they were last hashed are read again. If
+    `cache_file` is given, the cache is loaded from and persisted to it, so repeated
+    calculations (e.g. on every `truss watch` iteration) only hash changed files.
+    Files that are not cached and large are hashed in parallel.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None) -> None:
+        self._cache_file = cache_file
+        self._entries: Dict[str, Tuple[int, int, int, str]] = {}
+        self._used_keys: set = set()
+        self._dirty = False
+        if cache_file is not None:
+            self._load(cache_file)
+
+    def _load(self, cache_file: Path) -> None:
+        try:
+            data = json.loads(cache_file.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable file hash cache {cache_file}: {e}")
+            return
+        if data.get("version") != FILE_HASH_CACHE_VERSION:
+            return
+        self._entries = {
+            path: tuple(entry)  # type: ignore[misc]
+            for path, entry in data.get("entries", {}).items()
+        }
+
+    def file_hashes(
+        self, root: Path, relative_paths: Iterable[RelativePath]
+    ) -> Dict[RelativePath, str]:
+        """Returns the hex blake3 content hash of each regular file in `relative_paths`.
+
+        The result is keyed by the given relative paths. Other paths, e.g.
+        directories or dangling symlinks, are skipped.
+        """
+        hashes: Dict[RelativePath, str] = {}
+        to_hash: List[Tuple[RelativePath, str, os.stat_result]] = []
+        abs_root = os.path.abspath(root)
+        for path in relative_paths:
+            key = os.path.join(abs_root, path)
+            try:
+                stat = os.stat(key)
+            except OSError:  # E.g. a dangling symlink.
+                continue
+            if not S_ISREG(stat.st_mode):
+                continue
+            self._used_keys.add(key)
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and entry[0] == stat.st_size
+                and entry[1] == stat.st_mtime_ns
+                and entry[2] == stat.st_ino
+            ):
+                hashes[path] = entry[3]
+            else:
+                to_hash.append((path, key, stat))
+        if not to_hash:
+            return hashes
+
+        large = [
+            item for item in to_hash if item[2].st_size >= PARALLEL_HASH_MIN_FILE_BYTES
+        ]
+        small = [
+            item for item in to_hash if item[2].st_size < PARALLEL_HASH_MIN_FILE_BYTES
+        ]
+        computed: List[Tuple[RelativePath, str, os.stat_result, str]] = []
+        if len(large) > 1:
+            # blake3 and file reads release the GIL.
+            with ThreadPoolExecutor(max_workers=PARALLEL_HASH_MAX_WORKERS) as executor:
+                large_hashes = executor.map(
+                    lambda item: file_content_hash_str(Path(item[1])), large
+                )
+                computed.extend(
+                    (*item, hash_str) for item, hash_str in zip(large, large_hashes)
+                )
+        else:
+            small = large + small
+        computed.extend((*item, file_content_hash_str(Path(item[1]))) for item in small)
+
+        racy_after_ns = time.time_ns() - FILE_HASH_CACHE_RACY_WINDOW_NS
+        for file, key, stat, hash_str in computed:
+            hashes[file] = hash_str
+            if stat.st_mtime_ns < racy_after_ns:
+                self._entries[key] = (
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    stat.st_ino,
+                    hash_str,
+                )
+                self._dirty = True
+            else:
+                self._entries.pop(key, None)
+        return hashes
+
+    def save(self) -> None:
+        """Persists entries of files looked up through this instance.
+
+        Entries of files that were not looked up (e.g. deleted files) are dropped.
+        """
+        if self._cache_file is None:
+            return
+        entries = {k: v for k, v in self._entries.items() if k in self._used_keys}
+        if not self._dirty and len(entries) == len(self._entries):
+            return
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self._cache_file.parent, delete=False, suffix=".tmp"
+        ) as f:
+            json.dump({"version": FILE_HASH_CACHE_VERSION, "entries": entries}, f)
+        # Atomic, so that concurrent truss processes never read a partial file.
+        os.replace(f.name, self._cache_file)
+        self._entries = entries
+        self._dirty = False
+
 
 def directory_content_hash(
-    root: Path, ignore_patterns: Optional[List[str]] = None
+    root: Path,
+    ignore_patterns: Optional[List[str]] = None,
+    cache: Optional[FileHashCache] = None,
 ) -> str:
     """Calculate content based hash of a filesystem directory.
 
@@ -21,11 +163,12 @@ def directory_content_hash(
     hasher = blake3()
     paths = list(get_unignored_relative_paths_from_root(root, ignore_patterns))
     paths.sort()
+    file_hashes = (cache or FileHashCache()).file_hashes(root, paths)
     for path in paths:
         hasher.update(str_hash(str(path)))
-        absolute_path = root / path
-        if absolute_path.is_file():
-            hasher.update(file_content_hash(absolute_path))
+        file_hash = file_hashes.get(path)
+        if file_hash is not None:
+            hasher.update(bytes.fromhex(file_hash))
     return hasher.hexdigest()
 
 
@@ -5,12 +5,15 @@ from truss.base.constants import CONFIG_FILE
 from truss.base.truss_config import TrussConfig
 from truss.truss_handle.patch.custom_types import TrussSignature
 from truss.truss_handle.patch.dir_signature import directory_content_signature
+from truss.truss_handle.patch.hash import FileHashCache
 
 
 def calc_truss_signature(
-    truss_dir: Path, ignore_patterns: Optional[List[str]] = None
+    truss_dir: Path,
+    ignore_patterns: Optional[List[str]] = None,
+    cache: Optional[FileHashCache] = None,
 ) -> TrussSignature:
-    content_signature = directory_content_signature(truss_dir, ignore_patterns)
+    content_signature = directory_content_signature(truss_dir, ignore_patterns, cache)
     config_path = truss_dir / CONFIG_FILE
     with (config_path).open("r") as config_file:
         config = config_file.read()
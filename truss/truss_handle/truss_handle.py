@@ -52,7 +52,7 @@ from truss.truss_handle.patch.custom_types import (
     PatchRequest,
     TrussSignature,
 )
-from truss.truss_handle.patch.hash import directory_content_hash
+from truss.truss_handle.patch.hash import FileHashCache, directory_content_hash
 from truss.truss_handle.patch.signature import calc_truss_signature
 from truss.truss_handle.readme_generator import generate_readme
 from truss.util.docker import (
@@ -838,17 +838,25 @@ class TrussHandle:
             return None
         prev_sign = TrussSignature.from_dict(json.loads(prev_sign_str))
         ignore_patterns = truss_ignore_patterns + self._spec.hash_ignore_patterns
-        patch_ops = calc_truss_patch(self._truss_dir, prev_sign, ignore_patterns)
+        # Persisted across calls, so that e.g. `truss watch` only re-hashes changed
+        # files on each iteration.
+        cache = FileHashCache(LocalConfigHandler.file_hash_cache_path(self._truss_dir))
+        patch_ops = calc_truss_patch(self._truss_dir, prev_sign, ignore_patterns, cache)
         if patch_ops is None:
+            cache.save()
             return None
 
-        return PatchDetails(
+        patch_details = PatchDetails(
             prev_signature=prev_sign,
             prev_hash=prev_truss_hash,
-            next_hash=directory_content_hash(self._truss_dir, ignore_patterns),
-            next_signature=calc_truss_signature(self._truss_dir, ignore_patterns),
+            next_hash=directory_content_hash(self._truss_dir, ignore_patterns, cache),
+            next_signature=calc_truss_signature(
+                self._truss_dir, ignore_patterns, cache
+            ),
             patch_ops=patch_ops,
         )
+        cache.save()
+        return patch_details
 
     def gather(self) -> Path:
         """Convert a Truss with external dependencies into one without.
@@ -1,21 +1,83 @@
+import functools
+import hashlib
+import json
+import logging
 import os
-import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional, Sequence, Set, TypeVar
 
 import requests
+import urllib3
 
+from truss.base.errors import DownloadError
 from truss.base.truss_config import ExternalData
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
 B10CP_EXECUTABLE_NAME = "b10cp"
 BLOB_DOWNLOAD_TIMEOUT_SECS = 600  # 10 minutes
 B10CP_PATH_TRUSS_ENV_VAR_NAME = "B10CP_PATH_TRUSS"
+DOWNLOAD_MAX_WORKERS_ENV_VAR_NAME = "TRUSS_DOWNLOAD_MAX_WORKERS"
+DEFAULT_DOWNLOAD_MAX_WORKERS = 8
+# Files of at least `RANGE_MIN_FILE_SIZE` bytes are downloaded as concurrent ranges
+# of `RANGE_CHUNK_SIZE` bytes, if the server supports range requests.
+RANGE_CHUNK_SIZE = 64 * 1024 * 1024
+RANGE_MIN_FILE_SIZE = 2 * RANGE_CHUNK_SIZE
+DOWNLOAD_ATTEMPTS = 3
+
+# Downloads are written to `<file>.part` and moved into place once complete and
+# verified. `<file>.part.progress` records what is needed to resume them.
+PARTIAL_SUFFIX = ".part"
+PROGRESS_SUFFIX = ".part.progress"
+
+_COPY_BUFFER_SIZE = 1024 * 1024
+# Errors while reading the body from `response.raw`, e.g. on a connection reset
+# mid-stream, are raised by `urllib3` instead of `requests`.
+_RETRIED_ERRORS = (
+    requests.RequestException,
+    urllib3.exceptions.HTTPError,
+    OSError,
+    DownloadError,
+)
+_thread_local = threading.local()
+
+
+@dataclass
+class DownloadResult:
+    path: Path
+    num_bytes: int
+    # Bytes of a partial or existing file that did not need to be downloaded again.
+    reused_bytes: int
+    duration_secs: float
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.num_bytes / self.duration_secs if self.duration_secs else 0.0
 
 
-def download_external_data(external_data: Optional[ExternalData], data_dir: Path):
+def download_external_data(
+    external_data: Optional[ExternalData],
+    data_dir: Path,
+    max_workers: Optional[int] = None,
+) -> List[DownloadResult]:
+    """Downloads all external data items into `data_dir`.
+
+    Files (or ranges of large files) are downloaded by a pool of `max_workers`
+    threads, defaulting to `TRUSS_DOWNLOAD_MAX_WORKERS` or 8. Interrupted downloads
+    are resumed from their partial files, and files are verified against the
+    `sha256` of their items, if set. An existing file with a matching `sha256` is
+    not downloaded again. If `b10cp` is available, each file is downloaded by one
+    `b10cp` process instead, with the same concurrency limit.
+    """
     if external_data is None:
-        return
+        return []
     data_dir.mkdir(exist_ok=True)
     b10cp_path = _b10cp_path()
 
@@ -28,57 +90,295 @@ def download_external_data(external_data: Optional[ExternalData], data_dir: Path
             )
         path.parent.mkdir(exist_ok=True, parents=True)
 
+    downloads = [
+        _FileDownload(
+            item.url, (data_dir / item.local_data_path).resolve(), item.sha256
+        )
+        for item in external_data.items
+    ]
     if b10cp_path is not None:
         print("b10cp found, using it to download external data")
-        _download_external_data_using_b10cp(b10cp_path, data_dir, external_data)
-        return
+    return _download_all(downloads, _max_workers(max_workers), b10cp_path)
+
 
-    # slow path
-    _download_external_data_using_requests(data_dir, external_data)
+def download_from_url_using_requests(URL: str, download_to: Path):
+    _download_all([_FileDownload(URL, download_to)], max_workers=1)
 
 
 def _b10cp_path() -> Optional[str]:
     return os.environ.get(B10CP_PATH_TRUSS_ENV_VAR_NAME)
 
 
-def _download_external_data_using_b10cp(
-    b10cp_path: str, data_dir: Path, external_data: ExternalData
-):
-    procs = []
-    # TODO(pankaj) Limit concurrency here
-    for item in external_data.items:
-        path = (data_dir / item.local_data_path).resolve()
-        proc = _download_from_url_using_b10cp(b10cp_path, item.url, path)
-        procs.append(proc)
-
-    for proc in procs:
-        proc.wait()
-
-
-def _download_from_url_using_b10cp(b10cp_path: str, url: str, download_to: Path):
-    return subprocess.Popen(
-        [
-            b10cp_path,
-            "-source",
-            url,  # Add quotes to work with any special characters.
-            "-target",
-            str(download_to),
-        ]
-    )
+def _max_workers(max_workers: Optional[int]) -> int:
+    if max_workers is None:
+        max_workers = int(
+            os.environ.get(
+                DOWNLOAD_MAX_WORKERS_ENV_VAR_NAME, DEFAULT_DOWNLOAD_MAX_WORKERS
+            )
+        )
+    return max(max_workers, 1)
 
 
-def _download_external_data_using_requests(data_dir: Path, external_data: ExternalData):
-    for item in external_data.items:
-        download_from_url_using_requests(
-            item.url, (data_dir / item.local_data_path).resolve()
+def _session() -> requests.Session:
+    if not hasattr(_thread_local, "session"):
+        _thread_local.session = requests.Session()
+    return _thread_local.session
+
+
+def _run_all(executor: ThreadPoolExecutor, tasks: Sequence[Callable[[], T]]) -> List[T]:
+    futures = [executor.submit(task) for task in tasks]
+    done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+    for future in not_done:
+        future.cancel()
+    # Let running tasks finish writing, so partial files can be resumed.
+    wait(not_done)
+    for future in futures:
+        if not future.cancelled() and future.exception():
+            raise future.exception()  # type: ignore[misc]
+    return [future.result() for future in futures]
+
+
+def _download_all(
+    downloads: List["_FileDownload"], max_workers: int, b10cp_path: Optional[str] = None
+) -> List[DownloadResult]:
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="truss-download"
+    ) as executor:
+        if b10cp_path is not None:
+            _run_all(
+                executor,
+                [
+                    functools.partial(download.download_using_b10cp, b10cp_path)
+                    for download in downloads
+                ],
+            )
+        else:
+            # Probe all files first, so that ranges of large files and small files
+            # share the pool.
+            _run_all(executor, [download.prepare for download in downloads])
+            _run_all(
+                executor, [task for download in downloads for task in download.tasks()]
+            )
+        return _run_all(executor, [download.finish for download in downloads])
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(_COPY_BUFFER_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _FileDownload:
+    """Download of one file, possibly split into concurrently downloaded ranges."""
+
+    def __init__(self, url: str, path: Path, sha256: Optional[str] = None) -> None:
+        self._url = url
+        self._path = path
+        self._sha256 = sha256.lower() if sha256 else None
+        self._part_path = path.with_name(path.name + PARTIAL_SUFFIX)
+        self._progress_path = path.with_name(path.name + PROGRESS_SUFFIX)
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self._supports_ranges = False
+        self._etag: Optional[str] = None
+        self._chunked = False
+        self._done_chunks: Set[int] = set()
+        self._complete = False
+        self._downloaded_bytes = 0
+        self._reused_bytes = 0
+        self._started_at = time.monotonic()
+
+    def _get(self, headers: Optional[dict] = None) -> requests.Response:
+        response = _session().get(
+            self._url,
+            headers=headers,
+            allow_redirects=True,
+            stream=True,
+            timeout=BLOB_DOWNLOAD_TIMEOUT_SECS,
         )
+        if response.status_code != 416:
+            response.raise_for_status()
+        return response
 
+    def prepare(self) -> None:
+        """Probes size and range support, and restores the state of a partial file."""
+        self._started_at = time.monotonic()
+        if self._sha256 and self._path.exists() and _sha256(self._path) == self._sha256:
+            self._complete = True
+            self._reused_bytes = self._path.stat().st_size
+            return
 
-def download_from_url_using_requests(URL: str, download_to: Path):
-    # Streaming download to keep memory usage low
-    resp = requests.get(
-        URL, allow_redirects=True, stream=True, timeout=BLOB_DOWNLOAD_TIMEOUT_SECS
-    )
-    resp.raise_for_status()
-    with download_to.open("wb") as file:
-        shutil.copyfileobj(resp.raw, file)
+        self._with_retries(self._probe)()
+        self._chunked = (
+            self._supports_ranges
+            and self._size is not None
+            and self._size >= RANGE_MIN_FILE_SIZE
+        )
+
+        state = {
+            "url": self._url,
+            "size": self._size,
+            "etag": self._etag,
+            "chunk_size": RANGE_CHUNK_SIZE if self._chunked else None,
+        }
+        if self._supports_ranges and self._read_progress() == state:
+            if self._chunked:
+                self._reused_bytes = sum(
+                    self._chunk_end(index) - index * RANGE_CHUNK_SIZE
+                    for index in self._done_chunks
+                )
+            else:
+                self._reused_bytes = self._part_path.stat().st_size
+            logger.info(f"Resuming download of {self._url} to {self._path}.")
+            return
+
+        self._done_chunks = set()
+        with self._part_path.open("wb") as f:
+            if self._chunked:
+                f.truncate(self._size)
+        self._progress_path.write_text(json.dumps(state) + "\n")
+
+    def _probe(self) -> None:
+        # A one byte range, instead of `HEAD`, also works with presigned URLs.
+        with self._get({"Range": "bytes=0-0"}) as response:
+            content_range = response.headers.get("Content-Range", "")
+            if response.status_code == 206 and "/" in content_range:
+                total = content_range.rsplit("/", 1)[1]
+                self._size = int(total) if total.isdigit() else None
+                self._supports_ranges = self._size is not None
+            elif "Content-Length" in response.headers:
+                self._size = int(response.headers["Content-Length"])
+            self._etag = response.headers.get("ETag")
+
+    def _read_progress(self) -> Optional[dict]:
+        if not self._part_path.exists() or not self._progress_path.exists():
+            return None
+        try:
+            header, *done_lines = self._progress_path.read_text().splitlines()
+            state = json.loads(header)
+            self._done_chunks = {int(line) for line in done_lines if line}
+        except ValueError:
+            return None
+        if state.get("chunk_size") and self._part_path.stat().st_size != self._size:
+            return None
+        return state
+
+    def _chunk_end(self, index: int) -> int:
+        assert self._size is not None
+        return min((index + 1) * RANGE_CHUNK_SIZE, self._size)
+
+    def tasks(self) -> List[Callable[[], None]]:
+        if self._complete:
+            return []
+        if not self._chunked:
+            return [self._with_retries(self._download_stream)]
+        assert self._size is not None
+        num_chunks = -(-self._size // RANGE_CHUNK_SIZE)
+        return [
+            self._with_retries(functools.partial(self._download_chunk, index))
+            for index in range(num_chunks)
+            if index not in self._done_chunks
+        ]
+
+    def _with_retries(self, fn: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+                try:
+                    return fn()
+                except _RETRIED_ERRORS as e:
+                    if attempt == DOWNLOAD_ATTEMPTS:
+                        raise
+                    logger.warning(
+                        f"Download of {self._url} failed ({e}), retrying "
+                        f"({attempt}/{DOWNLOAD_ATTEMPTS})."
+                    )
+
+        return run
+
+    def _copy(self, response: requests.Response, f) -> int:
+        copied = 0
+        while chunk := response.raw.read(_COPY_BUFFER_SIZE):
+            f.write(chunk)
+            copied += len(chunk)
+            with self._lock:
+                self._downloaded_bytes += len(chunk)
+        return copied
+
+    def _download_stream(self) -> None:
+        offset = self._part_path.stat().st_size if self._supports_ranges else 0
+        if self._size is not None and offset >= self._size:
+            return
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        with self._get(headers) as response:
+            if response.status_code == 416:
+                return
+            if response.status_code != 206:
+                # The whole file is sent, e.g. if the server ignores the range.
+                offset = 0
+            with self._part_path.open("r+b" if offset else "wb") as f:
+                f.seek(offset)
+                self._copy(response, f)
+
+    def _download_chunk(self, index: int) -> None:
+        start, end = index * RANGE_CHUNK_SIZE, self._chunk_end(index)
+        with self._get({"Range": f"bytes={start}-{end - 1}"}) as response:
+            if response.status_code != 206:
+                raise DownloadError(
+                    f"Expected a partial response for range {start}-{end - 1} of "
+                    f"{self._url}, got status {response.status_code}."
+                )
+            with self._part_path.open("r+b") as f:
+                f.seek(start)
+                copied = self._copy(response, f)
+        if copied != end - start:
+            raise DownloadError(
+                f"Got {copied} bytes for range {start}-{end - 1} of {self._url}."
+            )
+        with self._lock, self._progress_path.open("a") as progress:
+            progress.write(f"{index}\n")
+
+    def download_using_b10cp(self, b10cp_path: str) -> None:
+        self._started_at = time.monotonic()
+        if self._sha256 and self._path.exists() and _sha256(self._path) == self._sha256:
+            self._complete = True
+            self._reused_bytes = self._path.stat().st_size
+            return
+        proc = subprocess.run(
+            [b10cp_path, "-source", self._url, "-target", str(self._part_path)]
+        )
+        if proc.returncode != 0:
+            raise DownloadError(
+                f"b10cp failed to download {self._url} with exit code "
+                f"{proc.returncode}."
+            )
+        self._downloaded_bytes = self._part_path.stat().st_size
+
+    def finish(self) -> DownloadResult:
+        """Verifies the downloaded file and moves it into place."""
+        if not self._complete:
+            if self._sha256:
+                actual = _sha256(self._part_path)
+                if actual != self._sha256:
+                    self._part_path.unlink()
+                    self._progress_path.unlink(missing_ok=True)
+                    raise DownloadError(
+                        f"Checksum mismatch for {self._url}: expected sha256 "
+                        f"{self._sha256}, got {actual}."
+                    )
+            self._part_path.replace(self._path)
+            self._progress_path.unlink(missing_ok=True)
+        result = DownloadResult(
+            path=self._path,
+            num_bytes=self._downloaded_bytes,
+            reused_bytes=self._reused_bytes,
+            duration_secs=time.monotonic() - self._started_at,
+        )
+        logger.info(
+            f"Downloaded {self._url} to {self._path}: "
+            f"{result.num_bytes / 1e6:.1f}MB in {result.duration_secs:.2f}s "
+            f"({result.bytes_per_sec / 1e6:.1f}MB/s, {result.reused_bytes / 1e6:.1f}MB "
+            "reused)."
+        )
+        return result
@@ -210,10 +210,36 @@ def get_ignored_relative_paths(
 def get_unignored_relative_paths_from_root(
     root: Path, ignore_patterns: Optional[List[str]] = None
 ) -> Set[Path]:
-    """Given a root directory, returns an iterator of the relative paths that do not match ignore_patterns."""
-    root_relative_paths = set(path.relative_to(root) for path in root.glob("**/*"))
+    """Given a root directory, returns the relative paths that do not match ignore_patterns.
 
-    ignored_paths = set(
-        get_ignored_relative_paths(root_relative_paths, ignore_patterns)
+    Like `walk_filtered`, ignored directories are pruned during the walk instead of
+    being listed and filtered afterwards. A directory that only matches as
+    directory (e.g. `data/` or `**/__pycache__/**`) is still listed itself, as
+    when matching each path on its own.
+    """
+    spec = pathspec.PathSpec.from_lines(
+        pathspec.patterns.GitWildMatchPattern, ignore_patterns or []
     )
-    return root_relative_paths - ignored_paths  # type: ignore
+
+    def is_ignored(rel_path: str) -> bool:
+        return bool(ignore_patterns) and spec.match_file(rel_path)
+
+    # Works on posix strings, creating `Path` objects per entry is comparatively slow.
+    relative_paths: List[str] = []
+    root_str = str(root)
+    for dirpath, dirs, filenames in os.walk(root_str, followlinks=False):
+        rel_root = Path(os.path.relpath(dirpath, root_str)).as_posix()
+        prefix = "" if rel_root == "." else rel_root + "/"
+        descend = []
+        for d in dirs:
+            rel_dir = prefix + d
+            if is_ignored(rel_dir):
+                continue
+            relative_paths.append(rel_dir)
+            if not is_ignored(rel_dir + "/"):
+                descend.append(d)
+        dirs[:] = descend
+        relative_paths.extend(
+            prefix + f for f in filenames if not is_ignored(prefix + f)
+        )
+    return set(map(Path, relative_paths))